@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+""" Stand-in for BioNetGen's ``BNG2.pl`` for benchmarking the overhead of BioSimulators-BioNetGen
+
+The stand-in reads a BNGL file and executes its ``simulate`` actions (``simulate``, ``simulate_ode``, ``simulate_ssa``,
+etc.) by writing BioNetGen-formatted time courses of the observables of the model (``<prefix>[_<suffix>].gdat``) to the
+output directory, without simulating the model. The values of the observables are deterministic, smooth functions of
+time. The stand-in also prints BioNetGen-formatted diagnostic output, including the ``CPU TIME`` of each action. Other
+actions (e.g., ``generate_network``, ``setParameter``) are accepted and ignored.
+
+Usage::
+
+    BNG2.pl <model.bngl> [--outdir <dirname>]
+    BNG2.pl --version
+
+The size of the time courses and the duration of the simulations can be configured with the following environment
+variables:
+
+* ``BNG2_STAND_IN_EXTRA_OBSERVABLES``: number of observables to add to the time courses in addition to those of the
+  model (default: 0)
+* ``BNG2_STAND_IN_SIMULATION_TIME``: duration (in seconds) to wait for each simulation (default: 0)
+
+:Author: Jonathan Karr <karr@mssm.edu>
+:Date: 2021-01-05
+:Copyright: 2020-2021, Center for Reproducible Biomedical Modeling
+:License: MIT
+"""
+
+import math
+import os
+import re
+import sys
+import time
+import zlib
+
+ACTION_PATTERN = re.compile(r'^\s*(\w+)\s*\((.*)\)\s*;?\s*$')
+ARGUMENT_PATTERN = re.compile(r'(\w+)\s*=>\s*("[^"]*"|\[[^\]]*\]|[^,}]+)')
+
+
+def read_model(filename):
+    """ Read the observables and actions of a BNGL file
+
+    Args:
+        filename (:obj:`str`): path to the BNGL file
+
+    Returns:
+        :obj:`tuple`:
+
+            * :obj:`list` of :obj:`str`: ids of the observables
+            * :obj:`list` of :obj:`tuple`: name and arguments (:obj:`dict`) of each action
+    """
+    observables = []
+    actions = []
+    block = None
+    with open(filename, 'r') as file:
+        for line in file:
+            line = line.partition('#')[0].strip()
+            if not line:
+                continue
+
+            if line.startswith('begin '):
+                block = line[len('begin '):].strip()
+            elif line.startswith('end '):
+                block = None
+            elif block == 'observables':
+                tokens = line.split()
+                if tokens[0].isdigit():
+                    tokens = tokens[1:]
+                observables.append(tokens[1])
+            elif block is None:
+                match = ACTION_PATTERN.match(line)
+                if match:
+                    actions.append((match.group(1), dict(
+                        (key, value.strip().strip('"')) for key, value in ARGUMENT_PATTERN.findall(match.group(2)))))
+
+    return observables, actions
+
+
+def write_results(filename, observables, t_start, t_end, n_steps):
+    """ Write BioNetGen-formatted time courses of observables
+
+    Args:
+        filename (:obj:`str`): path to save the time courses
+        observables (:obj:`list` of :obj:`str`): ids of the observables
+        t_start (:obj:`float`): initial time
+        t_end (:obj:`float`): end time
+        n_steps (:obj:`int`): number of steps
+    """
+    coefficients = []
+    for observable in observables:
+        hash = zlib.crc32(observable.encode())
+        coefficients.append((1. + hash % 100, 1. + (hash >> 8) % 100, 0.01 + ((hash >> 16) % 100) / 100.))
+
+    with open(filename, 'w') as file:
+        file.write('#{:>18}'.format('time') + ''.join(' {:>19}'.format(name) for name in observables) + '\n')
+        for i_step in range(n_steps + 1):
+            t = t_start + (t_end - t_start) * i_step / n_steps
+            values = [t] + [a + b * math.exp(-k * (t - t_start)) for a, b, k in coefficients]
+            file.write(' '.join('{: .12e}'.format(value) for value in values) + '\n')
+
+
+def main(argv):
+    """ Execute the actions of a BNGL file
+
+    Args:
+        argv (:obj:`list` of :obj:`str`): command-line arguments
+
+    Returns:
+        :obj:`int`: exit status
+    """
+    if argv[0] in ['-v', '--version']:
+        print('BioNetGen version 2.9.3 (stand-in)')
+        return 0
+
+    start = time.process_time()
+    filename = argv[0]
+    outdir = argv[argv.index('--outdir') + 1] if '--outdir' in argv else os.path.dirname(filename)
+    extra_observables = int(os.getenv('BNG2_STAND_IN_EXTRA_OBSERVABLES', '0'))
+    simulation_time = float(os.getenv('BNG2_STAND_IN_SIMULATION_TIME', '0'))
+
+    print('BioNetGen version 2.9.3 (stand-in)')
+    print('Reading from file {} (level 0)'.format(filename))
+    observables, actions = read_model(filename)
+    observables += ['Extra{}'.format(i_observable) for i_observable in range(extra_observables)]
+    print('Read {} observable(s).'.format(len(observables)))
+
+    for name, args in actions:
+        print('ACTION: {}( {} )'.format(name, ', '.join('{}=>{}'.format(key, value) for key, value in args.items())))
+        action_start = time.process_time()
+
+        if name == 'simulate' or name.startswith('simulate_'):
+            if 't_end' not in args:
+                print('ERROR: t_end is required', file=sys.stderr)
+                return 1
+
+            time.sleep(simulation_time)
+            prefix = args.get('prefix', None) or os.path.join(outdir, os.path.splitext(os.path.basename(filename))[0])
+            if args.get('suffix', None):
+                prefix += '_' + args['suffix']
+            write_results(prefix + '.gdat', observables,
+                          float(args.get('t_start', 0.)), float(args['t_end']), int(float(args.get('n_steps', 1))))
+            print('Time course of groups written to file {}.gdat.'.format(prefix))
+
+        print('CPU TIME: {} {:.2f} s.'.format(name, time.process_time() - action_start))
+
+    print('Finished processing file {}.'.format(filename))
+    print('CPU TIME: total {:.2f} s.'.format(time.process_time() - start))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
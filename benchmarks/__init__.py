@@ -0,0 +1,7 @@
+""" Benchmarks of the overhead of BioSimulators-BioNetGen
+
+:Author: Jonathan Karr <karr@mssm.edu>
+:Date: 2021-01-05
+:Copyright: 2020-2021, Center for Reproducible Biomedical Modeling
+:License: MIT
+"""
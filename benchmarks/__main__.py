@@ -0,0 +1,90 @@
+""" Command-line interface for the benchmarks of BioSimulators-BioNetGen
+
+Usage::
+
+    python -m benchmarks run [--output results.json] [--baseline baseline.json] [--num-species 100] [--num-points 1000]
+    python -m benchmarks compare baseline.json results.json [--threshold 0.25]
+
+``run`` and ``compare`` exit with status 1 if the duration of a benchmark increased by more than the threshold relative
+to the baseline.
+
+:Author: Jonathan Karr <karr@mssm.edu>
+:Date: 2021-01-05
+:Copyright: 2020-2021, Center for Reproducible Biomedical Modeling
+:License: MIT
+"""
+
+from .core import (BENCHMARKS, run_benchmarks, compare_benchmark_results, format_benchmark_results,
+                   format_benchmark_comparison, write_benchmark_results, read_benchmark_results)
+import argparse
+import sys
+
+
+def compare(baseline, results, threshold, statistic):
+    """ Print a comparison of the results of benchmarks with a baseline
+
+    Args:
+        baseline (:obj:`dict`): results of the benchmarks of the baseline
+        results (:obj:`dict`): results of the benchmarks
+        threshold (:obj:`float`): maximum relative increase of the duration of a benchmark which isn't a regression
+        statistic (:obj:`str`): statistic of the durations to compare
+
+    Returns:
+        :obj:`int`: exit status; 1 if a benchmark regressed
+    """
+    if baseline['parameters'] != results['parameters']:
+        print('Warning: the parameters of the baseline ({}) differ from those of the results ({}).'.format(
+            baseline['parameters'], results['parameters']), file=sys.stderr)
+
+    comparisons = compare_benchmark_results(baseline, results, threshold=threshold, statistic=statistic)
+    print(format_benchmark_comparison(comparisons))
+
+    regressions = [comparison['name'] for comparison in comparisons if comparison['regression']]
+    if regressions:
+        print('\n{} benchmark(s) regressed by more than {:.0%}: {}'.format(len(regressions), threshold, ', '.join(regressions)))
+        return 1
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description='Benchmarks of BioSimulators-BioNetGen')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = subparsers.add_parser('run', help='Run the benchmarks')
+    run_parser.add_argument('--benchmark', action='append', dest='benchmarks', choices=list(BENCHMARKS.keys()),
+                            help='Benchmark to run (default: all)')
+    run_parser.add_argument('--num-species', type=int, default=100, help='Number of species of the synthetic model')
+    run_parser.add_argument('--num-points', type=int, default=1000, help='Number of time points of the simulation')
+    run_parser.add_argument('--repeat', type=int, default=5, help='Number of times to time each benchmark')
+    run_parser.add_argument('--bionetgen-path', help='Path to BioNetGen (default: the stand-in for BioNetGen)')
+    run_parser.add_argument('--output', '-o', help='Path to save the results (JSON)')
+    run_parser.add_argument('--baseline', help='Path to the results of a baseline (JSON) to compare with')
+
+    compare_parser = subparsers.add_parser('compare', help='Compare the results of benchmarks with a baseline')
+    compare_parser.add_argument('baseline', help='Path to the results of the baseline (JSON)')
+    compare_parser.add_argument('results', help='Path to the results (JSON)')
+
+    for subparser in [run_parser, compare_parser]:
+        subparser.add_argument('--threshold', type=float, default=0.25,
+                               help='Maximum relative increase of the duration of a benchmark which is not a regression')
+        subparser.add_argument('--statistic', choices=['min', 'median', 'mean'], default='min',
+                               help='Statistic of the durations to compare')
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'run':
+        results = run_benchmarks(names=args.benchmarks, num_species=args.num_species, num_points=args.num_points,
+                                 repeat=args.repeat, bionetgen_path=args.bionetgen_path)
+        print(format_benchmark_results(results))
+        if args.output:
+            write_benchmark_results(results, args.output)
+        if args.baseline:
+            print()
+            return compare(read_benchmark_results(args.baseline), results, args.threshold, args.statistic)
+        return 0
+
+    return compare(read_benchmark_results(args.baseline), read_benchmark_results(args.results), args.threshold, args.statistic)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,422 @@
+""" Benchmarks of the overhead of BioSimulators-BioNetGen
+
+The benchmarks time the reading and writing of BNGL files, the preprocessing of SED tasks, the creation of BioNetGen
+actions for SED simulations, the reading of simulation results, the extraction of the results of SED variables, the
+end-to-end execution of SED tasks, and the startup of the command-line interface. By default, tasks are executed with a
+stand-in for ``BNG2.pl`` (``BNG2.pl`` in this directory) which quickly writes realistic results without simulating
+models, so that the overhead of BioSimulators-BioNetGen can be measured on any Linux machine, without BioNetGen.
+
+The benchmarks use a synthetic model whose number of species (and observables) and a simulation whose number of time
+points can be configured. Results are saved as JSON files, which can be compared with baselines to detect regressions.
+
+:Author: Jonathan Karr <karr@mssm.edu>
+:Date: 2021-01-05
+:Copyright: 2020-2021, Center for Reproducible Biomedical Modeling
+:License: MIT
+"""
+
+from biosimulators_bionetgen._version import __version__
+from biosimulators_bionetgen.core import exec_sed_task, preprocess_sed_task
+from biosimulators_bionetgen.io import read_task, write_task, read_simulation_results
+from biosimulators_bionetgen.utils import create_actions_for_simulation, get_variables_results_from_observable_results
+from biosimulators_utils.config import get_config
+from biosimulators_utils.sedml import data_model as sedml_data_model
+from collections import OrderedDict
+from unittest import mock
+import biosimulators_bionetgen
+import datetime
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import timeit
+
+__all__ = ['STAND_IN_BIONETGEN_PATH', 'BENCHMARKS', 'run_benchmarks', 'compare_benchmark_results',
+           'format_benchmark_results', 'format_benchmark_comparison', 'write_benchmark_results', 'read_benchmark_results']
+
+STAND_IN_BIONETGEN_PATH = os.path.join(os.path.dirname(__file__), 'BNG2.pl')
+
+BENCHMARKS = OrderedDict()
+
+
+def benchmark(func):
+    """ Register a benchmark
+
+    Args:
+        func (:obj:`types.FunctionType`): function which receives the fixtures of the benchmarks (:obj:`dict`) and
+            returns the function to time
+
+    Returns:
+        :obj:`types.FunctionType`: :obj:`func`
+    """
+    BENCHMARKS[func.__name__[len('benchmark_'):]] = func
+    return func
+
+
+@benchmark
+def benchmark_read_task(fixtures):
+    return lambda: read_task(fixtures['model_filename'])
+
+
+@benchmark
+def benchmark_write_task(fixtures):
+    task = fixtures['preprocessed_task']['bionetgen_task']
+    filename = os.path.join(fixtures['dirname'], 'write_task.bngl')
+    return lambda: write_task(task, filename)
+
+
+@benchmark
+def benchmark_preprocess_sed_task(fixtures):
+    return lambda: preprocess_sed_task(fixtures['task'], fixtures['variables'], config=fixtures['config'])
+
+
+@benchmark
+def benchmark_create_actions_for_simulation(fixtures):
+    return lambda: create_actions_for_simulation(fixtures['task'].simulation)
+
+
+@benchmark
+def benchmark_read_simulation_results(fixtures):
+    return lambda: read_simulation_results(fixtures['results_filename'])
+
+
+@benchmark
+def benchmark_get_variables_results_from_observable_results(fixtures):
+    return lambda: get_variables_results_from_observable_results(fixtures['observable_results'], fixtures['variables'],
+                                                                 number_of_points=fixtures['task'].simulation.number_of_points)
+
+
+@benchmark
+def benchmark_exec_sed_task(fixtures):
+    return lambda: exec_sed_task(fixtures['task'], fixtures['variables'], config=fixtures['config'])
+
+
+@benchmark
+def benchmark_import_cli(fixtures):
+    command = [sys.executable, '-c', 'import biosimulators_bionetgen.__main__']
+    return lambda: subprocess.run(command, check=True, env=fixtures['cli_environ'])
+
+
+@benchmark
+def benchmark_cli_help(fixtures):
+    command = [sys.executable, '-m', 'biosimulators_bionetgen', '--help']
+    return lambda: subprocess.run(command, check=True, stdout=subprocess.DEVNULL, env=fixtures['cli_environ'])
+
+
+def write_model(filename, num_species):
+    """ Write a synthetic BNGL model in which each species independently decays
+
+    Args:
+        filename (:obj:`str`): path to save the model
+        num_species (:obj:`int`): number of species (and observables) of the model
+    """
+    species_ids = ['X{}'.format(i_species) for i_species in range(num_species)]
+    blocks = [
+        ('parameters', ['k_{} {}'.format(species_id, 0.01 * (1 + i_species % 10)) for i_species, species_id in enumerate(species_ids)]),
+        ('molecule types', ['{}()'.format(species_id) for species_id in species_ids]),
+        ('species', ['{}() {}'.format(species_id, 100 + i_species) for i_species, species_id in enumerate(species_ids)]),
+        ('observables', ['Molecules {0}_tot {0}()'.format(species_id) for species_id in species_ids]),
+        ('reaction rules', ['{0}() -> 0 k_{0}'.format(species_id) for species_id in species_ids]),
+    ]
+    with open(filename, 'w') as file:
+        file.write('begin model\n')
+        for block, lines in blocks:
+            file.write('begin {}\n'.format(block))
+            for line in lines:
+                file.write('    {}\n'.format(line))
+            file.write('end {}\n'.format(block))
+        file.write('end model\n')
+
+
+def get_sed_task(model_filename, num_species, num_points):
+    """ Get a SED task for the synthetic model and variables for the time and each of its species
+
+    Args:
+        model_filename (:obj:`str`): path to the synthetic model
+        num_species (:obj:`int`): number of species of the model
+        num_points (:obj:`int`): number of time points of the simulation
+
+    Returns:
+        :obj:`tuple`:
+
+            * :obj:`sedml_data_model.Task`: task
+            * :obj:`list` of :obj:`sedml_data_model.Variable`: variables
+    """
+    model = sedml_data_model.Model(
+        id='model',
+        source=model_filename,
+        language=sedml_data_model.ModelLanguage.BNGL.value,
+        changes=[
+            sedml_data_model.ModelAttributeChange(target='parameters.k_X0.value', new_value='0.02'),
+            sedml_data_model.ModelAttributeChange(target='species.X0().initialCount', new_value='200'),
+        ],
+    )
+    simulation = sedml_data_model.UniformTimeCourseSimulation(
+        id='simulation',
+        algorithm=sedml_data_model.Algorithm(kisao_id='KISAO_0000019'),
+        initial_time=0.,
+        output_start_time=0.,
+        output_end_time=100.,
+        number_of_points=num_points,
+    )
+    task = sedml_data_model.Task(id='task', model=model, simulation=simulation)
+    variables = [sedml_data_model.Variable(id='time', symbol=sedml_data_model.Symbol.time, task=task)]
+    for i_species in range(num_species):
+        variables.append(sedml_data_model.Variable(id='X{}'.format(i_species), target='species.X{}'.format(i_species), task=task))
+    return task, variables
+
+
+def get_fixtures(dirname, num_species, num_points):
+    """ Create the fixtures of the benchmarks
+
+    Args:
+        dirname (:obj:`str`): directory in which to save the fixtures
+        num_species (:obj:`int`): number of species of the synthetic model
+        num_points (:obj:`int`): number of time points of the simulation
+
+    Returns:
+        :obj:`dict`: fixtures
+    """
+    model_filename = os.path.join(dirname, 'model.bngl')
+    write_model(model_filename, num_species)
+
+    task, variables = get_sed_task(model_filename, num_species, num_points)
+
+    config = get_config()
+    config.LOG = True
+    config.VERBOSE = False
+
+    preprocessed_task = preprocess_sed_task(task, variables, config=config)
+    preprocessed_task['bionetgen_task'].actions = preprocessed_task['simulation_actions']
+
+    # simulate the model to generate results
+    task_filename = os.path.join(dirname, 'task.bngl')
+    write_task(preprocessed_task['bionetgen_task'], task_filename)
+    subprocess.run([os.environ['BIONETGEN_PATH'], task_filename, '--outdir', dirname], check=True, stdout=subprocess.DEVNULL)
+    results_filename = os.path.join(dirname, 'task.gdat')
+
+    # environment for executing the command-line interface with this version of BioSimulators-BioNetGen
+    cli_environ = dict(os.environ)
+    cli_environ['PYTHONPATH'] = os.pathsep.join(filter(None, [
+        os.path.dirname(os.path.dirname(os.path.abspath(biosimulators_bionetgen.__file__))),
+        os.getenv('PYTHONPATH', None),
+    ]))
+
+    return {
+        'dirname': dirname,
+        'model_filename': model_filename,
+        'task': task,
+        'variables': variables,
+        'config': config,
+        'preprocessed_task': preprocessed_task,
+        'results_filename': results_filename,
+        'observable_results': read_simulation_results(results_filename),
+        'cli_environ': cli_environ,
+    }
+
+
+def time_function(func, repeat):
+    """ Time a function
+
+    The function is executed in loops of at least 0.2 s (see :obj:`timeit.Timer.autorange`), and the durations of the
+    loops are divided by their numbers of executions.
+
+    Args:
+        func (:obj:`types.FunctionType`): function
+        repeat (:obj:`int`): number of loops
+
+    Returns:
+        :obj:`dict`: number of executions per loop (``number``), number of loops (``repeat``), and the minimum
+        (``min``), median (``median``), mean (``mean``), and standard deviation (``stdev``) of the duration (in
+        seconds) of each execution
+    """
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    durations = [duration / number for duration in timer.repeat(repeat=repeat, number=number)]
+    return {
+        'number': number,
+        'repeat': repeat,
+        'min': min(durations),
+        'median': statistics.median(durations),
+        'mean': statistics.mean(durations),
+        'stdev': statistics.stdev(durations) if repeat > 1 else 0.,
+    }
+
+
+def run_benchmarks(names=None, num_species=100, num_points=1000, repeat=5, bionetgen_path=None):
+    """ Run benchmarks
+
+    The caches of networks, model XML files, and results are disabled so that each execution of a task executes
+    BioNetGen, and the version of BioNetGen is cached in a temporary directory. The other options of
+    BioSimulators-BioNetGen are read from the environment.
+
+    Args:
+        names (:obj:`list` of :obj:`str`, optional): names of the benchmarks to run; if :obj:`None`, all benchmarks are
+            run
+        num_species (:obj:`int`, optional): number of species (and observables) of the synthetic model
+        num_points (:obj:`int`, optional): number of time points of the simulation
+        repeat (:obj:`int`, optional): number of times to time each benchmark
+        bionetgen_path (:obj:`str`, optional): path to BioNetGen; if :obj:`None`, the stand-in for BioNetGen is used
+
+    Returns:
+        :obj:`dict`: parameters and environment of the benchmarks, and the timings of each benchmark (see
+        :obj:`time_function`)
+
+    Raises:
+        :obj:`ValueError`: if a benchmark is undefined
+    """
+    names = list(BENCHMARKS.keys()) if names is None else names
+    undefined_names = set(names).difference(BENCHMARKS.keys())
+    if undefined_names:
+        raise ValueError('The following benchmarks are undefined:\n  - {}\n\nBenchmarks must be one of the following:\n  - {}'.format(
+            '\n  - '.join(sorted(undefined_names)), '\n  - '.join(BENCHMARKS.keys())))
+
+    bionetgen_path = bionetgen_path or STAND_IN_BIONETGEN_PATH
+    dirname = tempfile.mkdtemp()
+    environ = {
+        'BIONETGEN_PATH': bionetgen_path,
+        'BIONETGEN_NETWORK_CACHE_DIR': '',
+        'BIONETGEN_MODEL_XML_CACHE_DIR': '',
+        'BIONETGEN_RESULT_CACHE_DIR': '',
+        'BIONETGEN_VERSION_CACHE_DIR': dirname,
+    }
+
+    try:
+        with mock.patch.dict(os.environ, environ):
+            fixtures = get_fixtures(dirname, num_species, num_points)
+
+            timings = OrderedDict()
+            for name in names:
+                timings[name] = time_function(BENCHMARKS[name](fixtures), repeat)
+    finally:
+        shutil.rmtree(dirname)
+
+    return {
+        'created': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        'parameters': {
+            'num_species': num_species,
+            'num_points': num_points,
+            'repeat': repeat,
+            'bionetgen_path': 'stand-in' if bionetgen_path == STAND_IN_BIONETGEN_PATH else bionetgen_path,
+        },
+        'environment': {
+            'biosimulators_bionetgen': __version__,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'machine': platform.machine(),
+            'processor': platform.processor(),
+            'cpu_count': os.cpu_count(),
+        },
+        'benchmarks': timings,
+    }
+
+
+def compare_benchmark_results(baseline, results, threshold=0.25, statistic='min'):
+    """ Compare the results of benchmarks with a baseline
+
+    Args:
+        baseline (:obj:`dict`): results of the benchmarks of the baseline (see :obj:`run_benchmarks`)
+        results (:obj:`dict`): results of the benchmarks (see :obj:`run_benchmarks`)
+        threshold (:obj:`float`, optional): maximum relative increase of the duration of a benchmark, relative to the
+            baseline, which isn't considered a regression
+        statistic (:obj:`str`, optional): statistic of the durations to compare (``min``, ``median``, or ``mean``)
+
+    Returns:
+        :obj:`list` of :obj:`dict`: comparison of each benchmark of both the baseline and the results, including the
+        name (``name``), duration of the baseline (``baseline``), duration (``duration``), ratio of the duration to that
+        of the baseline (``ratio``), and whether the benchmark regressed (``regression``)
+    """
+    comparisons = []
+    for name, timing in results['benchmarks'].items():
+        baseline_timing = baseline['benchmarks'].get(name, None)
+        if baseline_timing is None:
+            continue
+
+        ratio = timing[statistic] / baseline_timing[statistic]
+        comparisons.append({
+            'name': name,
+            'baseline': baseline_timing[statistic],
+            'duration': timing[statistic],
+            'ratio': ratio,
+            'regression': ratio > 1. + threshold,
+        })
+    return comparisons
+
+
+def format_duration(duration):
+    """ Format a duration
+
+    Args:
+        duration (:obj:`float`): duration (in seconds)
+
+    Returns:
+        :obj:`str`: formatted duration
+    """
+    for unit, scale in [('s', 1.), ('ms', 1e-3), ('us', 1e-6)]:
+        if duration >= scale:
+            return '{:.3f} {}'.format(duration / scale, unit)
+    return '{:.3f} ns'.format(duration / 1e-9)
+
+
+def format_benchmark_results(results):
+    """ Format the results of benchmarks as a table
+
+    Args:
+        results (:obj:`dict`): results of the benchmarks (see :obj:`run_benchmarks`)
+
+    Returns:
+        :obj:`str`: table
+    """
+    width = max([len('Benchmark')] + [len(name) for name in results['benchmarks'].keys()])
+    lines = ['{:<{}}  {:>12}  {:>12}  {:>12}'.format('Benchmark', width, 'Min', 'Median', 'Stdev')]
+    for name, timing in results['benchmarks'].items():
+        lines.append('{:<{}}  {:>12}  {:>12}  {:>12}'.format(
+            name, width, format_duration(timing['min']), format_duration(timing['median']), format_duration(timing['stdev'])))
+    return '\n'.join(lines)
+
+
+def format_benchmark_comparison(comparisons):
+    """ Format a comparison of the results of benchmarks with a baseline as a table
+
+    Args:
+        comparisons (:obj:`list` of :obj:`dict`): comparison (see :obj:`compare_benchmark_results`)
+
+    Returns:
+        :obj:`str`: table
+    """
+    width = max([len('Benchmark')] + [len(comparison['name']) for comparison in comparisons])
+    lines = ['{:<{}}  {:>12}  {:>12}  {:>8}'.format('Benchmark', width, 'Baseline', 'Current', 'Ratio')]
+    for comparison in comparisons:
+        lines.append('{:<{}}  {:>12}  {:>12}  {:>7.2f}x{}'.format(
+            comparison['name'], width, format_duration(comparison['baseline']), format_duration(comparison['duration']),
+            comparison['ratio'], '  REGRESSION' if comparison['regression'] else ''))
+    return '\n'.join(lines)
+
+
+def write_benchmark_results(results, filename):
+    """ Save the results of benchmarks to a JSON file
+
+    Args:
+        results (:obj:`dict`): results of the benchmarks (see :obj:`run_benchmarks`)
+        filename (:obj:`str`): path to save the results
+    """
+    with open(filename, 'w') as file:
+        json.dump(results, file, indent=2)
+        file.write('\n')
+
+
+def read_benchmark_results(filename):
+    """ Read the results of benchmarks from a JSON file
+
+    Args:
+        filename (:obj:`str`): path to the results
+
+    Returns:
+        :obj:`dict`: results of the benchmarks (see :obj:`run_benchmarks`)
+    """
+    with open(filename, 'r') as file:
+        return json.load(file)
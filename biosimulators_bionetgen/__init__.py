@@ -2,9 +2,12 @@ from ._version import __version__  # noqa: F401
 # :obj:`str`: version
 
 from .config import Config
-from .core import exec_sed_task, preprocess_sed_task, exec_sed_doc, exec_sedml_docs_in_combine_archive  # noqa: F401
-
+import importlib
+import json
+import os
+import shutil
 import subprocess
+import tempfile
 
 
 __all = [
@@ -14,14 +17,106 @@ __all = [
     'preprocess_sed_task',
     'exec_sed_doc',
     'exec_sedml_docs_in_combine_archive',
+    'async_exec_sed_task',
+    'async_exec_sed_doc',
+    'exec_sed_task_ensemble',
 ]
 
+# The simulation methods are imported from :obj:`core` on first use so that the package (e.g., the command-line
+# interface) can be imported without importing pandas, KiSAO, and the SED-ML execution stack of BioSimulators utils
+_LAZY_ATTRIBUTES = {
+    'exec_sed_task': '.core',
+    'preprocess_sed_task': '.core',
+    'exec_sed_doc': '.core',
+    'exec_sedml_docs_in_combine_archive': '.core',
+    'async_exec_sed_task': '.core',
+    'async_exec_sed_doc': '.core',
+    'exec_sed_task_ensemble': '.core',
+}
+
+
+def __getattr__(name):
+    module = _LAZY_ATTRIBUTES.get(name, None)
+    if module is None:
+        raise AttributeError("module '{}' has no attribute '{}'".format(__name__, name))
+    value = globals()[name] = getattr(importlib.import_module(module, __name__), name)
+    return value
 
-def get_simulator_version():
+
+def get_simulator_version(config=None):
     """ Get the version of BioNetGen
 
+    If :obj:`Config.version_cache_dir` is set, the version of each BioNetGen executable is cached, keyed by the path
+    and modification time of the executable, so that BioNetGen is only executed again after it changes.
+
+    Args:
+        config (:obj:`Config`, optional): BioNetGen configuration
+
     Returns:
         :obj:`str`: version
     """
-    config = Config()
-    return subprocess.check_output([config.bionetgen_path, '--version']).decode().strip().split(' ')[2]
+    config = config or Config()
+
+    bionetgen_path = os.path.realpath(shutil.which(config.bionetgen_path) or config.bionetgen_path)
+    try:
+        mtime = os.stat(bionetgen_path).st_mtime_ns
+    except OSError:
+        mtime = None
+
+    versions = None
+    cache_filename = None
+    if config.version_cache_dir and mtime is not None:
+        cache_filename = os.path.join(config.version_cache_dir, 'versions.json')
+        versions = _read_simulator_versions(cache_filename)
+        cached = versions.get(bionetgen_path, None)
+        if isinstance(cached, dict) and cached.get('mtime', None) == mtime and cached.get('version', None):
+            return cached['version']
+
+    version = subprocess.check_output([config.bionetgen_path, '--version']).decode().strip().split(' ')[2]
+
+    if cache_filename:
+        versions[bionetgen_path] = {'mtime': mtime, 'version': version}
+        _write_simulator_versions(cache_filename, versions)
+
+    return version
+
+
+def _read_simulator_versions(filename):
+    """ Read the cached versions of BioNetGen executables
+
+    Args:
+        filename (:obj:`str`): path to the cache
+
+    Returns:
+        :obj:`dict`: dictionary that maps the path of each executable to its modification time and version; empty if
+        the cache doesn't exist or is invalid
+    """
+    try:
+        with open(filename, 'r') as file:
+            versions = json.load(file)
+    except (OSError, ValueError):
+        return {}
+    return versions if isinstance(versions, dict) else {}
+
+
+def _write_simulator_versions(filename, versions):
+    """ Save the versions of BioNetGen executables to the cache, ignoring errors (e.g., read-only file systems)
+
+    The cache is replaced atomically so that concurrent processes never read a partially written cache.
+
+    Args:
+        filename (:obj:`str`): path to the cache
+        versions (:obj:`dict`): dictionary that maps the path of each executable to its modification time and version
+    """
+    try:
+        os.makedirs(os.path.dirname(filename), exist_ok=True)
+        fid, temp_filename = tempfile.mkstemp(dir=os.path.dirname(filename), suffix='.tmp')
+        try:
+            with os.fdopen(fid, 'w') as file:
+                json.dump(versions, file)
+            os.replace(temp_filename, filename)
+        except BaseException:
+            os.remove(temp_filename)
+            raise
+    except OSError:
+        pass
@@ -1,21 +1,65 @@
 """ BioSimulators-compliant command-line interface to the `BioNetGen <https://bionetgen.org/>`_ simulation program.
 
+The command-line application is built on first use, and the simulation stack is only imported once an archive is
+executed, so that the interface (e.g., ``--help``) starts quickly.
+
 :Author: Jonathan Karr <karr@mssm.edu>
 :Date: 2021-01-05
 :Copyright: 2020-2021, BioSimulators
 :License: MIT
 """
 
-from . import get_simulator_version
 from ._version import __version__
-from .core import exec_sedml_docs_in_combine_archive
-from biosimulators_utils.simulator.cli import build_cli
 
-App = build_cli('bionetgen', __version__,
-                'BioNetGen', get_simulator_version(), 'https://bionetgen.org',
-                exec_sedml_docs_in_combine_archive)
+_App = None
+
+
+def exec_sedml_docs_in_combine_archive(archive_filename, out_dir, config=None):
+    """ Execute the SED tasks defined in a COMBINE/OMEX archive and save the outputs (see
+    :obj:`biosimulators_bionetgen.core.exec_sedml_docs_in_combine_archive`)
+
+    Args:
+        archive_filename (:obj:`str`): path to COMBINE/OMEX archive
+        out_dir (:obj:`str`): path to store the outputs of the archive
+        config (:obj:`Config`, optional): BioSimulators common configuration
+
+    Returns:
+        :obj:`tuple`:
+
+            * :obj:`SedDocumentResults`: results
+            * :obj:`CombineArchiveLog`: log
+    """
+    from .core import exec_sedml_docs_in_combine_archive
+    return exec_sedml_docs_in_combine_archive(archive_filename, out_dir, config=config)
+
+
+def get_app():
+    """ Get the command-line application, building it on first use
+
+    Returns:
+        :obj:`cement.App`: command-line application
+    """
+    global _App
+    if _App is None:
+        from . import get_simulator_version
+        from biosimulators_utils.simulator.cli import build_cli
+
+        _App = build_cli('bionetgen', __version__,
+                         'BioNetGen', get_simulator_version(), 'https://bionetgen.org',
+                         exec_sedml_docs_in_combine_archive)
+    return _App
+
+
+def __getattr__(name):
+    if name == 'App':
+        return get_app()
+    raise AttributeError("module '{}' has no attribute '{}'".format(__name__, name))
 
 
 def main():
-    with App() as app:
+    with get_app()() as app:
         app.run()
+
+
+if __name__ == '__main__':
+    main()
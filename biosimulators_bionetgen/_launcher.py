@@ -0,0 +1,60 @@
+""" Launcher which executes a command within resource limits and reports the resources that it used
+
+The launcher is executed by :obj:`biosimulators_bionetgen.utils.start_bionetgen_process` as a separate, lightweight
+Python process::
+
+    python -I -S _launcher.py <fd> <max-memory> <max-cpu-time> <command> [<arg> ...]
+
+The peak resident set size that the operating system reports for a process includes the memory of the process which
+launched it. Executing commands from this launcher, rather than directly from the (much larger) process which executes
+tasks, ensures that their reported memory usage reflects their own memory. The launcher writes a JSON-encoded
+dictionary of the CPU time (``cpu_time``, in seconds) and peak resident set size (``max_rss``, in bytes) of the command
+and its child processes to a line of file descriptor ``<fd>``, preceded by a line with the number of the error
+(``errno``) if the command couldn't be executed, and exits with the status of the command.
+
+:Author: Jonathan Karr <karr@mssm.edu>
+:Date: 2021-01-05
+:Copyright: 2020-2021, Center for Reproducible Biomedical Modeling
+:License: MIT
+"""
+
+import json
+import os
+import resource
+import signal
+import sys
+
+
+def main(fd, max_memory, max_cpu_time, command):
+    pid = os.fork()
+    if pid == 0:
+        try:
+            for name, limit in [('RLIMIT_AS', max_memory), ('RLIMIT_CPU', max_cpu_time)]:
+                if limit:
+                    _, hard_limit = resource.getrlimit(getattr(resource, name))
+                    limit = int(limit)
+                    if hard_limit != resource.RLIM_INFINITY:
+                        limit = min(limit, hard_limit)
+                    resource.setrlimit(getattr(resource, name), (limit, hard_limit))
+            os.set_inheritable(fd, False)
+            os.execvp(command[0], command)
+        except OSError as exception:
+            os.write(fd, json.dumps({'errno': exception.errno}).encode() + b'\n')
+        finally:
+            os._exit(127)
+
+    _, status, rusage = os.wait4(pid, 0)
+    os.write(fd, json.dumps({
+        'cpu_time': rusage.ru_utime + rusage.ru_stime,
+        'max_rss': rusage.ru_maxrss * (1 if sys.platform == 'darwin' else 1024),
+    }).encode() + b'\n')
+    os.close(fd)
+
+    if os.WIFSIGNALED(status):
+        signal.signal(os.WTERMSIG(status), signal.SIG_DFL)
+        os.kill(os.getpid(), os.WTERMSIG(status))
+    os._exit(os.WEXITSTATUS(status))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]), sys.argv[2], sys.argv[3], sys.argv[4:])
@@ -0,0 +1,681 @@
+""" On-disk caches of artifacts generated by BioNetGen, such as reaction networks and simulation results
+
+:Author: Jonathan Karr <karr@mssm.edu>
+:Date: 2021-01-05
+:Copyright: 2020-2021, Center for Reproducible Biomedical Modeling
+:License: MIT
+"""
+
+from .io import format_task
+import ast
+import hashlib
+import html
+import json
+import math
+import numpy
+import os
+import pandas
+import re
+import shutil
+import tempfile
+import zipfile
+
+__all__ = ['DiskCache', 'NetworkCache', 'ModelXmlCache', 'ResultCache']
+
+
+class DiskCache(object):
+    """ A size-bounded cache of files, stored in a directory which can be shared by multiple processes
+
+    Entries are written to temporary files and then atomically renamed into place so that readers never
+    observe partially-written entries. Entries are evicted in least-recently-used order (based on their
+    modification times, which are updated each time an entry is read) once the total size of the cache
+    exceeds :obj:`max_size`.
+
+    Attributes:
+        dirname (:obj:`str`): path to the directory which stores the cache
+        max_size (:obj:`int`): maximum total size (in bytes) of the entries of the cache
+        extension (:obj:`str`): extension of the files of the entries of the cache
+    """
+
+    def __init__(self, dirname, max_size, extension):
+        self.dirname = dirname
+        self.max_size = max_size
+        self.extension = extension
+
+    def get_filename(self, key):
+        """ Get the path to the file for an entry of the cache
+
+        Args:
+            key (:obj:`str`): key
+
+        Returns:
+            :obj:`str`: path to the file for the entry
+        """
+        return os.path.join(self.dirname, key + self.extension)
+
+    def read(self, key, filename):
+        """ Copy an entry of the cache to a file
+
+        Args:
+            key (:obj:`str`): key
+            filename (:obj:`str`): path to copy the entry to
+
+        Returns:
+            :obj:`bool`: whether the cache contained the entry
+        """
+        cache_filename = self.get_filename(key)
+        try:
+            shutil.copyfile(cache_filename, filename)
+        except FileNotFoundError:
+            return False
+
+        try:
+            os.utime(cache_filename)
+        except OSError:  # pragma: no cover # entry was concurrently evicted
+            pass
+
+        return True
+
+    def write(self, key, filename):
+        """ Store a file in the cache and, if necessary, evict entries to keep the cache within its size limit
+
+        Args:
+            key (:obj:`str`): key
+            filename (:obj:`str`): path to the file to store
+        """
+        if not os.path.isdir(self.dirname):
+            os.makedirs(self.dirname, exist_ok=True)
+
+        temp_fid, temp_filename = tempfile.mkstemp(dir=self.dirname, suffix='.tmp')
+        os.close(temp_fid)
+        try:
+            shutil.copyfile(filename, temp_filename)
+            os.replace(temp_filename, self.get_filename(key))
+        except Exception:
+            os.remove(temp_filename)
+            raise
+
+        self.evict()
+
+    def evict(self):
+        """ Remove the least recently used entries of the cache until its total size is within :obj:`max_size` """
+        entries = []
+        total_size = 0
+        for entry in os.scandir(self.dirname):
+            if not entry.name.endswith(self.extension):
+                continue
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:  # pragma: no cover # entry was concurrently evicted
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+            total_size += stat.st_size
+
+        entries.sort()
+        for _, size, filename in entries:
+            if total_size <= self.max_size:
+                break
+            try:
+                os.remove(filename)
+            except FileNotFoundError:  # pragma: no cover # entry was concurrently evicted
+                pass
+            total_size -= size
+
+
+class NetworkCache(DiskCache):
+    """ Cache of reaction networks (``.net`` files) generated by BioNetGen
+
+    Networks are keyed by a canonical hash of the structural blocks of models (e.g., molecule types, seed species,
+    reaction rules, observables) so that executions of models which only differ in their parameter values or the
+    expressions of their global functions can share networks. When a network is reused, the values of the
+    parameters and the expressions of the global functions of the network are replaced with those of the model.
+
+    Networks of models with compartments are not cached because BioNetGen incorporates the sizes of compartments
+    into the rate constants of their networks.
+    """
+
+    GENERATE_NETWORK_PATTERN = re.compile(r'^generate_network\(\{(.*)\}\)$')
+    PARAMETER_PATTERN = re.compile(r'^([^\s=]+)\s*=?\s*(.*)$')
+    GLOBAL_FUNCTION_PATTERN = re.compile(r'^([^\s\(\)]+)\(\s*\)\s*=?\s*(.*)$')
+    NETWORK_PARAMETER_PATTERN = re.compile(r'^\s*(\d+)\s+(\S+)\s')
+    NETWORK_FUNCTION_PATTERN = re.compile(r'^\s*(\d+)\s+([^\s\(\)]+)\(\s*\)\s')
+
+    def __init__(self, dirname, max_size):
+        super(NetworkCache, self).__init__(dirname, max_size, '.net')
+
+    def get_key(self, task, bionetgen_path):
+        """ Get the key for the network of a task
+
+        Args:
+            task (:obj:`Task`): BioNetGen task
+            bionetgen_path (:obj:`str`): path to the BioNetGen executable which will generate the network
+
+        Returns:
+            :obj:`str`: key for the network, or :obj:`None` if the network of the task cannot be cached
+        """
+        generate_network_actions = [action for action in task.actions if self.GENERATE_NETWORK_PATTERN.match(action)]
+        if len(generate_network_actions) != 1 or 'prefix' in generate_network_actions[0]:
+            return None
+
+        if self.normalize_block(task.model.get('compartments', [])):
+            return None
+
+        structure = [bionetgen_path, generate_network_actions[0]]
+        for block_type, block_lines in task.model.items():
+            lines = self.normalize_block(block_lines)
+            if block_type == 'parameters':
+                lines = [self.get_parameter_id(line) or line for line in lines]
+            elif block_type == 'functions':
+                lines = [self.get_global_function_id(line) or line for line in lines]
+            structure.append([block_type, lines])
+
+        return hashlib.sha256(json.dumps(structure).encode()).hexdigest()
+
+    def read_network(self, key, model, filename):
+        """ Copy a cached network to a file, updating the values of its parameters and the expressions of its
+        global functions to those of a model
+
+        Args:
+            key (:obj:`str`): key
+            model (:obj:`Model`): model
+            filename (:obj:`str`): path to save the network
+
+        Returns:
+            :obj:`bool`: whether the cache contained the network
+        """
+        if not self.read(key, filename):
+            return False
+
+        parameters = {}
+        for line in self.normalize_block(model.get('parameters', [])):
+            match = self.PARAMETER_PATTERN.match(line)
+            if match:
+                parameters[match.group(1)] = match.group(2)
+
+        functions = {}
+        for line in self.normalize_block(model.get('functions', [])):
+            match = self.GLOBAL_FUNCTION_PATTERN.match(line)
+            if match:
+                functions[match.group(1)] = match.group(2)
+
+        self.set_network_parameters(filename, parameters, functions)
+
+        return True
+
+    @classmethod
+    def set_network_parameters(cls, filename, parameters, functions=None):
+        """ Set the values of parameters and the expressions of global functions of a network
+
+        Args:
+            filename (:obj:`str`): path to the network
+            parameters (:obj:`dict`): dictionary that maps the ids of parameters to their new values
+            functions (:obj:`dict`, optional): dictionary that maps the ids of global functions to their new expressions
+        """
+        functions = functions or {}
+
+        with open(filename, 'r') as file:
+            lines = file.readlines()
+
+        block_type = None
+        for i_line, line in enumerate(lines):
+            if line.startswith('begin '):
+                block_type = line.partition(' ')[2].strip()
+            elif line.startswith('end '):
+                block_type = None
+
+            elif block_type == 'parameters':
+                match = cls.NETWORK_PARAMETER_PATTERN.match(line)
+                if match and match.group(2) in parameters:
+                    lines[i_line] = '{:>5} {} {}\n'.format(match.group(1), match.group(2), parameters[match.group(2)])
+
+            elif block_type == 'functions':
+                match = cls.NETWORK_FUNCTION_PATTERN.match(line)
+                if match and match.group(2) in functions:
+                    lines[i_line] = '{:>5} {}() {}\n'.format(match.group(1), match.group(2), functions[match.group(2)])
+
+        with open(filename, 'w') as file:
+            file.writelines(lines)
+
+    @classmethod
+    def get_generate_network_action(cls, action, prefix):
+        """ Get a network generation action which saves the network with a prefix
+
+        Args:
+            action (:obj:`str`): network generation action
+            prefix (:obj:`str`): prefix for the network file
+
+        Returns:
+            :obj:`str`: network generation action
+        """
+        args = cls.GENERATE_NETWORK_PATTERN.match(action).group(1).strip()
+        return 'generate_network({{{}prefix => "{}"}})'.format(args + ', ' if args else '', prefix)
+
+    @classmethod
+    def get_parameter_id(cls, line):
+        """ Get the id of a parameter
+
+        Args:
+            line (:obj:`str`): line of a ``parameters`` block
+
+        Returns:
+            :obj:`str`: id of the parameter, or :obj:`None` if the line isn't a parameter
+        """
+        match = cls.PARAMETER_PATTERN.match(line)
+        if match:
+            return match.group(1)
+        return None
+
+    @classmethod
+    def get_global_function_id(cls, line):
+        """ Get the id of a global function (a function without arguments)
+
+        Args:
+            line (:obj:`str`): line of a ``functions`` block
+
+        Returns:
+            :obj:`str`: id of the function, or :obj:`None` if the line isn't a global function
+        """
+        match = cls.GLOBAL_FUNCTION_PATTERN.match(line)
+        if match:
+            return match.group(1) + '()'
+        return None
+
+    @staticmethod
+    def normalize_block(lines):
+        """ Remove comments, blank lines, and redundant white space from the lines of a block
+
+        Args:
+            lines (:obj:`list` of :obj:`str`): lines of a block
+
+        Returns:
+            :obj:`list` of :obj:`str`: normalized lines
+        """
+        normalized_lines = []
+        for line in lines:
+            line = ' '.join(line.partition('#')[0].split())
+            if line:
+                normalized_lines.append(line)
+        return normalized_lines
+
+
+class ModelXmlCache(DiskCache):
+    """ Cache of the XML files of models which BioNetGen generates for NFsim
+
+    Model XML files are keyed by a canonical hash of all of the blocks of models. When a cached file is reused, the values
+    of parameters can be overridden (e.g., to apply ``setParameter`` actions). Because NFsim reads the evaluated values of
+    parameters rather than their expressions, the values of all of the parameters are then re-evaluated from their
+    expressions.
+    """
+
+    PARAMETER_PATTERN = re.compile(r'^(\s*<Parameter id=")([^"]+)(" type="Constant" value=")([^"]*)(" expr=")([^"]*)("/>\s*)$')
+
+    FUNCTIONS = {
+        'exp': math.exp,
+        'ln': math.log,
+        'log10': math.log10,
+        'log2': math.log2,
+        'sqrt': math.sqrt,
+        'abs': abs,
+        'sin': math.sin,
+        'cos': math.cos,
+        'tan': math.tan,
+        'asin': math.asin,
+        'acos': math.acos,
+        'atan': math.atan,
+        'sinh': math.sinh,
+        'cosh': math.cosh,
+        'tanh': math.tanh,
+        'asinh': math.asinh,
+        'acosh': math.acosh,
+        'atanh': math.atanh,
+        'min': min,
+        'max': max,
+    }
+
+    CONSTANTS = {
+        '_pi': math.pi,
+        '_e': math.e,
+    }
+
+    def __init__(self, dirname, max_size):
+        super(ModelXmlCache, self).__init__(dirname, max_size, '.xml')
+
+    def get_key(self, model, bionetgen_path):
+        """ Get the key for the XML file of a model
+
+        Args:
+            model (:obj:`Model`): model
+            bionetgen_path (:obj:`str`): path to the BioNetGen executable which will generate the XML file
+
+        Returns:
+            :obj:`str`: key for the XML file
+        """
+        structure = [bionetgen_path]
+        for block_type, block_lines in model.items():
+            structure.append([block_type, NetworkCache.normalize_block(block_lines)])
+
+        return hashlib.sha256(json.dumps(structure).encode()).hexdigest()
+
+    def read_model_xml(self, key, filename, parameters=None):
+        """ Copy a cached model XML file to a file, overriding the values of parameters
+
+        Args:
+            key (:obj:`str`): key
+            filename (:obj:`str`): path to save the XML file
+            parameters (:obj:`dict`, optional): dictionary that maps the ids of parameters to their new values
+
+        Returns:
+            :obj:`bool`: whether the cache contained the XML file and its parameters could be overridden
+        """
+        if not self.read(key, filename):
+            return False
+
+        if parameters:
+            try:
+                self.set_model_xml_parameters(filename, parameters)
+            except ValueError:
+                return False
+
+        return True
+
+    @classmethod
+    def set_model_xml_parameters(cls, filename, parameters):
+        """ Override the values of parameters of a model XML file and re-evaluate the values of all of its parameters
+
+        Args:
+            filename (:obj:`str`): path to the XML file
+            parameters (:obj:`dict`): dictionary that maps the ids of parameters to their new values
+
+        Raises:
+            :obj:`ValueError`: if the expression of a parameter can't be evaluated
+        """
+        with open(filename, 'r') as file:
+            lines = file.readlines()
+
+        expressions = {}
+        parameter_lines = {}
+        for i_line, line in enumerate(lines):
+            match = cls.PARAMETER_PATTERN.match(line)
+            if match:
+                expressions[match.group(2)] = html.unescape(match.group(6))
+                parameter_lines[match.group(2)] = (i_line, match)
+
+        unknown_parameter_ids = set(parameters.keys()).difference(expressions.keys())
+        if unknown_parameter_ids:
+            raise ValueError('Model does not have parameters {}'.format(', '.join(sorted(unknown_parameter_ids))))
+
+        for id, value in parameters.items():
+            expressions[id] = str(value)
+
+        values = {}
+        for id in expressions.keys():
+            cls.evaluate_parameter(id, expressions, values, set())
+
+        for id, (i_line, match) in parameter_lines.items():
+            expr = html.escape(str(parameters[id])) if id in parameters else match.group(6)
+            lines[i_line] = ''.join([match.group(1), id, match.group(3), cls.format_value(values[id]),
+                                     match.group(5), expr, match.group(7)])
+
+        with open(filename, 'w') as file:
+            file.writelines(lines)
+
+    @classmethod
+    def evaluate_parameter(cls, id, expressions, values, evaluating):
+        """ Evaluate the value of a parameter, first evaluating the parameters that it depends on
+
+        Args:
+            id (:obj:`str`): id of the parameter
+            expressions (:obj:`dict`): dictionary that maps the ids of parameters to their expressions
+            values (:obj:`dict`): dictionary that maps the ids of evaluated parameters to their values
+            evaluating (:obj:`set`): ids of the parameters which are being evaluated
+
+        Returns:
+            :obj:`float`: value of the parameter
+
+        Raises:
+            :obj:`ValueError`: if the expression of the parameter can't be evaluated
+        """
+        if id in values:
+            return values[id]
+        if id in evaluating or id not in expressions:
+            raise ValueError('Parameter `{}` cannot be evaluated'.format(id))
+
+        evaluating.add(id)
+        try:
+            tree = ast.parse(expressions[id].replace('^', '**'), mode='eval')
+        except SyntaxError:
+            raise ValueError('Expression `{}` of parameter `{}` cannot be evaluated'.format(expressions[id], id))
+        values[id] = float(cls._evaluate_node(tree.body, expressions, values, evaluating))
+        evaluating.remove(id)
+        return values[id]
+
+    @classmethod
+    def _evaluate_node(cls, node, expressions, values, evaluating):
+        """ Evaluate a node of the syntax tree of the expression of a parameter
+
+        Args:
+            node (:obj:`ast.AST`): node
+            expressions (:obj:`dict`): dictionary that maps the ids of parameters to their expressions
+            values (:obj:`dict`): dictionary that maps the ids of evaluated parameters to their values
+            evaluating (:obj:`set`): ids of the parameters which are being evaluated
+
+        Returns:
+            :obj:`float`: value of the node
+
+        Raises:
+            :obj:`ValueError`: if the node can't be evaluated
+        """
+        def evaluate(node):
+            return cls._evaluate_node(node, expressions, values, evaluating)
+
+        if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)):
+            return node.value
+        if isinstance(node, ast.Name):
+            if node.id in cls.CONSTANTS and node.id not in expressions:
+                return cls.CONSTANTS[node.id]
+            return cls.evaluate_parameter(node.id, expressions, values, evaluating)
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.UAdd, ast.USub)):
+            value = evaluate(node.operand)
+            return -value if isinstance(node.op, ast.USub) else value
+        if isinstance(node, ast.BinOp):
+            left = evaluate(node.left)
+            right = evaluate(node.right)
+            try:
+                if isinstance(node.op, ast.Add):
+                    return left + right
+                if isinstance(node.op, ast.Sub):
+                    return left - right
+                if isinstance(node.op, ast.Mult):
+                    return left * right
+                if isinstance(node.op, ast.Div):
+                    return left / right
+                if isinstance(node.op, ast.Pow):
+                    return math.pow(left, right)
+            except (ArithmeticError, ValueError):
+                raise ValueError('Expression cannot be evaluated')
+        if (
+            isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id in cls.FUNCTIONS
+            and not node.keywords
+        ):
+            args = [evaluate(arg) for arg in node.args]
+            try:
+                return cls.FUNCTIONS[node.func.id](*args)
+            except (ArithmeticError, TypeError, ValueError):
+                raise ValueError('Function `{}` cannot be evaluated'.format(node.func.id))
+
+        raise ValueError('Expression cannot be evaluated')
+
+    @staticmethod
+    def format_value(value):
+        """ Format the value of a parameter in the same way as BioNetGen
+
+        Args:
+            value (:obj:`float`): value
+
+        Returns:
+            :obj:`str`: formatted value
+        """
+        return re.sub(r'(e[+-])0+(\d+)', r'\1\2', '{:.8g}'.format(value))
+
+
+class ResultCache(DiskCache):
+    """ Cache of the predicted values of the observables of tasks whose simulations are reproducible
+
+    Results are keyed by a hash of the BNGL text of tasks (their models, including any changes, and their actions) and
+    the version of BioNetGen. Only the results of tasks which only execute known actions which don't depend on external
+    files, and whose simulations are deterministic (ODE) or seeded, are cached. The results of unseeded stochastic
+    simulations are never cached.
+
+    Results are stored as NumPy ``.npz`` files of the ids and values of all of the observables of tasks so that they can
+    be reused by executions which read different observables, without parsing them.
+    """
+
+    ACTION_PATTERN = re.compile(r'^\s*(\w+)\s*\((.*)\)\s*;?\s*$', re.DOTALL)
+    METHOD_PATTERN = re.compile(r'\bmethod\s*=>\s*["\']?(\w+)')
+    SEED_PATTERN = re.compile(r'\bseed\s*=>')
+    SIMULATION_ACTIONS = {
+        'simulate': None,
+        'simulate_ode': 'ode',
+        'simulate_ssa': 'ssa',
+        'simulate_pla': 'pla',
+        'simulate_nf': 'nf',
+        'parameter_scan': None,
+    }
+    DETERMINISTIC_METHODS = ['ode']
+    OTHER_ACTIONS = [
+        'generate_network',
+        'setParameter',
+        'setConcentration',
+        'addConcentration',
+        'saveConcentrations',
+        'resetConcentrations',
+        'saveParameters',
+        'resetParameters',
+        'setOption',
+        'setModelName',
+    ]
+
+    def __init__(self, dirname, max_size):
+        super(ResultCache, self).__init__(dirname, max_size, '.npz')
+
+    def get_key(self, task, bionetgen_version):
+        """ Get the key for the results of a task
+
+        Args:
+            task (:obj:`Task`): BioNetGen task
+            bionetgen_version (:obj:`str`): version of BioNetGen
+
+        Returns:
+            :obj:`str`: key for the results, or :obj:`None` if the results of the task cannot be cached
+        """
+        if not self.is_reproducible(task.actions):
+            return None
+        return hashlib.sha256(json.dumps([bionetgen_version, format_task(task)]).encode()).hexdigest()
+
+    @classmethod
+    def is_reproducible(cls, actions):
+        """ Determine whether the results of actions are reproducible: the actions must include at least one
+        simulation, all of the actions must be known actions which don't depend on external files, and all of the
+        simulations must be deterministic or seeded
+
+        Args:
+            actions (:obj:`list` of :obj:`str`): actions
+
+        Returns:
+            :obj:`bool`: whether the results of the actions are reproducible
+        """
+        num_simulations = 0
+        for action in actions:
+            match = cls.ACTION_PATTERN.match(action)
+            if not match:
+                return False
+
+            name, args = match.groups()
+            if name in cls.SIMULATION_ACTIONS:
+                method = cls.SIMULATION_ACTIONS[name]
+                if method is None:
+                    method_match = cls.METHOD_PATTERN.search(args)
+                    if not method_match:
+                        return False
+                    method = method_match.group(1)
+
+                if method not in cls.DETERMINISTIC_METHODS and not cls.SEED_PATTERN.search(args):
+                    return False
+                num_simulations += 1
+
+            elif name not in cls.OTHER_ACTIONS:
+                return False
+
+        return num_simulations > 0
+
+    def read_results(self, key, observables=None):
+        """ Read cached results
+
+        Args:
+            key (:obj:`str`): key
+            observables (:obj:`list` of :obj:`str`, optional): ids of the observables (e.g., ``time``) to read; if
+                :obj:`None`, all of the observables are read
+
+        Returns:
+            :obj:`pandas.DataFrame`: predicted values of the observables, or :obj:`None` if the cache doesn't contain
+            the results
+        """
+        cache_filename = self.get_filename(key)
+        try:
+            with numpy.load(cache_filename, allow_pickle=False) as data:
+                names = data['names'].tolist()
+                values = data['values']
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError, zipfile.BadZipFile):  # pragma: no cover # entry is corrupted
+            return None
+
+        try:
+            os.utime(cache_filename)
+        except OSError:  # pragma: no cover # entry was concurrently evicted
+            pass
+
+        return self.select_observables(values, names, observables)
+
+    def write_results(self, key, results):
+        """ Store results in the cache and, if necessary, evict entries to keep the cache within its size limit
+
+        Args:
+            key (:obj:`str`): key
+            results (:obj:`pandas.DataFrame`): predicted values of all of the observables
+        """
+        if not os.path.isdir(self.dirname):
+            os.makedirs(self.dirname, exist_ok=True)
+
+        temp_fid, temp_filename = tempfile.mkstemp(dir=self.dirname, suffix='.tmp')
+        try:
+            with os.fdopen(temp_fid, 'wb') as file:
+                numpy.savez(file, names=numpy.array(results.index, dtype=str),
+                            values=results.to_numpy(dtype=numpy.float64))
+            os.replace(temp_filename, self.get_filename(key))
+        except Exception:
+            os.remove(temp_filename)
+            raise
+
+        self.evict()
+
+    @staticmethod
+    def select_observables(values, names, observables=None):
+        """ Get a data frame of the values of a subset of observables
+
+        Args:
+            values (:obj:`numpy.ndarray`): values of the observables (one row per observable)
+            names (:obj:`list` of :obj:`str`): ids of the observables
+            observables (:obj:`list` of :obj:`str`, optional): ids of the observables to select; if :obj:`None`, all
+                of the observables are selected
+
+        Returns:
+            :obj:`pandas.DataFrame`: predicted values of the selected observables
+        """
+        if observables is not None:
+            observables = set(observables)
+            i_rows = [i_row for i_row, name in enumerate(names) if name in observables]
+            if len(i_rows) < len(names):
+                values = values[i_rows, :]
+                names = [names[i_row] for i_row in i_rows]
+        return pandas.DataFrame(values, index=names, copy=False)
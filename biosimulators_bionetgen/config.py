@@ -16,7 +16,102 @@ class Config(object):
 
     Attributes:
         bionetgen_path (:obj:`str`): path to BioNetGen executable
+        network_cache_dir (:obj:`str`): path to a directory in which to cache generated reaction networks; if
+            :obj:`None`, networks are not cached
+        network_cache_max_size (:obj:`int`): maximum total size (in bytes) of the cached reaction networks
+        num_workers (:obj:`int`): number of processes to use to execute the independent tasks of SED documents, and the
+            maximum number of replicates of ensembles of stochastic simulations to execute concurrently; if less than or
+            equal to 1, tasks (and replicates) are executed sequentially
+        fail_fast (:obj:`bool`): if :obj:`True`, stop executing the tasks of a SED document in parallel once a task fails
+        batch_tasks (:obj:`bool`): if :obj:`True`, execute the independent tasks of a SED document which share the same
+            BNGL file with a single BioNetGen process
+        reuse_workspaces (:obj:`bool`): if :obj:`True`, execute tasks in persistent, reusable scratch directories
+            rather than in new temporary directories
+        workspace_dir (:obj:`str`): path to the directory in which to create scratch directories on disk; if
+            :obj:`None`, the default temporary directory is used
+        workspace_ram_dir (:obj:`str`): path to a RAM-backed directory in which to create reusable scratch directories
+            when it has enough free space; if :obj:`None`, scratch directories are created on disk
+        workspace_ram_min_free (:obj:`int`): minimum free space (in bytes) of :obj:`workspace_ram_dir` for it to be used
+        direct_run_network (:obj:`bool`): if :obj:`True`, simulate networks which are reused from the cache directly with
+            ``run_network`` rather than through ``BNG2.pl``, when the actions of tasks permit
+        run_network_path (:obj:`str`): path to the ``run_network`` executable; if :obj:`None`, the executable bundled
+            with BioNetGen (``bin/run_network`` in the directory of :obj:`bionetgen_path`) is used
+        model_xml_cache_dir (:obj:`str`): path to a directory in which to cache the XML files of models which BioNetGen
+            generates for network-free simulations; if :obj:`None`, the XML files are not cached
+        model_xml_cache_max_size (:obj:`int`): maximum total size (in bytes) of the cached XML files
+        direct_nfsim (:obj:`bool`): if :obj:`True`, execute network-free simulations of models whose XML files are
+            reused from the cache directly with ``NFsim`` rather than through ``BNG2.pl``, when the actions of tasks permit
+        nfsim_path (:obj:`str`): path to the ``NFsim`` executable; if :obj:`None`, the executable bundled with BioNetGen
+            (``bin/NFsim`` in the directory of :obj:`bionetgen_path`) is used
+        results_memory_budget (:obj:`int`): maximum total size (in bytes) of the results of the variables of tasks to keep in
+            memory; once the budget is exhausted, results are spilled to memory-mapped files in the scratch directory of
+            the process; if :obj:`None`, all results are kept in memory
+        result_cache_dir (:obj:`str`): path to a directory in which to cache the results of tasks whose simulations are
+            reproducible (deterministic or seeded); if :obj:`None`, results are not cached
+        result_cache_max_size (:obj:`int`): maximum total size (in bytes) of the cached results
+        parameter_scans (:obj:`bool`): if :obj:`True`, execute the iterations of repeated tasks of SED documents which
+            only change the value of a parameter with single BioNetGen processes (``parameter_scan``)
+        timeout (:obj:`float`): maximum wall-clock time (in seconds) of each execution of BioNetGen (or of a simulator
+            executed directly), after which it and its child processes are killed; if :obj:`None`, executions aren't
+            timed out
+        max_memory (:obj:`int`): maximum size (in bytes) of the virtual memory (``RLIMIT_AS``) of each process
+            launched to execute a task; if :obj:`None`, the memory of processes isn't limited
+        max_cpu_time (:obj:`int`): maximum CPU time (in seconds, ``RLIMIT_CPU``) of each process launched to execute a
+            task; if :obj:`None`, the CPU time of processes isn't limited
+        resource_accounting (:obj:`bool`): if :obj:`True`, measure the CPU time and peak memory of the processes launched
+            to execute tasks and record them in the logs of the tasks. Each process is then launched by a lightweight
+            launcher because the peak memory which the operating system reports for a process (e.g., by ``wait4``)
+            includes the memory of the process which launched it. The launcher adds about 15 ms to each process, whereas
+            executing a process directly takes less than 1 ms, so resources are not measured by default.
+        phase_timing (:obj:`bool`): if :obj:`True`, record the duration of each phase of the execution of each task (e.g.,
+            reading the model, generating the network, simulating the network, reading the results) in the logs of the
+            tasks (``phase_timings`` of their simulator details), and the total durations in the logs of SED documents
+        version_cache_dir (:obj:`str`): path to a directory in which to cache the version of each BioNetGen executable
+            (keyed by the path and modification time of the executable) so that BioNetGen isn't executed to determine its
+            version each time the command-line interface starts; if :obj:`None`, versions are not cached
+        task_cache_size (:obj:`int`): maximum number of tasks read from BNGL files to cache in memory, so that BNGL files
+            which are used by multiple SED tasks are only parsed once by each process; if 0, tasks are not cached
+        task_cache_hash (:obj:`bool`): if :obj:`True`, key the cached tasks by the hashes of the contents of their files,
+            in addition to the paths, sizes, and modification times of the files
+        bulk_model_changes_threshold (:obj:`int`): minimum number of changes of the values of parameters and initial counts
+            of species of a SED task for the changes to be applied by rewriting the lines of the ``parameters`` and
+            ``seed species`` blocks of its model rather than with individual ``setParameter`` and ``setConcentration``
+            actions; if :obj:`None`, changes are always applied with actions
     """
 
     def __init__(self):
         self.bionetgen_path = os.getenv('BIONETGEN_PATH', 'BNG2.pl')
+        self.network_cache_dir = os.getenv('BIONETGEN_NETWORK_CACHE_DIR', None) or None
+        self.network_cache_max_size = int(os.getenv('BIONETGEN_NETWORK_CACHE_MAX_SIZE', str(2 ** 30)))
+        self.num_workers = int(os.getenv('BIONETGEN_NUM_WORKERS', '1'))
+        self.fail_fast = os.getenv('BIONETGEN_FAIL_FAST', '0').lower() in ['1', 'true']
+        self.batch_tasks = os.getenv('BIONETGEN_BATCH_TASKS', '0').lower() in ['1', 'true']
+        self.reuse_workspaces = os.getenv('BIONETGEN_REUSE_WORKSPACES', '0').lower() in ['1', 'true']
+        self.workspace_dir = os.getenv('BIONETGEN_WORKSPACE_DIR', None) or None
+        self.workspace_ram_dir = os.getenv('BIONETGEN_WORKSPACE_RAM_DIR', '/dev/shm') or None
+        self.workspace_ram_min_free = int(os.getenv('BIONETGEN_WORKSPACE_RAM_MIN_FREE', str(2 ** 30)))
+        self.direct_run_network = os.getenv('BIONETGEN_DIRECT_RUN_NETWORK', '1').lower() in ['1', 'true']
+        self.run_network_path = os.getenv('BIONETGEN_RUN_NETWORK_PATH', None) or None
+        self.model_xml_cache_dir = os.getenv('BIONETGEN_MODEL_XML_CACHE_DIR', None) or None
+        self.model_xml_cache_max_size = int(os.getenv('BIONETGEN_MODEL_XML_CACHE_MAX_SIZE', str(2 ** 30)))
+        self.direct_nfsim = os.getenv('BIONETGEN_DIRECT_NFSIM', '1').lower() in ['1', 'true']
+        self.nfsim_path = os.getenv('BIONETGEN_NFSIM_PATH', None) or None
+        results_memory_budget = os.getenv('BIONETGEN_RESULTS_MEMORY_BUDGET', None) or None
+        self.results_memory_budget = int(results_memory_budget) if results_memory_budget is not None else None
+        self.result_cache_dir = os.getenv('BIONETGEN_RESULT_CACHE_DIR', None) or None
+        self.result_cache_max_size = int(os.getenv('BIONETGEN_RESULT_CACHE_MAX_SIZE', str(2 ** 30)))
+        self.parameter_scans = os.getenv('BIONETGEN_PARAMETER_SCANS', '1').lower() in ['1', 'true']
+        timeout = os.getenv('BIONETGEN_TIMEOUT', None) or None
+        self.timeout = float(timeout) if timeout is not None else None
+        max_memory = os.getenv('BIONETGEN_MAX_MEMORY', None) or None
+        self.max_memory = int(max_memory) if max_memory is not None else None
+        max_cpu_time = os.getenv('BIONETGEN_MAX_CPU_TIME', None) or None
+        self.max_cpu_time = int(max_cpu_time) if max_cpu_time is not None else None
+        self.resource_accounting = os.getenv('BIONETGEN_RESOURCE_ACCOUNTING', '0').lower() in ['1', 'true']
+        self.phase_timing = os.getenv('BIONETGEN_PHASE_TIMING', '0').lower() in ['1', 'true']
+        self.version_cache_dir = os.getenv('BIONETGEN_VERSION_CACHE_DIR', os.path.join(
+            os.getenv('XDG_CACHE_HOME', None) or os.path.join(os.path.expanduser('~'), '.cache'), 'biosimulators_bionetgen')) or None
+        self.task_cache_size = int(os.getenv('BIONETGEN_TASK_CACHE_SIZE', '32'))
+        self.task_cache_hash = os.getenv('BIONETGEN_TASK_CACHE_HASH', '0').lower() in ['1', 'true']
+        bulk_model_changes_threshold = os.getenv('BIONETGEN_BULK_MODEL_CHANGES_THRESHOLD', '64') or None
+        self.bulk_model_changes_threshold = int(bulk_model_changes_threshold) if bulk_model_changes_threshold is not None else None
@@ -7,10 +7,18 @@
 :License: MIT
 """
 
-from .io import read_task
-from .utils import (exec_bionetgen_task, preprocess_model_attribute_change, add_model_attribute_change_to_task,
+from .config import Config as SimulatorConfig
+from .cache import NetworkCache
+from .data_model import ModelBlock, Task as BnglTask
+from .ensemble import DEFAULT_QUANTILES
+from .io import get_task_cache, TaskTemplate
+from .timing import DISABLED_PHASE_TIMER, get_phase_timer, aggregate_phase_timings
+from .utils import (exec_bionetgen_task, exec_bionetgen_task_batch, async_exec_bionetgen_task, exec_bionetgen_parameter_scan,
+                    get_parameter_scan_actions, exec_bionetgen_ensemble,
+                    preprocess_model_attribute_changes, add_model_attribute_change_to_task, get_task_with_model_attribute_changes,
                     create_actions_for_simulation,
-                    get_variables_results_from_observable_results, add_variables_to_model)
+                    get_variables_results_from_observable_results, add_variables_to_model, get_observables_for_variables,
+                    budget_variable_results)
 from .warnings import IgnoredBnglFileContentWarning
 from biosimulators_utils.combine.exec import exec_sedml_docs_in_archive
 from biosimulators_utils.config import get_config, Config  # noqa: F401
@@ -18,14 +26,25 @@ from biosimulators_utils.log.data_model import CombineArchiveLog, TaskLog, Stand
 from biosimulators_utils.viz.data_model import VizFormat  # noqa: F401
 from biosimulators_utils.report.data_model import ReportFormat, VariableResults, SedDocumentResults  # noqa: F401
 from biosimulators_utils.sedml import validation
-from biosimulators_utils.sedml.data_model import (Task, ModelLanguage, ModelAttributeChange,  # noqa: F401
-                                                  UniformTimeCourseSimulation, Variable)
+from biosimulators_utils.sedml.data_model import (SedDocument, Task, ModelLanguage, ModelAttributeChange,  # noqa: F401
+                                                  UniformTimeCourseSimulation, Variable, RepeatedTask,
+                                                  SetValueComputeModelChange)
 from biosimulators_utils.sedml.exec import exec_sed_doc as base_exec_sed_doc
+from biosimulators_utils.sedml.io import SedmlSimulationReader
+from biosimulators_utils.sedml.utils import get_variables_for_task, resolve_range, calc_compute_model_change_new_value
 from biosimulators_utils.utils.core import raise_errors_warnings
+from collections import OrderedDict, deque
+import asyncio
+import concurrent.futures
 import copy
+import functools
+import os
+import re
 import warnings
 
-__all__ = ['exec_sedml_docs_in_combine_archive', 'exec_sed_doc', 'exec_sed_task', 'preprocess_sed_task']
+__all__ = ['exec_sedml_docs_in_combine_archive', 'exec_sed_doc', 'exec_independent_sed_tasks', 'exec_sed_task_batch',
+           'exec_sed_task', 'preprocess_sed_task',
+           'async_exec_sed_doc', 'async_exec_sed_task', 'exec_sed_task_ensemble']
 
 
 def exec_sedml_docs_in_combine_archive(archive_filename, out_dir, config=None):
@@ -56,9 +75,18 @@ def exec_sedml_docs_in_combine_archive(archive_filename, out_dir, config=None):
 def exec_sed_doc(doc, working_dir, base_out_path, rel_out_path=None,
                  apply_xml_model_changes=False,
                  log=None, indent=0, pretty_print_modified_xml_models=False,
-                 log_level=StandardOutputErrorCapturerLevel.c, config=None):
+                 log_level=StandardOutputErrorCapturerLevel.c, config=None, simulator_config=None):
     """ Execute the tasks specified in a SED document and generate the specified outputs
 
+    If :obj:`SimulatorConfig.num_workers` is greater than 1, the independent tasks of the document (non-repeated
+    tasks of BNGL files) are first executed in parallel by a pool of processes. If :obj:`SimulatorConfig.batch_tasks`
+    is :obj:`True`, independent tasks which share the same BNGL file are executed together by a single BioNetGen
+    process. In both cases, the outputs of the document are then generated in the same order as when the tasks are
+    executed sequentially. If :obj:`SimulatorConfig.parameter_scans` is :obj:`True`, the iterations of repeated tasks
+    which only change the value of a parameter are executed with single BioNetGen processes (``parameter_scan``).
+    If :obj:`SimulatorConfig.phase_timing` is :obj:`True`, the total duration of each phase of the execution of the
+    tasks is recorded in the ``phase_timings`` attribute of the log of the document.
+
     Args:
         doc (:obj:`SedDocument` or :obj:`str`): SED document or a path to SED-ML file which defines a SED document
         working_dir (:obj:`str`): working directory of the SED document (path relative to which models are located)
@@ -78,7 +106,83 @@ def exec_sed_doc(doc, working_dir, base_out_path, rel_out_path=None,
         pretty_print_modified_xml_models (:obj:`bool`, optional): if :obj:`True`, pretty print modified XML models
         log_level (:obj:`StandardOutputErrorCapturerLevel`, optional): level at which to log output
         config (:obj:`Config`, optional): BioSimulators common configuration
-        simulator_config (:obj:`SimulatorConfig`, optional): tellurium configuration
+        simulator_config (:obj:`SimulatorConfig`, optional): BioNetGen configuration
+
+    Returns:
+        :obj:`tuple`:
+
+            * :obj:`ReportResults`: results of each report
+            * :obj:`SedDocumentLog`: log of the document
+    """
+    config = config or get_config()
+    simulator_config = simulator_config or SimulatorConfig()
+
+    task_executer = functools.partial(exec_sed_task, simulator_config=simulator_config)
+    if simulator_config.num_workers > 1 or simulator_config.batch_tasks:
+        if not isinstance(doc, SedDocument):
+            doc = SedmlSimulationReader().run(doc, config=config)
+        task_results = exec_independent_sed_tasks(doc, working_dir, config=config, simulator_config=simulator_config)
+        task_executer = functools.partial(get_sed_task_results, task_results, simulator_config=simulator_config)
+
+    if simulator_config.parameter_scans:
+        if not isinstance(doc, SedDocument):
+            doc = SedmlSimulationReader().run(doc, config=config)
+        parameter_scans = get_parameter_scans(doc)
+        if parameter_scans:
+            task_executer = functools.partial(exec_parameter_scan_sed_task, parameter_scans, task_executer,
+                                              simulator_config=simulator_config)
+
+    report_results, log = base_exec_sed_doc(task_executer, doc, working_dir, base_out_path,
+                                            rel_out_path=rel_out_path,
+                                            apply_xml_model_changes=apply_xml_model_changes,
+                                            log=log,
+                                            indent=indent,
+                                            pretty_print_modified_xml_models=pretty_print_modified_xml_models,
+                                            log_level=log_level,
+                                            config=config)
+    add_phase_timings_to_doc_log(log, simulator_config)
+    return report_results, log
+
+
+def add_phase_timings_to_doc_log(log, simulator_config):
+    """ If :obj:`SimulatorConfig.phase_timing` is :obj:`True`, record the total duration of each phase of the
+    execution of the tasks of a SED document (``phase_timings`` attribute of the log of the document)
+
+    Args:
+        log (:obj:`SedDocumentLog`): log of the document
+        simulator_config (:obj:`SimulatorConfig`): BioNetGen configuration
+    """
+    if log is not None and simulator_config.phase_timing:
+        log.phase_timings = aggregate_phase_timings((log.tasks or {}).values())
+
+
+async def async_exec_sed_doc(doc, working_dir, base_out_path, rel_out_path=None,
+                             apply_xml_model_changes=False,
+                             log=None, indent=0, pretty_print_modified_xml_models=False,
+                             log_level=StandardOutputErrorCapturerLevel.c, config=None, simulator_config=None,
+                             semaphore=None):
+    """ Asynchronously execute the tasks specified in a SED document and generate the specified outputs
+
+    The independent tasks of the document (non-repeated tasks of BNGL files) are executed concurrently with
+    :obj:`async_exec_sed_task`. The remaining tasks and the outputs of the document are then executed and generated
+    by :obj:`exec_sed_doc` in a thread, in the same order as when the tasks are executed sequentially.
+
+    Args:
+        doc (:obj:`SedDocument` or :obj:`str`): SED document or a path to SED-ML file which defines a SED document
+        working_dir (:obj:`str`): working directory of the SED document (path relative to which models are located)
+        base_out_path (:obj:`str`): path to store the outputs
+        rel_out_path (:obj:`str`, optional): path relative to :obj:`base_out_path` to store the outputs
+        apply_xml_model_changes (:obj:`bool`, optional): if :obj:`True`, apply any model changes specified in the SED-ML file before
+            calling :obj:`task_executer`.
+        log (:obj:`SedDocumentLog`, optional): log of the document
+        indent (:obj:`int`, optional): degree to indent status messages
+        pretty_print_modified_xml_models (:obj:`bool`, optional): if :obj:`True`, pretty print modified XML models
+        log_level (:obj:`StandardOutputErrorCapturerLevel`, optional): level at which to log output
+        config (:obj:`Config`, optional): BioSimulators common configuration
+        simulator_config (:obj:`SimulatorConfig`, optional): BioNetGen configuration
+        semaphore (:obj:`asyncio.Semaphore`, optional): semaphore for bounding the number of concurrent BioNetGen
+            processes. Defaults to a semaphore with :obj:`SimulatorConfig.num_workers` slots, or one slot per CPU if
+            :obj:`SimulatorConfig.num_workers` is less than or equal to 1.
 
     Returns:
         :obj:`tuple`:
@@ -86,17 +190,687 @@ def exec_sed_doc(doc, working_dir, base_out_path, rel_out_path=None,
             * :obj:`ReportResults`: results of each report
             * :obj:`SedDocumentLog`: log of the document
     """
-    return base_exec_sed_doc(exec_sed_task, doc, working_dir, base_out_path,
-                             rel_out_path=rel_out_path,
-                             apply_xml_model_changes=apply_xml_model_changes,
-                             log=log,
-                             indent=indent,
-                             pretty_print_modified_xml_models=pretty_print_modified_xml_models,
-                             log_level=log_level,
-                             config=config)
+    config = config or get_config()
+    simulator_config = simulator_config or SimulatorConfig()
+
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(simulator_config.num_workers if simulator_config.num_workers > 1 else (os.cpu_count() or 1))
+
+    loop = asyncio.get_running_loop()
+    if not isinstance(doc, SedDocument):
+        doc = await loop.run_in_executor(None, functools.partial(SedmlSimulationReader().run, doc, config=config))
+
+    # execute the independent tasks concurrently
+    batches = get_independent_sed_task_batches(doc, working_dir)
+    futures = [
+        asyncio.ensure_future(async_exec_independent_sed_task(tasks[0], variables[0], working_dir, config, semaphore,
+                                                              simulator_config=simulator_config))
+        for tasks, variables in batches.values()
+    ]
+
+    task_results = {}
+    failed_task_id = None
+    try:
+        for future in asyncio.as_completed(futures):
+            task_id, result = await future
+            task_results[task_id] = result
+
+            if result[3] is not None and simulator_config.fail_fast:
+                failed_task_id = task_id
+                break
+    finally:
+        for future in futures:
+            future.cancel()
+        await asyncio.gather(*futures, return_exceptions=True)
+
+    if failed_task_id is not None:
+        for tasks, _ in batches.values():
+            if tasks[0].id not in task_results:
+                task_results[tasks[0].id] = (None, None, [], RuntimeError(
+                    'Task `{}` was not executed because task `{}` failed.'.format(tasks[0].id, failed_task_id)))
+
+    # execute the remaining tasks and generate the outputs
+    task_executer = functools.partial(get_sed_task_results, task_results, simulator_config=simulator_config)
+    if simulator_config.parameter_scans:
+        parameter_scans = get_parameter_scans(doc)
+        if parameter_scans:
+            task_executer = functools.partial(exec_parameter_scan_sed_task, parameter_scans, task_executer,
+                                              simulator_config=simulator_config)
+
+    report_results, log = await loop.run_in_executor(None, functools.partial(
+        base_exec_sed_doc, task_executer, doc, working_dir, base_out_path,
+        rel_out_path=rel_out_path,
+        apply_xml_model_changes=apply_xml_model_changes,
+        log=log,
+        indent=indent,
+        pretty_print_modified_xml_models=pretty_print_modified_xml_models,
+        log_level=log_level,
+        config=config))
+    add_phase_timings_to_doc_log(log, simulator_config)
+    return report_results, log
+
+
+async def async_exec_independent_sed_task(task, variables, working_dir, config, semaphore, simulator_config=None):
+    """ Asynchronously execute an independent task of a SED document
+
+    Args:
+        task (:obj:`Task`): SED task
+        variables (:obj:`list` of :obj:`Variable`): variables that should be recorded
+        working_dir (:obj:`str`): working directory of the SED document (path relative to which models are located)
+        config (:obj:`Config`): BioSimulators common configuration
+        semaphore (:obj:`asyncio.Semaphore`): semaphore for bounding the number of concurrent BioNetGen processes
+        simulator_config (:obj:`SimulatorConfig`, optional): BioNetGen configuration
+
+    Returns:
+        :obj:`tuple`:
+
+            * :obj:`str`: id of the task
+            * :obj:`tuple`: results of the variables (:obj:`VariableResults`), log (:obj:`TaskLog`), warnings raised by
+              the task (:obj:`list` of :obj:`Warning`), and exception raised by the task (:obj:`Exception`)
+    """
+    task, variables = copy.deepcopy((task, variables))
+    task.model.source = os.path.abspath(os.path.join(working_dir, task.model.source))
+
+    log = TaskLog() if config.LOG else None
+    try:
+        variable_results, log = await async_exec_sed_task(task, variables, log=log, config=config, semaphore=semaphore,
+                                                          simulator_config=simulator_config)
+        return task.id, (variable_results, log, [], None)
+    except Exception as exception:
+        return task.id, (None, log, [], exception)
+
+
+def exec_independent_sed_tasks(doc, working_dir, config=None, simulator_config=None):
+    """ Execute the independent tasks of a SED document in parallel using a pool of processes and/or in batches of
+    tasks which share the same BNGL file
+
+    Non-repeated tasks of BNGL files that are executed by a SED document are independent of each other because each task
+    is executed by a separate BioNetGen process. All other tasks (e.g., repeated tasks) are left to be executed
+    sequentially.
+
+    Args:
+        doc (:obj:`SedDocument`): SED document
+        working_dir (:obj:`str`): working directory of the SED document (path relative to which models are located)
+        config (:obj:`Config`, optional): BioSimulators common configuration
+        simulator_config (:obj:`SimulatorConfig`, optional): BioNetGen configuration
+
+    Returns:
+        :obj:`dict`: dictionary that maps the id of each independent task to a tuple of its results
+            (:obj:`VariableResults`), its log (:obj:`TaskLog`), the warnings that it raised (:obj:`list` of
+            :obj:`Warning`), and the exception that it raised (:obj:`Exception`)
+    """
+    config = config or get_config()
+    simulator_config = simulator_config or SimulatorConfig()
+
+    batches = get_independent_sed_task_batches(doc, working_dir, batch_tasks=simulator_config.batch_tasks)
+
+    # execute the batches
+    task_results = {}
+    batch_task_ids = {}
+    failed_task_id = None
+
+    if simulator_config.num_workers > 1:
+        # the results of the tasks are returned to this process, which keeps them within its memory budget, so the
+        # worker processes don't also spill (and count) them
+        worker_simulator_config = copy.copy(simulator_config)
+        worker_simulator_config.results_memory_budget = None
+
+        with concurrent.futures.ProcessPoolExecutor(max_workers=simulator_config.num_workers) as executor:
+            futures = {}
+            for tasks, variables in batches.values():
+                future = executor.submit(exec_sed_tasks_in_subprocess, tasks, variables, working_dir, config,
+                                         simulator_config=worker_simulator_config)
+                futures[future] = batch_task_ids[future] = [task.id for task in tasks]
+
+            for future in concurrent.futures.as_completed(futures):
+                try:
+                    batch_results = future.result()
+                except concurrent.futures.CancelledError:
+                    continue
+                except Exception as exception:
+                    batch_results = {task_id: (None, None, [], exception) for task_id in futures[future]}
+
+                # the results are copied into this process; keep them within its memory budget
+                for variable_results, log, _, _ in batch_results.values():
+                    if variable_results is not None:
+                        budget_sed_task_results(variable_results, log, simulator_config=simulator_config)
+
+                task_results.update(batch_results)
+
+                if simulator_config.fail_fast and failed_task_id is None:
+                    failed_task_id = get_failed_task_id(batch_results)
+                    if failed_task_id is not None:
+                        for other_future in futures:
+                            other_future.cancel()
+
+    else:
+        for tasks, variables in batches.values():
+            # tasks which can't be batched are left to be executed sequentially
+            if len(tasks) < 2:
+                continue
+
+            batch_task_ids[len(batch_task_ids)] = [task.id for task in tasks]
+            if failed_task_id is None:
+                batch_results = exec_sed_tasks_in_subprocess(tasks, variables, working_dir, config,
+                                                             simulator_config=simulator_config)
+                task_results.update(batch_results)
+                if simulator_config.fail_fast:
+                    failed_task_id = get_failed_task_id(batch_results)
+
+    if failed_task_id is not None:
+        for task_ids in batch_task_ids.values():
+            for task_id in task_ids:
+                if task_id not in task_results:
+                    task_results[task_id] = (None, None, [], RuntimeError(
+                        'Task `{}` was not executed because task `{}` failed.'.format(task_id, failed_task_id)))
+
+    return task_results
+
+
+def get_independent_sed_task_batches(doc, working_dir, batch_tasks=False):
+    """ Get the independent tasks of a SED document, optionally grouped into batches of tasks which share the same
+    BNGL file
+
+    Args:
+        doc (:obj:`SedDocument`): SED document
+        working_dir (:obj:`str`): working directory of the SED document (path relative to which models are located)
+        batch_tasks (:obj:`bool`, optional): whether to group tasks which share the same BNGL file
+
+    Returns:
+        :obj:`OrderedDict`: dictionary that maps the key of each batch to a tuple of its tasks (:obj:`list` of :obj:`Task`)
+            and the variables that should be recorded for each task (:obj:`list` of :obj:`list` of :obj:`Variable`)
+    """
+    batches = OrderedDict()
+    for task in doc.tasks:
+        if not isinstance(task, Task) or not is_sed_task_independent(task):
+            continue
+
+        variables = get_variables_for_task(doc, task)
+        if not variables:
+            continue
+
+        if batch_tasks:
+            batch_key = os.path.abspath(os.path.join(working_dir, task.model.source))
+        else:
+            batch_key = task.id
+        batches.setdefault(batch_key, ([], []))
+        batches[batch_key][0].append(task)
+        batches[batch_key][1].append(variables)
+    return batches
+
+
+def get_failed_task_id(task_results):
+    """ Get the id of the first failed task of a batch
+
+    Args:
+        task_results (:obj:`dict`): dictionary that maps the ids of tasks to their results
+
+    Returns:
+        :obj:`str`: id of the first failed task, or :obj:`None` if no task failed
+    """
+    for task_id, (_, _, _, exception) in task_results.items():
+        if exception is not None:
+            return task_id
+    return None
+
+
+def is_sed_task_independent(task):
+    """ Determine whether a SED task can be executed independently of the other tasks of its SED document
+
+    Args:
+        task (:obj:`Task`): SED task
+
+    Returns:
+        :obj:`bool`: whether the task can be executed independently
+    """
+    source = task.model.source or ''
+    return (
+        not source.startswith('#')
+        and not re.match(r'^[a-z]+:', source, re.IGNORECASE)
+        and all(isinstance(change, ModelAttributeChange) for change in task.model.changes)
+    )
+
+
+def exec_sed_tasks_in_subprocess(tasks, variables, working_dir, config, simulator_config=None):
+    """ Execute a batch of SED tasks which share the same BNGL file, such as in a subprocess of a pool
+
+    Args:
+        tasks (:obj:`list` of :obj:`Task`): SED tasks
+        variables (:obj:`list` of :obj:`list` of :obj:`Variable`): variables that should be recorded for each task
+        working_dir (:obj:`str`): working directory of the SED document (path relative to which models are located)
+        config (:obj:`Config`): BioSimulators common configuration
+        simulator_config (:obj:`SimulatorConfig`, optional): BioNetGen configuration
+
+    Returns:
+        :obj:`dict`: dictionary that maps the id of each task to a tuple of
+
+            * :obj:`VariableResults`: results of the variables
+            * :obj:`TaskLog`: log
+            * :obj:`list` of :obj:`Warning`: warnings raised by the task
+            * :obj:`Exception`: exception raised by the task
+    """
+    tasks, variables = copy.deepcopy((tasks, variables))
+    for task in tasks:
+        task.model.source = os.path.abspath(os.path.join(working_dir, task.model.source))
+
+    with warnings.catch_warnings(record=True) as caught_warnings:
+        warnings.simplefilter('always')
+        if len(tasks) == 1:
+            log = TaskLog() if config.LOG else None
+            try:
+                variable_results, log = exec_sed_task(tasks[0], variables[0], log=log, config=config,
+                                                      simulator_config=simulator_config)
+                task_results = {tasks[0].id: (variable_results, log, None)}
+            except Exception as exception:
+                task_results = {tasks[0].id: (None, log, exception)}
+        else:
+            task_results = exec_sed_task_batch(tasks, variables, config=config, simulator_config=simulator_config)
+
+    batch_warnings = [caught_warning.message for caught_warning in caught_warnings]
+    return OrderedDict(
+        (task_id, (variable_results, log, batch_warnings, exception))
+        for task_id, (variable_results, log, exception) in task_results.items()
+    )
+
+
+def exec_sed_task_batch(tasks, variables, config=None, simulator_config=None):
+    """ Execute a batch of SED tasks which share the same BNGL file with as few BioNetGen processes as possible
+
+    Tasks whose changes to the blocks of the model (sizes of compartments, expressions of functions) are identical and
+    whose simulation algorithms require a network are executed together by a single BioNetGen process. If such a
+    process fails, its tasks are executed individually to determine which tasks failed.
+
+    Args:
+        tasks (:obj:`list` of :obj:`Task`): SED tasks
+        variables (:obj:`list` of :obj:`list` of :obj:`Variable`): variables that should be recorded for each task
+        config (:obj:`Config`, optional): BioSimulators common configuration
+        simulator_config (:obj:`SimulatorConfig`, optional): BioNetGen configuration
+
+    Returns:
+        :obj:`dict`: dictionary that maps the id of each task to a tuple of its results (:obj:`VariableResults`),
+            its log (:obj:`TaskLog`), and the exception that it raised (:obj:`Exception`)
+    """
+    config = config or get_config()
+    simulator_config = simulator_config or SimulatorConfig()
+
+    task_results = OrderedDict()
+
+    # preprocess the tasks and group them by the changes that they make to the blocks of the model
+    groups = OrderedDict()
+    for task, task_variables in zip(tasks, variables):
+        try:
+            preprocessed_task = preprocess_sed_task(task, task_variables, config=config, simulator_config=simulator_config)
+        except Exception as exception:
+            task_results[task.id] = (None, TaskLog() if config.LOG else None, exception)
+            continue
+
+        block_changes = []
+        change_actions = BnglTask()
+        for change in task.model.changes:
+            preprocessed_change = preprocessed_task['model_changes'][change.target]
+            if preprocessed_change['type'] == 'replace_line_in_block':
+                block_changes.append((change.target, str(change.new_value)))
+            else:
+                add_model_attribute_change_to_task(change_actions, change, preprocessed_change)
+
+        requires_network = any(NetworkCache.GENERATE_NETWORK_PATTERN.match(action)
+                               for action in preprocessed_task['simulation_actions'])
+        group_key = (tuple(block_changes), requires_network) if requires_network else task.id
+        groups.setdefault(group_key, []).append((task, task_variables, preprocessed_task, change_actions.actions))
+
+    # execute each group of tasks
+    for group in groups.values():
+        observables_results = None
+
+        if len(group) > 1:
+            # apply the changes to the blocks of the model, and the observables of all of the tasks of the group, without
+            # modifying the preprocessed task, which is reused to execute the tasks individually if the batch fails
+            task, _, preprocessed_task, _ = group[0]
+            bionetgen_task = get_task_with_model_attribute_changes(
+                preprocessed_task['bionetgen_task'],
+                [change for change in task.model.changes
+                 if preprocessed_task['model_changes'][change.target]['type'] == 'replace_line_in_block'],
+                preprocessed_task['model_changes'])
+            if 'observables' in bionetgen_task.model:
+                bionetgen_task.model['observables'] = ModelBlock(bionetgen_task.model['observables'])
+            add_variables_to_model(bionetgen_task.model, [variable for _, task_variables, _, _ in group for variable in task_variables])
+
+            try:
+                observables_results = exec_bionetgen_task_batch(
+                    bionetgen_task.model,
+                    [change_actions + preprocessed_task['simulation_actions']
+                     for _, _, preprocessed_task, change_actions in group],
+                    verbose=config.VERBOSE,
+                    observables=get_observables_for_variables(
+                        [variable for _, task_variables, _, _ in group for variable in task_variables]),
+                    config=simulator_config)
+            except Exception:
+                observables_results = None
+
+        for i_task, (task, task_variables, preprocessed_task, change_actions) in enumerate(group):
+            log = TaskLog() if config.LOG else None
+
+            if observables_results is None:
+                try:
+                    variable_results, log = exec_sed_task(task, task_variables, preprocessed_task=preprocessed_task,
+                                                          log=log, config=config, simulator_config=simulator_config)
+                    task_results[task.id] = (variable_results, log, None)
+                except Exception as exception:
+                    task_results[task.id] = (None, log, exception)
+                continue
+
+            try:
+                variable_results = get_variables_results_for_sed_task(task, task_variables, observables_results[i_task])
+                exception = None
+            except Exception as caught_exception:
+                variable_results = None
+                exception = caught_exception
+
+            if config.LOG:
+                log.algorithm = preprocessed_task['algorithm_kisao_id']
+                log.simulator_details = {
+                    'actions': change_actions + preprocessed_task['simulation_actions'],
+                }
+
+            if variable_results is not None:
+                budget_sed_task_results(variable_results, log, simulator_config=simulator_config)
+
+            task_results[task.id] = (variable_results, log, exception)
+
+    return OrderedDict((task.id, task_results[task.id]) for task in tasks)
+
+
+def add_resource_usage_to_log(log, observable_results):
+    """ Record the resources used to execute a task in its log
+
+    The CPU time (in seconds) and peak resident set size (in bytes) of BioNetGen and its child processes are recorded as
+    ``cpu_time`` and ``max_rss``. The resources aren't recorded if the results of the task were reused from the cache
+    of results or the platform can't report the resources used by processes.
+
+    Args:
+        log (:obj:`TaskLog`): log for the task
+        observable_results (:obj:`pandas.DataFrame`): predicted values of the observables of the task
+    """
+    resource_usage = observable_results.attrs.get('resource_usage', None)
+    if resource_usage is not None:
+        log.simulator_details['cpu_time'] = resource_usage['cpu_time']
+        log.simulator_details['max_rss'] = resource_usage['max_rss']
+
+
+def add_result_cache_counters_to_log(log, observable_results):
+    """ Record whether the results of a task were reused from the cache of results in its log
+
+    The numbers of hits and misses of the cache are recorded as ``result_cache_hits`` and ``result_cache_misses``. The
+    counters are only recorded if the results of the task could be cached.
+
+    Args:
+        log (:obj:`TaskLog`): log for the task
+        observable_results (:obj:`pandas.DataFrame`): predicted values of the observables of the task
+    """
+    status = observable_results.attrs.get('result_cache', None)
+    if status is not None:
+        log.simulator_details['result_cache_hits'] = int(status == 'hit')
+        log.simulator_details['result_cache_misses'] = int(status == 'miss')
+
+
+def get_parameter_scans(doc):
+    """ Get the repeated tasks of a SED document whose iterations can be executed with BioNetGen's ``parameter_scan``
+    action
+
+    A repeated task can be executed as parameter scans if it has a single change, that change sets the value of a
+    parameter of a BNGL model (``parameters.<parameter_id>.value``) as a function of the ranges of the task (and not of
+    variables of models), and all of its sub-tasks are non-repeated, independent tasks of that model. Each sub-task is
+    executed as a separate scan. Sub-tasks which are used by multiple repeated tasks are executed iteration by iteration.
+
+    Args:
+        doc (:obj:`SedDocument`): SED document
+
+    Returns:
+        :obj:`dict`: dictionary that maps the id of each sub-task which can be executed as a parameter scan to a
+        dictionary with the id of the parameter (``parameter_id``), the target of the change (``target``), the values
+        of the parameter for each iteration (``values``), the number of changes of the model of the sub-task outside of
+        the repeated task (``num_model_changes``), and the results of the scan once it has been executed (``results``)
+    """
+    parameter_scans = {}
+    sub_task_ids = set()
+    duplicate_sub_task_ids = set()
+
+    for task in doc.tasks:
+        if not isinstance(task, RepeatedTask):
+            continue
+
+        sub_tasks = [sub_task.task for sub_task in task.sub_tasks]
+        for sub_task in sub_tasks:
+            if sub_task.id in sub_task_ids:
+                duplicate_sub_task_ids.add(sub_task.id)
+            sub_task_ids.add(sub_task.id)
+
+        if len(task.changes) != 1:
+            continue
+        change = task.changes[0]
+        if not isinstance(change, SetValueComputeModelChange) or change.symbol or change.variables or not change.model:
+            continue
+        parameter_match = re.match(r'^parameters\.([^\.]+)(\.value)?$', change.target or '')
+        if not parameter_match:
+            continue
+        if not sub_tasks or not all(
+            isinstance(sub_task, Task)
+            and sub_task.model.id == change.model.id
+            and is_sed_task_independent(sub_task)
+            for sub_task in sub_tasks
+        ):
+            continue
+
+        values = get_parameter_scan_values(task, change)
+        if values is None:
+            continue
+
+        for sub_task in sub_tasks:
+            parameter_scans[sub_task.id] = {
+                'parameter_id': parameter_match.group(1),
+                'target': change.target,
+                'values': values,
+                'num_model_changes': len(sub_task.model.changes),
+                'results': None,
+            }
+
+    for sub_task_id in duplicate_sub_task_ids:
+        parameter_scans.pop(sub_task_id, None)
+
+    return parameter_scans
+
+
+def get_parameter_scan_values(task, change):
+    """ Get the values that a change of a repeated task sets for each iteration of the task, formatted in the same way
+    as when the iterations are executed individually
+
+    Args:
+        task (:obj:`RepeatedTask`): repeated task
+        change (:obj:`SetValueComputeModelChange`): change of the task
+
+    Returns:
+        :obj:`list` of :obj:`str`: value for each iteration, or :obj:`None` if the values can't be determined without
+        the models of the task (e.g., functional ranges of variables of models) or aren't finite
+    """
+    try:
+        ranges = [task.range] + list(task.ranges) + ([change.range] if change.range else [])
+        range_values = {range.id: resolve_range(range) for range in ranges}
+
+        values = []
+        for i_iteration in range(len(range_values[task.range.id])):
+            current_range_values = {range_id: range_id_values[i_iteration] for range_id, range_id_values in range_values.items()}
+            value = calc_compute_model_change_new_value(change, variable_values={}, range_values=current_range_values)
+            values.append(str(int(value)) if value == int(value) else str(value))
+    except Exception:
+        return None
+
+    return values
 
 
-def exec_sed_task(task, variables, preprocessed_task=None, log=None, config=None):
+def exec_parameter_scan_sed_task(parameter_scans, task_executer, task, variables, preprocessed_task=None, log=None,
+                                 config=None, simulator_config=None):
+    """ Get the results of an iteration of a sub-task of a repeated task from the BioNetGen parameter scan of the sub-task,
+    or execute the task with another executer
+
+    The parameter scan of a sub-task is executed the first time that one of its iterations is requested. Iterations
+    of parameter scans which fail, and other tasks (including executions of sub-tasks outside of their repeated tasks),
+    are executed with :obj:`task_executer`.
+
+    Args:
+        parameter_scans (:obj:`dict`): parameter scans (see :obj:`get_parameter_scans`)
+        task_executer (:obj:`types.FunctionType`): function for executing other tasks (e.g., :obj:`exec_sed_task`)
+        task (:obj:`Task`): SED task
+        variables (:obj:`list` of :obj:`Variable`): variables that should be recorded
+        preprocessed_task (:obj:`dict`, optional): preprocessed information about the task
+        log (:obj:`TaskLog`, optional): log for the task
+        config (:obj:`Config`, optional): BioSimulators common configuration
+        simulator_config (:obj:`SimulatorConfig`, optional): BioNetGen configuration
+
+    Returns:
+        :obj:`tuple`:
+
+            :obj:`VariableResults`: results of variables
+            :obj:`TaskLog`: log
+    """
+    parameter_scan = parameter_scans.get(task.id, None)
+
+    # determine the value of the parameter for the iteration
+    value = None
+    if parameter_scan is not None:
+        iteration_changes = task.model.changes[parameter_scan['num_model_changes']:]
+        if iteration_changes and all(change.target == parameter_scan['target'] for change in iteration_changes):
+            value = str(iteration_changes[-1].new_value)
+
+    if value is None or value not in parameter_scan['values']:
+        return task_executer(task, variables, preprocessed_task=preprocessed_task, log=log, config=config)
+
+    # execute the parameter scan
+    if parameter_scan['results'] is None:
+        parameter_scan['results'] = {}
+        try:
+            scan_results = exec_sed_task_parameter_scan(task, variables, parameter_scan, config=config,
+                                                        simulator_config=simulator_config)
+        except Exception:
+            scan_results = []
+        for scan_value, result in zip(parameter_scan['values'], scan_results):
+            parameter_scan['results'].setdefault(scan_value, deque()).append(result)
+
+    # get the results of the iteration
+    value_results = parameter_scan['results'].get(value, None)
+    if not value_results:
+        return task_executer(task, variables, preprocessed_task=preprocessed_task, log=log, config=config)
+
+    variable_results, scan_log = value_results.popleft()
+    if log is not None and scan_log is not None:
+        log.algorithm = scan_log.algorithm
+        log.simulator_details = scan_log.simulator_details
+    return variable_results, log
+
+
+def exec_sed_task_parameter_scan(task, variables, parameter_scan, config=None, simulator_config=None):
+    """ Execute all of the iterations of a sub-task of a repeated task with a single BioNetGen parameter scan
+
+    Args:
+        task (:obj:`Task`): SED task, with the changes of an iteration of its repeated task
+        variables (:obj:`list` of :obj:`Variable`): variables that should be recorded
+        parameter_scan (:obj:`dict`): parameter scan (see :obj:`get_parameter_scans`)
+        config (:obj:`Config`, optional): BioSimulators common configuration
+        simulator_config (:obj:`SimulatorConfig`, optional): BioNetGen configuration
+
+    Returns:
+        :obj:`list` of :obj:`tuple`: results of the variables (:obj:`VariableResults`) and log (:obj:`TaskLog`) of each
+        iteration
+    """
+    config = config or get_config()
+    simulator_config = simulator_config or SimulatorConfig()
+
+    # remove the changes of the iteration from the task
+    task = copy.copy(task)
+    task.model = copy.copy(task.model)
+    task.model.changes = task.model.changes[0:parameter_scan['num_model_changes']]
+
+    # execute the scan
+    preprocessed_task = preprocess_sed_task(task, variables, config=config, simulator_config=simulator_config)
+    bionetgen_task = get_bionetgen_task_for_sed_task(task, preprocessed_task)
+    observables_results = exec_bionetgen_parameter_scan(bionetgen_task, parameter_scan['parameter_id'],
+                                                        parameter_scan['values'], verbose=config.VERBOSE,
+                                                        observables=get_observables_for_variables(variables),
+                                                        config=simulator_config)
+
+    # get the predicted values of the variables for each iteration
+    results = []
+    for observable_results in observables_results:
+        variable_results = get_variables_results_for_sed_task(task, variables, observable_results)
+
+        log = TaskLog() if config.LOG else None
+        if config.LOG:
+            log.algorithm = preprocessed_task['algorithm_kisao_id']
+            log.simulator_details = {
+                'actions': get_parameter_scan_actions(bionetgen_task.actions, parameter_scan['parameter_id'],
+                                                      parameter_scan['values']),
+            }
+
+        budget_sed_task_results(variable_results, log, simulator_config=simulator_config)
+        results.append((variable_results, log))
+
+    return results
+
+
+def budget_sed_task_results(variable_results, log, simulator_config=None):
+    """ Keep the results of the variables of a SED task within the results memory budget of the process, and record the
+    number of bytes of results that were spilled to memory-mapped files in the log of the task
+
+    Args:
+        variable_results (:obj:`VariableResults`): results of the variables
+        log (:obj:`TaskLog`): log for the task, or :obj:`None`
+        simulator_config (:obj:`SimulatorConfig`, optional): BioNetGen configuration
+    """
+    spilled_size = budget_variable_results(variable_results, config=simulator_config)
+    if spilled_size is not None and log is not None:
+        log.simulator_details = log.simulator_details or {}
+        log.simulator_details['spilled_bytes'] = log.simulator_details.get('spilled_bytes', 0) + spilled_size
+
+
+def get_sed_task_results(task_results, task, variables, preprocessed_task=None, log=None, config=None, simulator_config=None):
+    """ Get the results of a task which was executed by :obj:`exec_independent_sed_tasks` (in parallel and/or in a
+    batch), or execute the task if it wasn't executed by :obj:`exec_independent_sed_tasks`
+
+    Args:
+        task_results (:obj:`dict`): dictionary that maps the ids of the tasks executed by
+            :obj:`exec_independent_sed_tasks` to their results
+        task (:obj:`Task`): SED task
+        variables (:obj:`list` of :obj:`Variable`): variables that should be recorded
+        preprocessed_task (:obj:`dict`, optional): preprocessed information about the task
+        log (:obj:`TaskLog`, optional): log for the task
+        config (:obj:`Config`, optional): BioSimulators common configuration
+        simulator_config (:obj:`SimulatorConfig`, optional): BioNetGen configuration
+
+    Returns:
+        :obj:`tuple`:
+
+            :obj:`VariableResults`: results of variables
+            :obj:`TaskLog`: log
+    """
+    if task.id not in task_results:
+        return exec_sed_task(task, variables, preprocessed_task=preprocessed_task, log=log, config=config,
+                             simulator_config=simulator_config)
+
+    variable_results, task_log, task_warnings, exception = task_results[task.id]
+
+    for task_warning in task_warnings:
+        warnings.warn(task_warning, task_warning.__class__)
+
+    if exception is not None:
+        raise exception
+
+    if log is not None and task_log is not None:
+        log.algorithm = task_log.algorithm
+        log.simulator_details = task_log.simulator_details
+
+    return variable_results, log
+
+
+def exec_sed_task(task, variables, preprocessed_task=None, log=None, config=None, simulator_config=None):
     """ Execute a task and save its results
 
     Args:
@@ -107,6 +881,7 @@ def exec_sed_task(task, variables, preprocessed_task=None, log=None, config=None
             for repeated calls to this method.
         log (:obj:`TaskLog`, optional): log for the task
         config (:obj:`Config`, optional): BioSimulators common configuration
+        simulator_config (:obj:`SimulatorConfig`, optional): BioNetGen configuration
 
     Returns:
         :obj:`tuple`:
@@ -138,34 +913,32 @@ def exec_sed_task(task, variables, preprocessed_task=None, log=None, config=None
         * :obj:`get_variables_results_from_observable_results`
     """
     config = config or get_config()
+    simulator_config = simulator_config or SimulatorConfig()
 
     if config.LOG and not log:
         log = TaskLog()
 
-    if preprocessed_task is None:
-        preprocessed_task = preprocess_sed_task(task, variables, config=config)
+    timer = get_phase_timer(simulator_config)
 
-    # read the model from the BNGL file
-    bionetgen_task = preprocessed_task['bionetgen_task']
-    preprocessed_actions = bionetgen_task.actions
-    bionetgen_task.actions = copy.deepcopy(preprocessed_actions)
+    if preprocessed_task is None:
+        preprocessed_task = preprocess_sed_task(task, variables, config=config, timer=timer,
+                                                simulator_config=simulator_config)
 
-    # validate and apply the model attribute changes to the BioNetGen task
-    for change in task.model.changes:
-        add_model_attribute_change_to_task(bionetgen_task, change, preprocessed_task['model_changes'][change.target])
+    # validate and apply the model attribute changes and the simulation to the BioNetGen task
+    with timer.phase('prepare_task'):
+        bionetgen_task = get_bionetgen_task_for_sed_task(task, preprocessed_task)
 
     # apply the SED algorithm and its parameters to the BioNetGen task
     alg_kisao_id = preprocessed_task['algorithm_kisao_id']
 
     # execute the task
-    bionetgen_task.actions.extend(preprocessed_task['simulation_actions'])
-
-    observable_results = exec_bionetgen_task(bionetgen_task, verbose=config.VERBOSE)
+    observable_results = exec_bionetgen_task(bionetgen_task, verbose=config.VERBOSE,
+                                             observables=get_observables_for_variables(variables), timer=timer,
+                                             config=simulator_config)
 
     # get predicted values of the variables
-    variable_results = get_variables_results_from_observable_results(observable_results, variables)
-    for key in variable_results.keys():
-        variable_results[key] = variable_results[key][-(task.simulation.number_of_points + 1):]
+    with timer.phase('extract_variables'):
+        variable_results = get_variables_results_for_sed_task(task, variables, observable_results)
 
     # log action
     if config.LOG:
@@ -173,15 +946,199 @@ def exec_sed_task(task, variables, preprocessed_task=None, log=None, config=None
         log.simulator_details = {
             'actions': bionetgen_task.actions,
         }
+        add_result_cache_counters_to_log(log, observable_results)
+        add_resource_usage_to_log(log, observable_results)
+
+    # keep the results within the memory budget
+    with timer.phase('budget_results'):
+        budget_sed_task_results(variable_results, log if config.LOG else None, simulator_config=simulator_config)
 
-    # clean up
-    bionetgen_task.actions = preprocessed_actions
+    if config.LOG and timer.enabled:
+        log.simulator_details['phase_timings'] = timer.get_timings()
 
     # return the values of the variables and log
     return variable_results, log
 
 
-def preprocess_sed_task(task, variables, config=None):
+async def async_exec_sed_task(task, variables, preprocessed_task=None, log=None, config=None, semaphore=None,
+                              simulator_config=None):
+    """ Asynchronously execute a task and save its results
+
+    The preprocessed task isn't modified (see :obj:`get_bionetgen_task_for_sed_task`). Consequently, several instances
+    of the coroutine can concurrently execute the same preprocessed task.
+
+    Args:
+        task (:obj:`Task`): SED task
+        variables (:obj:`list` of :obj:`Variable`): variables that should be recorded
+        preprocessed_task (:obj:`dict`, optional): preprocessed information about the task, including possible
+            model changes and variables. This can be used to avoid repeatedly executing the same initialization
+            for repeated calls to this method.
+        log (:obj:`TaskLog`, optional): log for the task
+        config (:obj:`Config`, optional): BioSimulators common configuration
+        semaphore (:obj:`asyncio.Semaphore`, optional): semaphore for bounding the number of concurrent BioNetGen
+            processes
+        simulator_config (:obj:`SimulatorConfig`, optional): BioNetGen configuration
+
+    Returns:
+        :obj:`tuple`:
+
+            :obj:`VariableResults`: results of variables
+            :obj:`TaskLog`: log
+    """
+    config = config or get_config()
+    simulator_config = simulator_config or SimulatorConfig()
+
+    if config.LOG and not log:
+        log = TaskLog()
+
+    timer = get_phase_timer(simulator_config)
+
+    if preprocessed_task is None:
+        preprocessed_task = preprocess_sed_task(task, variables, config=config, timer=timer,
+                                                simulator_config=simulator_config)
+
+    # validate and apply the model attribute changes and the simulation to the BioNetGen task
+    with timer.phase('prepare_task'):
+        bionetgen_task = get_bionetgen_task_for_sed_task(task, preprocessed_task)
+
+    # execute the task
+    observable_results = await async_exec_bionetgen_task(bionetgen_task, verbose=config.VERBOSE, semaphore=semaphore,
+                                                         observables=get_observables_for_variables(variables), timer=timer,
+                                                         config=simulator_config)
+
+    # get predicted values of the variables
+    with timer.phase('extract_variables'):
+        variable_results = get_variables_results_for_sed_task(task, variables, observable_results)
+
+    # log action
+    if config.LOG:
+        log.algorithm = preprocessed_task['algorithm_kisao_id']
+        log.simulator_details = {
+            'actions': bionetgen_task.actions,
+        }
+        add_result_cache_counters_to_log(log, observable_results)
+        add_resource_usage_to_log(log, observable_results)
+
+    # keep the results within the memory budget
+    with timer.phase('budget_results'):
+        budget_sed_task_results(variable_results, log if config.LOG else None, simulator_config=simulator_config)
+
+    if config.LOG and timer.enabled:
+        log.simulator_details['phase_timings'] = timer.get_timings()
+
+    # return the values of the variables and log
+    return variable_results, log
+
+
+def exec_sed_task_ensemble(task, variables, num_replicates, preprocessed_task=None, seed=None, quantiles=DEFAULT_QUANTILES,
+                           log=None, config=None, simulator_config=None):
+    """ Execute replicates of a task with a stochastic simulation algorithm (e.g., SSA, PLA, network-free) and save
+    summary statistics of the results of its variables
+
+    The replicates are executed with :obj:`exec_bionetgen_ensemble`, which generates the network of the model once
+    and summarizes the replicates as they complete, without retaining them.
+
+    Args:
+        task (:obj:`Task`): SED task
+        variables (:obj:`list` of :obj:`Variable`): variables that should be recorded
+        num_replicates (:obj:`int`): number of replicates
+        preprocessed_task (:obj:`dict`, optional): preprocessed information about the task, including possible
+            model changes and variables. This can be used to avoid repeatedly executing the same initialization
+            for repeated calls to this method.
+        seed (:obj:`int`, optional): seed from which the seeds of the replicates are derived; if :obj:`None`, the seed
+            of the simulation is used, if any, and otherwise the seeds of the replicates are random
+        quantiles (:obj:`tuple` of :obj:`float`, optional): quantiles to estimate
+        log (:obj:`TaskLog`, optional): log for the task
+        config (:obj:`Config`, optional): BioSimulators common configuration
+        simulator_config (:obj:`SimulatorConfig`, optional): BioNetGen configuration
+
+    Returns:
+        :obj:`tuple`:
+
+            :obj:`dict`: dictionary that maps ``mean``, ``std``, and each quantile to the results of the variables
+                (:obj:`VariableResults`) for the statistic
+            :obj:`TaskLog`: log
+    """
+    config = config or get_config()
+    simulator_config = simulator_config or SimulatorConfig()
+
+    if config.LOG and not log:
+        log = TaskLog()
+
+    if preprocessed_task is None:
+        preprocessed_task = preprocess_sed_task(task, variables, config=config, simulator_config=simulator_config)
+
+    # validate and apply the model attribute changes and the simulation to the BioNetGen task
+    bionetgen_task = get_bionetgen_task_for_sed_task(task, preprocessed_task)
+
+    # execute the replicates
+    statistics = exec_bionetgen_ensemble(bionetgen_task, num_replicates, seed=seed, quantiles=quantiles,
+                                         num_workers=simulator_config.num_workers, verbose=config.VERBOSE,
+                                         observables=get_observables_for_variables(variables), config=simulator_config)
+
+    # get the summary statistics of the variables
+    statistics_results = OrderedDict()
+    statistics_results['mean'] = get_variables_results_for_sed_task(task, variables, statistics.get_mean())
+    statistics_results['std'] = get_variables_results_for_sed_task(task, variables, statistics.get_std())
+    for quantile in statistics.quantiles:
+        statistics_results[quantile] = get_variables_results_for_sed_task(task, variables, statistics.get_quantile(quantile))
+
+    # log action
+    if config.LOG:
+        log.algorithm = preprocessed_task['algorithm_kisao_id']
+        log.simulator_details = {
+            'actions': bionetgen_task.actions,
+            'num_replicates': statistics.num_replicates,
+        }
+        if statistics.resource_usage is not None:
+            log.simulator_details['cpu_time'] = statistics.resource_usage['cpu_time']
+            log.simulator_details['max_rss'] = statistics.resource_usage['max_rss']
+
+    # return the statistics of the variables and log
+    return statistics_results, log
+
+
+def get_bionetgen_task_for_sed_task(task, preprocessed_task):
+    """ Get a BioNetGen task which encodes the model changes and simulation of a SED task
+
+    The preprocessed BioNetGen task is not modified: the lines which the model changes replace are overlaid on copies of
+    the blocks which contain them, the other blocks are shared with the model of the preprocessed task, and the actions
+    are appended to a copy of its actions (see :obj:`get_task_with_model_attribute_changes`). Consequently, the same
+    preprocessed task can be executed concurrently (e.g., by several threads).
+
+    Args:
+        task (:obj:`Task`): SED task
+        preprocessed_task (:obj:`dict`): preprocessed information about the task
+
+    Returns:
+        :obj:`BnglTask`: BioNetGen task
+    """
+    # validate and apply the model attribute changes to the BioNetGen task
+    bionetgen_task = get_task_with_model_attribute_changes(preprocessed_task['bionetgen_task'], task.model.changes,
+                                                           preprocessed_task['model_changes'])
+
+    # apply the SED algorithm and its parameters to the BioNetGen task
+    bionetgen_task.actions.extend(preprocessed_task['simulation_actions'])
+
+    return bionetgen_task
+
+
+def get_variables_results_for_sed_task(task, variables, observable_results):
+    """ Get the predicted values of the variables of a SED task over its output time course
+
+    Args:
+        task (:obj:`Task`): SED task
+        variables (:obj:`list` of :obj:`Variable`): variables that should be recorded
+        observable_results (:obj:`pandas.DataFrame`): predicted values of the observables of the task
+
+    Returns:
+        :obj:`VariableResults`: results of variables
+    """
+    return get_variables_results_from_observable_results(observable_results, variables,
+                                                         number_of_points=task.simulation.number_of_points)
+
+
+def preprocess_sed_task(task, variables, config=None, timer=None, simulator_config=None):
     """ Preprocess a SED task, including its possible model changes and variables. This is useful for avoiding
     repeatedly initializing tasks on repeated calls of :obj:`exec_sed_task`.
 
@@ -189,53 +1146,65 @@ def preprocess_sed_task(task, variables, config=None):
         task (:obj:`Task`): task
         variables (:obj:`list` of :obj:`Variable`): variables that should be recorded
         config (:obj:`Config`, optional): BioSimulators common configuration
+        timer (:obj:`PhaseTimer`, optional): timer for the phases of the execution of the task
+        simulator_config (:obj:`SimulatorConfig`, optional): BioNetGen configuration
 
     Returns:
         :obj:`dict`: preprocessed information about the task
     """
     config = config or get_config()
+    simulator_config = simulator_config or SimulatorConfig()
+    timer = timer or DISABLED_PHASE_TIMER
 
-    if config.VALIDATE_SEDML:
-        raise_errors_warnings(
-            validation.validate_task(task),
-            error_summary='Task `{}` is invalid.'.format(task.id))
-        raise_errors_warnings(
-            validation.validate_model_language(task.model.language, ModelLanguage.BNGL),
-            error_summary='Language for model `{}` is not supported.'.format(task.model.id))
-        raise_errors_warnings(
-            validation.validate_model_change_types(task.model.changes, (ModelAttributeChange, )),
-            error_summary='Changes for model `{}` are not supported.'.format(task.model.id))
-        raise_errors_warnings(
-            *validation.validate_model_changes(task.model),
-            error_summary='Changes for model `{}` are invalid.'.format(task.model.id))
-        raise_errors_warnings(
-            validation.validate_simulation_type(task.simulation, (UniformTimeCourseSimulation, )),
-            error_summary='{} `{}` is not supported.'.format(
-                task.simulation.__class__.__name__,
-                task.simulation.id))
-        raise_errors_warnings(
-            *validation.validate_simulation(task.simulation),
-            error_summary='Simulation `{}` is invalid.'.format(task.simulation.id))
-        raise_errors_warnings(
-            *validation.validate_data_generator_variables(variables),
-            error_summary='Data generator variables for task `{}` are invalid.'.format(task.id))
+    with timer.phase('validate'):
+        if config.VALIDATE_SEDML:
+            raise_errors_warnings(
+                validation.validate_task(task),
+                error_summary='Task `{}` is invalid.'.format(task.id))
+            raise_errors_warnings(
+                validation.validate_model_language(task.model.language, ModelLanguage.BNGL),
+                error_summary='Language for model `{}` is not supported.'.format(task.model.id))
+            raise_errors_warnings(
+                validation.validate_model_change_types(task.model.changes, (ModelAttributeChange, )),
+                error_summary='Changes for model `{}` are not supported.'.format(task.model.id))
+            raise_errors_warnings(
+                *validation.validate_model_changes(task.model),
+                error_summary='Changes for model `{}` are invalid.'.format(task.model.id))
+            raise_errors_warnings(
+                validation.validate_simulation_type(task.simulation, (UniformTimeCourseSimulation, )),
+                error_summary='{} `{}` is not supported.'.format(
+                    task.simulation.__class__.__name__,
+                    task.simulation.id))
+            raise_errors_warnings(
+                *validation.validate_simulation(task.simulation),
+                error_summary='Simulation `{}` is invalid.'.format(task.simulation.id))
+            raise_errors_warnings(
+                *validation.validate_data_generator_variables(variables),
+                error_summary='Data generator variables for task `{}` are invalid.'.format(task.id))
 
     # read the model from the BNGL file
-    bionetgen_task = read_task(task.model.source)
-    if bionetgen_task.actions:
-        warnings.warn('Actions in the BNGL file were ignored.', IgnoredBnglFileContentWarning)
-        bionetgen_task.actions = []
+    with timer.phase('read_task'):
+        bionetgen_task = get_task_cache(simulator_config).read_task(task.model.source)
+        if bionetgen_task.actions:
+            warnings.warn('Actions in the BNGL file were ignored.', IgnoredBnglFileContentWarning)
+            bionetgen_task.actions = []
 
-    # validate and apply the model attribute changes to the BioNetGen task
-    model_changes = {}
-    for change in task.model.changes:
-        model_changes[change.target] = preprocess_model_attribute_change(bionetgen_task, change)
+    with timer.phase('preprocess_model'):
+        # validate and apply the model attribute changes to the BioNetGen task
+        model_changes = preprocess_model_attribute_changes(bionetgen_task, task.model.changes, config=simulator_config)
 
-    # add observables for the variables to the BioNetGen model
-    add_variables_to_model(bionetgen_task.model, variables)
+        # add observables for the variables to the BioNetGen model
+        add_variables_to_model(bionetgen_task.model, variables)
 
-    # apply the SED algorithm and its parameters to the BioNetGen task
-    simulation_actions, alg_kisao_id = create_actions_for_simulation(task.simulation)
+        # apply the SED algorithm and its parameters to the BioNetGen task
+        simulation_actions, alg_kisao_id = create_actions_for_simulation(task.simulation)
+
+        # pre-render the BNGL text of the model, with slots for the lines that the model attribute changes replace
+        bionetgen_task.template = TaskTemplate(bionetgen_task.model, slots=[
+            (model_change['block_type'], model_change['i_line'])
+            for model_change in model_changes.values()
+            if model_change['type'] == 'replace_line_in_block'
+        ])
 
     # return the values of the variables and log
     return {
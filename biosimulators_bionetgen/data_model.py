@@ -7,15 +7,158 @@
 """
 from biosimulators_utils.data_model import ValueType
 from collections import OrderedDict
+import hashlib
+import re
 
 __all__ = ['Model', 'ModelBlock', 'Task', 'KISAO_SIMULATION_METHOD_ARGUMENTS_MAP']
 
 
 class Model(OrderedDict):
-    """ A BNGL model: a collection of model blocks """
+    """ A BNGL model: a collection of model blocks
+
+    The lines of blocks can be deferred (:obj:`set_deferred_block`) until the blocks are first accessed (e.g., with
+    ``model[block_type]``, :obj:`get`, :obj:`items`, or :obj:`values`).
+
+    The lines of the elements of blocks (e.g., parameters) can be found by their ids (:obj:`find_block_line`) with
+    indexes which are built once for each block.
+
+    Models can be compared (:obj:`is_equal`) and keyed by canonical fingerprints (:obj:`get_fingerprint`) which are
+    combined from fingerprints that each block maintains as its lines are edited.
+
+    Attributes:
+        BLOCK_ID_PATTERNS (:obj:`dict`): dictionary that maps the types of indexable blocks to patterns for their lines;
+            the first group of each pattern is the id of the element defined by the line
+    """
+
+    BLOCK_ID_PATTERNS = {
+        'compartments': re.compile(r'^([^ ]+) (\d+) ([^ ]+)( .*?)?$'),
+        'parameters': re.compile(r'^([^\s=]+)(\s*=?\s*)(.*)$'),
+        'functions': re.compile(r'^([^\s\(\)]+)\((.*?)\) *= *(.*?)$'),
+        'seed species': re.compile(r'^\$?(\S+)( +)(.*)$'),
+        'species': re.compile(r'^\$?(\S+)( +)(.*)$'),
+    }
+
+    def __init__(self, *args, **kwargs):
+        self._block_indexes = {}
+        super(Model, self).__init__(*args, **kwargs)
+
+    def find_block_line(self, block_type, id):
+        """ Find the line of a block which defines an element (e.g., a parameter)
+
+        The index of a block is rebuilt when the block is replaced, when its number of lines changes, or when the indexed
+        line of an element no longer defines the element.
+
+        Args:
+            block_type (:obj:`str`): type of the block (e.g., ``parameters``, key of :obj:`BLOCK_ID_PATTERNS`)
+            id (:obj:`str`): id of the element
+
+        Returns:
+            :obj:`tuple`: number of the line (:obj:`int`) and match of the line with the pattern of the block
+            (:obj:`re.Match`), or :obj:`None` if the block doesn't define the element
+        """
+        block = self.get(block_type, None)
+        if block is None:
+            return None
+
+        pattern = self.BLOCK_ID_PATTERNS[block_type]
+        block_index = self._block_indexes.get(block_type, None)
+        for rebuild in [block_index is None or block_index[0] is not block or block_index[1] != len(block), True]:
+            if rebuild:
+                index = {}
+                for i_line, line in enumerate(block):
+                    match = pattern.match(line)
+                    if match:
+                        index.setdefault(match.group(1), i_line)
+                block_index = self._block_indexes[block_type] = (block, len(block), index)
+
+            i_line = block_index[2].get(id, None)
+            if i_line is None:
+                return None
+
+            match = pattern.match(block[i_line])
+            if match and match.group(1) == id:
+                return i_line, match
+
+        return None  # pragma: no cover # unreachable because a rebuilt index is consistent with its block
+
+    def __reduce__(self):
+        # don't copy or pickle the indexes of the blocks
+        reduced = super(Model, self).__reduce__()
+        state = dict(reduced[2] or {})
+        state.pop('_block_indexes', None)
+        return (reduced[0], reduced[1], state or None) + tuple(reduced[3:])
+
+    def set_deferred_block(self, key, read_block):
+        """ Set a block whose lines are read when the block is first accessed
+
+        Args:
+            key (:obj:`str`): type of the block (e.g., ``parameters``)
+            read_block (:obj:`types.FunctionType`): function which returns the block (:obj:`ModelBlock`)
+        """
+        super().__setitem__(key, _DeferredModelBlock(read_block))
+
+    def _read_deferred_block(self, key):
+        """ Read a deferred block, if the block is deferred
+
+        Args:
+            key (:obj:`str`): type of the block
+
+        Returns:
+            :obj:`ModelBlock`: block
+        """
+        block = super().__getitem__(key)
+        if block.__class__ is _DeferredModelBlock:
+            block = block.read_block()
+            super().__setitem__(key, block)
+        return block
+
+    def _read_deferred_blocks(self):
+        """ Read all of the deferred blocks """
+        for key in list(super().keys()):
+            self._read_deferred_block(key)
+
+    def __getitem__(self, key):
+        return self._read_deferred_block(key)
+
+    def get(self, key, default=None):
+        if key in self:
+            return self._read_deferred_block(key)
+        return default
+
+    def pop(self, key, *args):
+        if key in self:
+            self._read_deferred_block(key)
+        return super().pop(key, *args)
+
+    def popitem(self, last=True):
+        self._read_deferred_blocks()
+        return super().popitem(last=last)
+
+    def setdefault(self, key, default=None):
+        if key in self:
+            return self._read_deferred_block(key)
+        return super().setdefault(key, default)
+
+    def items(self):
+        self._read_deferred_blocks()
+        return super().items()
+
+    def values(self):
+        self._read_deferred_blocks()
+        return super().values()
+
+    def __eq__(self, other):
+        self._read_deferred_blocks()
+        if isinstance(other, Model):
+            other._read_deferred_blocks()
+        return super().__eq__(other)
+
+    def __ne__(self, other):
+        return not self == other
 
     def is_equal(self, other):
-        """ Determine whether two models are semantically equivalent
+        """ Determine whether two models are semantically equivalent: whether they have the same types of blocks, and
+        whether their blocks are semantically equivalent (see :obj:`ModelBlock.is_equal`)
 
         Args:
             other (:obj:`Model`): second model
@@ -26,37 +169,53 @@ class Model(OrderedDict):
         if self.__class__ != other.__class__:
             return False
 
-        self_keys = set()
-        for key, lines in self.items():
-            for line in lines:
-                line = line.partition('#')[0].strip()
-                if line:
-                    self_keys.add(key)
-                    break
-
-        other_keys = set()
-        for key, lines in other.items():
-            for line in lines:
-                line = line.partition('#')[0].strip()
-                if line:
-                    other_keys.add(key)
-                    break
-
-        if set(self.keys()) != set(other.keys()):
-            return False
+        return self.get_fingerprint() == other.get_fingerprint()
 
-        for key in self.keys():
-            if not self[key].is_equal(other[key]):
-                return False
+    def get_fingerprint(self):
+        """ Get a canonical fingerprint of the model: an order-insensitive hash of the types and fingerprints
+        (:obj:`ModelBlock.get_fingerprint`) of its blocks
 
-        return True
+        Semantically equivalent models (see :obj:`is_equal`) have the same fingerprint. Because the fingerprints of
+        blocks are maintained as their lines are edited, the fingerprint is computed in time proportional to the
+        number of blocks, rather than to the number of lines, of the model.
+
+        Returns:
+            :obj:`str`: fingerprint
+        """
+        fingerprint = 0
+        for block_type, block in self.items():
+            if not isinstance(block, ModelBlock):
+                block = ModelBlock(block)
+            fingerprint += _hash_line('{}\n{:032x}'.format(block_type, block._get_fingerprint()))
+        return '{:032x}'.format(fingerprint % _FINGERPRINT_MODULUS)
+
+
+class _DeferredModelBlock(object):
+    """ Block of a model whose lines haven't been read yet
+
+    Attributes:
+        read_block (:obj:`types.FunctionType`): function which returns the block (:obj:`ModelBlock`)
+    """
+
+    __slots__ = ('read_block',)
+
+    def __init__(self, read_block):
+        self.read_block = read_block
 
 
 class ModelBlock(list):
-    """ A "block" or section of a model such as `parameters` or 'molecule types' """
+    """ A "block" or section of a model such as `parameters` or 'molecule types'
+
+    Once the fingerprint of a block has been computed (:obj:`get_fingerprint`), it is updated as lines are set,
+    added, and removed, rather than recomputed from all of the lines of the block.
+    """
+
+    _line_counts = None
+    _fingerprint = 0
 
     def is_equal(self, other):
-        """ Determine whether two model blocks are semantically equivalent
+        """ Determine whether two model blocks are semantically equivalent: whether they have the same set of lines,
+        ignoring the order of the lines, comments, blank lines, and leading and trailing white space
 
         Args:
             other (:obj:`ModelBlock`): second model block
@@ -67,19 +226,152 @@ class ModelBlock(list):
         if self.__class__ != other.__class__:
             return False
 
-        self_lines = set()
-        for line in self:
+        return self._get_fingerprint() == other._get_fingerprint()
+
+    def get_fingerprint(self):
+        """ Get a canonical fingerprint of the block: an order-insensitive hash of the set of its lines, without
+        comments and leading and trailing white space
+
+        Semantically equivalent blocks (see :obj:`is_equal`) have the same fingerprint.
+
+        Returns:
+            :obj:`str`: fingerprint
+        """
+        return '{:032x}'.format(self._get_fingerprint())
+
+    def _get_fingerprint(self):
+        """ Get the fingerprint of the block, starting to maintain the fingerprint if it hasn't been computed
+
+        Returns:
+            :obj:`int`: fingerprint
+        """
+        if self._line_counts is None:
+            # count the lines with a separate block so that concurrent readers don't observe a partial fingerprint
+            block = ModelBlock()
+            block._line_counts = {}
+            block._add_lines(self)
+            self._fingerprint = block._fingerprint
+            self._line_counts = block._line_counts
+        return self._fingerprint
+
+    def _add_lines(self, lines):
+        """ Add lines to the fingerprint of the block
+
+        Args:
+            lines (:obj:`list` of :obj:`str`): lines
+        """
+        line_counts = self._line_counts
+        for line in lines:
             line = line.partition('#')[0].strip()
             if line:
-                self_lines.add(line)
+                count = line_counts.get(line, 0)
+                line_counts[line] = count + 1
+                if not count:
+                    self._fingerprint = (self._fingerprint + _hash_line(line)) % _FINGERPRINT_MODULUS
 
-        other_lines = set()
-        for line in other:
+    def _remove_lines(self, lines):
+        """ Remove lines from the fingerprint of the block
+
+        Args:
+            lines (:obj:`list` of :obj:`str`): lines
+        """
+        line_counts = self._line_counts
+        for line in lines:
             line = line.partition('#')[0].strip()
             if line:
-                other_lines.add(line)
-
-        return self_lines == other_lines
+                count = line_counts.pop(line)
+                if count > 1:
+                    line_counts[line] = count - 1
+                else:
+                    self._fingerprint = (self._fingerprint - _hash_line(line)) % _FINGERPRINT_MODULUS
+
+    def __setitem__(self, index, value):
+        if self._line_counts is None:
+            return super().__setitem__(index, value)
+
+        if isinstance(index, slice):
+            old_lines = super().__getitem__(index)
+            value = list(value)
+            new_lines = value
+        else:
+            old_lines = [super().__getitem__(index)]
+            new_lines = [value]
+        super().__setitem__(index, value)
+        self._remove_lines(old_lines)
+        self._add_lines(new_lines)
+
+    def __delitem__(self, index):
+        if self._line_counts is not None:
+            old_lines = super().__getitem__(index)
+            self._remove_lines(old_lines if isinstance(index, slice) else [old_lines])
+        super().__delitem__(index)
+
+    def __iadd__(self, lines):
+        self.extend(lines)
+        return self
+
+    def __imul__(self, n):
+        super().__imul__(n)
+        if self._line_counts is not None:
+            # recompute the fingerprint when it is next needed, rather than multiplying the counts of the lines
+            self._line_counts = None
+        return self
+
+    def append(self, line):
+        super().append(line)
+        if self._line_counts is not None:
+            self._add_lines([line])
+
+    def extend(self, lines):
+        if self._line_counts is not None:
+            lines = list(lines)
+            self._add_lines(lines)
+        super().extend(lines)
+
+    def insert(self, index, line):
+        super().insert(index, line)
+        if self._line_counts is not None:
+            self._add_lines([line])
+
+    def pop(self, index=-1):
+        line = super().pop(index)
+        if self._line_counts is not None:
+            self._remove_lines([line])
+        return line
+
+    def remove(self, line):
+        super().remove(line)
+        if self._line_counts is not None:
+            self._remove_lines([line])
+
+    def clear(self):
+        super().clear()
+        if self._line_counts is not None:
+            self._line_counts = {}
+            self._fingerprint = 0
+
+    def __reduce_ex__(self, protocol):
+        # don't copy or pickle the fingerprint because copies are reconstructed by appending their lines
+        reduced = super(ModelBlock, self).__reduce_ex__(protocol)
+        state = dict(reduced[2] or {})
+        state.pop('_line_counts', None)
+        state.pop('_fingerprint', None)
+        return (reduced[0], reduced[1], state or None) + tuple(reduced[3:])
+
+
+_FINGERPRINT_MODULUS = 2 ** 128
+
+
+def _hash_line(line):
+    """ Hash a line of a model into an integer which can be combined into an order-insensitive fingerprint
+
+    Args:
+        line (:obj:`str`): line
+
+    Returns:
+        :obj:`int`: 128-bit hash
+    """
+    return int.from_bytes(hashlib.blake2b(line.encode(), digest_size=16).digest(), 'big')
 
 
 class Task(object):
@@ -88,35 +380,42 @@ class Task(object):
     Attributes
         model (:obj:`Model`): model
         actions (:obj:`list` of :obj:`str`): actions such as simulations
+        template (:obj:`biosimulators_bionetgen.io.TaskTemplate`): pre-rendered BNGL text of the model; if :obj:`None`,
+            or the model no longer matches the template, the model is rendered each time the task is formatted
     """
 
-    def __init__(self, model=None, actions=None):
+    def __init__(self, model=None, actions=None, template=None):
         self.model = model
         self.actions = actions or []
+        self.template = template
 
     def is_equal(self, other):
-        """ Determine whether two model blocks are semantically equivalent
+        """ Determine whether two tasks are semantically equivalent: whether their models are semantically equivalent
+        (see :obj:`Model.is_equal`), and whether they have the same set of actions
 
         Args:
-            other (:obj:`ModelBlock`): second model block
+            other (:obj:`Task`): second task
 
         Returns:
-            :obj:`bool`: whether the model blocks are semantically equivalent
+            :obj:`bool`: whether the tasks are semantically equivalent
         """
         if self.__class__ != other.__class__:
             return False
 
-        if self.model is None:
-            if other.model is not None:
-                return False
-        else:
-            if not self.model.is_equal(other.model):
-                return False
+        return self.get_fingerprint() == other.get_fingerprint()
 
-        if set(self.actions) != set(other.actions):
-            return False
+    def get_fingerprint(self):
+        """ Get a canonical fingerprint of the task: a hash of the fingerprint of its model (:obj:`Model.get_fingerprint`)
+        and of its set of actions
 
-        return True
+        Semantically equivalent tasks (see :obj:`is_equal`) have the same fingerprint.
+
+        Returns:
+            :obj:`str`: fingerprint
+        """
+        model_fingerprint = self.model.get_fingerprint() if self.model is not None else ''
+        actions = sorted(set(self.actions))
+        return hashlib.blake2b('\n'.join([model_fingerprint] + actions).encode(), digest_size=16).hexdigest()
 
 
 KISAO_SIMULATION_METHOD_ARGUMENTS_MAP = OrderedDict([
@@ -0,0 +1,263 @@
+""" Summary statistics of ensembles of replicates of stochastic simulations
+
+:Author: Jonathan Karr <karr@mssm.edu>
+:Date: 2021-01-05
+:Copyright: 2020-2021, Center for Reproducible Biomedical Modeling
+:License: MIT
+"""
+
+import numpy
+import pandas
+
+__all__ = ['STOCHASTIC_METHODS', 'DEFAULT_QUANTILES', 'get_ensemble_seeds', 'EnsembleStatistics', 'QuantileEstimator']
+
+STOCHASTIC_METHODS = ['ssa', 'pla', 'nf']
+DEFAULT_QUANTILES = (0.05, 0.25, 0.5, 0.75, 0.95)
+
+
+def get_ensemble_seeds(num_replicates, seed=None):
+    """ Deterministically derive independent seeds for the replicates of an ensemble
+
+    The seed of each replicate only depends on the seed of the ensemble and the index of the replicate. Consequently,
+    the first replicates of larger ensembles with the same seed are identical to the replicates of smaller ensembles.
+
+    Args:
+        num_replicates (:obj:`int`): number of replicates
+        seed (:obj:`int`, optional): seed of the ensemble; if :obj:`None`, the seeds are random
+
+    Returns:
+        :obj:`list` of :obj:`int`: seed of each replicate (between 0 and 2 ** 31 - 1)
+    """
+    return [int(child.generate_state(1)[0] % 2 ** 31)
+            for child in numpy.random.SeedSequence(seed).spawn(num_replicates)]
+
+
+class EnsembleStatistics(object):
+    """ Running summary statistics (mean, variance, quantiles) of the predicted values of the observables of the
+    replicates of an ensemble
+
+    The statistics are updated as each replicate is added, without retaining the replicates. Consequently, the memory
+    used by the statistics is independent of the number of replicates.
+
+    Attributes:
+        quantiles (:obj:`tuple` of :obj:`float`): quantiles to estimate (between 0 and 1)
+        num_replicates (:obj:`int`): number of replicates added to the statistics
+        index (:obj:`pandas.Index`): ids of the observables
+        columns (:obj:`pandas.Index`): columns (time points) of the predicted values
+        mean (:obj:`numpy.ndarray`): running mean
+        sum_squared_deviations (:obj:`numpy.ndarray`): running sum of the squared deviations from the mean
+        quantile_estimator (:obj:`QuantileEstimator`): running estimator of the quantiles
+        resource_usage (:obj:`dict`): total CPU time (``cpu_time``, in seconds) and peak resident set size
+            (``max_rss``, in bytes) of the processes which simulated the replicates, or :obj:`None` if unknown
+    """
+
+    def __init__(self, quantiles=DEFAULT_QUANTILES):
+        self.quantiles = tuple(quantiles)
+        self.num_replicates = 0
+        self.index = None
+        self.columns = None
+        self.mean = None
+        self.sum_squared_deviations = None
+        self.quantile_estimator = QuantileEstimator(self.quantiles)
+        self.resource_usage = None
+
+    def add(self, observable_results):
+        """ Add the predicted values of the observables of a replicate to the statistics
+
+        Args:
+            observable_results (:obj:`pandas.DataFrame`): predicted values of the observables of the replicate
+
+        Raises:
+            :obj:`ValueError`: if the observables or time points of the replicate differ from those of the previous
+                replicates
+        """
+        values = observable_results.to_numpy(dtype=numpy.float64)
+
+        if self.num_replicates == 0:
+            self.index = observable_results.index
+            self.columns = observable_results.columns
+            self.mean = numpy.zeros(values.shape)
+            self.sum_squared_deviations = numpy.zeros(values.shape)
+        elif not self.index.equals(observable_results.index) or values.shape != self.mean.shape:
+            raise ValueError('The observables and time points of each replicate must be the same.')
+
+        # Welford's algorithm
+        self.num_replicates += 1
+        deviations = values - self.mean
+        self.mean += deviations / self.num_replicates
+        self.sum_squared_deviations += deviations * (values - self.mean)
+
+        self.quantile_estimator.add(values)
+
+    def add_resource_usage(self, resource_usage):
+        """ Add the resources used by a process which simulated (or prepared) replicates to :obj:`resource_usage`
+
+        Args:
+            resource_usage (:obj:`dict`): CPU time (``cpu_time``) and peak resident set size (``max_rss``) of the
+                process, or :obj:`None` if unknown
+        """
+        if resource_usage is None:
+            return
+        if self.resource_usage is None:
+            self.resource_usage = dict(resource_usage)
+        else:
+            self.resource_usage['cpu_time'] += resource_usage['cpu_time']
+            self.resource_usage['max_rss'] = max(self.resource_usage['max_rss'], resource_usage['max_rss'])
+
+    def get_mean(self):
+        """ Get the mean of the predicted values of the observables
+
+        Returns:
+            :obj:`pandas.DataFrame`: mean
+        """
+        return self._to_data_frame(self.mean)
+
+    def get_variance(self):
+        """ Get the (sample) variance of the predicted values of the observables
+
+        Returns:
+            :obj:`pandas.DataFrame`: variance; :obj:`numpy.nan` if less than two replicates were added
+        """
+        if self.num_replicates < 2:
+            return self._to_data_frame(numpy.full(self.mean.shape, numpy.nan))
+        return self._to_data_frame(self.sum_squared_deviations / (self.num_replicates - 1))
+
+    def get_std(self):
+        """ Get the (sample) standard deviation of the predicted values of the observables
+
+        Returns:
+            :obj:`pandas.DataFrame`: standard deviation; :obj:`numpy.nan` if less than two replicates were added
+        """
+        return numpy.sqrt(self.get_variance())
+
+    def get_quantile(self, quantile):
+        """ Get the estimate of a quantile of the predicted values of the observables
+
+        Args:
+            quantile (:obj:`float`): quantile (one of :obj:`quantiles`)
+
+        Returns:
+            :obj:`pandas.DataFrame`: estimate of the quantile
+        """
+        return self._to_data_frame(self.quantile_estimator.get(quantile))
+
+    def _to_data_frame(self, values):
+        """ Get a data frame of values of the observables
+
+        Args:
+            values (:obj:`numpy.ndarray`): values
+
+        Returns:
+            :obj:`pandas.DataFrame`: values
+
+        Raises:
+            :obj:`ValueError`: if no replicates have been added
+        """
+        if self.num_replicates == 0:
+            raise ValueError('No replicates have been added to the statistics.')
+        return pandas.DataFrame(values, index=self.index, columns=self.columns)
+
+
+class QuantileEstimator(object):
+    """ Running estimator of quantiles of arrays of values, using the P-square algorithm (Jain & Chlamtac, 1985)
+
+    The quantiles of each element of the arrays are estimated independently, using five markers per quantile and
+    element. Until five arrays have been added, the quantiles are calculated exactly.
+
+    Attributes:
+        quantiles (:obj:`tuple` of :obj:`float`): quantiles to estimate (between 0 and 1)
+        count (:obj:`int`): number of arrays added to the estimator
+        initial_values (:obj:`list` of :obj:`numpy.ndarray`): first (up to) five arrays
+        heights (:obj:`numpy.ndarray`): heights of the markers (marker x quantile x element)
+        positions (:obj:`numpy.ndarray`): positions of the markers (marker x quantile x element)
+        desired_positions (:obj:`numpy.ndarray`): desired positions of the markers (marker x quantile)
+        increments (:obj:`numpy.ndarray`): increments of the desired positions of the markers (marker x quantile)
+    """
+
+    def __init__(self, quantiles):
+        self.quantiles = tuple(quantiles)
+        self.count = 0
+        self.initial_values = []
+        self.heights = None
+        self.positions = None
+
+        p = numpy.array(self.quantiles, dtype=numpy.float64)
+        self.desired_positions = numpy.array([numpy.ones_like(p), 1 + 2 * p, 1 + 4 * p, 3 + 2 * p, 5 * numpy.ones_like(p)])
+        self.increments = numpy.array([numpy.zeros_like(p), p / 2, p, (1 + p) / 2, numpy.ones_like(p)])
+
+    def add(self, values):
+        """ Add an array of values to the estimator
+
+        Args:
+            values (:obj:`numpy.ndarray`): values
+        """
+        self.count += 1
+
+        if self.count <= 5:
+            self.initial_values.append(numpy.array(values, dtype=numpy.float64))
+            if self.count == 5:
+                heights = numpy.sort(numpy.stack(self.initial_values), axis=0)
+                self.heights = numpy.repeat(heights[:, numpy.newaxis], len(self.quantiles), axis=1)
+                self.positions = numpy.broadcast_to(
+                    numpy.arange(1., 6.).reshape((5, 1) + (1,) * values.ndim), self.heights.shape).copy()
+                self.initial_values = []
+            return
+
+        q = self.heights
+        n = self.positions
+        x = numpy.broadcast_to(values, q.shape[1:])
+
+        # update the extreme markers and increment the positions of the markers above the new value
+        numpy.minimum(q[0], x, out=q[0])
+        numpy.maximum(q[4], x, out=q[4])
+        k = (x >= q[1]).astype(numpy.int64) + (x >= q[2]) + (x >= q[3])
+        for i in range(1, 5):
+            n[i] += k < i
+
+        self.desired_positions += self.increments
+        desired_positions = self.desired_positions.reshape(self.desired_positions.shape + (1,) * values.ndim)
+
+        # adjust the heights of the middle markers which are off their desired positions
+        with numpy.errstate(divide='ignore', invalid='ignore'):
+            for i in range(1, 4):
+                d = desired_positions[i] - n[i]
+                s = (
+                    ((d >= 1) & (n[i + 1] - n[i] > 1)).astype(numpy.float64)
+                    - ((d <= -1) & (n[i - 1] - n[i] < -1))
+                )
+
+                parabolic = q[i] + s / (n[i + 1] - n[i - 1]) * (
+                    (n[i] - n[i - 1] + s) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+                    + (n[i + 1] - n[i] - s) * (q[i] - q[i - 1]) / (n[i] - n[i - 1])
+                )
+                linear = numpy.where(
+                    s > 0,
+                    q[i] + (q[i + 1] - q[i]) / (n[i + 1] - n[i]),
+                    q[i] - (q[i - 1] - q[i]) / (n[i - 1] - n[i]),
+                )
+                height = numpy.where((q[i - 1] < parabolic) & (parabolic < q[i + 1]), parabolic, linear)
+
+                q[i] = numpy.where(s != 0, height, q[i])
+                n[i] += s
+
+    def get(self, quantile):
+        """ Get the estimate of a quantile
+
+        Args:
+            quantile (:obj:`float`): quantile (one of :obj:`quantiles`)
+
+        Returns:
+            :obj:`numpy.ndarray`: estimate of the quantile of each element
+
+        Raises:
+            :obj:`ValueError`: if the quantile isn't estimated or no values have been added
+        """
+        if quantile not in self.quantiles:
+            raise ValueError('Quantile {} is not estimated. Quantile must be one of {}.'.format(
+                quantile, ', '.join(str(q) for q in self.quantiles)))
+        if self.count == 0:
+            raise ValueError('No values have been added to the estimator.')
+
+        if self.count < 5:
+            return numpy.quantile(numpy.stack(self.initial_values), quantile, axis=0)
+        return self.heights[2, self.quantiles.index(quantile)].copy()
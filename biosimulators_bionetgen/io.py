@@ -6,18 +6,35 @@
 :License: MIT
 """
 
+from .config import Config
 from .data_model import Model, ModelBlock, Task
 from .warnings import IgnoredBnglFileContentWarning
-import pandas
+import collections
+import functools
+import hashlib
+import io
+import numpy
+import os
 import re
+import threading
+import time
 import warnings
 
-__all__ = ['read_task', 'write_task', 'read_simulation_results']
+__all__ = ['read_task', 'TaskCache', 'get_task_cache', 'TaskTemplate', 'write_task', 'format_task',
+           'read_simulation_results', 'iter_simulation_results']
+
+
+_BLOCK_DELIMITER_PATTERN = re.compile(r'^[^\S\n]*(?:begin|end) ', re.MULTILINE)
+_COMMENT_PATTERN = re.compile(r'#[^\n]*')
+_SPACES_PATTERN = re.compile(' {2,}')
 
 
 def read_task(filename):
     """ Read a BNGL task from a file.
 
+    The file is read in bulk: only the lines which start or end blocks are parsed individually, and the lines of the
+    blocks of the model are only read when the blocks are first accessed (see :obj:`Model.set_deferred_block`).
+
     Args:
        filename (:obj:`str`): path to the task
 
@@ -27,74 +44,105 @@ def read_task(filename):
     Raises:
         :obj:`ValueError`: if the file is invalid
     """
-    with open(filename, 'r') as file:
-        task = Task()
-        model = None
-        current_block = None
-        block_types = []
-
-        for i_line, line in enumerate(file):
-            # ignore comments and leading and trailing white space
-            line = line.partition('#')[0].strip()
-            line = re.sub(' +', ' ', line)
-
-            # ignore blank and comment lines
-            if not line:
-                continue
-
-            # handle starts of blocks
-            if line.startswith('begin '):
-                block_type = line.partition(' ')[2].lower()
-                block_types.append(block_type)
-
-                if block_type == 'model' and model is not None:
-                    msg = ('`{}` contains a second model at line {}.').format(
-                        filename, i_line + 1)
-                    raise ValueError(msg)
-
-                if model is None:
-                    model = task.model = Model()
+    task, task_warnings = _read_task(filename)
+    for msg in task_warnings:
+        warnings.warn(msg, IgnoredBnglFileContentWarning)
+    return task
 
-                if len(block_types) > 1 and block_types[0] != 'model':
-                    msg = ('`{}` is inappropriately nested with `{}` at line {} of `{}`.').format(
-                        block_type, block_types[0], i_line + 1, filename)
-                    raise ValueError(msg)
 
-                if len(block_types) > 2:
-                    msg = ('`{}` is inappropriately nested with `{}` at line {} of `{}`.').format(
-                        block_type, block_types[-2], i_line + 1, filename)
-                    raise ValueError(msg)
+def _read_task(filename):
+    """ Read a BNGL task from a file (see :obj:`read_task`)
 
-                if block_type != 'model':
-                    if block_type in model:
-                        msg = ('`{}` has a second `{}` block at line {}.').format(
-                            filename, block_types[-1], i_line + 1)
-                        raise ValueError(msg)
-                    current_block = model[block_type] = ModelBlock()
-
-            # handle ends of blocks
-            elif line.startswith('end '):
-                end_block_type = line.partition(' ')[2]
-                start_block_type = block_types.pop()
-                if end_block_type != start_block_type:
-                    msg = '`{}` block of `{}` incorrectly ends with `{}` at line {}.'.format(
-                        start_block_type, filename, end_block_type, i_line + 1)
-                    raise ValueError(msg)
-                current_block = None
+    Args:
+       filename (:obj:`str`): path to the task
 
-                if task.actions:
-                    msg = 'Lines in `{}` outside content blocks were ignored\n:  `{}`'.format(
-                        filename, '`\n  `'.join(task.actions))
-                    warnings.warn(msg, IgnoredBnglFileContentWarning)
-                    task.actions = []
+    Returns:
+        :obj:`tuple`:
 
-            # handle the contents of blocks
-            else:
-                if current_block is not None:
-                    current_block.append(line)
+            * :obj:`Task`: task
+            * :obj:`list` of :obj:`str`: messages of the warnings (:obj:`IgnoredBnglFileContentWarning`) about the
+              content of the file which was ignored
 
-                else:
-                    task.actions.append(line)
+    Raises:
+        :obj:`ValueError`: if the file is invalid
+    """
+    with open(filename, 'r') as file:
+        text = file.read()
+
+    task = Task()
+    task_warnings = []
+    model = None
+    current_block_type = None
+    block_types = []
+    content_start = 0
+
+    for match in _BLOCK_DELIMITER_PATTERN.finditer(text):
+        line_start = match.start()
+        line_end = text.find('\n', line_start)
+        if line_end == -1:
+            line_end = len(text)
+
+        # ignore comments and leading and trailing white space
+        line = _SPACES_PATTERN.sub(' ', text[line_start:line_end].partition('#')[0].strip())
+        if not line.startswith(('begin ', 'end ')):
+            continue
+
+        # handle the contents of blocks
+        if current_block_type is not None:
+            model.set_deferred_block(current_block_type, functools.partial(_read_model_block, text, content_start, line_start))
+        else:
+            task.actions.extend(_read_lines(text, content_start, line_start))
+        content_start = line_end + 1
+
+        # handle starts of blocks
+        if line.startswith('begin '):
+            block_type = line.partition(' ')[2].lower()
+            block_types.append(block_type)
+
+            if block_type == 'model' and model is not None:
+                msg = ('`{}` contains a second model at line {}.').format(
+                    filename, _get_line_number(text, line_start))
+                raise ValueError(msg)
+
+            if model is None:
+                model = task.model = Model()
+
+            if len(block_types) > 1 and block_types[0] != 'model':
+                msg = ('`{}` is inappropriately nested with `{}` at line {} of `{}`.').format(
+                    block_type, block_types[0], _get_line_number(text, line_start), filename)
+                raise ValueError(msg)
+
+            if len(block_types) > 2:
+                msg = ('`{}` is inappropriately nested with `{}` at line {} of `{}`.').format(
+                    block_type, block_types[-2], _get_line_number(text, line_start), filename)
+                raise ValueError(msg)
+
+            if block_type != 'model':
+                if block_type in model:
+                    msg = ('`{}` has a second `{}` block at line {}.').format(
+                        filename, block_types[-1], _get_line_number(text, line_start))
+                    raise ValueError(msg)
+                model[block_type] = ModelBlock()
+                current_block_type = block_type
+
+        # handle ends of blocks
+        else:
+            end_block_type = line.partition(' ')[2]
+            start_block_type = block_types.pop()
+            if end_block_type != start_block_type:
+                msg = '`{}` block of `{}` incorrectly ends with `{}` at line {}.'.format(
+                    start_block_type, filename, end_block_type, _get_line_number(text, line_start))
+                raise ValueError(msg)
+            current_block_type = None
+
+            if task.actions:
+                msg = 'Lines in `{}` outside content blocks were ignored\n:  `{}`'.format(
+                    filename, '`\n  `'.join(task.actions))
+                task_warnings.append(msg)
+                task.actions = []
+
+    if current_block_type is None:
+        task.actions.extend(_read_lines(text, content_start, len(text)))
 
     if model is None:
         msg = '`{}` does not contain a model.'.format(filename)
@@ -104,7 +152,287 @@ def read_task(filename):
         msg = 'The `{}` block in `{}` has no termination`.'.format(block_types[-1], filename)
         raise ValueError(msg)
 
-    return task
+    return task, task_warnings
+
+
+def _read_lines(text, start, end):
+    """ Read the non-blank lines of a region of a BNGL file, without their comments and leading and trailing white
+    space, and with runs of spaces collapsed
+
+    Args:
+        text (:obj:`str`): text of the file
+        start (:obj:`int`): offset of the start of the region
+        end (:obj:`int`): offset of the end of the region
+
+    Returns:
+        :obj:`list` of :obj:`str`: lines
+    """
+    region = text[start:end]
+    if '#' in region:
+        region = _COMMENT_PATTERN.sub('', region)
+    region = _SPACES_PATTERN.sub(' ', region)
+    return [line for line in map(str.strip, region.split('\n')) if line]
+
+
+def _read_model_block(text, start, end):
+    """ Read a block of a model from a region of a BNGL file
+
+    Args:
+        text (:obj:`str`): text of the file
+        start (:obj:`int`): offset of the start of the contents of the block
+        end (:obj:`int`): offset of the end of the contents of the block
+
+    Returns:
+        :obj:`ModelBlock`: block
+    """
+    return ModelBlock(_read_lines(text, start, end))
+
+
+def _get_line_number(text, offset):
+    """ Get the number of the line of a BNGL file at an offset
+
+    Args:
+        text (:obj:`str`): text of the file
+        offset (:obj:`int`): offset
+
+    Returns:
+        :obj:`int`: line number (1-based)
+    """
+    return text.count('\n', 0, offset) + 1
+
+
+class TaskCache(object):
+    """ A size-bounded, least-recently-used cache of the tasks read from BNGL files
+
+    Entries are keyed by the absolute path, size, and modification time of each file and, optionally, by the SHA-256
+    hash of its contents. Each read returns a new task whose blocks are copied from the cached task when they are first
+    accessed, so that modifications of the returned tasks (e.g., by :obj:`preprocess_model_attribute_change` and
+    :obj:`add_variables_to_model`) never change the cached task or other returned tasks. The warnings about the content
+    of each file which was ignored are emitted each time the file is read.
+
+    Attributes:
+        max_size (:obj:`int`): maximum number of tasks to cache
+        hash_contents (:obj:`bool`): if :obj:`True`, also key entries by the SHA-256 hash of the contents of each file
+        hits (:obj:`int`): number of reads which were served from the cache
+        misses (:obj:`int`): number of reads which required a file to be parsed
+    """
+
+    def __init__(self, max_size, hash_contents=False):
+        self.max_size = max_size
+        self.hash_contents = hash_contents
+        self.hits = 0
+        self.misses = 0
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_key(self, filename):
+        """ Get the key for a file
+
+        Args:
+            filename (:obj:`str`): path to the file
+
+        Returns:
+            :obj:`tuple`: key
+        """
+        filename = os.path.realpath(filename)
+        stat = os.stat(filename)
+        if self.hash_contents:
+            with open(filename, 'rb') as file:
+                digest = hashlib.sha256(file.read()).hexdigest()
+        else:
+            digest = None
+        return (filename, stat.st_size, stat.st_mtime_ns, digest)
+
+    def read_task(self, filename):
+        """ Read a BNGL task from a file, or from the cache
+
+        Args:
+           filename (:obj:`str`): path to the task
+
+        Returns:
+            :obj:`Task`: task
+
+        Raises:
+            :obj:`ValueError`: if the file is invalid
+        """
+        key = self.get_key(filename)
+
+        with self._lock:
+            entry = self._entries.get(key, None)
+            if entry is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self._entries.move_to_end(key)
+
+        if entry is None:
+            entry = _read_task(filename)
+
+            # only cache tasks whose files didn't change while they were read
+            if self.max_size > 0 and self.get_key(filename) == key:
+                with self._lock:
+                    self._entries[key] = entry
+                    self._entries.move_to_end(key)
+                    while len(self._entries) > self.max_size:
+                        self._entries.popitem(last=False)
+
+        task, task_warnings = entry
+        for msg in task_warnings:
+            warnings.warn(msg, IgnoredBnglFileContentWarning)
+
+        model = Model()
+        for block_type in task.model.keys():
+            model.set_deferred_block(block_type, functools.partial(_copy_model_block, task.model, block_type))
+        return Task(model=model, actions=list(task.actions))
+
+    def get_statistics(self):
+        """ Get the statistics of the cache
+
+        Returns:
+            :obj:`dict`: numbers of reads which were served from the cache (``hits``) and which required files to be
+            parsed (``misses``), and the number (``size``) and maximum number (``max_size``) of cached tasks
+        """
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'size': len(self._entries),
+                'max_size': self.max_size,
+            }
+
+    def clear(self):
+        """ Remove all of the tasks from the cache and reset its statistics """
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+def _copy_model_block(model, block_type):
+    """ Copy a block of a model
+
+    Args:
+        model (:obj:`Model`): model
+        block_type (:obj:`str`): type of the block
+
+    Returns:
+        :obj:`ModelBlock`: copy of the block
+    """
+    return ModelBlock(model[block_type])
+
+
+_task_cache = None
+_task_cache_lock = threading.Lock()
+
+
+def get_task_cache(config=None):
+    """ Get the process-wide cache of the tasks read from BNGL files
+
+    Args:
+        config (:obj:`Config`, optional): BioNetGen configuration
+
+    Returns:
+        :obj:`TaskCache`: cache, sized according to :obj:`Config.task_cache_size` and :obj:`Config.task_cache_hash`
+    """
+    global _task_cache
+    config = config or Config()
+    with _task_cache_lock:
+        if (
+            _task_cache is None
+            or _task_cache.max_size != config.task_cache_size
+            or _task_cache.hash_contents != config.task_cache_hash
+        ):
+            _task_cache = TaskCache(config.task_cache_size, hash_contents=config.task_cache_hash)
+        return _task_cache
+
+
+class TaskTemplate(object):
+    """ Pre-rendered BNGL text of a model, with slots for the lines of its blocks which change between executions (e.g.,
+    the lines which :obj:`add_model_attribute_change_to_task` replaces)
+
+    The template is valid for the model from which it was rendered, and for copies of the model whose blocks with slots
+    are copied and whose other blocks are shared (e.g., the models of the tasks which
+    :obj:`biosimulators_bionetgen.utils.get_task_with_model_attribute_changes` returns), as long as the numbers of the
+    lines of the blocks don't change.
+
+    Attributes:
+        block_types (:obj:`list` of :obj:`str`): types of the blocks of the model, in order
+        blocks (:obj:`list` of :obj:`tuple`): block (:obj:`ModelBlock`) and number of lines (:obj:`int`) of each block
+        slot_block_types (:obj:`set` of :obj:`str`): types of the blocks which have slots
+        slots (:obj:`list` of :obj:`tuple`): type of the block (:obj:`str`) and number of the line (:obj:`int`) of each
+            slot, in order
+        segments (:obj:`list` of :obj:`str`): text before, between, and after the slots
+    """
+
+    def __init__(self, model, slots=None):
+        slot_lines = {}
+        for block_type, i_line in (slots or []):
+            slot_lines.setdefault(block_type, set()).add(i_line)
+
+        self.block_types = []
+        self.blocks = []
+        self.slot_block_types = set(slot_lines.keys())
+        self.slots = []
+        self.segments = []
+
+        lines = ['begin model\n']
+        for block_type, block_lines in model.items():
+            self.block_types.append(block_type)
+            self.blocks.append((block_lines, len(block_lines)))
+
+            lines.append('begin {}\n'.format(block_type))
+            block_slot_lines = slot_lines.get(block_type, ())
+            for i_line, line in enumerate(block_lines):
+                if i_line in block_slot_lines:
+                    self.segments.append(''.join(lines))
+                    self.slots.append((block_type, i_line))
+                    lines = []
+                else:
+                    lines.append('    {}\n'.format(line))
+            lines.append('end {}\n'.format(block_type))
+        lines.append('end model\n')
+        self.segments.append(''.join(lines))
+
+    def is_valid_for(self, model):
+        """ Determine whether the template is valid for a model
+
+        Args:
+            model (:obj:`Model`): model
+
+        Returns:
+            :obj:`bool`: whether the template is valid for the model
+        """
+        if len(model) != len(self.block_types):
+            return False
+
+        for (block_type, block_lines), expected_block_type, (expected_block_lines, num_lines) in zip(
+                model.items(), self.block_types, self.blocks):
+            if (
+                block_type != expected_block_type
+                or len(block_lines) != num_lines
+                or (block_lines is not expected_block_lines and block_type not in self.slot_block_types)
+            ):
+                return False
+
+        return True
+
+    def format_model(self, model):
+        """ Get the BNGL text of a model for which the template is valid, filling the slots with the current lines of the
+        model
+
+        Args:
+            model (:obj:`Model`): model
+
+        Returns:
+            :obj:`str`: BNGL text of the model
+        """
+        parts = [self.segments[0]]
+        for (block_type, i_line), segment in zip(self.slots, self.segments[1:]):
+            parts.append('    ')
+            parts.append(model[block_type][i_line])
+            parts.append('\n')
+            parts.append(segment)
+        return ''.join(parts)
 
 
 def write_task(task, filename):
@@ -115,36 +443,452 @@ def write_task(task, filename):
         filename (:obj:`str`): path to save the model
     """
     with open(filename, 'w') as file:
-        # write model to file
-        if task.model:
-            model = task.model
-            file.write('begin model\n')
-            for block_type, block_lines in model.items():
-                file.write('begin {}\n'.format(block_type))
-                for line in block_lines:
-                    file.write('    {}\n'.format(line))
-                file.write('end {}\n'.format(block_type))
-            file.write('end model\n')
-
-        # write actions to file
-        for action in task.actions:
-            file.write(action)
-            file.write('\n')
-
-
-def read_simulation_results(filename):
+        file.write(format_task(task))
+
+
+def format_task(task):
+    """ Get the BNGL text of a task
+
+    Args:
+        task (:obj:`Task`): task
+
+    Returns:
+        :obj:`str`: BNGL text of the task
+    """
+    lines = []
+
+    # write model
+    template = getattr(task, 'template', None)
+    if task.model and template is not None and template.is_valid_for(task.model):
+        lines.append(template.format_model(task.model))
+
+    elif task.model:
+        model = task.model
+        lines.append('begin model\n')
+        for block_type, block_lines in model.items():
+            lines.append('begin {}\n'.format(block_type))
+            for line in block_lines:
+                lines.append('    {}\n'.format(line))
+            lines.append('end {}\n'.format(block_type))
+        lines.append('end model\n')
+
+    # write actions
+    for action in task.actions:
+        lines.append(action)
+        lines.append('\n')
+
+    return ''.join(lines)
+
+
+def read_simulation_results(filename, observables=None):
     """ Read the predicted time courses of the observables of a simulation
 
     Args:
         filename (:obj:`str`): path to simulation results in BioNetGen's gdat format
+        observables (:obj:`list` of :obj:`str`, optional): ids of the observables (e.g., ``time``) to read; if
+            :obj:`None`, all of the observables are read
 
     Returns:
         :obj:`pandas.DataFrame`: predicted time courses of the observables
     """
-    with open(filename, "r") as file:
+    with open(filename, "rb") as file:
         # Get column names from first line of file
-        line = file.readline()
-        names = re.split(r'\s+', (re.sub('#', '', line)).strip())
+        names = _get_simulation_results_names(file.readline().decode())
 
         # Read results
-        return pandas.read_table(file, sep=r'\s+', header=None, names=names).transpose()
+        return _parse_simulation_results(file.read(), names, observables=observables)
+
+
+def iter_simulation_results(filename, is_running=None, poll_interval=0.1, observables=None):
+    """ Incrementally read the predicted time courses of the observables of a simulation from a file which is still
+    being written (e.g., by a running simulation)
+
+    The file is tailed until it stops growing and :obj:`is_running` returns :obj:`False`. Each block of rows which
+    has been completely written is yielded as it appears. Concatenating the blocks (``pandas.concat(blocks, axis=1)``)
+    produces the same data frame as :obj:`read_simulation_results`.
+
+    Args:
+        filename (:obj:`str`): path to simulation results in BioNetGen's gdat format
+        is_running (:obj:`types.FunctionType`, optional): function which returns whether the file could still grow;
+            if :obj:`None`, the file is read once
+        poll_interval (:obj:`float`, optional): time (in seconds) to wait for the file to grow
+        observables (:obj:`list` of :obj:`str`, optional): ids of the observables (e.g., ``time``) to read; if
+            :obj:`None`, all of the observables are read
+
+    Yields:
+        :obj:`pandas.DataFrame`: predicted time courses of the observables for a block of time points
+
+    Raises:
+        :obj:`FileNotFoundError`: if the file is not created
+    """
+    file = None
+    names = None
+    buffer = ''
+    num_time_points = 0
+
+    try:
+        while True:
+            # check whether the file could still grow before reading it so that the last rows are never missed
+            running = is_running() if is_running else False
+
+            if file is None and os.path.isfile(filename):
+                file = open(filename, 'r')
+
+            data = file.read() if file else ''
+            if data:
+                buffer += data
+                lines = buffer.split('\n')
+                buffer = lines.pop()
+
+                if names is None and lines:
+                    names = _get_simulation_results_names(lines.pop(0))
+
+                block = _read_simulation_results_block(lines, names, num_time_points, observables=observables)
+                if block is not None:
+                    num_time_points += block.shape[1]
+                    yield block
+
+            elif not running:
+                break
+
+            else:
+                time.sleep(poll_interval)
+
+        if file is None:
+            raise FileNotFoundError('Simulation results file `{}` was not created'.format(filename))
+
+        # read the last line, if it wasn't terminated with a new line
+        if names is None:
+            if buffer.strip():
+                names = _get_simulation_results_names(buffer)
+        else:
+            block = _read_simulation_results_block([buffer], names, num_time_points, observables=observables)
+            if block is not None:
+                yield block
+
+    finally:
+        if file is not None:
+            file.close()
+
+
+def _get_simulation_results_names(line):
+    """ Get the names of the columns of simulation results from their header
+
+    Args:
+        line (:obj:`str`): header
+
+    Returns:
+        :obj:`list` of :obj:`str`: names of the columns
+    """
+    return re.split(r'\s+', (re.sub('#', '', line)).strip())
+
+
+def _read_simulation_results_block(lines, names, first_time_point, observables=None):
+    """ Read a block of rows of simulation results
+
+    Args:
+        lines (:obj:`list` of :obj:`str`): rows
+        names (:obj:`list` of :obj:`str`): names of the columns
+        first_time_point (:obj:`int`): index of the first row of the block
+        observables (:obj:`list` of :obj:`str`, optional): ids of the observables to read; if :obj:`None`, all of the
+            observables are read
+
+    Returns:
+        :obj:`pandas.DataFrame`: predicted time courses of the observables for the block, or :obj:`None` if the block
+        has no rows
+    """
+    import pandas
+
+    lines = [line for line in lines if line.strip()]
+    if not lines:
+        return None
+
+    block = _parse_simulation_results('\n'.join(lines).encode(), names, observables=observables)
+    block.columns = pandas.RangeIndex(first_time_point, first_time_point + block.shape[1])
+    return block
+
+
+def _parse_simulation_results(data, names, observables=None):
+    """ Parse the rows of simulation results in BioNetGen's gdat format
+
+    BioNetGen's simulators write each value with a fixed format (e.g., ``run_network`` uses ``%19.12e``). When all of
+    the rows have the same layout, the rows are parsed as a two-dimensional array of characters, and only the columns of
+    the requested observables are converted to numbers. Otherwise, the rows are parsed as whitespace-delimited
+    numbers.
+
+    Args:
+        data (:obj:`bytes`): rows
+        names (:obj:`list` of :obj:`str`): names of the columns
+        observables (:obj:`list` of :obj:`str`, optional): ids of the observables to read; if :obj:`None`, all of the
+            observables are read
+
+    Returns:
+        :obj:`pandas.DataFrame`: predicted time courses of the observables
+    """
+    # pandas is imported when results are read so that BNGL files can be read and written without it
+    import pandas
+
+    if observables is None:
+        i_columns = list(range(len(names)))
+    else:
+        observables = set(observables)
+        i_columns = [i_column for i_column, name in enumerate(names) if name in observables]
+
+    values = _parse_fixed_width_simulation_results(data, len(names), i_columns)
+    if values is None:
+        values = _parse_delimited_simulation_results(data, len(names), i_columns)
+
+    if values is None:
+        results = pandas.read_table(io.BytesIO(data), sep=r'\s+', header=None, names=names).transpose()
+        if observables is not None:
+            results = results.loc[[names[i_column] for i_column in i_columns], :]
+        return results
+
+    # wrap the array of values rather than copying it
+    return pandas.DataFrame(values, index=[names[i_column] for i_column in i_columns], copy=False)
+
+
+def _is_whitespace(chars):
+    """ Determine which characters are whitespace (spaces, tabs, and carriage returns)
+
+    Args:
+        chars (:obj:`numpy.ndarray`): characters
+
+    Returns:
+        :obj:`numpy.ndarray`: whether each character is whitespace
+    """
+    return (chars == ord(' ')) | (chars == ord('\t')) | (chars == ord('\r'))
+
+
+FIXED_WIDTH_BLOCK_SIZE = 2 ** 16
+
+
+def _parse_fixed_width_simulation_results(data, num_columns, i_columns):
+    """ Parse the rows of simulation results whose rows all have the same layout
+
+    The rows are checked and converted in blocks so that the passes over each block stay in the cache.
+
+    Args:
+        data (:obj:`bytes`): rows
+        num_columns (:obj:`int`): number of columns
+        i_columns (:obj:`list` of :obj:`int`): indices of the columns to parse
+
+    Returns:
+        :obj:`numpy.ndarray`: values of the columns (one row per column), or :obj:`None` if the rows don't have the
+        same layout
+    """
+    # ignore the trailing line break without copying the rows
+    size = len(data)
+    while size and data[size - 1] in b'\r\n':
+        size -= 1
+    if size == 0:
+        return numpy.zeros((len(i_columns), 0))
+    chars = numpy.frombuffer(data, dtype=numpy.uint8, count=size)
+
+    # check that all of the rows have the same length
+    row_length = data.find(b'\n', 0, size) + 1 or size + 1
+    num_rows = (size + 1) // row_length
+    if num_rows * row_length != size + 1:
+        return None
+    if not numpy.all(chars[row_length - 1::row_length] == ord('\n')):
+        return None
+    rows = numpy.lib.stride_tricks.as_strided(chars, shape=(num_rows, row_length - 1), strides=(row_length, 1))
+
+    # determine where the values of the columns end from the first row
+    is_whitespace = _is_whitespace(rows[0])
+    column_ends = numpy.flatnonzero(~is_whitespace & numpy.append(is_whitespace[1:], True)) + 1
+    if column_ends.size != num_columns:
+        return None
+    column_starts = numpy.concatenate(([0], column_ends[:-1]))
+
+    values = numpy.empty((len(i_columns), num_rows))
+    block_num_rows = max(1, FIXED_WIDTH_BLOCK_SIZE // max(1, len(i_columns)))
+    for block_start in range(0, num_rows, block_num_rows):
+        block_rows = rows[block_start:block_start + block_num_rows]
+
+        # check that the rows don't contain other line breaks and that the values of the columns end at the same
+        # positions as in the first row
+        if (
+            numpy.any(block_rows == ord('\n'))
+            or not numpy.all(_is_whitespace(block_rows[:, column_starts[1:]]))
+            or not numpy.all(_is_whitespace(block_rows[:, column_ends[-1]:]))
+            or numpy.any(_is_whitespace(block_rows[:, column_ends - 1]))
+        ):
+            return None
+
+        # convert the values of the requested columns
+        if i_columns:
+            block_values = _parse_fixed_width_block(block_rows, column_starts[i_columns], column_ends[i_columns])
+            if block_values is None:
+                return None
+            values[:, block_start:block_start + block_rows.shape[0]] = block_values
+
+    return values
+
+
+def _parse_fixed_width_block(rows, column_starts, column_ends):
+    """ Convert the values of several columns of a block of rows to floats
+
+    The values of all of the columns are converted together when the columns have the same layout (e.g., BioNetGen's
+    ``%19.12e``), which avoids converting small files column by column. Otherwise, the columns are converted one by
+    one.
+
+    Args:
+        rows (:obj:`numpy.ndarray`): characters of the rows (one row per row of the results)
+        column_starts (:obj:`numpy.ndarray`): positions where the columns start
+        column_ends (:obj:`numpy.ndarray`): positions where the columns end
+
+    Returns:
+        :obj:`numpy.ndarray`: values of the columns (one row per column), or :obj:`None` if a value isn't a number
+    """
+    # align the columns on the narrowest column, provided that the other columns are only padded with whitespace
+    width = numpy.min(column_ends - column_starts)
+    padding = numpy.concatenate([numpy.arange(start, end - width) for start, end in zip(column_starts, column_ends)])
+    if numpy.all(_is_whitespace(rows[:, padding])):
+        # gather the characters by position (one column per value) so that each position is contiguous
+        positions = numpy.arange(width)[:, numpy.newaxis] + (column_ends - width)
+        chars = rows.transpose()[positions].reshape(width, -1)
+        values = _parse_scientific_notation(chars)
+        if values is not None:
+            return values.reshape(len(column_starts), rows.shape[0])
+
+    values = numpy.empty((len(column_starts), rows.shape[0]))
+    for i_value, (start, end) in enumerate(zip(column_starts, column_ends)):
+        column_values = _parse_scientific_notation_column(rows[:, start:end])
+        if column_values is None:
+            try:
+                column_values = _convert_column_to_float(rows[:, start:end])
+            except ValueError:
+                return None
+        values[i_value, :] = column_values
+    return values
+
+
+SCIENTIFIC_NOTATION_PATTERN = re.compile(r'^-?\d\.(\d+)[eE][+-](\d+)$')
+POWERS_OF_TEN = 10. ** numpy.arange(23)
+
+
+def _parse_scientific_notation_column(chars):
+    """ Convert a column of numbers which are right-aligned in scientific notation with the same numbers of digits
+    (e.g., ``%19.12e``) to floats
+
+    Args:
+        chars (:obj:`numpy.ndarray`): characters of the numbers (one row per number)
+
+    Returns:
+        :obj:`numpy.ndarray`: numbers, or :obj:`None` if the numbers don't have the same layout
+    """
+    # transpose the characters so that each position is contiguous
+    return _parse_scientific_notation(numpy.ascontiguousarray(chars).transpose().copy())
+
+
+def _parse_scientific_notation(chars):
+    """ Convert numbers which are right-aligned in scientific notation with the same numbers of digits
+    (e.g., ``%19.12e``) to floats with vectorized arithmetic on their digits
+
+    Each number is parsed into an integer mantissa and a power of ten. Because both are exactly representable as
+    floats, their product (or quotient) is correctly rounded, as with :obj:`float`.
+
+    Args:
+        chars (:obj:`numpy.ndarray`): characters of the numbers (one row per position, one column per number)
+
+    Returns:
+        :obj:`numpy.ndarray`: numbers, or :obj:`None` if the numbers don't have the same layout
+    """
+    width = chars.shape[0]
+    match = SCIENTIFIC_NOTATION_PATTERN.match(chars[:, 0].tobytes().decode(errors='replace').strip())
+    if not match:
+        return None
+    num_frac_digits = len(match.group(1))
+    num_exp_digits = len(match.group(2))
+    if num_frac_digits > 14 or num_exp_digits > 3:
+        return None
+
+    exp_sign_pos = width - num_exp_digits - 1
+    e_pos = exp_sign_pos - 1
+    point_pos = e_pos - num_frac_digits - 1
+    digit_pos = list(range(point_pos - 1, point_pos)) + list(range(point_pos + 1, e_pos))
+    sign_pos = point_pos - 2
+
+    # check that all of the numbers have the same layout
+    valid = (
+        numpy.all(chars[digit_pos + list(range(exp_sign_pos + 1, width))] - ord('0') <= 9)
+        and numpy.all(chars[point_pos] == ord('.'))
+        and numpy.all((chars[e_pos] == ord('e')) | (chars[e_pos] == ord('E')))
+        and numpy.all((chars[exp_sign_pos] == ord('+')) | (chars[exp_sign_pos] == ord('-')))
+        and (sign_pos < 0 or numpy.all(_is_whitespace(chars[sign_pos]) | (chars[sign_pos] == ord('-'))))
+        and (sign_pos < 1 or numpy.all(_is_whitespace(chars[:sign_pos])))
+    )
+    if not valid:
+        return None
+
+    # calculate the mantissas and exponents of the numbers
+    mantissas = numpy.zeros(chars.shape[1], dtype=numpy.int64)
+    for pos in digit_pos:
+        mantissas *= 10
+        mantissas += chars[pos]
+        mantissas -= ord('0')
+
+    exponents = numpy.zeros(chars.shape[1], dtype=numpy.int64)
+    for pos in range(exp_sign_pos + 1, width):
+        exponents *= 10
+        exponents += chars[pos]
+        exponents -= ord('0')
+    exponents[chars[exp_sign_pos] == ord('-')] *= -1
+    exponents -= num_frac_digits
+
+    # combine the mantissas and exponents
+    values = numpy.empty(chars.shape[1])
+    positive = exponents >= 0
+    numpy.multiply(mantissas, POWERS_OF_TEN[numpy.clip(exponents, 0, 22)], out=values, where=positive)
+    numpy.divide(mantissas, POWERS_OF_TEN[numpy.clip(-exponents, 0, 22)], out=values, where=~positive)
+    if sign_pos >= 0:
+        values[chars[sign_pos] == ord('-')] *= -1
+
+    # convert numbers whose exponents are too large for exact arithmetic individually
+    inexact = numpy.flatnonzero(numpy.abs(exponents) > 22)
+    if inexact.size:
+        values[inexact] = _convert_column_to_float(numpy.ascontiguousarray(chars[:, inexact].transpose()))
+
+    return values
+
+
+def _convert_column_to_float(chars):
+    """ Convert a column of numbers to floats
+
+    Args:
+        chars (:obj:`numpy.ndarray`): characters of the numbers (one row per number)
+
+    Returns:
+        :obj:`numpy.ndarray`: numbers
+
+    Raises:
+        :obj:`ValueError`: if a value isn't a number
+    """
+    return numpy.ascontiguousarray(chars).view('S{}'.format(chars.shape[1])).ravel().astype(numpy.float64)
+
+
+def _parse_delimited_simulation_results(data, num_columns, i_columns):
+    """ Parse the rows of simulation results as whitespace-delimited numbers
+
+    Args:
+        data (:obj:`bytes`): rows
+        num_columns (:obj:`int`): number of columns
+        i_columns (:obj:`list` of :obj:`int`): indices of the columns to parse
+
+    Returns:
+        :obj:`numpy.ndarray`: values of the columns (one row per column), or :obj:`None` if the rows contain values
+        which aren't numbers or rows with different numbers of values
+    """
+    with warnings.catch_warnings():
+        warnings.simplefilter('error', DeprecationWarning)
+        try:
+            values = numpy.fromstring(data, sep=' ')
+        except (ValueError, DeprecationWarning):
+            return None
+
+    num_lines = len([line for line in data.splitlines() if line.strip()])
+    if values.size != num_lines * num_columns:
+        return None
+
+    return numpy.ascontiguousarray(values.reshape(num_lines, num_columns)[:, i_columns].transpose())
@@ -0,0 +1,216 @@
+""" Precomputed substitutions of the KiSAO algorithms which BioNetGen implements for other algorithms
+
+Resolving the algorithm which should be executed for a requested algorithm with the KiSAO ontology requires loading
+and walking the ontology each time. Because the algorithms which BioNetGen implements are fixed, the resolution of each
+requested algorithm at each algorithm substitution policy is precomputed into a table
+(``substitution_table.json``), and the ontology is only loaded for algorithms which aren't in the table.
+
+The table should be regenerated whenever the algorithms which BioNetGen implements
+(:obj:`KISAO_SIMULATION_METHOD_ARGUMENTS_MAP`) or the version of KiSAO change::
+
+    python -m biosimulators_bionetgen.substitution
+
+The table is ignored if it was generated for other algorithms or another version of KiSAO.
+
+:Author: Jonathan Karr <karr@mssm.edu>
+:Date: 2021-01-05
+:Copyright: 2020-2021, Center for Reproducible Biomedical Modeling
+:License: MIT
+"""
+
+from .data_model import KISAO_SIMULATION_METHOD_ARGUMENTS_MAP
+from kisao.data_model import AlgorithmSubstitutionPolicy, ALGORITHM_SUBSTITUTION_POLICY_LEVELS
+from kisao.exceptions import AlgorithmCannotBeSubstitutedException
+from kisao.warnings import AlgorithmSubstitutedWarning
+import json
+import kisao
+import os
+import threading
+import warnings
+
+__all__ = [
+    'SUBSTITUTION_TABLE_FILENAME',
+    'get_preferred_substitute_algorithm_by_ids',
+    'generate_substitution_table',
+    'write_substitution_table',
+]
+
+SUBSTITUTION_TABLE_FILENAME = os.path.join(os.path.dirname(__file__), 'substitution_table.json')
+
+_substitution_table = None
+_substitution_table_lock = threading.Lock()
+
+
+def get_preferred_substitute_algorithm_by_ids(algorithm, substitution_policy=AlgorithmSubstitutionPolicy.SIMILAR_VARIABLES):
+    """ Get the algorithm which BioNetGen should execute for a requested algorithm, with the same results and exceptions
+    as :obj:`kisao.utils.get_preferred_substitute_algorithm_by_ids`
+
+    So that the results can be memoized, the warning about the substitution of an algorithm which is resolved with the
+    table is returned rather than emitted, so that it can be emitted (e.g., with :obj:`biosimulators_utils.warnings.warn`)
+    each time the result is used. Algorithms which aren't in the table are resolved with the ontology, which emits the
+    warning itself.
+
+    Args:
+        algorithm (:obj:`str`): KiSAO id of the requested algorithm (e.g., ``KISAO_0000088``)
+        substitution_policy (:obj:`AlgorithmSubstitutionPolicy`, optional): algorithm substitution policy
+
+    Returns:
+        :obj:`tuple`:
+
+            * :obj:`str`: KiSAO id of the algorithm to execute (e.g., ``KISAO_0000019``)
+            * :obj:`str`: message of the warning (:obj:`AlgorithmSubstitutedWarning`) which should be emitted about the
+              substitution, or :obj:`None`
+            * :obj:`bool`: whether the algorithm was resolved without the ontology (i.e., the algorithm is implemented
+              by BioNetGen, or is in the table)
+
+    Raises:
+        :obj:`AlgorithmCannotBeSubstitutedException`: if no algorithm can be substituted for the requested algorithm
+    """
+    alt_algorithms = list(KISAO_SIMULATION_METHOD_ARGUMENTS_MAP.keys())
+
+    if algorithm in alt_algorithms:
+        return algorithm, None, True
+
+    if (
+        ALGORITHM_SUBSTITUTION_POLICY_LEVELS[substitution_policy]
+        <= ALGORITHM_SUBSTITUTION_POLICY_LEVELS[AlgorithmSubstitutionPolicy.SAME_METHOD]
+    ):
+        raise AlgorithmCannotBeSubstitutedException("Algorithms cannot be substituted at policy '{}'.".format(substitution_policy.name))
+
+    table = get_substitution_table()
+    substitutes = table['substitutes'].get(algorithm, None) if table else None
+    substitute = substitutes[ALGORITHM_SUBSTITUTION_POLICY_LEVELS[substitution_policy]] if substitutes else None
+
+    # resolve algorithms which aren't in the table with the ontology
+    if substitute is None:
+        from kisao.utils import get_preferred_substitute_algorithm_by_ids as get_preferred_substitute_algorithm_by_ids_with_ontology
+        return get_preferred_substitute_algorithm_by_ids_with_ontology(algorithm, alt_algorithms,
+                                                                       substitution_policy=substitution_policy), None, False
+
+    names = table['names']
+    if not substitute:
+        raise AlgorithmCannotBeSubstitutedException(
+            (
+                "No algorithm can be substituted for '{}' ({}) at substitution policy '{}'. "
+                "Algorithms can only be substituted for the following algorithms:\n  {}"
+            ).format(
+                names[algorithm], algorithm, substitution_policy.name,
+                '\n  '.join(sorted('{}: {}'.format(alt_algorithm, names[alt_algorithm]) for alt_algorithm in alt_algorithms))
+            ))
+
+    msg = "'{}' ({}) will be substituted for '{}' ({}) at substitution policy '{}'.".format(
+        names[substitute], substitute, names[algorithm], algorithm, substitution_policy.name)
+    return substitute, msg, True
+
+
+def get_substitution_table():
+    """ Get the table of substitutions, reading it on first use
+
+    Returns:
+        :obj:`dict`: table (see :obj:`generate_substitution_table`), or :obj:`None` if the table doesn't exist or was
+        generated for other algorithms or another version of KiSAO
+    """
+    global _substitution_table
+    with _substitution_table_lock:
+        if _substitution_table is None:
+            _substitution_table = read_substitution_table(SUBSTITUTION_TABLE_FILENAME) or {}
+        return _substitution_table or None
+
+
+def read_substitution_table(filename):
+    """ Read a table of substitutions
+
+    Args:
+        filename (:obj:`str`): path to the table
+
+    Returns:
+        :obj:`dict`: table (see :obj:`generate_substitution_table`), or :obj:`None` if the table doesn't exist or was
+        generated for other algorithms or another version of KiSAO
+    """
+    try:
+        with open(filename, 'r') as file:
+            table = json.load(file)
+    except (OSError, ValueError):
+        return None
+
+    if (
+        table.get('kisao_version', None) != kisao.__version__
+        or table.get('algorithms', None) != list(KISAO_SIMULATION_METHOD_ARGUMENTS_MAP.keys())
+        or table.get('policies', None) != [policy.name for policy in ALGORITHM_SUBSTITUTION_POLICY_LEVELS.keys()]
+    ):
+        return None
+
+    return table
+
+
+def generate_substitution_table():
+    """ Generate the table of the substitutions of the algorithms which BioNetGen implements for each algorithm of the
+    KiSAO ontology, at each algorithm substitution policy
+
+    Returns:
+        :obj:`dict`: table, with the following keys
+
+            * ``kisao_version``: version of KiSAO used to generate the table
+            * ``algorithms``: KiSAO ids of the algorithms which BioNetGen implements
+            * ``policies``: names of the algorithm substitution policies, in the order of their levels
+            * ``names``: dictionary that maps the KiSAO id of each algorithm to its name
+            * ``substitutes``: dictionary that maps the KiSAO id of each algorithm to the KiSAO id of the algorithm which
+              should be executed at each policy (in the order of ``policies``); ``""`` if no algorithm can be substituted
+              at the policy, or :obj:`None` if the substitution should be resolved with the ontology
+    """
+    from kisao import Kisao
+    from kisao.utils import get_preferred_substitute_algorithm
+
+    ontology = Kisao()
+    alt_algorithms = list(KISAO_SIMULATION_METHOD_ARGUMENTS_MAP.keys())
+    alt_algorithm_terms = [ontology.get_term(alt_algorithm) for alt_algorithm in alt_algorithms]
+
+    names = {}
+    substitutes = {}
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', AlgorithmSubstitutedWarning)
+        for term in ontology.get_term('KISAO_0000000').subclasses(with_self=True):
+            algorithm = ontology.get_term_id(term)
+            names[algorithm] = term.name
+            substitutes[algorithm] = []
+            for policy in ALGORITHM_SUBSTITUTION_POLICY_LEVELS.keys():
+                try:
+                    substitute = ontology.get_term_id(get_preferred_substitute_algorithm(
+                        term, alt_algorithm_terms, substitution_policy=policy))
+                except AlgorithmCannotBeSubstitutedException:
+                    substitute = ''
+                except Exception:
+                    substitute = None
+                substitutes[algorithm].append(substitute)
+
+    return {
+        'kisao_version': kisao.__version__,
+        'algorithms': alt_algorithms,
+        'policies': [policy.name for policy in ALGORITHM_SUBSTITUTION_POLICY_LEVELS.keys()],
+        'names': dict(sorted(names.items())),
+        'substitutes': dict(sorted(substitutes.items())),
+    }
+
+
+def write_substitution_table(table, filename=SUBSTITUTION_TABLE_FILENAME):
+    """ Save a table of substitutions
+
+    Args:
+        table (:obj:`dict`): table (see :obj:`generate_substitution_table`)
+        filename (:obj:`str`, optional): path to save the table
+    """
+    with open(filename, 'w') as file:
+        file.write('{\n')
+        file.write('  "kisao_version": {},\n'.format(json.dumps(table['kisao_version'])))
+        file.write('  "algorithms": {},\n'.format(json.dumps(table['algorithms'])))
+        file.write('  "policies": {},\n'.format(json.dumps(table['policies'])))
+        for key in ['names', 'substitutes']:
+            file.write('  "{}": {{\n'.format(key))
+            file.write(',\n'.join('    {}: {}'.format(json.dumps(algorithm), json.dumps(value))
+                                  for algorithm, value in table[key].items()))
+            file.write('\n  }}{}\n'.format(',' if key == 'names' else ''))
+        file.write('}\n')
+
+
+if __name__ == '__main__':
+    write_substitution_table(generate_substitution_table())
@@ -0,0 +1,132 @@
+""" Timers for the phases of the execution of tasks
+
+:Author: Jonathan Karr <karr@mssm.edu>
+:Date: 2021-01-05
+:Copyright: 2020-2021, Center for Reproducible Biomedical Modeling
+:License: MIT
+"""
+
+from .config import Config
+import contextlib
+import re
+import time
+
+__all__ = ['PhaseTimer', 'DISABLED_PHASE_TIMER', 'get_phase_timer', 'add_bionetgen_log_to_phase_timer',
+           'aggregate_phase_timings']
+
+
+class PhaseTimer(object):
+    """ Timer which records the total duration of each phase (e.g., ``read_task``, ``bionetgen``) of the execution of
+    a task
+
+    Attributes:
+        enabled (:obj:`bool`): whether the timer records durations
+        durations (:obj:`dict`): dictionary that maps the name of each phase to its total duration (in nanoseconds)
+    """
+
+    enabled = True
+
+    def __init__(self):
+        self.durations = {}
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        """ Context manager which records the duration of a phase
+
+        Args:
+            name (:obj:`str`): name of the phase
+        """
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter_ns() - start)
+
+    def add(self, name, duration):
+        """ Add a duration to the total duration of a phase
+
+        Args:
+            name (:obj:`str`): name of the phase
+            duration (:obj:`int`): duration (in nanoseconds)
+        """
+        self.durations[name] = self.durations.get(name, 0) + duration
+
+    def get_timings(self):
+        """ Get the total duration of each phase
+
+        Returns:
+            :obj:`dict`: dictionary that maps the name of each phase to its total duration (in seconds)
+        """
+        return {name: duration * 1e-9 for name, duration in self.durations.items()}
+
+
+class _DisabledPhaseTimer(PhaseTimer):
+    """ Timer which doesn't record durations """
+
+    enabled = False
+    _null_context = contextlib.nullcontext()
+
+    def phase(self, name):
+        return self._null_context
+
+    def add(self, name, duration):
+        pass
+
+
+DISABLED_PHASE_TIMER = _DisabledPhaseTimer()
+
+
+def get_phase_timer(config=None):
+    """ Get a timer for the phases of the execution of a task
+
+    Args:
+        config (:obj:`Config`, optional): BioNetGen configuration
+
+    Returns:
+        :obj:`PhaseTimer`: new timer if :obj:`Config.phase_timing` is :obj:`True`, otherwise
+        :obj:`DISABLED_PHASE_TIMER`
+    """
+    config = config or Config()
+    if config.phase_timing:
+        return PhaseTimer()
+    return DISABLED_PHASE_TIMER
+
+
+BIONETGEN_CPU_TIME_PATTERN = re.compile(r'^CPU TIME: (\w+) ([0-9.eE+\-]+) s\.', re.MULTILINE)
+BIONETGEN_PHASES = {
+    'generate_network': 'bionetgen_generate_network',
+    'simulate': 'bionetgen_simulate',
+    'parameter_scan': 'bionetgen_simulate',
+}
+
+
+def add_bionetgen_log_to_phase_timer(timer, log):
+    """ Add the CPU times that BioNetGen reports for its actions (``CPU TIME: <action> <seconds> s.``) to a timer
+
+    The times of network generation actions are added to the ``bionetgen_generate_network`` phase, and the times of
+    simulation actions (e.g., ``simulate``, ``simulate_ode``) are added to the ``bionetgen_simulate`` phase.
+
+    Args:
+        timer (:obj:`PhaseTimer`): timer
+        log (:obj:`str`): standard output of BioNetGen
+    """
+    for action, seconds in BIONETGEN_CPU_TIME_PATTERN.findall(log):
+        phase = BIONETGEN_PHASES.get(action, None) or BIONETGEN_PHASES.get(action.partition('_')[0], None)
+        if phase:
+            timer.add(phase, int(float(seconds) * 1e9))
+
+
+def aggregate_phase_timings(task_logs):
+    """ Sum the durations of the phases of the executions of tasks (``phase_timings`` of their simulator details)
+
+    Args:
+        task_logs (:obj:`list` of :obj:`TaskLog`): logs of the tasks
+
+    Returns:
+        :obj:`dict`: dictionary that maps the name of each phase to its total duration (in seconds)
+    """
+    timings = {}
+    for task_log in task_logs:
+        for name, duration in ((task_log and task_log.simulator_details or {}).get('phase_timings', None) or {}).items():
+            timings[name] = timings.get(name, 0.) + duration
+    return timings
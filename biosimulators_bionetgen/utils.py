@@ -6,9 +6,14 @@
 :License: MIT
 """
 
+from .cache import NetworkCache, ModelXmlCache, ResultCache
 from .config import Config as SimulatorConfig
 from .data_model import Model, ModelBlock, Task, KISAO_SIMULATION_METHOD_ARGUMENTS_MAP  # noqa: F401
-from .io import write_task, read_simulation_results
+from .ensemble import STOCHASTIC_METHODS, DEFAULT_QUANTILES, EnsembleStatistics, get_ensemble_seeds
+from .io import write_task, read_simulation_results, iter_simulation_results
+from .substitution import get_preferred_substitute_algorithm_by_ids
+from .timing import DISABLED_PHASE_TIMER, add_bionetgen_log_to_phase_timer
+from .workspace import task_workspace, get_results_memory_budget
 from biosimulators_utils.config import Config  # noqa: F401
 from biosimulators_utils.report.data_model import VariableResults
 from biosimulators_utils.sedml.data_model import (ModelAttributeChange, Variable,  # noqa: F401
@@ -17,25 +22,117 @@ from biosimulators_utils.simulator.utils import get_algorithm_substitution_polic
 from biosimulators_utils.warnings import warn, BioSimulatorsWarning
 from collections import OrderedDict
 from kisao.data_model import AlgorithmSubstitutionPolicy, ALGORITHM_SUBSTITUTION_POLICY_LEVELS
-from kisao.utils import get_preferred_substitute_algorithm_by_ids
+from kisao.warnings import AlgorithmSubstitutedWarning
+import asyncio
+import collections
+import concurrent.futures
+import contextlib
+import functools
+import json
+import numpy
 import os
-import pandas  # noqa: F401
+import pandas
+import random
 import re
 import shutil
+import signal
 import subprocess
-import tempfile
+import sys
+import threading
+import time
 
 __all__ = [
+    'preprocess_model_attribute_changes',
     'preprocess_model_attribute_change',
     'add_model_attribute_change_to_task',
+    'get_task_with_model_attribute_changes',
     'add_variables_to_model',
     'create_actions_for_simulation',
     'exec_bionetgen_task',
+    'exec_bionetgen_task_batch',
+    'exec_bionetgen_parameter_scan',
+    'get_parameter_scan_actions',
+    'exec_bionetgen_ensemble',
+    'get_ensemble_replicate_command',
+    'iter_bionetgen_task_results',
+    'run_bionetgen_task',
+    'async_exec_bionetgen_task',
+    'async_run_bionetgen_task',
+    'write_bionetgen_task',
+    'get_run_network_path',
+    'get_run_network_task',
+    'get_nfsim_path',
+    'get_nfsim_task',
+    'kill_process_group',
+    'run_bionetgen_command',
+    'start_bionetgen_process',
+    'wait_for_bionetgen_process',
+    'async_start_bionetgen_process',
+    'async_wait_for_bionetgen_process',
+    'get_observables_for_variables',
+    'get_result_cache_key',
+    'get_memoized_simulator_version',
+    'read_bionetgen_task_results',
     'get_variables_results_from_observable_results',
+    'budget_variable_results',
 ]
 
 
-def preprocess_model_attribute_change(task, change):
+MODEL_ATTRIBUTE_CHANGE_TARGET_PATTERN = re.compile(
+    r'^(?:'
+    r'compartments\.(?P<compartment>[^\.]+)(?:\.size)?'
+    r'|parameters\.(?P<parameter>[^\.]+)(?:\.value)?'
+    r'|species\.(?P<species>[^\.]+)\((?P<species_sites>.*?)\)(?:\.initialCount)?'
+    r'|functions\.(?P<function>[^\.\(\)]+)(?:\.expression)?'
+    r'|functions\.(?P<function_with_args>[^\.]+)\((?P<function_args>.*?)\)(?:\.expression)?'
+    r')$')
+MODEL_ATTRIBUTE_CHANGE_TARGET_PATTERNS = OrderedDict([
+    ('compartment size', 'compartments.<compartment_id>.size'),
+    ('function arguments and expression', 'functions.<function_id>(<arguments>).expression'),
+    ('function expression', 'functions.<function_id>.expression'),
+    ('initial species count/concentration', 'species.<species_id>(<sites>).initialCount'),
+    ('parameter value', 'parameters.<parameter_id>.value'),
+])
+
+
+def preprocess_model_attribute_changes(task, changes, config=None):
+    """ Process the model changes of a task
+
+    If a task has at least :obj:`SimulatorConfig.bulk_model_changes_threshold` changes of the values of parameters and
+    initial counts of species, the changes are compiled into rewrites of the lines of the ``parameters`` and
+    ``seed species`` blocks of the model rather than into individual ``setParameter`` and ``setConcentration``
+    actions.
+
+    Args:
+        task (:obj:`Task`): BioNetGen task
+        changes (:obj:`list` of :obj:`ModelAttributeChange`): model attribute changes
+        config (:obj:`SimulatorConfig`, optional): BioNetGen configuration
+
+    Returns:
+        :obj:`dict`: dictionary that maps the target of each change to processed information about the change (see
+        :obj:`preprocess_model_attribute_change`)
+
+    Raises:
+        :obj:`ValueError`: if a target of a change is not valid
+    """
+    config = config or SimulatorConfig()
+
+    bulk = False
+    if config.bulk_model_changes_threshold is not None:
+        num_action_changes = 0
+        for change in changes:
+            match = MODEL_ATTRIBUTE_CHANGE_TARGET_PATTERN.match(change.target)
+            if match and (match.group('parameter') or match.group('species')):
+                num_action_changes += 1
+        bulk = num_action_changes >= config.bulk_model_changes_threshold
+
+    preprocessed_changes = {}
+    for change in changes:
+        preprocessed_changes[change.target] = preprocess_model_attribute_change(task, change, bulk=bulk)
+    return preprocessed_changes
+
+
+def preprocess_model_attribute_change(task, change, bulk=False):
     """ Process a model change
 
     * Compartment sizes: targets should follow the pattern ``compartments.<compartment_id>.size``
@@ -46,6 +143,9 @@ def preprocess_model_attribute_change(task, change):
     Args:
         task (:obj:`Task`): BioNetGen task
         change (:obj:`ModelAttributeChange`): model attribute change
+        bulk (:obj:`bool`, optional): if :obj:`True`, process changes of the values of parameters and initial counts of
+            species into rewrites of the lines of the ``parameters`` and ``seed species`` blocks which define them,
+            when the blocks define them, rather than into ``setParameter`` and ``setConcentration`` actions
 
     Returns:
         :obj:`dict`: processed information about the model change
@@ -54,101 +154,80 @@ def preprocess_model_attribute_change(task, change):
         :obj:`ValueError`: if a target of a change is not valid
     """
     target = change.target
+    model = task.model
+    target_match = MODEL_ATTRIBUTE_CHANGE_TARGET_PATTERN.match(target)
 
-    compartment_size_match = re.match(r'^compartments\.([^\.]+)(\.size)?$', target)
-    if compartment_size_match:
-        obj_id = compartment_size_match.group(1)
-        block = task.model.get('compartments', [])
-
-        pattern = r'^' + re.escape(obj_id) + r' (\d+) ([^ ]+)( .*?)?$'
-        comp_changed = False
-        for i_line, line in enumerate(block):
-            match = re.match(pattern, line)
-            if match:
-                comp_changed = True
-                return {
-                    'type': 'replace_line_in_block',
-                    'block': block,
-                    'i_line': i_line,
-                    'new_line': lambda new_value: '{} {} {} {}'.format(
-                        obj_id, match.group(1), new_value, (match.group(3) or '').strip()).strip(),
-                }
-
-        if not comp_changed:
+    if target_match and target_match.group('compartment'):
+        obj_id = target_match.group('compartment')
+        line = model.find_block_line('compartments', obj_id)
+        if line is None:
             raise ValueError(('The size of compartment `{}` cannot be changed '
                               'because the model does not have a compartment with this id.').format(obj_id))
 
-    parameter_values_match = re.match(r'^parameters\.([^\.]+)(\.value)?$', target)
-    if parameter_values_match:
+        i_line, match = line
+        return {
+            'type': 'replace_line_in_block',
+            'block_type': 'compartments',
+            'i_line': i_line,
+            'new_line': lambda new_value: '{} {} {} {}'.format(
+                obj_id, match.group(2), new_value, (match.group(4) or '').strip()).strip(),
+        }
+
+    if target_match and target_match.group('parameter'):
+        obj_id = target_match.group('parameter')
+        line = model.find_block_line('parameters', obj_id) if bulk else None
+        if line is not None:
+            i_line, match = line
+            return {
+                'type': 'replace_line_in_block',
+                'block_type': 'parameters',
+                'i_line': i_line,
+                'new_line': lambda new_value: '{}{}{}'.format(obj_id, match.group(2) or ' ', new_value),
+            }
+
         return {
             'type': 'append_action',
-            'action': lambda new_value: 'setParameter("{}", {})'.format(parameter_values_match.group(1), new_value),
+            'action': lambda new_value: 'setParameter("{}", {})'.format(obj_id, new_value),
         }
 
-    species_counts_match = re.match(r'^species\.([^\.]+)\((.*?)\)(\.initialCount)?$', target)
-    if species_counts_match:
+    if target_match and target_match.group('species'):
+        species = '{}({})'.format(target_match.group('species'), target_match.group('species_sites'))
+        if bulk:
+            for block_type in ['seed species', 'species']:
+                line = model.find_block_line(block_type, species)
+                if line is not None:
+                    i_line, match = line
+                    prefix = model[block_type][i_line][0:match.end(2)]
+                    return {
+                        'type': 'replace_line_in_block',
+                        'block_type': block_type,
+                        'i_line': i_line,
+                        'new_line': lambda new_value: '{}{}'.format(prefix, new_value),
+                    }
+
         return {
             'type': 'append_action',
-            'action': lambda new_value: 'setConcentration("{}({})", {})'.format(
-                species_counts_match.group(1), species_counts_match.group(2), new_value),
+            'action': lambda new_value: 'setConcentration("{}", {})'.format(species, new_value),
         }
 
-    functions_expression_match = re.match(r'^functions\.([^\.\(\)]+)(\.expression)?$', target)
-    if functions_expression_match:
-        obj_id = functions_expression_match.group(1)
-
-        block = task.model.get('functions', [])
-
-        func_changed = False
-        pattern = r'^' + re.escape(obj_id) + r'\((.*?)\) *= *(.*?)$'
-        for i_line, line in enumerate(block):
-            match = re.match(pattern, line)
-            if match:
-                func_changed = True
-                return {
-                    'type': 'replace_line_in_block',
-                    'block': block,
-                    'i_line': i_line,
-                    'new_line': lambda new_value: '{}({}) = {}'.format(obj_id, match.group(1), new_value),
-                }
-
-        if not func_changed:
+    if target_match and (target_match.group('function') or target_match.group('function_with_args')):
+        obj_id = target_match.group('function') or target_match.group('function_with_args')
+        line = model.find_block_line('functions', obj_id)
+        if line is None:
             raise ValueError(('The expression of function `{}` cannot be changed '
                               'because the model does not have a function with this id.').format(obj_id))
 
-    function_args_expression_match = re.match(r'^functions\.([^\.]+)\((.*?)\)(\.expression)?$', target)
-    if function_args_expression_match:
-        obj_id = function_args_expression_match.group(1)
-        obj_args = function_args_expression_match.group(2)
-
-        block = task.model.get('functions', [])
-
-        func_changed = False
-        pattern = r'^' + re.escape(obj_id) + r'\(.*?\) *= *(.*?)$'
-        for i_line, line in enumerate(block):
-            match = re.match(pattern, line)
-            if match:
-                func_changed = True
-                return {
-                    'type': 'replace_line_in_block',
-                    'block': block,
-                    'i_line': i_line,
-                    'new_line': lambda new_value: '{}({}) = {}'.format(obj_id, obj_args, new_value),
-                }
-
-        if not func_changed:
-            raise ValueError(('The expression of function `{}` cannot be changed '
-                              'because the model does not have a function with this id.').format(obj_id))
+        i_line, match = line
+        obj_args = target_match.group('function_args') if target_match.group('function_with_args') else match.group(2)
+        return {
+            'type': 'replace_line_in_block',
+            'block_type': 'functions',
+            'i_line': i_line,
+            'new_line': lambda new_value: '{}({}) = {}'.format(obj_id, obj_args, new_value),
+        }
 
-    target_patterns = {
-        'compartment size': compartment_size_match,
-        'parameter value': parameter_values_match,
-        'initial species count/concentration': species_counts_match,
-        'function expression': functions_expression_match,
-        'function arguments and expression': function_args_expression_match,
-    }
     msg = '`{}` is not a valid target. The following patterns of targets are supported:\n  - {}'.format(
-        target, '\n  - '.join('{}: `{}`'.format(key, target_patterns[key]) for key in sorted(target_patterns.keys())))
+        target, '\n  - '.join('{}: `{}`'.format(key, pattern) for key, pattern in MODEL_ATTRIBUTE_CHANGE_TARGET_PATTERNS.items()))
     raise NotImplementedError(msg)
 
 
@@ -160,6 +239,9 @@ def add_model_attribute_change_to_task(task, change, preprocessed_change=None):
     * Initial species counts: targets should follow the pattern ``species.<species_id>.count``
     * Parameter values: targets should follow the pattern ``parameters.<parameter_id>.value``
 
+    The model and actions of the task are modified. To apply changes to a task without modifying it (e.g., to a task which
+    is shared by several threads), use :obj:`get_task_with_model_attribute_changes`.
+
     Args:
         task (:obj:`Task`): BioNetGen task
         change (:obj:`ModelAttributeChange`): model attribute change
@@ -174,7 +256,7 @@ def add_model_attribute_change_to_task(task, change, preprocessed_change=None):
     new_value = change.new_value
 
     if preprocessed_change['type'] == 'replace_line_in_block':
-        preprocessed_change['block'][preprocessed_change['i_line']] = preprocessed_change['new_line'](new_value)
+        task.model[preprocessed_change['block_type']][preprocessed_change['i_line']] = preprocessed_change['new_line'](new_value)
     else:
         try:
             float(new_value)
@@ -184,6 +266,41 @@ def add_model_attribute_change_to_task(task, change, preprocessed_change=None):
         task.actions.append(preprocessed_change['action'](new_value))
 
 
+def get_task_with_model_attribute_changes(task, changes, preprocessed_changes):
+    """ Get a BioNetGen task which encodes model attribute changes into a task, without modifying the task
+
+    The lines which the changes replace are overlaid on copies of the blocks which contain them, and the other blocks
+    are shared with the model of the task. The actions of the changes are appended to a copy of the actions of the task.
+    Because the task isn't modified, the same task can be changed concurrently (e.g., by several threads), as long as
+    the task isn't otherwise modified.
+
+    Args:
+        task (:obj:`Task`): BioNetGen task
+        changes (:obj:`list` of :obj:`ModelAttributeChange`): model attribute changes
+        preprocessed_changes (:obj:`dict`): dictionary that maps the target of each change to preprocessed information
+            about the change (see :obj:`preprocess_model_attribute_changes`)
+
+    Returns:
+        :obj:`Task`: BioNetGen task
+    """
+    changed_block_types = set()
+    for change in changes:
+        preprocessed_change = preprocessed_changes[change.target]
+        if preprocessed_change['type'] == 'replace_line_in_block':
+            changed_block_types.add(preprocessed_change['block_type'])
+
+    model = Model()
+    for block_type, block_lines in task.model.items():
+        if block_type in changed_block_types:
+            block_lines = ModelBlock(block_lines)
+        model[block_type] = block_lines
+
+    changed_task = Task(model=model, actions=list(task.actions), template=task.template)
+    for change in changes:
+        add_model_attribute_change_to_task(changed_task, change, preprocessed_changes[change.target])
+    return changed_task
+
+
 def add_variables_to_model(model, variables):
     """ Encode SED variables into observables in a BioNetGen task
 
@@ -247,9 +364,16 @@ def add_variables_to_model(model, variables):
         raise NotImplementedError(msg)
 
 
+_simulation_actions = {}
+MAX_MEMOIZED_SIMULATION_ACTIONS = 1024
+
+
 def create_actions_for_simulation(simulation, config=None):
     """ Create BioNetGen actions for a SED simulation
 
+    The actions for each distinct simulation (time course, algorithm, algorithm parameters, and algorithm substitution
+    policy) are memoized for the process. The warnings about the simulation are emitted each time.
+
     Args:
         simulation (:obj:`UniformTimeCourseSimulation`): SED simulation
         config (:obj:`Config`, optional): configuration
@@ -264,6 +388,51 @@ def create_actions_for_simulation(simulation, config=None):
             * :obj:`list` of :obj:`str`: actions for SED simulation
             * :obj:`str`: KiSAO id of the algorithm that will be executed
     """
+    algorithm_substitution_policy = get_algorithm_substitution_policy(config=config)
+    key = (
+        simulation.initial_time, simulation.output_start_time, simulation.output_end_time, simulation.number_of_points,
+        simulation.algorithm.kisao_id,
+        tuple((change.kisao_id, change.new_value) for change in simulation.algorithm.changes),
+        algorithm_substitution_policy,
+    )
+
+    memoized = _simulation_actions.get(key, None)
+    if memoized is None:
+        actions, exec_kisao_id, simulation_warnings, memoizable = _create_actions_for_simulation(
+            simulation, algorithm_substitution_policy)
+        memoized = (tuple(actions), exec_kisao_id, tuple(simulation_warnings))
+        if memoizable:
+            if len(_simulation_actions) >= MAX_MEMOIZED_SIMULATION_ACTIONS:
+                _simulation_actions.clear()
+            _simulation_actions[key] = memoized
+
+    actions, exec_kisao_id, simulation_warnings = memoized
+    for msg, category in simulation_warnings:
+        warn(msg, category)
+
+    return list(actions), exec_kisao_id
+
+
+def _create_actions_for_simulation(simulation, algorithm_substitution_policy):
+    """ Create BioNetGen actions for a SED simulation (see :obj:`create_actions_for_simulation`)
+
+    Args:
+        simulation (:obj:`UniformTimeCourseSimulation`): SED simulation
+        algorithm_substitution_policy (:obj:`AlgorithmSubstitutionPolicy`): algorithm substitution policy
+
+    Raises:
+        :obj:`NotImplementedError`: if BioNetGen doesn't support the request algorithm or
+            algorithm parameters
+
+    Returns:
+        :obj:`tuple`:
+
+            * :obj:`list` of :obj:`str`: actions for SED simulation
+            * :obj:`str`: KiSAO id of the algorithm that will be executed
+            * :obj:`list` of :obj:`tuple`: message and category of each warning which should be emitted
+            * :obj:`bool`: whether the actions can be memoized
+    """
+    simulation_warnings = []
     simulate_args = OrderedDict()
 
     # setup the initial time, end time, and the number of time points to record
@@ -280,10 +449,10 @@ def create_actions_for_simulation(simulation, config=None):
 
     simulate_args['n_steps'] = int(n_steps)
 
-    algorithm_substitution_policy = get_algorithm_substitution_policy(config=config)
-    exec_kisao_id = get_preferred_substitute_algorithm_by_ids(
-        simulation.algorithm.kisao_id, KISAO_SIMULATION_METHOD_ARGUMENTS_MAP.keys(),
-        substitution_policy=algorithm_substitution_policy)
+    exec_kisao_id, substitution_warning, memoizable = get_preferred_substitute_algorithm_by_ids(
+        simulation.algorithm.kisao_id, substitution_policy=algorithm_substitution_policy)
+    if substitution_warning:
+        simulation_warnings.append((substitution_warning, AlgorithmSubstitutedWarning))
 
     if exec_kisao_id == 'KISAO_0000263' and simulation.initial_time != 0:
         raise NotImplementedError('The initial time of a network free simulation (KISAO_0000263) must be 0.')
@@ -317,7 +486,7 @@ def create_actions_for_simulation(simulation, config=None):
                             '{}: {}'.format(kisao_id, parameter['name'])
                             for kisao_id, parameter in simulation_method['parameters'].items())),
                     ])
-                    warn(msg, BioSimulatorsWarning)
+                    simulation_warnings.append((msg, BioSimulatorsWarning))
 
     # if necessary create a network generation action
     actions = []
@@ -328,16 +497,23 @@ def create_actions_for_simulation(simulation, config=None):
     # create a simulation action
     actions.append('simulate({{{}}})'.format(', '.join('{} => {}'.format(key, val) for key, val in simulate_args.items())))
 
-    # return actions and the KiSAO id of the algorithm that will be executed
-    return actions, exec_kisao_id
+    # return actions, the KiSAO id of the algorithm that will be executed, and warnings
+    return actions, exec_kisao_id, simulation_warnings, memoizable
 
 
-def exec_bionetgen_task(task, verbose=True):
+def exec_bionetgen_task(task, verbose=True, callback=None, observables=None, timer=None, config=None):
     """ Execute a task and return the predicted values of the observables
 
     Args:
         task (:obj:`Task`): task
         verbose (:obj:`bool`, optional): whether to display diagnostic information
+        callback (:obj:`types.FunctionType`, optional): function which is called with each block of the predicted
+            values of the observables as the simulation produces them (see :obj:`iter_bionetgen_task_results`). If
+            the function returns :obj:`False`, the simulation is stopped and the values predicted so far are returned.
+        observables (:obj:`list` of :obj:`str`, optional): ids of the observables (e.g., ``time``) to read from the
+            results of the simulation; if :obj:`None`, all of the observables are read
+        timer (:obj:`PhaseTimer`, optional): timer for the phases of the execution of the task
+        config (:obj:`SimulatorConfig`, optional): BioNetGen configuration
 
     Returns:
         :obj:`pandas.DataFrame`: predicted values of the observables
@@ -345,41 +521,1244 @@ def exec_bionetgen_task(task, verbose=True):
     Raises:
         :obj:`Exception`: if the task fails
     """
+    config = config or SimulatorConfig()
+    timer = timer or DISABLED_PHASE_TIMER
+
+    if callback is not None:
+        blocks = []
+        results = iter_bionetgen_task_results(task, verbose=verbose, observables=observables, config=config)
+        try:
+            for block in results:
+                blocks.append(block)
+                proceed = callback(block)
+                if proceed is not None and not proceed:
+                    break
+        finally:
+            results.close()
+
+        if blocks:
+            return pandas.concat(blocks, axis=1)
+        return pandas.DataFrame()
+
+    # reuse the results of the task from the cache
+    with timer.phase('result_cache'):
+        result_cache, result_cache_key = get_result_cache_key(task, config=config)
+        if result_cache_key:
+            observable_results = result_cache.read_results(result_cache_key, observables=observables)
+            if observable_results is not None:
+                observable_results.attrs['result_cache'] = 'hit'
+                return observable_results
+
+    # get a scratch directory to store the task and its results
+    with task_workspace(config) as dirname:
+        # execute the task
+        resource_usage = run_bionetgen_task(task, dirname, verbose=verbose, timer=timer, config=config)
+
+        # read the predicted observables of the task
+        with timer.phase('read_results'):
+            results_filename = os.path.join(dirname, 'task.gdat')
+            observable_results = read_bionetgen_task_results(results_filename, observables=observables,
+                                                             result_cache=result_cache, result_cache_key=result_cache_key)
+    observable_results.attrs['resource_usage'] = resource_usage
 
-    # create a temporary directory to store the task and its results
-    temp_dirname = tempfile.mkdtemp()
+    # return the predicted values of the observables of the task
+    return observable_results
+
+
+def get_result_cache_key(task, config=None):
+    """ Get the cache of results (:obj:`SimulatorConfig.result_cache_dir`) and the key for the results of a task
+
+    Args:
+        task (:obj:`Task`): task
+        config (:obj:`SimulatorConfig`, optional): BioNetGen configuration
+
+    Returns:
+        :obj:`tuple`:
+
+            * :obj:`ResultCache`: cache, or :obj:`None` if no cache of results is configured
+            * :obj:`str`: key for the results of the task, or :obj:`None` if the results of the task can't be cached
+    """
+    config = config or SimulatorConfig()
+    if not config.result_cache_dir:
+        return None, None
+
+    result_cache = ResultCache(config.result_cache_dir, config.result_cache_max_size)
+    if not result_cache.is_reproducible(task.actions):
+        return result_cache, None
+    return result_cache, result_cache.get_key(task, get_memoized_simulator_version(config))
+
+
+_simulator_versions = {}
+
+
+def get_memoized_simulator_version(config=None):
+    """ Get the version of BioNetGen, executing BioNetGen only once for each BioNetGen executable
+
+    Args:
+        config (:obj:`SimulatorConfig`, optional): BioNetGen configuration
+
+    Returns:
+        :obj:`str`: version
+    """
+    from . import get_simulator_version
+
+    config = config or SimulatorConfig()
+    version = _simulator_versions.get(config.bionetgen_path, None)
+    if version is None:
+        version = _simulator_versions[config.bionetgen_path] = get_simulator_version(config)
+    return version
+
+
+def read_bionetgen_task_results(filename, observables=None, result_cache=None, result_cache_key=None):
+    """ Read the predicted values of the observables of a task and, if the results of the task can be cached, save them
+    to the cache of results
+
+    Args:
+        filename (:obj:`str`): path to the results of the task
+        observables (:obj:`list` of :obj:`str`, optional): ids of the observables (e.g., ``time``) to read; if
+            :obj:`None`, all of the observables are read
+        result_cache (:obj:`ResultCache`, optional): cache of results
+        result_cache_key (:obj:`str`, optional): key for the results of the task in :obj:`result_cache`
+
+    Returns:
+        :obj:`pandas.DataFrame`: predicted values of the observables
+    """
+    if not result_cache_key:
+        return read_simulation_results(filename, observables=observables)
+
+    # cache all of the observables so that the results can be reused by executions which read other observables
+    results = read_simulation_results(filename)
+    result_cache.write_results(result_cache_key, results)
+
+    results = ResultCache.select_observables(results.to_numpy(), list(results.index), observables=observables)
+    results.attrs['result_cache'] = 'miss'
+    return results
+
+
+def iter_bionetgen_task_results(task, verbose=True, poll_interval=0.1, observables=None, config=None):
+    """ Execute a task and incrementally yield the predicted values of the observables while the simulation is
+    running
+
+    The results file of the simulation (``task.gdat``) is tailed, and each block of time points is yielded as soon as
+    the simulator writes it. Closing the iterator before it is exhausted (e.g., breaking out of a ``for`` loop over it)
+    kills BioNetGen and its simulator.
+
+    Args:
+        task (:obj:`Task`): task
+        verbose (:obj:`bool`, optional): whether to display diagnostic information
+        poll_interval (:obj:`float`, optional): time (in seconds) to wait between checks for new results
+        observables (:obj:`list` of :obj:`str`, optional): ids of the observables (e.g., ``time``) to read from the
+            results of the simulation; if :obj:`None`, all of the observables are read
+        config (:obj:`SimulatorConfig`, optional): BioNetGen configuration
+
+    Yields:
+        :obj:`pandas.DataFrame`: predicted values of the observables for a block of time points. Concatenating the
+        blocks (``pandas.concat(blocks, axis=1)``) produces the same data frame as :obj:`exec_bionetgen_task`.
+
+    Raises:
+        :obj:`subprocess.TimeoutExpired`: if the task runs longer than :obj:`SimulatorConfig.timeout`
+        :obj:`Exception`: if the task fails
+    """
+    config = config or SimulatorConfig()
+
+    with task_workspace(config) as dirname:
+        command, on_success = write_bionetgen_task(task, dirname, config=config)
+
+        # execute the task in a new process group so that the simulator can be killed along with BioNetGen
+        process = start_bionetgen_process(command, verbose=verbose, config=config)
+        deadline = time.monotonic() + config.timeout if config.timeout is not None else None
+
+        def is_running():
+            running = process.poll() is None
+            if running and deadline is not None and time.monotonic() > deadline:
+                # the process group is killed as the iterator exits
+                raise subprocess.TimeoutExpired(command, config.timeout)
+            return running
+
+        try:
+            yield from iter_simulation_results(os.path.join(dirname, 'task.gdat'),
+                                               is_running=is_running,
+                                               poll_interval=poll_interval,
+                                               observables=observables)
+        except FileNotFoundError:
+            if process.wait() == 0:
+                raise
+        finally:
+            if process.poll() is None:
+                kill_process_group(process)
+            returncode, _ = wait_for_bionetgen_process(process)
+
+        if returncode != 0:
+            raise subprocess.CalledProcessError(returncode, command)
+
+        if on_success:
+            on_success()
 
-    # write the task to a file
-    task_filename = os.path.join(temp_dirname, 'task.bngl')
-    write_task(task, task_filename)
+
+async def async_exec_bionetgen_task(task, verbose=True, semaphore=None, observables=None, timer=None, config=None):
+    """ Asynchronously execute a task and return the predicted values of the observables
+
+    If the coroutine is cancelled, the BioNetGen process (and its children) are killed and the temporary directory
+    for the task is removed.
+
+    Args:
+        task (:obj:`Task`): task
+        verbose (:obj:`bool`, optional): whether to display diagnostic information
+        semaphore (:obj:`asyncio.Semaphore`, optional): semaphore for bounding the number of concurrent BioNetGen
+            processes. The semaphore is released before the results of the task are read so that reading them
+            overlaps with the execution of the next task.
+        observables (:obj:`list` of :obj:`str`, optional): ids of the observables (e.g., ``time``) to read from the
+            results of the simulation; if :obj:`None`, all of the observables are read
+        timer (:obj:`PhaseTimer`, optional): timer for the phases of the execution of the task
+        config (:obj:`SimulatorConfig`, optional): BioNetGen configuration
+
+    Returns:
+        :obj:`pandas.DataFrame`: predicted values of the observables
+
+    Raises:
+        :obj:`Exception`: if the task fails
+    """
+    config = config or SimulatorConfig()
+    timer = timer or DISABLED_PHASE_TIMER
+
+    # reuse the results of the task from the cache
+    with timer.phase('result_cache'):
+        result_cache, result_cache_key = get_result_cache_key(task, config=config)
+        if result_cache_key:
+            observable_results = result_cache.read_results(result_cache_key, observables=observables)
+            if observable_results is not None:
+                observable_results.attrs['result_cache'] = 'hit'
+                return observable_results
+
+    with task_workspace(config) as dirname:
+        # execute the task
+        if semaphore is None:
+            resource_usage = await async_run_bionetgen_task(task, dirname, verbose=verbose, timer=timer, config=config)
+        else:
+            async with semaphore:
+                resource_usage = await async_run_bionetgen_task(task, dirname, verbose=verbose, timer=timer, config=config)
+
+        # read the predicted observables of the task in a thread so that other tasks can proceed
+        with timer.phase('read_results'):
+            results_filename = os.path.join(dirname, 'task.gdat')
+            observable_results = await asyncio.get_running_loop().run_in_executor(
+                None, functools.partial(read_bionetgen_task_results, results_filename, observables=observables,
+                                        result_cache=result_cache, result_cache_key=result_cache_key))
+    observable_results.attrs['resource_usage'] = resource_usage
+
+    return observable_results
+
+
+def exec_bionetgen_task_batch(model, simulations_actions, verbose=True, observables=None, config=None):
+    """ Execute several simulations of a model in a single BioNetGen process and return the predicted values of the
+    observables of each simulation
+
+    The network of the model is generated (if needed) and its initial concentrations and parameter values are saved
+    once. The concentrations and parameters are then reset before the actions of each simulation are executed, and
+    the results of each simulation are saved with a distinct suffix.
+
+    Args:
+        model (:obj:`Model`): model
+        simulations_actions (:obj:`list` of :obj:`list` of :obj:`str`): actions (e.g., model changes, network generation,
+            simulation) of each simulation
+        verbose (:obj:`bool`, optional): whether to display diagnostic information
+        observables (:obj:`list` of :obj:`str`, optional): ids of the observables (e.g., ``time``) to read from the
+            results of the simulation; if :obj:`None`, all of the observables are read
+        config (:obj:`SimulatorConfig`, optional): BioNetGen configuration
+
+    Returns:
+        :obj:`list` of :obj:`pandas.DataFrame`: predicted values of the observables of each simulation
+
+    Raises:
+        :obj:`Exception`: if the task fails
+    """
+    generate_network_actions = []
+    batch_actions = []
+    for i_simulation, simulation_actions in enumerate(simulations_actions):
+        batch_actions.append('resetConcentrations()')
+        batch_actions.append('resetParameters()')
+        for action in simulation_actions:
+            if NetworkCache.GENERATE_NETWORK_PATTERN.match(action):
+                if action not in generate_network_actions:
+                    generate_network_actions.append(action)
+            elif action.startswith('simulate(') and action.endswith('})'):
+                batch_actions.append('{}, suffix => "{}"}})'.format(action[:-2], i_simulation))
+            else:
+                batch_actions.append(action)
+
+    task = Task(model=model,
+                actions=generate_network_actions + ['saveConcentrations()', 'saveParameters()'] + batch_actions)
+
+    config = config or SimulatorConfig()
+    with task_workspace(config) as dirname:
+        run_bionetgen_task(task, dirname, verbose=verbose, config=config)
+
+        observable_results = []
+        for i_simulation in range(len(simulations_actions)):
+            results_filename = os.path.join(dirname, 'task_{}.gdat'.format(i_simulation))
+            observable_results.append(read_simulation_results(results_filename, observables=observables))
+
+    return observable_results
+
+
+def exec_bionetgen_parameter_scan(task, parameter_id, values, verbose=True, observables=None, config=None):
+    """ Execute the simulation of a task for each of several values of a parameter with a single BioNetGen process
+    (``parameter_scan``) and return the predicted values of the observables for each value
+
+    The network of the model is generated once, and the initial concentrations of the species are reset before each
+    simulation.
+
+    Args:
+        task (:obj:`Task`): task whose actions include exactly one simulation (``simulate``)
+        parameter_id (:obj:`str`): id of the parameter
+        values (:obj:`list` of :obj:`str`): values of the parameter
+        verbose (:obj:`bool`, optional): whether to display diagnostic information
+        observables (:obj:`list` of :obj:`str`, optional): ids of the observables (e.g., ``time``) to read from the
+            results of the simulations; if :obj:`None`, all of the observables are read
+        config (:obj:`SimulatorConfig`, optional): BioNetGen configuration
+
+    Returns:
+        :obj:`list` of :obj:`pandas.DataFrame`: predicted values of the observables for each value of the parameter
+
+    Raises:
+        :obj:`ValueError`: if the actions of the task don't include exactly one simulation
+        :obj:`Exception`: if the task fails
+    """
+    actions = get_parameter_scan_actions(task.actions, parameter_id, values)
+    if actions is None:
+        raise ValueError('The actions of the task must include exactly one simulation.')
+
+    config = config or SimulatorConfig()
+    with task_workspace(config) as dirname:
+        run_bionetgen_task(Task(model=task.model, actions=actions), dirname, verbose=verbose, config=config)
+
+        observable_results = []
+        for i_value in range(len(values)):
+            results_filename = os.path.join(dirname, 'task_scan', 'task_scan_{:05d}.gdat'.format(i_value + 1))
+            observable_results.append(read_simulation_results(results_filename, observables=observables))
+
+    return observable_results
+
+
+def get_parameter_scan_actions(actions, parameter_id, values):
+    """ Replace the simulation of a list of actions with a scan of the values of a parameter (``parameter_scan``). The
+    results of the simulation for the value with index ``i`` (starting from 1) are saved to
+    ``task_scan/task_scan_{i:05d}.gdat``.
+
+    Args:
+        actions (:obj:`list` of :obj:`str`): actions
+        parameter_id (:obj:`str`): id of the parameter
+        values (:obj:`list` of :obj:`str`): values of the parameter
+
+    Returns:
+        :obj:`list` of :obj:`str`: actions, or :obj:`None` if the actions don't include exactly one simulation
+    """
+    i_simulations = [i_action for i_action, action in enumerate(actions) if SIMULATE_PATTERN.match(action)]
+    if len(i_simulations) != 1:
+        return None
+
+    i_simulation = i_simulations[0]
+    args = SIMULATE_PATTERN.match(actions[i_simulation]).group(1).strip()
+    scan_action = 'parameter_scan({{{}parameter => "{}", par_scan_vals => [{}], suffix => "scan"}})'.format(
+        args + ', ' if args else '', parameter_id, ', '.join(values))
+    return actions[0:i_simulation] + [scan_action] + actions[i_simulation + 1:]
+
+
+def exec_bionetgen_ensemble(task, num_replicates, seed=None, quantiles=DEFAULT_QUANTILES, num_workers=None, verbose=True,
+                            observables=None, config=None):
+    """ Execute replicates of the stochastic simulation of a task and return running summary statistics of the predicted
+    values of the observables of the replicates
+
+    The network of the model (or, for network-free simulations, the XML file of the model) is generated once, after the
+    actions which precede the simulation (e.g., parameter changes) are executed. The replicates are then simulated
+    directly with ``run_network`` (or ``NFsim``) when possible, and otherwise with ``BioNetGen`` from the generated
+    network. Up to :obj:`num_workers` replicates are simulated concurrently. The results of each replicate are added
+    to the statistics, in the order of the replicates, as soon as they are available and then discarded.
+
+    Args:
+        task (:obj:`Task`): task whose last action is a stochastic simulation (SSA, PLA, or network-free)
+        num_replicates (:obj:`int`): number of replicates
+        seed (:obj:`int`, optional): seed from which the seeds of the replicates are derived; if :obj:`None`, the seed
+            of the simulation is used, if any, and otherwise the seeds of the replicates are random
+        quantiles (:obj:`tuple` of :obj:`float`, optional): quantiles to estimate
+        num_workers (:obj:`int`, optional): maximum number of replicates to simulate concurrently; if :obj:`None`,
+            :obj:`SimulatorConfig.num_workers` is used
+        verbose (:obj:`bool`, optional): whether to display diagnostic information
+        observables (:obj:`list` of :obj:`str`, optional): ids of the observables (e.g., ``time``) to read from the
+            results of the replicates; if :obj:`None`, all of the observables are read
+        config (:obj:`SimulatorConfig`, optional): BioNetGen configuration
+
+    Returns:
+        :obj:`EnsembleStatistics`: summary statistics of the predicted values of the observables of the replicates
+
+    Raises:
+        :obj:`ValueError`: if the last action of the task isn't a stochastic simulation
+        :obj:`Exception`: if a replicate fails
+    """
+    config = config or SimulatorConfig()
+    if num_workers is None:
+        num_workers = config.num_workers
+    num_workers = max(1, num_workers)
+
+    # validate the simulation of the task
+    i_simulations = [i_action for i_action, action in enumerate(task.actions) if SIMULATE_PATTERN.match(action)]
+    if i_simulations != [len(task.actions) - 1]:
+        raise ValueError('The last action of the task must be its only simulation.')
+
+    args = OrderedDict()
+    for arg in SIMULATE_PATTERN.match(task.actions[-1]).group(1).split(','):
+        key, sep, value = arg.partition('=>')
+        if sep:
+            args[key.strip()] = value.strip()
+    method = args.get('method', '').strip('"')
+    if method not in STOCHASTIC_METHODS:
+        raise ValueError('The simulation method must be one of {}, not `{}`.'.format(', '.join(STOCHASTIC_METHODS), method))
+
+    if seed is None and 'seed' in args:
+        seed = int(float(args['seed']))
+    seeds = get_ensemble_seeds(num_replicates, seed)
+
+    statistics = EnsembleStatistics(quantiles)
+
+    with task_workspace(config) as dirname:
+        # generate the network (or XML file) of the model once
+        if method == 'nf':
+            model_filename = os.path.join(dirname, 'model.xml')
+            model_action = 'writeXML({{prefix => "{}"}})'.format(os.path.splitext(model_filename)[0])
+        else:
+            model_filename = os.path.join(dirname, 'network.net')
+            model_action = 'writeNetwork({{overwrite => 1, prefix => "{}"}})'.format(os.path.splitext(model_filename)[0])
+        statistics.add_resource_usage(run_bionetgen_task(Task(model=task.model, actions=task.actions[:-1] + [model_action]),
+                                                         dirname, verbose=verbose, config=config))
+
+        def run_replicate(i_replicate):
+            replicate_dirname = os.path.join(dirname, 'replicate-{}'.format(i_replicate + 1))
+            os.mkdir(replicate_dirname)
+            replicate_args = OrderedDict(args, seed=str(seeds[i_replicate]))
+            simulate_action = 'simulate({{{}}})'.format(', '.join('{} => {}'.format(key, val)
+                                                                  for key, val in replicate_args.items()))
+            command = get_ensemble_replicate_command(task, simulate_action, model_filename, replicate_dirname,
+                                                     config=config)
+            resource_usage = run_bionetgen_command(command, verbose=verbose, config=config)
+            return replicate_dirname, resource_usage
+
+        # simulate the replicates, keeping a bounded number of replicates in flight
+        with concurrent.futures.ThreadPoolExecutor(max_workers=num_workers) as executor:
+            futures = collections.deque()
+            i_next_replicate = 0
+            try:
+                while futures or i_next_replicate < num_replicates:
+                    while i_next_replicate < num_replicates and len(futures) < 2 * num_workers:
+                        futures.append(executor.submit(run_replicate, i_next_replicate))
+                        i_next_replicate += 1
+
+                    replicate_dirname, resource_usage = futures.popleft().result()
+                    statistics.add(read_simulation_results(os.path.join(replicate_dirname, 'task.gdat'),
+                                                           observables=observables))
+                    statistics.add_resource_usage(resource_usage)
+                    shutil.rmtree(replicate_dirname)
+            finally:
+                for future in futures:
+                    future.cancel()
+
+    return statistics
+
+
+def get_ensemble_replicate_command(task, simulate_action, model_filename, dirname, config=None):
+    """ Get the command which executes a replicate of an ensemble of stochastic simulations, saving its results to
+    ``task.gdat`` in a directory
+
+    Replicates are simulated directly with ``run_network`` (or ``NFsim``) when the simulation permits, and otherwise
+    with ``BioNetGen`` from the network of the model (or, for network-free simulations, from the model and the actions
+    which precede its simulation).
+
+    Args:
+        task (:obj:`Task`): task whose last action is its simulation
+        simulate_action (:obj:`str`): simulation action, including the seed of the replicate
+        model_filename (:obj:`str`): path to the network (``.net``) or XML file (``.xml``) of the model
+        dirname (:obj:`str`): directory in which to save the results of the replicate
+        config (:obj:`SimulatorConfig`, optional): BioNetGen configuration
+
+    Returns:
+        :obj:`list` of :obj:`str`: command
+    """
+    config = config or SimulatorConfig()
+    prefix = os.path.join(dirname, 'task')
+    network_free = model_filename.endswith('.xml')
+
+    if network_free:
+        nfsim_path = get_nfsim_path(config) if config.direct_nfsim else None
+        direct_task = get_nfsim_task([simulate_action], model_filename, prefix, nfsim_path) if nfsim_path else None
+    else:
+        run_network_path = get_run_network_path(config) if config.direct_run_network else None
+        direct_task = (get_run_network_task([simulate_action], model_filename, prefix, run_network_path)
+                       if run_network_path else None)
+    if direct_task:
+        return direct_task[0]
+
+    task_filename = os.path.join(dirname, 'task.bngl')
+    if network_free:
+        write_task(Task(model=task.model, actions=task.actions[:-1] + [simulate_action]), task_filename)
+    else:
+        write_task(Task(actions=['readFile({{file => "{}"}})'.format(model_filename), simulate_action]), task_filename)
+    return [config.bionetgen_path, task_filename, '--outdir', dirname]
+
+
+def run_bionetgen_task(task, dirname, verbose=True, timer=None, config=None):
+    """ Write a task to ``task.bngl`` in a directory and execute it with BioNetGen, saving its outputs to the directory
+
+    If a cache of networks is configured (:obj:`SimulatorConfig.network_cache_dir`), the network of the task is
+    reused from the cache, or saved to the cache after it is generated.
+
+    Args:
+        task (:obj:`Task`): task
+        dirname (:obj:`str`): directory in which to save the task and its outputs
+        verbose (:obj:`bool`, optional): whether to display diagnostic information
+        timer (:obj:`PhaseTimer`, optional): timer for the phases of the execution of the task. If the timer is
+            enabled, the output of BioNetGen is saved to ``task.log`` (and then displayed, if :obj:`verbose`) so that
+            the times that BioNetGen reports for network generation and simulation can be recorded.
+        config (:obj:`SimulatorConfig`, optional): BioNetGen configuration
+
+    Returns:
+        :obj:`dict`: resources used by BioNetGen (see :obj:`run_bionetgen_command`)
+
+    Raises:
+        :obj:`Exception`: if the task fails
+    """
+    config = config or SimulatorConfig()
+    timer = timer or DISABLED_PHASE_TIMER
+
+    with timer.phase('write_task'):
+        command, on_success = write_bionetgen_task(task, dirname, config=config)
 
     # execute the task
-    bionetgen_path = SimulatorConfig().bionetgen_path
+    log_filename = os.path.join(dirname, 'task.log') if timer.enabled else None
     try:
-        subprocess.check_call([bionetgen_path, task_filename, '--outdir', temp_dirname],
-                              stdout=None if verbose else subprocess.DEVNULL)
-    except Exception:
-        # cleanup temporary files
-        shutil.rmtree(temp_dirname)
+        with timer.phase('bionetgen'):
+            resource_usage = run_bionetgen_command(command, verbose=verbose, config=config, log_filename=log_filename)
+    finally:
+        if log_filename:
+            read_bionetgen_log(log_filename, timer, verbose=verbose)
+
+    if on_success:
+        with timer.phase('cache'):
+            on_success()
+
+    return resource_usage
+
+
+async def async_run_bionetgen_task(task, dirname, verbose=True, timer=None, config=None):
+    """ Asynchronously write a task to ``task.bngl`` in a directory and execute it with BioNetGen, saving its outputs
+    to the directory
+
+    BioNetGen is executed in a new process group, within the limits of :obj:`SimulatorConfig.timeout`,
+    :obj:`SimulatorConfig.max_memory`, and :obj:`SimulatorConfig.max_cpu_time`. If the coroutine is cancelled or the
+    task times out, the process group is killed.
+
+    Args:
+        task (:obj:`Task`): task
+        dirname (:obj:`str`): directory in which to save the task and its outputs
+        verbose (:obj:`bool`, optional): whether to display diagnostic information
+        timer (:obj:`PhaseTimer`, optional): timer for the phases of the execution of the task (see
+            :obj:`run_bionetgen_task`)
+        config (:obj:`SimulatorConfig`, optional): BioNetGen configuration
+
+    Returns:
+        :obj:`dict`: resources used by BioNetGen (see :obj:`run_bionetgen_command`)
+
+    Raises:
+        :obj:`subprocess.TimeoutExpired`: if the task times out
+        :obj:`Exception`: if the task fails
+    """
+    config = config or SimulatorConfig()
+    timer = timer or DISABLED_PHASE_TIMER
+
+    with timer.phase('write_task'):
+        command, on_success = write_bionetgen_task(task, dirname, config=config)
+
+    # execute the task
+    log_filename = os.path.join(dirname, 'task.log') if timer.enabled else None
+    try:
+        with timer.phase('bionetgen'):
+            process = await async_start_bionetgen_process(command, verbose=verbose, config=config, log_filename=log_filename)
+            try:
+                returncode, resource_usage = await asyncio.wait_for(async_wait_for_bionetgen_process(process), config.timeout)
+            except asyncio.TimeoutError:
+                kill_process_group(process)
+                await process.wait()
+                raise subprocess.TimeoutExpired(command, config.timeout)
+            except asyncio.CancelledError:
+                kill_process_group(process)
+                await process.wait()
+                raise
+    finally:
+        if log_filename:
+            read_bionetgen_log(log_filename, timer, verbose=verbose)
+
+    if returncode != 0:
+        raise subprocess.CalledProcessError(returncode, command)
+
+    if on_success:
+        with timer.phase('cache'):
+            on_success()
+
+    return resource_usage
+
+
+def read_bionetgen_log(filename, timer, verbose=True):
+    """ Read the output of BioNetGen, add the times that it reports for its actions to a timer, and display the
+    output
+
+    Args:
+        filename (:obj:`str`): path to the output of BioNetGen
+        timer (:obj:`PhaseTimer`): timer
+        verbose (:obj:`bool`, optional): whether to display the output
+    """
+    if not os.path.isfile(filename):
+        return
+
+    with open(filename, 'r', errors='replace') as file:
+        log = file.read()
+
+    if verbose:
+        sys.stdout.write(log)
+        sys.stdout.flush()
+
+    add_bionetgen_log_to_phase_timer(timer, log)
+
+
+def write_bionetgen_task(task, dirname, config=None):
+    """ Write a task to ``task.bngl`` in a directory and get the command for executing it with BioNetGen
+
+    If a cache of networks is configured (:obj:`SimulatorConfig.network_cache_dir`), the task is written to reuse
+    its network from the cache, or to save its network so that it can be added to the cache. Similarly, if a cache of
+    model XML files is configured (:obj:`SimulatorConfig.model_xml_cache_dir`), network-free tasks are executed
+    directly with ``NFsim`` using the cached XML file of their model, or written to save the XML file of their model
+    so that it can be added to the cache.
+
+    Args:
+        task (:obj:`Task`): task
+        dirname (:obj:`str`): directory in which to save the task and its outputs
+        config (:obj:`SimulatorConfig`, optional): BioNetGen configuration
+
+    Returns:
+        :obj:`tuple`:
+
+            * :obj:`list` of :obj:`str`: command for executing the task
+            * :obj:`types.FunctionType`: function which should be called after the task successfully executes, or
+              :obj:`None`
+    """
+    config = config or SimulatorConfig()
+    bionetgen_path = config.bionetgen_path
+
+    # determine whether the network of the task can be reused from, or saved to, the cache
+    network_cache = None
+    network_cache_key = None
+    if config.network_cache_dir:
+        network_cache = NetworkCache(config.network_cache_dir, config.network_cache_max_size)
+        network_cache_key = network_cache.get_key(task, bionetgen_path)
+
+    # determine whether the XML file of the model of a network-free task can be reused from, or saved to, the cache
+    model_xml_cache = None
+    nfsim_task = None
+    if not network_cache_key and config.model_xml_cache_dir and config.direct_nfsim:
+        nfsim_path = get_nfsim_path(config)
+        if nfsim_path:
+            nfsim_task = get_nfsim_task(task.actions, os.path.join(dirname, 'model.xml'), os.path.join(dirname, 'task'),
+                                        nfsim_path)
+        if nfsim_task:
+            model_xml_cache = ModelXmlCache(config.model_xml_cache_dir, config.model_xml_cache_max_size)
+
+    # write the task to a file
+    task_filename = os.path.join(dirname, 'task.bngl')
+    on_success = None
+    if network_cache_key:
+        network_filename = os.path.join(dirname, 'network.net')
+        other_actions = [action for action in task.actions if not NetworkCache.GENERATE_NETWORK_PATTERN.match(action)]
+        generate_network_action = next(action for action in task.actions if NetworkCache.GENERATE_NETWORK_PATTERN.match(action))
+
+        # determine whether the network can be simulated directly with run_network, bypassing BNG2.pl
+        run_network_task = None
+        if config.direct_run_network:
+            run_network_path = get_run_network_path(config)
+            if run_network_path:
+                run_network_task = get_run_network_task(other_actions, network_filename, os.path.join(dirname, 'task'),
+                                                        run_network_path)
+
+        if network_cache.read_network(network_cache_key, task.model, network_filename):
+            if run_network_task:
+                # apply the parameter changes of the task to the network and simulate it with run_network
+                run_network_command, parameters = run_network_task
+                NetworkCache.set_network_parameters(network_filename, parameters)
+                return run_network_command, None
+
+            # reuse the cached network
+            write_task(Task(actions=['readFile({{file => "{}"}})'.format(network_filename)] + other_actions), task_filename)
+        else:
+            # generate the network before applying changes so that it can be reused by tasks with other changes. This
+            # doesn't change the results of the task because the network keeps the initial amounts of species as
+            # expressions of parameters, which are evaluated when the network is simulated.
+            write_task(Task(model=task.model,
+                            actions=[NetworkCache.get_generate_network_action(generate_network_action, 'network')] + other_actions,
+                            template=task.template),
+                       task_filename)
+
+            # save the generated network to the cache
+            on_success = functools.partial(network_cache.write, network_cache_key, network_filename)
+
+    elif model_xml_cache:
+        nfsim_command, parameters = nfsim_task
+        model_xml_filename = os.path.join(dirname, 'model.xml')
+        model_xml_cache_key = model_xml_cache.get_key(task.model, bionetgen_path)
+
+        if model_xml_cache.read_model_xml(model_xml_cache_key, model_xml_filename, parameters):
+            # simulate the cached model, with the parameter changes of the task, directly with NFsim
+            return nfsim_command, None
+
+        # write the XML file of the model before applying changes so that it can be reused by tasks with other changes
+        write_task(Task(model=task.model,
+                        actions=['writeXML({{prefix => "{}"}})'.format(os.path.splitext(model_xml_filename)[0])] + task.actions,
+                        template=task.template),
+                   task_filename)
+
+        # save the XML file to the cache
+        on_success = functools.partial(model_xml_cache.write, model_xml_cache_key, model_xml_filename)
+
+    else:
+        write_task(task, task_filename)
+
+    return [bionetgen_path, task_filename, '--outdir', dirname], on_success
+
+
+def get_run_network_path(config=None):
+    """ Get the path to the ``run_network`` executable which simulates networks
+
+    Args:
+        config (:obj:`SimulatorConfig`, optional): BioNetGen configuration
+
+    Returns:
+        :obj:`str`: path to the ``run_network`` executable, or :obj:`None` if the executable can't be found
+    """
+    config = config or SimulatorConfig()
+    return config.run_network_path or get_bundled_executable_path('run_network', config)
+
+
+def get_nfsim_path(config=None):
+    """ Get the path to the ``NFsim`` executable which executes network-free simulations
+
+    Args:
+        config (:obj:`SimulatorConfig`, optional): BioNetGen configuration
+
+    Returns:
+        :obj:`str`: path to the ``NFsim`` executable, or :obj:`None` if the executable can't be found
+    """
+    config = config or SimulatorConfig()
+    return config.nfsim_path or get_bundled_executable_path('NFsim', config)
+
+
+def get_bundled_executable_path(name, config=None):
+    """ Get the path to an executable bundled with BioNetGen (in the ``bin`` subdirectory of the directory of
+    ``BNG2.pl``)
+
+    Args:
+        name (:obj:`str`): name of the executable
+        config (:obj:`SimulatorConfig`, optional): BioNetGen configuration
+
+    Returns:
+        :obj:`str`: path to the executable, or :obj:`None` if the executable can't be found
+    """
+    config = config or SimulatorConfig()
+    bionetgen_path = shutil.which(config.bionetgen_path)
+    if bionetgen_path:
+        path = os.path.join(os.path.dirname(os.path.realpath(bionetgen_path)), 'bin', name)
+        if os.access(path, os.X_OK):
+            return path
+    return None
+
+
+SIMULATE_PATTERN = re.compile(r'^simulate\(\{(.*)\}\)$')
+SET_PARAMETER_PATTERN = re.compile(r'^setParameter\("([^"]+)", *([^"]+)\)$')
+RUN_NETWORK_METHODS = {
+    'ode': 'cvode',
+    'ssa': 'ssa',
+    'pla': 'pla',
+}
+
+
+def get_run_network_task(actions, network_filename, prefix, run_network_path):
+    """ Get the ``run_network`` command which executes the actions of a task for a network, mirroring the command
+    that ``BNG2.pl`` would run
+
+    Only actions which set the values of parameters, followed by a single simulation with an ODE, SSA, or PLA method,
+    are supported. The simulation can only be configured with ``t_start``, ``t_end``, ``n_steps``, ``atol``, ``rtol``,
+    ``seed``, and ``max_sim_steps``.
+
+    Args:
+        actions (:obj:`list` of :obj:`str`): actions of the task, other than network generation
+        network_filename (:obj:`str`): path to the network
+        prefix (:obj:`str`): prefix for the outputs of the simulation (e.g., ``<prefix>.gdat``)
+        run_network_path (:obj:`str`): path to the ``run_network`` executable
+
+    Returns:
+        :obj:`tuple`: command for executing the task and dictionary that maps the ids of the parameters changed by the
+        task to their new values, or :obj:`None` if the actions can't be executed directly with ``run_network``
+    """
+    parsed_actions = parse_simple_simulation_actions(actions)
+    if parsed_actions is None:
+        return None
+    parameters, args = parsed_actions
+
+    method = RUN_NETWORK_METHODS.get(args.pop('method', '').strip('"'), None)
+    if method is None or 't_end' not in args or set(args.keys()).difference(
+            ['t_start', 't_end', 'n_steps', 'atol', 'rtol', 'seed', 'max_sim_steps']):
+        return None
+
+    try:
+        t_start = float(args.get('t_start', 0.))
+        t_end = float(args['t_end'])
+        n_steps = int(float(args.get('n_steps', 1)))
+        seed = format_run_network_number(args['seed']) if 'seed' in args else str(random.randrange(2 ** 31))
+        atol = format_run_network_number(args.get('atol', 1e-8))
+        rtol = format_run_network_number(args.get('rtol', 1e-8))
+        max_sim_steps = format_run_network_number(args['max_sim_steps']) if 'max_sim_steps' in args else None
+    except ValueError:
+        return None
+
+    command = [run_network_path, '-o', prefix, '-p', method]
+    if method == 'pla':
+        command.append('fEuler|pre-neg:sb|eps=0.03')
+    if method == 'cvode':
+        command.extend(['-a', atol, '-r', rtol])
+    else:
+        command.extend(['-h', seed])
+    if max_sim_steps is not None:
+        command.extend(['-M', max_sim_steps])
+    command.extend(['--cdat', '1', '--fdat', '0'])
+    if t_start != 0.:
+        command.extend(['-i', format_run_network_number(t_start)])
+    command.extend(['-g', network_filename, network_filename,
+                    format_run_network_number((t_end - t_start) / n_steps), str(n_steps)])
+
+    return command, parameters
+
+
+def get_nfsim_task(actions, model_xml_filename, prefix, nfsim_path):
+    """ Get the ``NFsim`` command which executes the actions of a network-free task, mirroring the command that
+    ``BNG2.pl`` would run
+
+    Only actions which set the values of parameters, followed by a single network-free simulation, are supported.
+    The simulation can only be configured with ``t_start``, ``t_end``, ``n_steps``, ``seed``, and ``max_sim_steps``
+    (which, as with ``BNG2.pl``, is ignored).
+
+    Args:
+        actions (:obj:`list` of :obj:`str`): actions of the task
+        model_xml_filename (:obj:`str`): path to the XML file of the model
+        prefix (:obj:`str`): prefix for the outputs of the simulation (e.g., ``<prefix>.gdat``)
+        nfsim_path (:obj:`str`): path to the ``NFsim`` executable
+
+    Returns:
+        :obj:`tuple`: command for executing the task and dictionary that maps the ids of the parameters changed by the
+        task to their new values, or :obj:`None` if the actions can't be executed directly with ``NFsim``
+    """
+    parsed_actions = parse_simple_simulation_actions(actions)
+    if parsed_actions is None:
+        return None
+    parameters, args = parsed_actions
+
+    if args.pop('method', '').strip('"') != 'nf' or 't_end' not in args or set(args.keys()).difference(
+            ['t_start', 't_end', 'n_steps', 'seed', 'max_sim_steps']):
+        return None
+
+    try:
+        t_start = float(args.get('t_start', 0.))
+        t_end = float(args['t_end'])
+        n_steps = int(float(args['n_steps']))
+        seed = format_run_network_number(args['seed']) if 'seed' in args else str(random.randrange(2 ** 31))
+    except (KeyError, ValueError):
+        return None
+
+    if n_steps < 1 or t_end <= t_start:
+        return None
+
+    command = [nfsim_path,
+               '-xml', model_xml_filename,
+               '-o', prefix + '.gdat',
+               '-sim', format_run_network_number(t_end - t_start),
+               '-oSteps', str(n_steps),
+               '-seed', seed,
+               '-ss', prefix + '.species',
+               '-cb']
+
+    return command, parameters
+
+
+def parse_simple_simulation_actions(actions):
+    """ Parse actions which set the values of parameters followed by a single simulation
+
+    Args:
+        actions (:obj:`list` of :obj:`str`): actions
+
+    Returns:
+        :obj:`tuple`: dictionary that maps the ids of the parameters changed by the actions to their new values and
+        dictionary that maps the arguments of the simulation to their values, or :obj:`None` if the actions have
+        another form or set parameters to values which aren't numbers
+    """
+    if not actions:
+        return None
+
+    # parameter changes
+    parameters = {}
+    for action in actions[:-1]:
+        match = SET_PARAMETER_PATTERN.match(action)
+        if not match:
+            return None
+        try:
+            parameters[match.group(1)] = format_run_network_number(match.group(2))
+        except ValueError:
+            return None
+
+    # simulation
+    match = SIMULATE_PATTERN.match(actions[-1])
+    if not match:
+        return None
+
+    args = {}
+    for arg in match.group(1).split(','):
+        key, sep, value = arg.partition('=>')
+        if not sep:
+            return None
+        args[key.strip()] = value.strip()
+
+    return parameters, args
+
+
+def format_run_network_number(value):
+    """ Format a number as an argument of ``run_network`` or ``NFsim`` in the same way as ``BNG2.pl``
+
+    Args:
+        value (:obj:`float` or :obj:`str`): number
+
+    Returns:
+        :obj:`str`: formatted number
+
+    Raises:
+        :obj:`ValueError`: if the value isn't a number
+    """
+    return '{:.15g}'.format(float(value))
+
+
+def kill_process_group(process):
+    """ Kill a process and the other processes of its process group (e.g., ``run_network`` or ``NFsim`` processes
+    launched by ``BNG2.pl``)
+
+    Args:
+        process (:obj:`asyncio.subprocess.Process` or :obj:`subprocess.Popen`): process which leads its process group
+    """
+    try:
+        if hasattr(os, 'killpg'):
+            os.killpg(process.pid, signal.SIGKILL)
+        else:  # pragma: no cover # Windows
+            process.kill()
+    except ProcessLookupError:  # pragma: no cover # process already terminated
+        pass
+
+
+def run_bionetgen_command(command, verbose=True, config=None, log_filename=None):
+    """ Execute a command (e.g., ``BNG2.pl``, ``run_network``, ``NFsim``) within the limits of
+    :obj:`SimulatorConfig.timeout`, :obj:`SimulatorConfig.max_memory`, and :obj:`SimulatorConfig.max_cpu_time`, and
+    get the resources that it used
+
+    If the command times out, its process group is killed.
+
+    Args:
+        command (:obj:`list` of :obj:`str`): command
+        verbose (:obj:`bool`, optional): whether to display diagnostic information
+        config (:obj:`SimulatorConfig`, optional): BioNetGen configuration
+        log_filename (:obj:`str`, optional): path to save the standard output of the command to, rather than
+            displaying it
+
+    Returns:
+        :obj:`dict`: resources used by the command and its child processes (see :obj:`wait_for_bionetgen_process`)
+
+    Raises:
+        :obj:`subprocess.TimeoutExpired`: if the command times out
+        :obj:`subprocess.CalledProcessError`: if the command fails
+    """
+    config = config or SimulatorConfig()
+
+    process = start_bionetgen_process(command, verbose=verbose, config=config, log_filename=log_filename)
+
+    timed_out = threading.Event()
+
+    def kill():
+        if process.poll() is None:
+            timed_out.set()
+            kill_process_group(process)
+
+    timer = None
+    if config.timeout is not None:
+        timer = threading.Timer(config.timeout, kill)
+        timer.daemon = True
+        timer.start()
+
+    try:
+        returncode, resource_usage = wait_for_bionetgen_process(process)
+    except BaseException:
+        kill_process_group(process)
+        process.wait()
         raise
+    finally:
+        if timer is not None:
+            timer.cancel()
 
-    # read the predicted observables of the task
-    results_filename = os.path.join(temp_dirname, 'task.gdat')
-    observable_results = read_simulation_results(results_filename)
+    if timed_out.is_set():
+        raise subprocess.TimeoutExpired(command, config.timeout)
+    if returncode != 0:
+        raise subprocess.CalledProcessError(returncode, command)
+    return resource_usage
 
-    # clean up the temporary directory
-    shutil.rmtree(temp_dirname)
 
-    # return the predicted values of the observables of the task
-    return observable_results
+LAUNCHER_FILENAME = os.path.join(os.path.dirname(__file__), '_launcher.py')
+
+
+def start_bionetgen_process(command, verbose=True, config=None, log_filename=None):
+    """ Start a command (e.g., ``BNG2.pl``, ``run_network``, ``NFsim``) in a new process group, within the limits of
+    :obj:`SimulatorConfig.max_memory` and :obj:`SimulatorConfig.max_cpu_time`
+
+    If :obj:`SimulatorConfig.resource_accounting` is :obj:`True` or the resources of the command are limited, the
+    command is executed by a lightweight launcher (``_launcher.py``) which limits its resources and reports the
+    resources that it used. Otherwise, the command is executed directly. The limits are applied by the launcher, rather
+    than by the process which starts the command, because the latter may have other threads (e.g., which execute other
+    tasks or replicates of ensembles), which makes running code between forking and executing a process unsafe.
+
+    Args:
+        command (:obj:`list` of :obj:`str`): command
+        verbose (:obj:`bool`, optional): whether to display diagnostic information
+        config (:obj:`SimulatorConfig`, optional): BioNetGen configuration
+        log_filename (:obj:`str`, optional): path to save the standard output of the command to, rather than
+            displaying it
+
+    Returns:
+        :obj:`subprocess.Popen`: process, whose ``command`` attribute is the command (rather than the command which
+        launched it) and whose ``resource_usage_fd`` attribute is the file descriptor from which the resources used by
+        the command can be read, or :obj:`None`
+    """
+    config = config or SimulatorConfig()
+    if log_filename:
+        with open(log_filename, 'wb') as log_file:
+            return _start_bionetgen_process(command, config, log_file)
+    return _start_bionetgen_process(command, config, None if verbose else subprocess.DEVNULL)
+
+
+async def async_start_bionetgen_process(command, verbose=True, config=None, log_filename=None):
+    """ Asynchronously start a command (e.g., ``BNG2.pl``) in a new process group (see :obj:`start_bionetgen_process`)
+
+    Args:
+        command (:obj:`list` of :obj:`str`): command
+        verbose (:obj:`bool`, optional): whether to display diagnostic information
+        config (:obj:`SimulatorConfig`, optional): BioNetGen configuration
+        log_filename (:obj:`str`, optional): path to save the standard output of the command to, rather than
+            displaying it
+
+    Returns:
+        :obj:`asyncio.subprocess.Process`: process, whose ``command`` and ``resource_usage_fd`` attributes are the
+        command and the file descriptor from which the resources used by the command can be read, or :obj:`None`
+    """
+    config = config or SimulatorConfig()
+    if log_filename:
+        with open(log_filename, 'wb') as log_file:
+            return await _async_start_bionetgen_process(command, config, log_file)
+    return await _async_start_bionetgen_process(command, config, None if verbose else subprocess.DEVNULL)
+
+
+def _start_bionetgen_process(command, config, stdout):
+    """ Start a command in a new process group (see :obj:`start_bionetgen_process`)
+
+    Args:
+        command (:obj:`list` of :obj:`str`): command
+        config (:obj:`SimulatorConfig`): BioNetGen configuration
+        stdout (:obj:`int` or :obj:`io.IOBase`): standard output of the command
+
+    Returns:
+        :obj:`subprocess.Popen`: process
+    """
+    with _launch_bionetgen_process(command, config) as (launch_command, kwargs, read_fd):
+        process = subprocess.Popen(launch_command, stdout=stdout, start_new_session=True, **kwargs)
+    process.command = list(command)
+    process.resource_usage_fd = read_fd
+    return process
+
+
+async def _async_start_bionetgen_process(command, config, stdout):
+    """ Asynchronously start a command in a new process group (see :obj:`start_bionetgen_process`)
+
+    Args:
+        command (:obj:`list` of :obj:`str`): command
+        config (:obj:`SimulatorConfig`): BioNetGen configuration
+        stdout (:obj:`int` or :obj:`io.IOBase`): standard output of the command
+
+    Returns:
+        :obj:`asyncio.subprocess.Process`: process
+    """
+    with _launch_bionetgen_process(command, config) as (launch_command, kwargs, read_fd):
+        process = await asyncio.create_subprocess_exec(*launch_command, stdout=stdout, start_new_session=True, **kwargs)
+    process.command = list(command)
+    process.resource_usage_fd = read_fd
+    return process
+
+
+@contextlib.contextmanager
+def _launch_bionetgen_process(command, config):
+    """ Get the command and the arguments with which to start a process for a command (see
+    :obj:`start_bionetgen_process`)
+
+    If the resources used by the command are measured or limited, the command is executed by the launcher, which
+    reports them to a pipe. The end of the pipe to which the launcher writes is closed once the process has been
+    started.
+
+    Args:
+        command (:obj:`list` of :obj:`str`): command
+        config (:obj:`SimulatorConfig`): BioNetGen configuration
+
+    Yields:
+        :obj:`tuple`:
+
+            * :obj:`list` of :obj:`str`: command to execute
+            * :obj:`dict`: additional keyword arguments for :obj:`subprocess.Popen`
+            * :obj:`int`: file descriptor from which the resources used by the command can be read, or :obj:`None`
+    """
+    limited = config.max_memory is not None or config.max_cpu_time is not None
+    if not (config.resource_accounting or limited) or not hasattr(os, 'wait4'):
+        yield list(command), {}, None
+        return
+
+    read_fd, write_fd = os.pipe()
+    try:
+        launcher_command = [
+            sys.executable, '-I', '-S', LAUNCHER_FILENAME, str(write_fd),
+            str(config.max_memory or ''), str(config.max_cpu_time or ''),
+        ]
+        yield launcher_command + list(command), {'pass_fds': (write_fd,)}, read_fd
+    except BaseException:
+        os.close(read_fd)
+        raise
+    finally:
+        os.close(write_fd)
+
 
+def wait_for_bionetgen_process(process):
+    """ Wait for a process started by :obj:`start_bionetgen_process` to terminate and get the resources that it used
 
-def get_variables_results_from_observable_results(observable_results, variables):
+    Args:
+        process (:obj:`subprocess.Popen`): process
+
+    Returns:
+        :obj:`tuple`:
+
+            * :obj:`int`: return code of the process (negative for processes terminated by signals)
+            * :obj:`dict`: resources used by the command and its child processes (e.g., ``run_network`` or ``NFsim``
+              processes launched by ``BNG2.pl``): their total CPU (user and system) time (``cpu_time``, in seconds) and
+              their peak resident set size (``max_rss``, in bytes), or :obj:`None` if the resources weren't measured
+              (e.g., the command was executed directly because :obj:`SimulatorConfig.resource_accounting` is
+              :obj:`False` and its resources aren't limited, the process was killed)
+
+    Raises:
+        :obj:`OSError`: if the command couldn't be executed (e.g., the executable doesn't exist)
+    """
+    returncode = process.wait()
+    if process.resource_usage_fd is None:
+        return returncode, None
+
+    with os.fdopen(process.resource_usage_fd, 'rb') as file:
+        reports = file.read()
+    process.resource_usage_fd = None
+
+    return returncode, _get_resource_usage(process, reports)
+
+
+async def async_wait_for_bionetgen_process(process):
+    """ Asynchronously wait for a process started by :obj:`async_start_bionetgen_process` to terminate and get the
+    resources that it used (see :obj:`wait_for_bionetgen_process`)
+
+    The resources are read from the pipe of the launcher by the event loop, concurrently with waiting for the process.
+
+    Args:
+        process (:obj:`asyncio.subprocess.Process`): process
+
+    Returns:
+        :obj:`tuple`:
+
+            * :obj:`int`: return code of the process (negative for processes terminated by signals)
+            * :obj:`dict`: resources used by the command and its child processes, or :obj:`None`
+
+    Raises:
+        :obj:`OSError`: if the command couldn't be executed (e.g., the executable doesn't exist)
+    """
+    if process.resource_usage_fd is None:
+        return await process.wait(), None
+
+    reader = asyncio.StreamReader()
+    transport, _ = await asyncio.get_running_loop().connect_read_pipe(
+        lambda: asyncio.StreamReaderProtocol(reader), os.fdopen(process.resource_usage_fd, 'rb'))
+    process.resource_usage_fd = None
+    try:
+        returncode, reports = await asyncio.gather(process.wait(), reader.read())
+    finally:
+        transport.close()
+
+    return returncode, _get_resource_usage(process, reports)
+
+
+def _get_resource_usage(process, reports):
+    """ Get the resources used by a command from the reports of the launcher which executed it
+
+    Args:
+        process (:obj:`subprocess.Popen` or :obj:`asyncio.subprocess.Process`): process of the launcher
+        reports (:obj:`bytes`): reports, one JSON-encoded dictionary per line
+
+    Returns:
+        :obj:`dict`: resources used by the command and its child processes, or :obj:`None`
+
+    Raises:
+        :obj:`OSError`: if the command couldn't be executed
+    """
+    resource_usage = None
+    for report in reports.splitlines():
+        report = json.loads(report)
+        if 'errno' in report:
+            raise OSError(report['errno'], os.strerror(report['errno']), process.command[0])
+        resource_usage = report
+    return resource_usage
+
+
+def get_observables_for_variables(variables):
+    """ Get the ids of the observables which must be read from the results of a simulation to obtain the predicted
+    values of variables
+
+    Args:
+        variables (:obj:`list` of :obj:`Variable`): variables
+
+    Returns:
+        :obj:`list` of :obj:`str`: ids of the observables
+    """
+    observables = ['time']
+    for variable in variables:
+        if variable.target and variable.id not in observables:
+            observables.append(variable.id)
+    return observables
+
+
+def get_variables_results_from_observable_results(observable_results, variables, number_of_points=None):
     """Get the predicted values of the desired variables
 
+    The results of the variables are views of the rows of a single array of the values of the observables, rather than
+    copies. Variables which represent time share the same view.
+
     Args:
         observable_results (:obj:`pandas.DataFrame`): predicted values of the observables of a simulation
         variables (:obj:`list` of :obj:`Variable`): desired variables
+        number_of_points (:obj:`int`, optional): number of points of the output time course; if provided, only the
+            last :obj:`number_of_points` + 1 time points are returned
 
     Returns:
         :obj:`VariableResults`: predicted values of the desired variables
@@ -388,29 +1767,37 @@ def get_variables_results_from_observable_results(observable_results, variables)
         :obj:`NotImplementedError`: if an unsupported symbol is requested
         :obj:`ValueError`: if an undefined target is requested
     """
+    values = observable_results.to_numpy(dtype=numpy.float64)
+    if not values.flags['C_CONTIGUOUS']:
+        values = numpy.ascontiguousarray(values)
+    if number_of_points is not None:
+        values = values[:, -(number_of_points + 1):]
+    observable_indices = {observable_id: i_observable for i_observable, observable_id in enumerate(observable_results.index)}
+
     variable_results = VariableResults()
     invalid_symbols = set()
     invalid_targets = set()
+    time_result = None
     for variable in variables:
+        variable_result = None
+
         if variable.symbol:
             if variable.symbol == Symbol.time:
-                variable_result = observable_results.loc['time', :]
+                if time_result is None:
+                    time_result = values[observable_indices['time']]
+                variable_result = time_result
 
             else:
-                variable_result = None
                 invalid_symbols.add(variable.symbol)
 
         elif variable.target:
-            try:
-                variable_result = observable_results.loc[variable.id, :]
-            except KeyError:
-                variable_result = None
+            i_observable = observable_indices.get(variable.id, None)
+            if i_observable is None:
                 invalid_targets.add(variable.target)
+            else:
+                variable_result = values[i_observable]
 
-        if variable_result is None:
-            variable_results[variable.id] = variable_result
-        else:
-            variable_results[variable.id] = variable_result.to_numpy()
+        variable_results[variable.id] = variable_result
 
     if invalid_symbols:
         raise NotImplementedError("".join([
@@ -429,3 +1816,49 @@ def get_variables_results_from_observable_results(observable_results, variables)
 
     # result results
     return variable_results
+
+
+def budget_variable_results(variable_results, config=None):
+    """ Copy the results of variables into a single array allocated within the results memory budget of the process
+    (:obj:`SimulatorConfig.results_memory_budget`). Once the budget is exhausted, the array is a memory-mapped file in the
+    scratch directory of the process, and the results are replaced with memory-mapped views of the file.
+
+    Results which are the same array (e.g., time) remain shared. Results which are already views of an array allocated
+    within the budget are left unchanged.
+
+    Args:
+        variable_results (:obj:`VariableResults`): results of variables
+        config (:obj:`SimulatorConfig`, optional): BioNetGen configuration
+
+    Returns:
+        :obj:`int`: number of bytes of results which were spilled to a memory-mapped file, or :obj:`None` if the
+        configuration doesn't have a results memory budget
+    """
+    budget = get_results_memory_budget(config)
+    if budget is None:
+        return None
+
+    results = OrderedDict()
+    for result in variable_results.values():
+        if result is not None and id(result) not in results and not budget.is_allocated(result):
+            results[id(result)] = numpy.asarray(result)
+    if not results:
+        return 0
+
+    dtype = numpy.result_type(*results.values())
+    array, spilled = budget.allocate((sum(result.size for result in results.values()),), dtype=dtype)
+
+    offset = 0
+    views = {}
+    for key, result in results.items():
+        view = views[key] = array[offset:offset + result.size].reshape(result.shape)
+        view[...] = result
+        offset += result.size
+    if spilled:
+        array.flush()
+
+    for variable_id, result in variable_results.items():
+        if result is not None and id(result) in views:
+            variable_results[variable_id] = views[id(result)]
+
+    return array.nbytes if spilled else 0
@@ -0,0 +1,339 @@
+""" Reusable scratch directories for executing BioNetGen tasks
+
+:Author: Jonathan Karr <karr@mssm.edu>
+:Date: 2021-01-05
+:Copyright: 2020-2021, Center for Reproducible Biomedical Modeling
+:License: MIT
+"""
+
+from .config import Config
+import atexit
+import concurrent.futures
+import contextlib
+import numpy
+import os
+import re
+import shutil
+import tempfile
+import threading
+import weakref
+
+__all__ = ['WorkspaceManager', 'get_workspace_manager', 'task_workspace',
+           'ResultsMemoryBudget', 'get_results_memory_budget']
+
+
+class WorkspaceManager(object):
+    """ Manager of the scratch directories (workspaces) of a process
+
+    Each process has a persistent root directory, preferably in a RAM-backed file system (e.g., ``/dev/shm``) when it has
+    enough free space, and otherwise on disk. Each execution of a task acquires a workspace within the root directory.
+    When the execution releases its workspace, the workspace is emptied in a background thread and then returned to the
+    pool of free workspaces so that it can be reused by subsequent executions.
+
+    Attributes:
+        ram_dirname (:obj:`str`): path to a RAM-backed directory in which to create workspaces, or :obj:`None`
+        ram_min_free (:obj:`int`): minimum free space (in bytes) of :obj:`ram_dirname` for it to be used for new
+            workspaces
+        disk_dirname (:obj:`str`): path to the directory in which to create workspaces when :obj:`ram_dirname` is
+            unavailable or doesn't have enough free space
+        roots (:obj:`dict`): dictionary that maps the base directories to the root directories of the workspaces
+            of the process
+        free_workspaces (:obj:`dict`): dictionary that maps each root directory to a list of its free workspaces
+        num_workspaces (:obj:`int`): number of workspaces created by the manager
+        pid (:obj:`int`): id of the process which owns the workspaces
+    """
+
+    ROOT_PATTERN = re.compile(r'^biosimulators-bionetgen-(\d+)$')
+
+    def __init__(self, ram_dirname=None, ram_min_free=0, disk_dirname=None):
+        self.ram_dirname = ram_dirname
+        self.ram_min_free = ram_min_free
+        self.disk_dirname = disk_dirname or tempfile.gettempdir()
+        self.roots = {}
+        self.free_workspaces = {}
+        self.num_workspaces = 0
+        self.pid = os.getpid()
+        self._lock = threading.Lock()
+        self._cleaner = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+
+    def acquire(self):
+        """ Acquire an empty workspace
+
+        Returns:
+            :obj:`str`: path to the workspace
+        """
+        root = self.get_root(self.get_base_dirname())
+        with self._lock:
+            if self.free_workspaces[root]:
+                return self.free_workspaces[root].pop()
+            self.num_workspaces += 1
+            dirname = os.path.join(root, str(self.num_workspaces))
+        os.mkdir(dirname)
+        return dirname
+
+    def release(self, dirname):
+        """ Release a workspace. The workspace is emptied in a background thread and then returned to the pool of free
+        workspaces.
+
+        Args:
+            dirname (:obj:`str`): path to the workspace
+        """
+        self._cleaner.submit(self._clean, dirname)
+
+    def _clean(self, dirname):
+        """ Empty a workspace and return it to the pool of free workspaces
+
+        Args:
+            dirname (:obj:`str`): path to the workspace
+        """
+        try:
+            for entry in os.scandir(dirname):
+                if entry.is_dir(follow_symlinks=False):
+                    shutil.rmtree(entry.path)
+                else:
+                    os.remove(entry.path)
+        except OSError:  # pragma: no cover # workspace couldn't be emptied; don't reuse it
+            shutil.rmtree(dirname, ignore_errors=True)
+            return
+
+        with self._lock:
+            self.free_workspaces[os.path.dirname(dirname)].append(dirname)
+
+    def get_base_dirname(self):
+        """ Get the directory in which a new workspace should be located: :obj:`ram_dirname` if it exists and has at
+        least :obj:`ram_min_free` bytes of free space, otherwise :obj:`disk_dirname`
+
+        Returns:
+            :obj:`str`: path to the directory
+        """
+        if self.ram_dirname and os.path.isdir(self.ram_dirname) and os.access(self.ram_dirname, os.W_OK):
+            try:
+                if shutil.disk_usage(self.ram_dirname).free >= self.ram_min_free:
+                    return self.ram_dirname
+            except OSError:  # pragma: no cover # file system can't be queried
+                pass
+        return self.disk_dirname
+
+    def get_root(self, base_dirname):
+        """ Get the root directory of the workspaces of the process within a base directory, creating it if necessary
+
+        Args:
+            base_dirname (:obj:`str`): base directory
+
+        Returns:
+            :obj:`str`: path to the root directory
+        """
+        with self._lock:
+            root = self.roots.get(base_dirname, None)
+            if root is None:
+                root = self.roots[base_dirname] = os.path.join(base_dirname, 'biosimulators-bionetgen-{}'.format(os.getpid()))
+                self.free_workspaces[root] = []
+                os.makedirs(root, exist_ok=True)
+                self._cleaner.submit(self.remove_stale_roots, base_dirname)
+        return root
+
+    def remove_stale_roots(self, base_dirname):
+        """ Remove the root directories of processes which are no longer running (e.g., processes of pools which exited
+        without running their exit handlers)
+
+        Args:
+            base_dirname (:obj:`str`): base directory
+        """
+        for entry in os.scandir(base_dirname):
+            match = self.ROOT_PATTERN.match(entry.name)
+            if not match or int(match.group(1)) == os.getpid():
+                continue
+            try:
+                os.kill(int(match.group(1)), 0)
+            except ProcessLookupError:
+                shutil.rmtree(entry.path, ignore_errors=True)
+            except OSError:  # pragma: no cover # process is owned by another user
+                pass
+
+    def remove(self):
+        """ Remove all of the workspaces of the process """
+        # forked children inherit the exit handlers of their parents
+        if os.getpid() != self.pid:
+            return
+
+        self._cleaner.shutdown(wait=True)
+        for root in self.roots.values():
+            shutil.rmtree(root, ignore_errors=True)
+        self.roots = {}
+        self.free_workspaces = {}
+
+
+_workspace_managers = {}
+
+
+def get_workspace_manager(config=None):
+    """ Get the workspace manager of the current process
+
+    Args:
+        config (:obj:`Config`, optional): BioNetGen configuration
+
+    Returns:
+        :obj:`WorkspaceManager`: workspace manager
+    """
+    pid = os.getpid()
+    manager = _workspace_managers.get(pid, None)
+    if manager is None:
+        config = config or Config()
+        manager = _workspace_managers[pid] = WorkspaceManager(ram_dirname=config.workspace_ram_dir,
+                                                              ram_min_free=config.workspace_ram_min_free,
+                                                              disk_dirname=config.workspace_dir)
+        atexit.register(manager.remove)
+    return manager
+
+
+@contextlib.contextmanager
+def task_workspace(config=None):
+    """ Context manager which provides an empty directory for executing a task
+
+    If :obj:`Config.reuse_workspaces` is :obj:`True`, the directory is a reusable workspace of the current process.
+    Otherwise, the directory is a new temporary directory which is removed when the context exits.
+
+    Args:
+        config (:obj:`Config`, optional): BioNetGen configuration
+
+    Yields:
+        :obj:`str`: path to the directory
+    """
+    config = config or Config()
+
+    if config.reuse_workspaces:
+        manager = get_workspace_manager(config)
+        dirname = manager.acquire()
+        try:
+            yield dirname
+        finally:
+            manager.release(dirname)
+
+    else:
+        dirname = tempfile.mkdtemp(dir=config.workspace_dir)
+        try:
+            yield dirname
+        finally:
+            shutil.rmtree(dirname)
+
+
+class ResultsMemoryBudget(object):
+    """ Budget for the memory used by the results of the tasks executed by a process
+
+    Arrays for results are allocated in memory until the total size of the live in-memory arrays would exceed the budget.
+    Subsequent arrays are allocated as memory-mapped files (:obj:`numpy.memmap`) in a scratch directory. The memory of
+    an in-memory array is returned to the budget, and the file of a memory-mapped array is removed, once the array and
+    all of its views have been garbage collected.
+
+    Attributes:
+        max_size (:obj:`int`): maximum total size (in bytes) of the in-memory arrays
+        dirname (:obj:`str`): path to the directory in which to create memory-mapped files
+        size (:obj:`int`): total size (in bytes) of the live in-memory arrays
+        num_files (:obj:`int`): number of memory-mapped files created by the budget
+        arrays (:obj:`weakref.WeakValueDictionary`): dictionary that maps the ids of the live arrays allocated by the
+            budget to the arrays
+    """
+
+    def __init__(self, max_size, dirname):
+        self.max_size = max_size
+        self.dirname = dirname
+        self.size = 0
+        self.num_files = 0
+        self.arrays = weakref.WeakValueDictionary()
+        self._lock = threading.Lock()
+
+    def allocate(self, shape, dtype=numpy.float64):
+        """ Allocate an array within the budget
+
+        Args:
+            shape (:obj:`tuple` of :obj:`int`): shape of the array
+            dtype (:obj:`numpy.dtype`, optional): data type of the array
+
+        Returns:
+            :obj:`tuple`:
+
+                * :obj:`numpy.ndarray`: array
+                * :obj:`bool`: whether the array was spilled to a memory-mapped file
+        """
+        size = int(numpy.prod(shape)) * numpy.dtype(dtype).itemsize
+
+        with self._lock:
+            in_memory = size == 0 or self.size + size <= self.max_size
+            if in_memory:
+                self.size += size
+            else:
+                self.num_files += 1
+                filename = os.path.join(self.dirname, 'results-{}.dat'.format(self.num_files))
+
+        if in_memory:
+            array = numpy.empty(shape, dtype=dtype)
+            weakref.finalize(array, self._release, size)
+        else:
+            os.makedirs(self.dirname, exist_ok=True)
+            array = numpy.memmap(filename, dtype=dtype, mode='w+', shape=shape)
+            weakref.finalize(array, _remove_file, filename)
+
+        self.arrays[id(array)] = array
+        return array, not in_memory
+
+    def _release(self, size):
+        """ Return the memory of an in-memory array to the budget
+
+        Args:
+            size (:obj:`int`): size (in bytes) of the array
+        """
+        with self._lock:
+            self.size -= size
+
+    def is_allocated(self, array):
+        """ Determine whether an array is (a view of) an array allocated by the budget
+
+        Args:
+            array (:obj:`numpy.ndarray`): array
+
+        Returns:
+            :obj:`bool`: whether the array was allocated by the budget
+        """
+        while isinstance(array.base, numpy.ndarray):
+            array = array.base
+        return self.arrays.get(id(array), None) is array
+
+
+def _remove_file(filename):
+    """ Remove a file, if it still exists
+
+    Args:
+        filename (:obj:`str`): path to the file
+    """
+    try:
+        os.remove(filename)
+    except OSError:  # pragma: no cover # the scratch directory was already removed
+        pass
+
+
+_results_memory_budgets = {}
+
+
+def get_results_memory_budget(config=None):
+    """ Get the memory budget for the results of the tasks executed by the current process
+
+    Memory-mapped files are created in the scratch directory of the process on disk (within :obj:`Config.workspace_dir`),
+    which is removed when the process exits.
+
+    Args:
+        config (:obj:`Config`, optional): BioNetGen configuration
+
+    Returns:
+        :obj:`ResultsMemoryBudget`: memory budget, or :obj:`None` if :obj:`Config.results_memory_budget` is :obj:`None`
+    """
+    config = config or Config()
+    if config.results_memory_budget is None:
+        return None
+
+    pid = os.getpid()
+    budget = _results_memory_budgets.get(pid, None)
+    if budget is None:
+        manager = get_workspace_manager(config)
+        dirname = os.path.join(manager.get_root(manager.disk_dirname), 'results')
+        budget = _results_memory_budgets[pid] = ResultsMemoryBudget(config.results_memory_budget, dirname)
+    return budget
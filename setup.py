@@ -44,7 +44,10 @@ setuptools.setup(
         'COMBINE',
         'OMEX',
     ],
-    packages=setuptools.find_packages(exclude=['tests', 'tests.*']),
+    packages=setuptools.find_packages(exclude=['tests', 'tests.*', 'benchmarks', 'benchmarks.*']),
+    package_data={
+        'biosimulators_bionetgen': ['substitution_table.json'],
+    },
     install_requires=md.install_requires,
     extras_require=md.extras_require,
     tests_require=md.tests_require,
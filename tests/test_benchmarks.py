@@ -0,0 +1,81 @@
+from benchmarks.core import (STAND_IN_BIONETGEN_PATH, BENCHMARKS, run_benchmarks, compare_benchmark_results,
+                             format_benchmark_results, format_benchmark_comparison, write_benchmark_results,
+                             read_benchmark_results)
+from benchmarks.__main__ import main
+from biosimulators_bionetgen.io import read_simulation_results
+from unittest import mock
+import copy
+import os
+import shutil
+import subprocess
+import tempfile
+import unittest
+
+
+class BenchmarksTestCase(unittest.TestCase):
+    def setUp(self):
+        self.dirname = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.dirname)
+
+    def test_stand_in(self):
+        filename = os.path.join(self.dirname, 'task.bngl')
+        with open(os.path.join(os.path.dirname(__file__), 'fixtures', 'test.bngl'), 'r') as file:
+            model = file.read()
+        with open(filename, 'w') as file:
+            file.write(model)
+            file.write('generate_network({overwrite => 1})\n')
+            file.write('simulate({t_start => 0, t_end => 10, n_steps => 20, method => "ode"})\n')
+            file.write('simulate({t_start => 0, t_end => 5, n_steps => 10, method => "ssa", suffix => "2"})\n')
+
+        with mock.patch.dict(os.environ, {'BNG2_STAND_IN_EXTRA_OBSERVABLES': '3'}):
+            log = subprocess.check_output([STAND_IN_BIONETGEN_PATH, filename, '--outdir', self.dirname]).decode()
+        self.assertIn('CPU TIME: generate_network', log)
+        self.assertIn('CPU TIME: total', log)
+
+        results = read_simulation_results(os.path.join(self.dirname, 'task.gdat'))
+        self.assertEqual(list(results.index), ['time', 'Atot', 'Btot', 'GA00tot', 'GA01tot', 'GA10tot', 'GB00tot', 'GB01tot',
+                                               'GB10tot', 'Extra0', 'Extra1', 'Extra2'])
+        self.assertEqual(results.shape[1], 21)
+        self.assertEqual(results.loc['time', 20], 10.)
+
+        results = read_simulation_results(os.path.join(self.dirname, 'task_2.gdat'))
+        self.assertEqual(results.shape, (12, 11))
+        self.assertEqual(results.loc['time', 10], 5.)
+
+    def test_run_and_compare_benchmarks(self):
+        names = ['read_task', 'preprocess_sed_task', 'read_simulation_results', 'exec_sed_task', 'cli_help']
+        results = run_benchmarks(names=names, num_species=5, num_points=10, repeat=2)
+        self.assertEqual(list(results['benchmarks'].keys()), names)
+        self.assertEqual(results['parameters']['bionetgen_path'], 'stand-in')
+        for timing in results['benchmarks'].values():
+            self.assertGreater(timing['min'], 0.)
+            self.assertLessEqual(timing['min'], timing['median'])
+        self.assertIn('exec_sed_task', format_benchmark_results(results))
+
+        filename = os.path.join(self.dirname, 'results.json')
+        write_benchmark_results(results, filename)
+        self.assertEqual(read_benchmark_results(filename), results)
+
+        regressed_results = copy.deepcopy(results)
+        regressed_results['benchmarks']['read_task']['min'] *= 2
+        del regressed_results['benchmarks']['exec_sed_task']
+        del regressed_results['benchmarks']['cli_help']
+        comparisons = compare_benchmark_results(results, regressed_results, threshold=0.25)
+        self.assertEqual([comparison['name'] for comparison in comparisons], names[0:3])
+        self.assertEqual([comparison['regression'] for comparison in comparisons], [True, False, False])
+        self.assertEqual(comparisons[0]['ratio'], 2.)
+        self.assertIn('REGRESSION', format_benchmark_comparison(comparisons))
+
+        regressed_filename = os.path.join(self.dirname, 'regressed_results.json')
+        write_benchmark_results(regressed_results, regressed_filename)
+        with mock.patch('sys.stdout.write'):
+            self.assertEqual(main(['compare', filename, regressed_filename]), 1)
+            self.assertEqual(main(['compare', filename, regressed_filename, '--threshold', '1.5']), 0)
+            self.assertEqual(main(['compare', filename, filename]), 0)
+
+        with self.assertRaisesRegex(ValueError, 'undefined'):
+            run_benchmarks(names=['undefined'])
+
+        self.assertEqual(len(BENCHMARKS), 9)
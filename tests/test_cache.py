@@ -0,0 +1,320 @@
+from biosimulators_bionetgen.cache import DiskCache, NetworkCache, ModelXmlCache, ResultCache
+from biosimulators_bionetgen.io import read_task
+import biosimulators_bionetgen.utils
+from biosimulators_bionetgen.utils import exec_bionetgen_task, async_exec_bionetgen_task
+from unittest import mock
+import asyncio
+import numpy.testing
+import pandas
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+import unittest
+
+
+class CacheTestCase(unittest.TestCase):
+    def setUp(self):
+        self.dirname = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.dirname)
+
+    def test_DiskCache(self):
+        cache = DiskCache(os.path.join(self.dirname, 'cache'), 10, '.txt')
+
+        filename = os.path.join(self.dirname, 'in.txt')
+        out_filename = os.path.join(self.dirname, 'out.txt')
+        self.assertFalse(cache.read('a', out_filename))
+
+        with open(filename, 'w') as file:
+            file.write('12345')
+        cache.write('a', filename)
+        self.assertTrue(cache.read('a', out_filename))
+        with open(out_filename, 'r') as file:
+            self.assertEqual(file.read(), '12345')
+
+        os.utime(cache.get_filename('a'), (time.time() - 10, time.time() - 10))
+        cache.write('b', filename)
+        self.assertEqual(sorted(os.listdir(cache.dirname)), ['a.txt', 'b.txt'])
+
+        # least recently used entry is evicted
+        cache.write('c', filename)
+        self.assertEqual(sorted(os.listdir(cache.dirname)), ['b.txt', 'c.txt'])
+        self.assertFalse(cache.read('a', out_filename))
+
+    def test_NetworkCache_get_key(self):
+        cache = NetworkCache(self.dirname, 2 ** 20)
+        model_filename = os.path.join(os.path.dirname(__file__), 'fixtures', 'test.bngl')
+
+        task = read_task(model_filename)
+        task.actions = ['generate_network({overwrite => 1})']
+        key = cache.get_key(task, 'BNG2.pl')
+        self.assertRegex(key, r'^[0-9a-f]{64}$')
+
+        # parameter values and expressions of global functions don't affect the key
+        task_2 = read_task(model_filename)
+        task_2.actions = ['setParameter("k_1", 2.0)', 'generate_network({overwrite => 1})']
+        task_2.model['parameters'][0] = 'k_1 = 1.0'
+        task_2.model['functions'][0] = 'gfunc() = 0.5  # comment'
+        self.assertEqual(cache.get_key(task_2, 'BNG2.pl'), key)
+
+        # structural blocks affect the key
+        task_2.model['species'][0] = 'GeneA_00() 2'
+        self.assertNotEqual(cache.get_key(task_2, 'BNG2.pl'), key)
+
+        self.assertNotEqual(cache.get_key(task, '/path/to/BNG2.pl'), key)
+
+        # networks which can't be cached
+        task.actions = []
+        self.assertEqual(cache.get_key(task, 'BNG2.pl'), None)
+
+        task.actions = ['generate_network({overwrite => 1, prefix => "x"})']
+        self.assertEqual(cache.get_key(task, 'BNG2.pl'), None)
+
+        task.actions = ['generate_network({overwrite => 1})']
+        task.model['compartments'] = ['EC 3 1.0']
+        self.assertEqual(cache.get_key(task, 'BNG2.pl'), None)
+
+    def test_NetworkCache_get_generate_network_action(self):
+        self.assertEqual(NetworkCache.get_generate_network_action('generate_network({overwrite => 1})', 'network'),
+                         'generate_network({overwrite => 1, prefix => "network"})')
+        self.assertEqual(NetworkCache.get_generate_network_action('generate_network({})', 'network'),
+                         'generate_network({prefix => "network"})')
+
+    def test_exec_bionetgen_task_with_network_cache(self):
+        model_filename = os.path.join(os.path.dirname(__file__), 'fixtures', 'test.bngl')
+        cache_dirname = os.path.join(self.dirname, 'cache')
+
+        def get_task(new_value):
+            task = read_task(model_filename)
+            task.actions = [
+                'setParameter("g1", {})'.format(new_value),
+                'generate_network({overwrite => 1})',
+                'simulate({t_start => 0, t_end => 10, n_steps => 10, method => "ode"})',
+            ]
+            task.model['functions'][0] = 'gfunc() = {}'.format(new_value)
+            return task
+
+        expected_results = exec_bionetgen_task(get_task(20.0), verbose=False)
+
+        with mock.patch.dict(os.environ, {'BIONETGEN_NETWORK_CACHE_DIR': cache_dirname}):
+            results = exec_bionetgen_task(get_task(10.0), verbose=False)
+            self.assertEqual(len(os.listdir(cache_dirname)), 1)
+
+            with mock.patch.object(NetworkCache, 'write', side_effect=Exception('network should be reused')):
+                cached_results = exec_bionetgen_task(get_task(20.0), verbose=False)
+
+        numpy.testing.assert_allclose(cached_results.to_numpy(), expected_results.to_numpy())
+        self.assertFalse(numpy.allclose(results.to_numpy(), expected_results.to_numpy()))
+
+    def test_exec_bionetgen_task_with_network_cache_and_initial_amounts_of_parameters(self):
+        model_filename = os.path.join(os.path.dirname(__file__), 'fixtures', 'test.bngl')
+
+        def get_task(new_value):
+            task = read_task(model_filename)
+            task.model['parameters'].append('A0 4.0')
+            task.model['species'] = [line.replace('A() 4', 'A() 2*A0') for line in task.model['species']]
+            task.actions = [
+                'generate_network({overwrite => 1})',
+                'simulate({t_start => 0, t_end => 10, n_steps => 10, method => "ode"})',
+            ]
+            if new_value is not None:
+                task.actions.insert(0, 'setParameter("A0", {})'.format(new_value))
+            return task
+
+        # the network is generated before the changes are applied, but the initial amounts of species are evaluated
+        # from the changed parameters
+        for direct_run_network in ['1', '0']:
+            cache_dirname = os.path.join(self.dirname, 'cache-' + direct_run_network)
+            with mock.patch.dict(os.environ, {'BIONETGEN_DIRECT_RUN_NETWORK': direct_run_network}):
+                for new_value in [100.0, 7.0, None]:
+                    expected_results = exec_bionetgen_task(get_task(new_value), verbose=False)
+                    with mock.patch.dict(os.environ, {'BIONETGEN_NETWORK_CACHE_DIR': cache_dirname}):
+                        cached_results = exec_bionetgen_task(get_task(new_value), verbose=False)
+                    self.assertEqual(len(os.listdir(cache_dirname)), 1)
+                    self.assertEqual(expected_results.loc['Atot'][0], 2 * (4.0 if new_value is None else new_value))
+                    numpy.testing.assert_allclose(cached_results.to_numpy(), expected_results.to_numpy())
+
+    def test_ModelXmlCache_get_key(self):
+        cache = ModelXmlCache(self.dirname, 2 ** 20)
+        model_filename = os.path.join(os.path.dirname(__file__), 'fixtures', 'test.bngl')
+
+        model = read_task(model_filename).model
+        key = cache.get_key(model, 'BNG2.pl')
+        self.assertRegex(key, r'^[0-9a-f]{64}$')
+
+        # comments and white space don't affect the key
+        model['parameters'][0] = '  k_1   0.0  # comment'
+        self.assertEqual(cache.get_key(model, 'BNG2.pl'), key)
+
+        # parameter values affect the key
+        model['parameters'][0] = 'k_1 1.0'
+        self.assertNotEqual(cache.get_key(model, 'BNG2.pl'), key)
+
+    def test_ModelXmlCache_set_model_xml_parameters(self):
+        filename = os.path.join(self.dirname, 'model.xml')
+        with open(filename, 'w') as file:
+            file.write('\n'.join([
+                '<sbml>',
+                '      <Parameter id="k" type="Constant" value="1" expr="1.0"/>',
+                '      <Parameter id="k2" type="Constant" value="2" expr="2*k^2"/>',
+                '      <Parameter id="k3" type="Constant" value="3" expr="min(k2,3)+exp(0)*_pi-_pi"/>',
+                '      <Parameter id="k4" type="Constant" value="1e-5" expr="1E-5"/>',
+                '      <Species id="S1"  concentration="k2" name="A()">',
+                '</sbml>',
+                '',
+            ]))
+
+        ModelXmlCache.set_model_xml_parameters(filename, {'k': '0.5'})
+        with open(filename, 'r') as file:
+            self.assertEqual(file.read().split('\n')[1:6], [
+                '      <Parameter id="k" type="Constant" value="0.5" expr="0.5"/>',
+                '      <Parameter id="k2" type="Constant" value="0.5" expr="2*k^2"/>',
+                '      <Parameter id="k3" type="Constant" value="0.5" expr="min(k2,3)+exp(0)*_pi-_pi"/>',
+                '      <Parameter id="k4" type="Constant" value="1e-5" expr="1E-5"/>',
+                '      <Species id="S1"  concentration="k2" name="A()">',
+            ])
+
+        with self.assertRaisesRegex(ValueError, 'does not have parameters'):
+            ModelXmlCache.set_model_xml_parameters(filename, {'k5': '1'})
+
+    def test_ModelXmlCache_evaluate_parameter(self):
+        self.assertEqual(ModelXmlCache.evaluate_parameter('a', {'a': '(-2)^2 + ln(_e) * b', 'b': '3 / 4'}, {}, set()), 4.75)
+
+        for expressions in [
+            {'a': 'b'},
+            {'a': 'b', 'b': 'a'},
+            {'a': 'if(1 > 0, 1, 2)'},
+            {'a': '1 > 0'},
+            {'a': 'unknown(1)'},
+            {'a': '1 / 0'},
+            {'a': 'sqrt(-1)'},
+            {'a': '"x"'},
+        ]:
+            with self.assertRaises(ValueError):
+                ModelXmlCache.evaluate_parameter('a', expressions, {}, set())
+
+    def test_ModelXmlCache_read_model_xml(self):
+        cache = ModelXmlCache(os.path.join(self.dirname, 'cache'), 2 ** 20)
+        filename = os.path.join(self.dirname, 'model.xml')
+        out_filename = os.path.join(self.dirname, 'out.xml')
+        self.assertFalse(cache.read_model_xml('a', out_filename))
+
+        with open(filename, 'w') as file:
+            file.write('      <Parameter id="k" type="Constant" value="1" expr="1.0"/>\n')
+        cache.write('a', filename)
+        self.assertTrue(cache.read_model_xml('a', out_filename, {'k': '2'}))
+        with open(out_filename, 'r') as file:
+            self.assertEqual(file.read(), '      <Parameter id="k" type="Constant" value="2" expr="2"/>\n')
+
+        self.assertFalse(cache.read_model_xml('a', out_filename, {'k2': '2'}))
+
+    def test_ResultCache_is_reproducible(self):
+        self.assertTrue(ResultCache.is_reproducible([
+            'setParameter("k_1", 2.0)',
+            'generate_network({overwrite => 1})',
+            'simulate({t_end => 10, n_steps => 10, method => "ode"})',
+        ]))
+        self.assertTrue(ResultCache.is_reproducible(['simulate({t_end => 10, n_steps => 10, method => "ssa", seed => 1})']))
+        self.assertTrue(ResultCache.is_reproducible(['simulate_nf({t_end => 10, n_steps => 10, seed => 1})']))
+
+        # unseeded stochastic simulations
+        self.assertFalse(ResultCache.is_reproducible(['simulate({t_end => 10, n_steps => 10, method => "ssa"})']))
+        self.assertFalse(ResultCache.is_reproducible(['simulate({t_end => 10, n_steps => 10, method => "nf"})']))
+        self.assertFalse(ResultCache.is_reproducible(['simulate_pla({t_end => 10, n_steps => 10})']))
+
+        # unknown methods, unknown actions, actions which read files, and tasks without simulations
+        self.assertFalse(ResultCache.is_reproducible(['simulate({t_end => 10, n_steps => 10})']))
+        self.assertFalse(ResultCache.is_reproducible(['readFile({file => "x.net"})',
+                                                      'simulate({t_end => 10, method => "ode"})']))
+        self.assertFalse(ResultCache.is_reproducible(['ode']))
+        self.assertFalse(ResultCache.is_reproducible(['generate_network({overwrite => 1})']))
+
+    def test_ResultCache_get_key(self):
+        cache = ResultCache(self.dirname, 2 ** 20)
+        model_filename = os.path.join(os.path.dirname(__file__), 'fixtures', 'test.bngl')
+
+        task = read_task(model_filename)
+        task.actions = ['simulate({t_end => 10, n_steps => 10, method => "ode"})']
+        key = cache.get_key(task, '2.5.0')
+        self.assertRegex(key, r'^[0-9a-f]{64}$')
+
+        self.assertNotEqual(cache.get_key(task, '2.6.0'), key)
+
+        task.model['parameters'][0] = 'k_1 1.0'
+        self.assertNotEqual(cache.get_key(task, '2.5.0'), key)
+
+        task.actions = ['simulate({t_end => 10, n_steps => 10, method => "ssa"})']
+        self.assertEqual(cache.get_key(task, '2.5.0'), None)
+
+    def test_ResultCache_read_write_results(self):
+        cache = ResultCache(os.path.join(self.dirname, 'cache'), 2 ** 20)
+        self.assertEqual(cache.read_results('a'), None)
+
+        results = pandas.DataFrame([[0., 1., 2.], [3., 4., 5.], [6., 7., 8.]], index=['time', 'A', 'B'])
+        cache.write_results('a', results)
+
+        cached_results = cache.read_results('a')
+        self.assertEqual(list(cached_results.index), ['time', 'A', 'B'])
+        numpy.testing.assert_equal(cached_results.to_numpy(), results.to_numpy())
+
+        cached_results = cache.read_results('a', observables=['time', 'B', 'C'])
+        self.assertEqual(list(cached_results.index), ['time', 'B'])
+        numpy.testing.assert_equal(cached_results.to_numpy(), results.loc[['time', 'B'], :].to_numpy())
+
+    def test_exec_bionetgen_task_with_result_cache(self):
+        model_filename = os.path.join(os.path.dirname(__file__), 'fixtures', 'test.bngl')
+        cache_dirname = os.path.join(self.dirname, 'cache')
+
+        def get_task(method, seed=None):
+            task = read_task(model_filename)
+            task.actions = [
+                'generate_network({overwrite => 1})',
+                'simulate({{t_start => 0, t_end => 10, n_steps => 10, method => "{}"{}}})'.format(
+                    method, ', seed => {}'.format(seed) if seed is not None else ''),
+            ]
+            return task
+
+        with mock.patch.dict(os.environ, {'BIONETGEN_RESULT_CACHE_DIR': cache_dirname}):
+            results = exec_bionetgen_task(get_task('ode'), verbose=False, observables=['time', 'Atot'])
+            self.assertEqual(results.attrs['result_cache'], 'miss')
+            self.assertEqual(list(results.index), ['time', 'Atot'])
+            self.assertEqual(len(os.listdir(cache_dirname)), 1)
+
+            with mock.patch('biosimulators_bionetgen.utils.run_bionetgen_command',
+                            side_effect=Exception('results should be reused')):
+                cached_results = exec_bionetgen_task(get_task('ode'), verbose=False)
+                self.assertEqual(cached_results.attrs['result_cache'], 'hit')
+                numpy.testing.assert_equal(cached_results.loc[['time', 'Atot'], :].to_numpy(), results.to_numpy())
+
+                cached_results = asyncio.run(async_exec_bionetgen_task(get_task('ode'), verbose=False))
+                self.assertEqual(cached_results.attrs['result_cache'], 'hit')
+
+            # seeded stochastic simulations are cached
+            results = exec_bionetgen_task(get_task('ssa', seed=1), verbose=False)
+            self.assertEqual(results.attrs['result_cache'], 'miss')
+            self.assertEqual(exec_bionetgen_task(get_task('ssa', seed=1), verbose=False).attrs['result_cache'], 'hit')
+            self.assertEqual(len(os.listdir(cache_dirname)), 2)
+
+            # unseeded stochastic simulations are never cached
+            results = exec_bionetgen_task(get_task('ssa'), verbose=False)
+            self.assertNotIn('result_cache', results.attrs)
+            self.assertEqual(len(os.listdir(cache_dirname)), 2)
+
+        # the version of BioNetGen is only determined once
+        with mock.patch('biosimulators_bionetgen.get_simulator_version', side_effect=Exception('version should be memoized')):
+            self.assertEqual(biosimulators_bionetgen.utils.get_memoized_simulator_version(),
+                             subprocess.check_output([biosimulators_bionetgen.utils.SimulatorConfig().bionetgen_path, '--version'])
+                             .decode().strip().split(' ')[2])
+
+        # the version of the BioNetGen executable of the configuration is determined
+        other_bionetgen_path = os.path.join(self.dirname, 'BNG2.pl')
+        with open(other_bionetgen_path, 'w') as file:
+            file.write('#!/bin/sh\necho "BioNetGen version 0.0.1"\n')
+        os.chmod(other_bionetgen_path, 0o755)
+        config = biosimulators_bionetgen.utils.SimulatorConfig()
+        config.bionetgen_path = other_bionetgen_path
+        config.version_cache_dir = None
+        self.assertEqual(biosimulators_bionetgen.utils.get_memoized_simulator_version(config), '0.0.1')
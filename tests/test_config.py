@@ -11,3 +11,128 @@ class ConfigTestCase(unittest.TestCase):
 
         with mock.patch.dict(os.environ, {'BIONETGEN_PATH': '/path/to/BNG2.pl'}):
             self.assertEqual(Config().bionetgen_path, '/path/to/BNG2.pl')
+
+    def test_Config_network_cache(self):
+        with mock.patch.dict(os.environ, {'BIONETGEN_NETWORK_CACHE_DIR': '', 'BIONETGEN_NETWORK_CACHE_MAX_SIZE': '1000'}):
+            config = Config()
+            self.assertEqual(config.network_cache_dir, None)
+            self.assertEqual(config.network_cache_max_size, 1000)
+
+        with mock.patch.dict(os.environ, {'BIONETGEN_NETWORK_CACHE_DIR': '/path/to/cache'}):
+            self.assertEqual(Config().network_cache_dir, '/path/to/cache')
+
+    def test_Config_workers(self):
+        with mock.patch.dict(os.environ, {'BIONETGEN_NUM_WORKERS': '4', 'BIONETGEN_FAIL_FAST': 'true', 'BIONETGEN_BATCH_TASKS': '1'}):
+            config = Config()
+            self.assertEqual(config.num_workers, 4)
+            self.assertTrue(config.fail_fast)
+            self.assertTrue(config.batch_tasks)
+
+        with mock.patch.dict(os.environ, {'BIONETGEN_NUM_WORKERS': '1', 'BIONETGEN_FAIL_FAST': '0'}):
+            config = Config()
+            self.assertEqual(config.num_workers, 1)
+            self.assertFalse(config.fail_fast)
+
+    def test_Config_workspaces(self):
+        with mock.patch.dict(os.environ, {'BIONETGEN_REUSE_WORKSPACES': '1',
+                                          'BIONETGEN_WORKSPACE_DIR': '/path/to/scratch',
+                                          'BIONETGEN_WORKSPACE_RAM_DIR': '',
+                                          'BIONETGEN_WORKSPACE_RAM_MIN_FREE': '1000'}):
+            config = Config()
+            self.assertTrue(config.reuse_workspaces)
+            self.assertEqual(config.workspace_dir, '/path/to/scratch')
+            self.assertEqual(config.workspace_ram_dir, None)
+            self.assertEqual(config.workspace_ram_min_free, 1000)
+
+    def test_Config_run_network(self):
+        with mock.patch.dict(os.environ, {'BIONETGEN_DIRECT_RUN_NETWORK': '0', 'BIONETGEN_RUN_NETWORK_PATH': '/path/to/run_network'}):
+            config = Config()
+            self.assertFalse(config.direct_run_network)
+            self.assertEqual(config.run_network_path, '/path/to/run_network')
+
+        with mock.patch.dict(os.environ, {'BIONETGEN_RUN_NETWORK_PATH': ''}):
+            config = Config()
+            self.assertTrue(config.direct_run_network)
+            self.assertEqual(config.run_network_path, None)
+
+    def test_Config_nfsim(self):
+        with mock.patch.dict(os.environ, {'BIONETGEN_MODEL_XML_CACHE_DIR': '/path/to/cache',
+                                          'BIONETGEN_MODEL_XML_CACHE_MAX_SIZE': '1000',
+                                          'BIONETGEN_DIRECT_NFSIM': 'false',
+                                          'BIONETGEN_NFSIM_PATH': '/path/to/NFsim'}):
+            config = Config()
+            self.assertEqual(config.model_xml_cache_dir, '/path/to/cache')
+            self.assertEqual(config.model_xml_cache_max_size, 1000)
+            self.assertFalse(config.direct_nfsim)
+            self.assertEqual(config.nfsim_path, '/path/to/NFsim')
+
+    def test_Config_results_memory_budget(self):
+        with mock.patch.dict(os.environ, {'BIONETGEN_RESULTS_MEMORY_BUDGET': '1000'}):
+            self.assertEqual(Config().results_memory_budget, 1000)
+
+        with mock.patch.dict(os.environ, {'BIONETGEN_RESULTS_MEMORY_BUDGET': ''}):
+            self.assertEqual(Config().results_memory_budget, None)
+
+    def test_Config_result_cache(self):
+        with mock.patch.dict(os.environ, {'BIONETGEN_RESULT_CACHE_DIR': '/path/to/cache',
+                                          'BIONETGEN_RESULT_CACHE_MAX_SIZE': '1000'}):
+            config = Config()
+            self.assertEqual(config.result_cache_dir, '/path/to/cache')
+            self.assertEqual(config.result_cache_max_size, 1000)
+
+    def test_Config_parameter_scans(self):
+        self.assertTrue(Config().parameter_scans)
+        with mock.patch.dict(os.environ, {'BIONETGEN_PARAMETER_SCANS': '0'}):
+            self.assertFalse(Config().parameter_scans)
+
+    def test_Config_resource_limits(self):
+        config = Config()
+        self.assertEqual(config.timeout, None)
+        self.assertEqual(config.max_memory, None)
+        self.assertEqual(config.max_cpu_time, None)
+        self.assertFalse(config.resource_accounting)
+
+        with mock.patch.dict(os.environ, {'BIONETGEN_TIMEOUT': '2.5',
+                                          'BIONETGEN_MAX_MEMORY': '1000000',
+                                          'BIONETGEN_MAX_CPU_TIME': '10',
+                                          'BIONETGEN_RESOURCE_ACCOUNTING': '1'}):
+            config = Config()
+            self.assertEqual(config.timeout, 2.5)
+            self.assertEqual(config.max_memory, 1000000)
+            self.assertEqual(config.max_cpu_time, 10)
+            self.assertTrue(config.resource_accounting)
+
+    def test_Config_phase_timing(self):
+        self.assertFalse(Config().phase_timing)
+
+        with mock.patch.dict(os.environ, {'BIONETGEN_PHASE_TIMING': '1'}):
+            self.assertTrue(Config().phase_timing)
+
+    def test_Config_version_cache(self):
+        with mock.patch.dict(os.environ, {'XDG_CACHE_HOME': '/path/to/cache'}):
+            self.assertEqual(Config().version_cache_dir, os.path.join('/path/to/cache', 'biosimulators_bionetgen'))
+
+        with mock.patch.dict(os.environ, {'BIONETGEN_VERSION_CACHE_DIR': '/path/to/versions'}):
+            self.assertEqual(Config().version_cache_dir, '/path/to/versions')
+
+        with mock.patch.dict(os.environ, {'BIONETGEN_VERSION_CACHE_DIR': ''}):
+            self.assertEqual(Config().version_cache_dir, None)
+
+    def test_Config_task_cache(self):
+        config = Config()
+        self.assertEqual(config.task_cache_size, 32)
+        self.assertEqual(config.task_cache_hash, False)
+
+        with mock.patch.dict(os.environ, {'BIONETGEN_TASK_CACHE_SIZE': '0', 'BIONETGEN_TASK_CACHE_HASH': '1'}):
+            config = Config()
+        self.assertEqual(config.task_cache_size, 0)
+        self.assertEqual(config.task_cache_hash, True)
+
+    def test_Config_bulk_model_changes_threshold(self):
+        self.assertEqual(Config().bulk_model_changes_threshold, 64)
+
+        with mock.patch.dict(os.environ, {'BIONETGEN_BULK_MODEL_CHANGES_THRESHOLD': '10'}):
+            self.assertEqual(Config().bulk_model_changes_threshold, 10)
+
+        with mock.patch.dict(os.environ, {'BIONETGEN_BULK_MODEL_CHANGES_THRESHOLD': ''}):
+            self.assertEqual(Config().bulk_model_changes_threshold, None)
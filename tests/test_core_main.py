@@ -8,24 +8,36 @@
 
 
 from biosimulators_bionetgen import __main__
-from biosimulators_bionetgen.core import exec_sed_task, exec_sedml_docs_in_combine_archive
+import biosimulators_bionetgen.core
+from biosimulators_bionetgen.config import Config as SimulatorConfig
+from biosimulators_bionetgen.core import (exec_sed_task, exec_sed_doc, exec_sedml_docs_in_combine_archive,
+                                          async_exec_sed_task, async_exec_sed_doc, exec_sed_task_ensemble,
+                                          preprocess_sed_task, get_bionetgen_task_for_sed_task, exec_independent_sed_tasks)
+from biosimulators_bionetgen.data_model import Task as BnglTask
+from biosimulators_bionetgen.io import get_task_cache, format_task
+import biosimulators_bionetgen.io
 from biosimulators_utils.combine import data_model as combine_data_model
 from biosimulators_utils.combine.io import CombineArchiveWriter
 from biosimulators_utils.config import get_config
 from biosimulators_utils.report import data_model as report_data_model
 from biosimulators_utils.report.io import ReportReader
 from biosimulators_utils.sedml import data_model as sedml_data_model
+from biosimulators_utils.sedml.exceptions import SedmlExecutionError
 from biosimulators_utils.sedml.io import SedmlSimulationWriter
 from biosimulators_utils.sedml.utils import append_all_nested_children_to_doc
 from biosimulators_utils.simulator.exec import exec_sedml_docs_in_archive_with_containerized_simulator
 from biosimulators_utils.simulator.specs import gen_algorithms_from_specs
 from unittest import mock
+import asyncio
+import concurrent.futures
 import copy
 import datetime
 import dateutil.tz
 import numpy
 import os
 import shutil
+import subprocess
+import sys
 import tempfile
 import unittest
 
@@ -44,9 +56,10 @@ class CliTestCase(unittest.TestCase):
         doc.models[0].source = os.path.join(os.path.dirname(__file__), 'fixtures', 'test.bngl')
 
         variables = [data_gen.variables[0] for data_gen in doc.data_generators]
-        variable_results, _ = exec_sed_task(doc.tasks[0], variables)
+        variable_results, log = exec_sed_task(doc.tasks[0], variables)
 
         self.assertEqual(set(variable_results.keys()), set([var.id for var in variables]))
+        self.assertNotIn('cpu_time', log.simulator_details)
         for var in variables:
             self.assertFalse(numpy.any(numpy.isnan(variable_results[var.id])))
         sim = doc.tasks[0].simulation
@@ -55,6 +68,12 @@ class CliTestCase(unittest.TestCase):
                                       numpy.linspace(sim.output_start_time, sim.output_end_time, sim.number_of_points + 1))
         numpy.testing.assert_allclose(variable_results['var_A'][0], 4, rtol=1e-1)
 
+        # resource accounting
+        with mock.patch.dict(os.environ, {'BIONETGEN_RESOURCE_ACCOUNTING': '1'}):
+            _, log = exec_sed_task(doc.tasks[0], variables)
+        self.assertGreater(log.simulator_details['cpu_time'], 0.)
+        self.assertGreater(log.simulator_details['max_rss'], 0)
+
         doc2 = copy.deepcopy(doc)
         doc2.tasks[0].model.changes.append(sedml_data_model.ModelAttributeChange(
             target='species.A().initialCount',
@@ -73,13 +92,238 @@ class CliTestCase(unittest.TestCase):
         numpy.testing.assert_allclose(variable_results_3['var_A'][0], 6, rtol=1e-1)
         self.assertGreater(variable_results_3['var_A'][0], variable_results_2['var_A'][0])
 
+    def test_preprocess_sed_task_reuses_parsed_models(self):
+        doc = self._build_sed_doc()
+        doc.models[0].source = os.path.join(os.path.dirname(__file__), 'fixtures', 'test.bngl')
+        variables = [data_gen.variables[0] for data_gen in doc.data_generators]
+
+        get_task_cache().clear()
+        with mock.patch('biosimulators_bionetgen.io._read_task', wraps=biosimulators_bionetgen.io._read_task) as read_task:
+            preprocessed_task = preprocess_sed_task(doc.tasks[0], variables)
+            preprocessed_task_2 = preprocess_sed_task(doc.tasks[0], variables[0:1])
+        self.assertEqual(read_task.call_count, 1)
+        self.assertEqual(get_task_cache().get_statistics()['hits'], 1)
+
+        bionetgen_task = get_bionetgen_task_for_sed_task(doc.tasks[0], preprocessed_task)
+        self.assertIn('gfunc() = 0.5*Atot^2/(10 + Atot^2)', bionetgen_task.model['functions'])
+        self.assertNotIn('gfunc() = 0.5*Atot^2/(10 + Atot^2)', preprocessed_task_2['bionetgen_task'].model['functions'])
+        self.assertNotEqual(preprocessed_task['bionetgen_task'].model['observables'],
+                            preprocessed_task_2['bionetgen_task'].model['observables'])
+
+        # the BNGL text of the model is pre-rendered with slots for the lines which the changes replace
+        template = preprocessed_task['bionetgen_task'].template
+        self.assertEqual(template.slots, [('functions', 0)])
+        self.assertIs(bionetgen_task.template, template)
+        self.assertEqual(format_task(bionetgen_task), format_task(BnglTask(model=bionetgen_task.model, actions=bionetgen_task.actions)))
+
+    def test_exec_sed_task_with_phase_timing(self):
+        doc = self._build_sed_doc()
+        doc.models[0].source = os.path.join(os.path.dirname(__file__), 'fixtures', 'test.bngl')
+        variables = [data_gen.variables[0] for data_gen in doc.data_generators]
+
+        _, log = exec_sed_task(doc.tasks[0], variables)
+        self.assertNotIn('phase_timings', log.simulator_details)
+
+        with mock.patch.dict(os.environ, {'BIONETGEN_PHASE_TIMING': '1'}):
+            expected_results, _ = exec_sed_task(doc.tasks[0], variables)
+            with mock.patch('sys.stdout.write') as write:
+                variable_results, log = exec_sed_task(doc.tasks[0], variables)
+            self.assertIn('CPU TIME: total', ''.join(call[0][0] for call in write.call_args_list))
+        for var in variables:
+            numpy.testing.assert_allclose(variable_results[var.id], expected_results[var.id])
+
+        timings = log.simulator_details['phase_timings']
+        self.assertEqual(set(timings.keys()), set([
+            'validate', 'read_task', 'preprocess_model', 'prepare_task', 'result_cache', 'write_task', 'bionetgen',
+            'bionetgen_generate_network', 'bionetgen_simulate', 'read_results', 'extract_variables', 'budget_results',
+        ]))
+        for duration in timings.values():
+            self.assertGreaterEqual(duration, 0.)
+        self.assertGreater(timings['bionetgen'], 0.)
+        self.assertLessEqual(timings['bionetgen_simulate'], timings['bionetgen'])
+
+        with mock.patch.dict(os.environ, {'BIONETGEN_PHASE_TIMING': '1'}):
+            _, log = asyncio.run(async_exec_sed_task(doc.tasks[0], variables))
+        self.assertIn('bionetgen_simulate', log.simulator_details['phase_timings'])
+
+    def test_exec_sed_task_with_phase_timing_enabled_by_simulator_config(self):
+        doc = self._build_sed_doc()
+        doc.models[0].source = os.path.join(os.path.dirname(__file__), 'fixtures', 'test.bngl')
+        variables = [data_gen.variables[0] for data_gen in doc.data_generators]
+
+        simulator_config = SimulatorConfig()
+        simulator_config.phase_timing = True
+        with mock.patch.dict(os.environ, {'BIONETGEN_PHASE_TIMING': '0'}):
+            _, log = exec_sed_task(doc.tasks[0], variables, simulator_config=simulator_config)
+            self.assertGreater(log.simulator_details['phase_timings']['bionetgen'], 0.)
+
+            _, log = asyncio.run(async_exec_sed_task(doc.tasks[0], variables, simulator_config=simulator_config))
+            self.assertGreater(log.simulator_details['phase_timings']['bionetgen'], 0.)
+
+            _, log = exec_sed_task(doc.tasks[0], variables)
+            self.assertNotIn('phase_timings', log.simulator_details)
+
+    def test_exec_sed_task_with_results_memory_budget(self):
+        doc = self._build_sed_doc()
+        doc.models[0].source = os.path.join(os.path.dirname(__file__), 'fixtures', 'test.bngl')
+        variables = [data_gen.variables[0] for data_gen in doc.data_generators]
+
+        expected_results, log = exec_sed_task(doc.tasks[0], variables)
+        self.assertNotIn('spilled_bytes', log.simulator_details)
+
+        with mock.patch.dict(os.environ, {'BIONETGEN_RESULTS_MEMORY_BUDGET': '0',
+                                          'BIONETGEN_WORKSPACE_DIR': self.dirname}):
+            with mock.patch('biosimulators_bionetgen.workspace._results_memory_budgets', {}):
+                with mock.patch('biosimulators_bionetgen.workspace._workspace_managers', {}):
+                    with mock.patch('atexit.register'):
+                        variable_results, log = exec_sed_task(doc.tasks[0], variables)
+
+        self.assertEqual(set(variable_results.keys()), set(expected_results.keys()))
+        for var in variables:
+            self.assertIsInstance(variable_results[var.id], numpy.memmap)
+            numpy.testing.assert_allclose(variable_results[var.id], expected_results[var.id])
+        self.assertEqual(log.simulator_details['spilled_bytes'],
+                         sum(variable_results[var.id].nbytes for var in variables))
+
+    def test_exec_independent_sed_tasks_with_results_memory_budget(self):
+        doc = self._build_sed_doc()
+        doc.models[0].source = 'test.bngl'
+        working_dir = os.path.join(os.path.dirname(__file__), 'fixtures')
+        variables = [data_gen.variables[0] for data_gen in doc.data_generators]
+
+        with mock.patch.dict(os.environ, {'BIONETGEN_RESULTS_MEMORY_BUDGET': '0',
+                                          'BIONETGEN_WORKSPACE_DIR': self.dirname,
+                                          'BIONETGEN_NUM_WORKERS': '2'}):
+            with mock.patch('biosimulators_bionetgen.workspace._results_memory_budgets', {}):
+                with mock.patch('biosimulators_bionetgen.workspace._workspace_managers', {}):
+                    with mock.patch('atexit.register'):
+                        task_results = exec_independent_sed_tasks(doc, working_dir)
+
+        variable_results, log, _, exception = task_results[doc.tasks[0].id]
+        self.assertEqual(exception, None)
+        for var in variables:
+            self.assertIsInstance(variable_results[var.id], numpy.memmap)
+
+        # the results are only spilled (and counted) by the parent process
+        self.assertEqual(log.simulator_details['spilled_bytes'],
+                         sum(variable_results[var.id].nbytes for var in variables))
+
+    def test_exec_sed_task_with_result_cache(self):
+        doc = self._build_sed_doc()
+        doc.models[0].source = os.path.join(os.path.dirname(__file__), 'fixtures', 'test.bngl')
+        variables = [data_gen.variables[0] for data_gen in doc.data_generators]
+
+        with mock.patch.dict(os.environ, {'BIONETGEN_RESULT_CACHE_DIR': os.path.join(self.dirname, 'cache')}):
+            expected_results, log = exec_sed_task(doc.tasks[0], variables)
+            self.assertEqual(log.simulator_details['result_cache_hits'], 0)
+            self.assertEqual(log.simulator_details['result_cache_misses'], 1)
+
+            variable_results, log = exec_sed_task(doc.tasks[0], variables)
+            self.assertEqual(log.simulator_details['result_cache_hits'], 1)
+            self.assertEqual(log.simulator_details['result_cache_misses'], 0)
+
+        for var in variables:
+            numpy.testing.assert_equal(variable_results[var.id], expected_results[var.id])
+
+    def test_exec_sed_task_with_simulator_config(self):
+        doc = self._build_sed_doc()
+        doc.models[0].source = 'test.bngl'
+        working_dir = os.path.join(os.path.dirname(__file__), 'fixtures')
+        variables = [data_gen.variables[0] for data_gen in doc.data_generators]
+
+        # the configuration passed to the tasks, rather than the environment, configures their execution
+        simulator_config = SimulatorConfig()
+        simulator_config.result_cache_dir = os.path.join(self.dirname, 'cache')
+        simulator_config.num_workers = 2
+
+        task = copy.deepcopy(doc.tasks[0])
+        task.model.source = os.path.join(working_dir, task.model.source)
+        _, log = exec_sed_task(task, variables, simulator_config=simulator_config)
+        self.assertEqual(log.simulator_details['result_cache_misses'], 1)
+
+        _, log = asyncio.run(async_exec_sed_task(task, variables, simulator_config=simulator_config))
+        self.assertEqual(log.simulator_details['result_cache_hits'], 1)
+
+        # the configuration is also passed to the processes of the pool
+        for _ in range(2):
+            task_results = exec_independent_sed_tasks(doc, working_dir, simulator_config=simulator_config)
+            _, log, _, exception = task_results[doc.tasks[0].id]
+            self.assertEqual(exception, None)
+        self.assertEqual(log.simulator_details['result_cache_hits'], 1)
+
+    def test_exec_sed_task_ensemble(self):
+        doc = self._build_sed_doc(algorithm=sedml_data_model.Algorithm(kisao_id='KISAO_0000029'))
+        doc.models[0].source = os.path.join(os.path.dirname(__file__), 'fixtures', 'test.bngl')
+        variables = [data_gen.variables[0] for data_gen in doc.data_generators]
+
+        results, log = exec_sed_task_ensemble(doc.tasks[0], variables, 5, seed=1, quantiles=(0.5,))
+        self.assertEqual(list(results.keys()), ['mean', 'std', 0.5])
+        for statistic_results in results.values():
+            self.assertEqual(set(statistic_results.keys()), set(var.id for var in variables))
+        sim = doc.tasks[0].simulation
+        numpy.testing.assert_allclose(results['mean']['var_time'],
+                                      numpy.linspace(sim.output_start_time, sim.output_end_time, sim.number_of_points + 1))
+        numpy.testing.assert_allclose(results['std']['var_time'], 0., atol=1e-12)
+        self.assertEqual(log.algorithm, 'KISAO_0000029')
+        self.assertEqual(log.simulator_details['num_replicates'], 5)
+
+        results_2, _ = exec_sed_task_ensemble(doc.tasks[0], variables, 5, seed=1, quantiles=(0.5,))
+        for var in variables:
+            numpy.testing.assert_allclose(results_2['mean'][var.id], results['mean'][var.id])
+
+    def test_async_exec_sed_task(self):
+        doc = self._build_sed_doc()
+        doc.models[0].source = os.path.join(os.path.dirname(__file__), 'fixtures', 'test.bngl')
+        variables = [data_gen.variables[0] for data_gen in doc.data_generators]
+
+        expected_results, _ = exec_sed_task(doc.tasks[0], variables)
+
+        async def exec_tasks():
+            return await asyncio.gather(*[async_exec_sed_task(doc.tasks[0], variables) for i in range(2)])
+
+        for variable_results, log in asyncio.run(exec_tasks()):
+            self.assertEqual(set(variable_results.keys()), set(expected_results.keys()))
+            for var in variables:
+                numpy.testing.assert_allclose(variable_results[var.id], expected_results[var.id])
+            self.assertEqual(log.algorithm, 'KISAO_0000019')
+
+    def test_exec_sed_task_concurrently_with_shared_preprocessed_task(self):
+        doc = self._build_sed_doc()
+        doc.models[0].source = os.path.join(os.path.dirname(__file__), 'fixtures', 'test.bngl')
+        variables = [data_gen.variables[0] for data_gen in doc.data_generators]
+
+        tasks = []
+        for i_task in range(4):
+            task = copy.deepcopy(doc.tasks[0])
+            task.model.changes[0].new_value = '{}*Atot^2/(10 + Atot^2)'.format(0.5 + i_task)
+            task.model.changes[1].new_value = task.model.changes[0].new_value
+            task.model.changes[2].new_value = str(4 + i_task)
+            tasks.append(task)
+        expected_results = [exec_sed_task(task, variables)[0] for task in tasks]
+
+        preprocessed_task = preprocess_sed_task(tasks[0], variables)
+        bionetgen_task = preprocessed_task['bionetgen_task']
+        model_text = format_task(bionetgen_task)
+        with concurrent.futures.ThreadPoolExecutor(max_workers=len(tasks)) as executor:
+            results = list(executor.map(lambda task: exec_sed_task(task, variables, preprocessed_task=preprocessed_task),
+                                        tasks * 2))
+
+        for i_result, (variable_results, log) in enumerate(results):
+            for var in variables:
+                numpy.testing.assert_allclose(variable_results[var.id], expected_results[i_result % len(tasks)][var.id])
+            self.assertIn('setConcentration("A()", {})'.format(4 + i_result % len(tasks)), log.simulator_details['actions'])
+
+        # the preprocessed task isn't modified
+        self.assertEqual(format_task(bionetgen_task), model_text)
+        self.assertEqual(bionetgen_task.actions, [])
+
     def test_exec_sed_task_positive_initial_time(self):
         doc = self._build_sed_doc()
         doc.models[0].source = os.path.join(os.path.dirname(__file__), 'fixtures', 'test.bngl')
         doc.simulations[0].initial_time = 0.1
 
         variables = [data_gen.variables[0] for data_gen in doc.data_generators]
-        variable_results, _ = exec_sed_task(doc.tasks[0], variables)
+        variable_results, log = exec_sed_task(doc.tasks[0], variables)
 
         self.assertEqual(set(variable_results.keys()), set([var.id for var in variables]))
         for var in variables:
@@ -98,7 +342,7 @@ class CliTestCase(unittest.TestCase):
         doc.simulations[0].number_of_points = 20
 
         variables = [data_gen.variables[0] for data_gen in doc.data_generators]
-        variable_results, _ = exec_sed_task(doc.tasks[0], variables)
+        variable_results, log = exec_sed_task(doc.tasks[0], variables)
 
         self.assertEqual(set(variable_results.keys()), set([var.id for var in variables]))
         for var in variables:
@@ -134,6 +378,144 @@ class CliTestCase(unittest.TestCase):
         numpy.testing.assert_allclose(results['var_time'],
                                       numpy.linspace(sim.output_start_time, sim.output_end_time, sim.number_of_points + 1))
 
+    def test_exec_sed_doc_in_parallel(self):
+        doc = self._build_sed_doc()
+        shutil.copyfile(os.path.join(os.path.dirname(__file__), 'fixtures', 'test.bngl'),
+                        os.path.join(self.dirname, 'model_1.bngl'))
+
+        model_2 = copy.deepcopy(doc.models[0])
+        model_2.id = 'model_2'
+        model_2.changes[2].new_value = '6'
+        doc.models.append(model_2)
+        task_2 = sedml_data_model.Task(id='task_2', model=model_2, simulation=doc.simulations[0])
+        doc.tasks.append(task_2)
+        for data_gen in list(doc.data_generators):
+            data_gen_2 = sedml_data_model.DataGenerator(
+                id=data_gen.id + '_2',
+                variables=[sedml_data_model.Variable(
+                    id=data_gen.variables[0].id + '_2',
+                    symbol=data_gen.variables[0].symbol,
+                    target=data_gen.variables[0].target,
+                    task=task_2,
+                )],
+                math=data_gen.variables[0].id + '_2',
+            )
+            doc.data_generators.append(data_gen_2)
+            doc.outputs[0].data_sets.append(sedml_data_model.DataSet(
+                id='data_set_' + data_gen_2.id, label=data_gen_2.id, data_generator=data_gen_2))
+
+        config = get_config()
+        config.REPORT_FORMATS = [report_data_model.ReportFormat.csv]
+
+        seq_out_dir = os.path.join(self.dirname, 'seq')
+        _, seq_log = exec_sed_doc(doc, self.dirname, seq_out_dir, config=config)
+
+        with open(os.path.join(seq_out_dir, 'report_1.csv'), 'rb') as file:
+            seq_report = file.read()
+
+        for num_workers, batch_tasks in [(2, False), (1, True), (2, True)]:
+            simulator_config = SimulatorConfig()
+            simulator_config.num_workers = num_workers
+            simulator_config.batch_tasks = batch_tasks
+            par_out_dir = os.path.join(self.dirname, 'par-{}-{}'.format(num_workers, batch_tasks))
+            _, par_log = exec_sed_doc(doc, self.dirname, par_out_dir, config=config, simulator_config=simulator_config)
+
+            with open(os.path.join(par_out_dir, 'report_1.csv'), 'rb') as file:
+                par_report = file.read()
+            self.assertEqual(par_report, seq_report)
+
+            for task_id in ['task_1', 'task_2']:
+                self.assertEqual(par_log.tasks[task_id].status, seq_log.tasks[task_id].status)
+                self.assertEqual(par_log.tasks[task_id].algorithm, 'KISAO_0000019')
+                self.assertEqual(par_log.tasks[task_id].simulator_details['actions'],
+                                 seq_log.tasks[task_id].simulator_details['actions'])
+
+        async_out_dir = os.path.join(self.dirname, 'async')
+        _, async_log = asyncio.run(async_exec_sed_doc(doc, self.dirname, async_out_dir, config=config))
+        with open(os.path.join(async_out_dir, 'report_1.csv'), 'rb') as file:
+            self.assertEqual(file.read(), seq_report)
+        for task_id in ['task_1', 'task_2']:
+            self.assertEqual(async_log.tasks[task_id].simulator_details['actions'],
+                             seq_log.tasks[task_id].simulator_details['actions'])
+        self.assertFalse(hasattr(async_log, 'phase_timings'))
+
+        simulator_config = SimulatorConfig()
+        simulator_config.phase_timing = True
+        _, timed_log = exec_sed_doc(doc, self.dirname, os.path.join(self.dirname, 'timed'),
+                                    config=config, simulator_config=simulator_config)
+        self.assertGreater(timed_log.phase_timings['bionetgen'], 0.)
+        self.assertAlmostEqual(timed_log.phase_timings['bionetgen'],
+                               sum(timed_log.tasks[task_id].simulator_details['phase_timings']['bionetgen']
+                                   for task_id in ['task_1', 'task_2']))
+
+        # error handling
+        doc.models[0].changes.append(sedml_data_model.ModelAttributeChange(target='parameters.undefined', new_value='1'))
+        simulator_config.fail_fast = True
+        simulator_config.batch_tasks = False
+        with self.assertRaisesRegex(SedmlExecutionError, 'non-zero exit status'):
+            exec_sed_doc(doc, self.dirname, os.path.join(self.dirname, 'err'),
+                         config=config, simulator_config=simulator_config)
+
+    def test_exec_sed_doc_with_parameter_scan(self):
+        doc = self._build_sed_doc()
+        shutil.copyfile(os.path.join(os.path.dirname(__file__), 'fixtures', 'test.bngl'),
+                        os.path.join(self.dirname, 'model_1.bngl'))
+
+        scan_range = sedml_data_model.VectorRange(id='range_1', values=[2., 4., 8.5, 4.])
+        repeated_task = sedml_data_model.RepeatedTask(
+            id='repeated_task_1',
+            range=scan_range,
+            ranges=[scan_range],
+            changes=[sedml_data_model.SetValueComputeModelChange(
+                target='parameters.g0.value',
+                model=doc.models[0],
+                range=scan_range,
+                math='range_1',
+            )],
+            sub_tasks=[sedml_data_model.SubTask(order=1, task=doc.tasks[0])],
+            reset_model_for_each_iteration=True,
+        )
+        doc.tasks.append(repeated_task)
+        report = sedml_data_model.Report(id='report_2')
+        for data_gen in list(doc.data_generators):
+            data_gen_2 = sedml_data_model.DataGenerator(
+                id=data_gen.id + '_scan',
+                variables=[sedml_data_model.Variable(
+                    id=data_gen.variables[0].id + '_scan',
+                    symbol=data_gen.variables[0].symbol,
+                    target=data_gen.variables[0].target,
+                    task=repeated_task,
+                )],
+                math=data_gen.variables[0].id + '_scan',
+            )
+            doc.data_generators.append(data_gen_2)
+            report.data_sets.append(sedml_data_model.DataSet(id='data_set_' + data_gen_2.id, label=data_gen_2.id,
+                                                             data_generator=data_gen_2))
+        doc.outputs.append(report)
+
+        config = get_config()
+        config.REPORT_FORMATS = [report_data_model.ReportFormat.csv]
+
+        reports = {}
+        for parameter_scans in [False, True]:
+            simulator_config = SimulatorConfig()
+            simulator_config.parameter_scans = parameter_scans
+            out_dir = os.path.join(self.dirname, str(parameter_scans))
+            with mock.patch('biosimulators_bionetgen.core.exec_bionetgen_task',
+                            wraps=biosimulators_bionetgen.core.exec_bionetgen_task) as exec_task:
+                with mock.patch('biosimulators_bionetgen.core.exec_bionetgen_parameter_scan',
+                                wraps=biosimulators_bionetgen.core.exec_bionetgen_parameter_scan) as exec_scan:
+                    _, log = exec_sed_doc(doc, self.dirname, out_dir, config=config, simulator_config=simulator_config)
+
+            self.assertEqual(exec_task.call_count, 1 if parameter_scans else 5)
+            self.assertEqual(exec_scan.call_count, 1 if parameter_scans else 0)
+            self.assertEqual(log.tasks['repeated_task_1'].status.value, 'SUCCEEDED')
+
+            with open(os.path.join(out_dir, 'report_2.csv'), 'r') as file:
+                reports[parameter_scans] = file.read()
+
+        self.assertEqual(reports[True], reports[False])
+
     def test_exec_sedml_docs_in_combine_archive(self):
         doc, archive_filename = self._build_combine_archive()
 
@@ -362,6 +744,20 @@ class CliTestCase(unittest.TestCase):
         for data_set_result in report_results.values():
             self.assertFalse(numpy.any(numpy.isnan(data_set_result)))
 
+    def test_cli_imports_are_lazy(self):
+        modules = subprocess.check_output([sys.executable, '-c', (
+            'import biosimulators_bionetgen.__main__, sys; '
+            'from biosimulators_bionetgen import Config; '
+            'print(" ".join(sys.modules.keys()))'
+        )], env=dict(os.environ, PYTHONPATH=os.path.dirname(os.path.dirname(__file__)))).decode().split()
+        for module in ['biosimulators_bionetgen.core', 'biosimulators_bionetgen.utils', 'pandas', 'kisao',
+                       'biosimulators_utils.sedml.exec']:
+            self.assertNotIn(module, modules)
+
+        self.assertIs(biosimulators_bionetgen.exec_sed_task, exec_sed_task)
+        with self.assertRaises(AttributeError):
+            biosimulators_bionetgen.undefined
+
     def test_raw_cli(self):
         with mock.patch('sys.argv', ['', '--help']):
             with self.assertRaises(SystemExit) as context:
@@ -1,6 +1,9 @@
 from biosimulators_bionetgen.data_model import Model, ModelBlock, Task, KISAO_SIMULATION_METHOD_ARGUMENTS_MAP
+import copy
 import json
 import os
+import pickle
+import random
 import unittest
 
 
@@ -20,6 +23,72 @@ class DataModelTestCase(unittest.TestCase):
         self.assertEqual(len(model['parameters']), 2)
         self.assertEqual(len(model['molecule types']), 3)
 
+    def test_Model_deferred_blocks(self):
+        read_blocks = []
+
+        def read_block(lines):
+            read_blocks.append(lines)
+            return ModelBlock(lines)
+
+        model = Model()
+        model['parameters'] = ModelBlock(['k_1 0.0'])
+        model.set_deferred_block('species', lambda: read_block(['A() 1']))
+        model.set_deferred_block('observables', lambda: read_block(['Molecules A A()']))
+        self.assertEqual(list(model.keys()), ['parameters', 'species', 'observables'])
+        self.assertIn('species', model)
+        self.assertEqual(read_blocks, [])
+
+        self.assertEqual(model['species'], ['A() 1'])
+        self.assertIs(model.get('species'), model['species'])
+        self.assertEqual(model.get('reactions', None), None)
+        self.assertEqual(read_blocks, [['A() 1']])
+
+        model_2 = Model()
+        model_2['parameters'] = ModelBlock(['k_1 0.0'])
+        model_2['species'] = ModelBlock(['A() 1'])
+        model_2['observables'] = ModelBlock(['Molecules A A()'])
+        self.assertEqual(model, model_2)
+        self.assertFalse(model != model_2)
+        self.assertEqual(read_blocks, [['A() 1'], ['Molecules A A()']])
+
+        model.set_deferred_block('species', lambda: read_block(['B() 1']))
+        self.assertNotEqual(model, model_2)
+        self.assertEqual(list(model.keys()), ['parameters', 'species', 'observables'])
+
+        model.set_deferred_block('species', lambda: read_block(['A() 1']))
+        self.assertEqual(list(model.values()), [['k_1 0.0'], ['A() 1'], ['Molecules A A()']])
+
+        model.set_deferred_block('species', lambda: read_block(['A() 1']))
+        self.assertEqual(model.pop('species'), ['A() 1'])
+        self.assertEqual(model.popitem(), ('observables', ['Molecules A A()']))
+
+    def test_Model_find_block_line(self):
+        model = Model()
+        model['parameters'] = ModelBlock(['k_1 1.0', 'k_2 = 2.0', 'k_1 3.0'])
+        model['seed species'] = ModelBlock(['$A() 1', 'B(b) k_1'])
+        self.assertEqual(model.find_block_line('compartments', 'c'), None)
+
+        i_line, match = model.find_block_line('parameters', 'k_1')
+        self.assertEqual(i_line, 0)
+        self.assertEqual(match.group(3), '1.0')
+        self.assertEqual(model.find_block_line('parameters', 'k_2')[0], 1)
+        self.assertEqual(model.find_block_line('parameters', 'k_3'), None)
+        self.assertEqual(model.find_block_line('seed species', 'A()')[0], 0)
+        self.assertEqual(model.find_block_line('seed species', 'B(b)')[1].group(3), 'k_1')
+
+        model['parameters'].insert(0, 'k_3 0.0')
+        self.assertEqual(model.find_block_line('parameters', 'k_2')[0], 2)
+        model['parameters'][2] = 'k_4 4.0'
+        self.assertEqual(model.find_block_line('parameters', 'k_2'), None)
+        self.assertEqual(model.find_block_line('parameters', 'k_4')[0], 2)
+        model['parameters'] = ModelBlock(['k_2 2.0'])
+        self.assertEqual(model.find_block_line('parameters', 'k_2')[0], 0)
+
+        model_2 = copy.deepcopy(model)
+        self.assertEqual(model_2, model)
+        self.assertEqual(model_2._block_indexes, {})
+        self.assertEqual(model_2.find_block_line('parameters', 'k_2')[0], 0)
+
     def test_ModelBlock_is_equal(self):
         block_1 = ModelBlock([
             'A', 'B',
@@ -50,6 +119,90 @@ class DataModelTestCase(unittest.TestCase):
         self.assertFalse(block_3.is_equal(block_1))
         self.assertTrue(block_4.is_equal(block_1))
 
+    def test_ModelBlock_get_fingerprint(self):
+        block = ModelBlock(['A', 'B  # comment', ' ', 'C'])
+        self.assertEqual(block.get_fingerprint(), ModelBlock(['C', 'B', 'A']).get_fingerprint())
+        self.assertEqual(block.get_fingerprint(), ModelBlock(['C', 'B', 'A', 'A']).get_fingerprint())
+        self.assertNotEqual(block.get_fingerprint(), ModelBlock(['C', 'B']).get_fingerprint())
+        self.assertEqual(ModelBlock().get_fingerprint(), ModelBlock(['', '# A']).get_fingerprint())
+
+        # the fingerprint is maintained as the block is edited in place
+        rand = random.Random(0)
+        lines = ['A', 'B', 'C # comment', 'D', '  E  ', '', '# F']
+        for i_edit in range(2000):
+            edit = rand.randrange(11)
+            if edit == 0:
+                block.append(rand.choice(lines))
+            elif edit == 1:
+                block.insert(rand.randrange(len(block) + 1), rand.choice(lines))
+            elif edit == 2:
+                block.extend(iter(rand.sample(lines, 2)))
+            elif edit == 3:
+                block += [rand.choice(lines)]
+            elif edit == 4 and block:
+                block[rand.randrange(len(block))] = rand.choice(lines)
+            elif edit == 5:
+                block[1:3] = iter(rand.sample(lines, rand.randrange(4)))
+            elif edit == 6 and block:
+                del block[rand.randrange(len(block))]
+            elif edit == 7:
+                del block[::3]
+            elif edit == 8 and block:
+                block.pop(rand.randrange(len(block)))
+            elif edit == 9 and block:
+                block.remove(rand.choice(block))
+            elif edit == 10:
+                block *= rand.randrange(3)
+            if i_edit % 100 == 0:
+                block.clear()
+
+            self.assertEqual(block.get_fingerprint(), ModelBlock(list(block)).get_fingerprint())
+
+        # copies are fingerprinted independently
+        block = ModelBlock(['A', 'B'])
+        fingerprint = block.get_fingerprint()
+        for block_2 in [copy.copy(block), copy.deepcopy(block), pickle.loads(pickle.dumps(block)),
+                        pickle.loads(pickle.dumps(block, protocol=0))]:
+            self.assertEqual(block_2, block)
+            self.assertEqual(block_2.get_fingerprint(), fingerprint)
+            block_2.append('C')
+            self.assertEqual(block_2.get_fingerprint(), ModelBlock(['A', 'B', 'C']).get_fingerprint())
+        self.assertEqual(block.get_fingerprint(), fingerprint)
+
+    def test_Model_get_fingerprint(self):
+        model_1 = Model()
+        model_1['parameters'] = ModelBlock(['k_1 1.0'])
+        model_1['molecule types'] = ModelBlock(['A()', 'B()'])
+
+        model_2 = Model()
+        model_2['molecule types'] = ModelBlock(['B()', 'A()'])
+        model_2.set_deferred_block('parameters', lambda: ModelBlock(['k_1 1.0']))
+        self.assertEqual(model_1.get_fingerprint(), model_2.get_fingerprint())
+
+        model_1['parameters'][0] = 'k_1 2.0'
+        self.assertNotEqual(model_1.get_fingerprint(), model_2.get_fingerprint())
+        model_2['parameters'].append('k_1 2.0')
+        model_2['parameters'].remove('k_1 1.0')
+        self.assertEqual(model_1.get_fingerprint(), model_2.get_fingerprint())
+
+        model_2['species'] = ModelBlock()
+        self.assertNotEqual(model_1.get_fingerprint(), model_2.get_fingerprint())
+
+        # blocks of different types with the same lines
+        self.assertNotEqual(Model([('parameters', ModelBlock(['A']))]).get_fingerprint(),
+                            Model([('functions', ModelBlock(['A']))]).get_fingerprint())
+
+        # blocks which are lists
+        self.assertEqual(Model([('parameters', ['A'])]).get_fingerprint(),
+                         Model([('parameters', ModelBlock(['A']))]).get_fingerprint())
+
+        task_1 = Task(model=model_1, actions=['simulate()', 'generate_network()'])
+        task_2 = Task(model=copy.deepcopy(model_1), actions=['generate_network()', 'simulate()'])
+        self.assertEqual(task_1.get_fingerprint(), task_2.get_fingerprint())
+        task_2.model['molecule types'].append('C()')
+        self.assertNotEqual(task_1.get_fingerprint(), task_2.get_fingerprint())
+        self.assertNotEqual(Task(model=Model()).get_fingerprint(), Task().get_fingerprint())
+
     def test_Block_is_equal(self):
         model_1 = Model()
         model_1['parameters'] = ModelBlock(['A'])
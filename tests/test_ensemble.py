@@ -0,0 +1,75 @@
+from biosimulators_bionetgen.ensemble import get_ensemble_seeds, EnsembleStatistics, QuantileEstimator
+import numpy
+import numpy.testing
+import pandas
+import unittest
+
+
+class EnsembleTestCase(unittest.TestCase):
+    def test_get_ensemble_seeds(self):
+        seeds = get_ensemble_seeds(10, seed=1)
+        self.assertEqual(len(seeds), 10)
+        self.assertEqual(len(set(seeds)), 10)
+        for seed in seeds:
+            self.assertGreaterEqual(seed, 0)
+            self.assertLess(seed, 2 ** 31)
+
+        self.assertEqual(get_ensemble_seeds(10, seed=1), seeds)
+        self.assertEqual(get_ensemble_seeds(5, seed=1), seeds[0:5])
+        self.assertNotEqual(get_ensemble_seeds(10, seed=2), seeds)
+
+    def test_EnsembleStatistics(self):
+        rng = numpy.random.default_rng(1)
+        replicates = rng.normal(loc=2., scale=3., size=(2000, 2, 4))
+
+        statistics = EnsembleStatistics(quantiles=(0.1, 0.5, 0.9))
+        with self.assertRaisesRegex(ValueError, 'No replicates'):
+            statistics.get_mean()
+
+        for replicate in replicates:
+            statistics.add(pandas.DataFrame(replicate, index=['time', 'A'], columns=range(4)))
+        self.assertEqual(statistics.num_replicates, 2000)
+
+        mean = statistics.get_mean()
+        self.assertEqual(list(mean.index), ['time', 'A'])
+        self.assertEqual(list(mean.columns), list(range(4)))
+        numpy.testing.assert_allclose(mean.to_numpy(), replicates.mean(axis=0))
+        numpy.testing.assert_allclose(statistics.get_variance().to_numpy(), replicates.var(axis=0, ddof=1))
+        numpy.testing.assert_allclose(statistics.get_std().to_numpy(), replicates.std(axis=0, ddof=1))
+        for quantile in statistics.quantiles:
+            numpy.testing.assert_allclose(statistics.get_quantile(quantile).to_numpy(),
+                                          numpy.quantile(replicates, quantile, axis=0), atol=0.3)
+
+        with self.assertRaisesRegex(ValueError, 'must be the same'):
+            statistics.add(pandas.DataFrame(replicates[0], index=['time', 'B'], columns=range(4)))
+        with self.assertRaisesRegex(ValueError, 'must be the same'):
+            statistics.add(pandas.DataFrame(replicates[0][:, 0:3], index=['time', 'A'], columns=range(3)))
+
+        statistics = EnsembleStatistics()
+        statistics.add(pandas.DataFrame(replicates[0], index=['time', 'A']))
+        self.assertTrue(numpy.all(numpy.isnan(statistics.get_variance().to_numpy())))
+
+    def test_QuantileEstimator(self):
+        rng = numpy.random.default_rng(2)
+        values = rng.exponential(size=(3000, 5))
+
+        estimator = QuantileEstimator((0.25, 0.5, 0.99))
+        with self.assertRaisesRegex(ValueError, 'No values'):
+            estimator.get(0.5)
+        with self.assertRaisesRegex(ValueError, 'is not estimated'):
+            estimator.get(0.75)
+
+        # exact until five arrays have been added
+        for i_value in range(4):
+            estimator.add(values[i_value])
+            numpy.testing.assert_allclose(estimator.get(0.5), numpy.median(values[0:i_value + 1], axis=0))
+
+        for value in values[4:]:
+            estimator.add(value)
+        self.assertEqual(estimator.heights.shape, (5, 3, 5))
+        for quantile, atol in [(0.25, 0.05), (0.5, 0.05), (0.99, 0.5)]:
+            numpy.testing.assert_allclose(estimator.get(quantile), numpy.quantile(values, quantile, axis=0), atol=atol)
+
+        # markers remain ordered
+        self.assertTrue(numpy.all(numpy.diff(estimator.heights, axis=0) >= 0))
+        self.assertTrue(numpy.all(numpy.diff(estimator.positions, axis=0) >= 1))
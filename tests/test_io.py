@@ -1,14 +1,20 @@
 from biosimulators_bionetgen.config import Config
 from biosimulators_bionetgen.data_model import Task, Model, ModelBlock
-from biosimulators_bionetgen.io import write_task, read_task, read_simulation_results
+from biosimulators_bionetgen.io import (write_task, format_task, read_task, read_simulation_results, iter_simulation_results,
+                                       TaskCache, get_task_cache, TaskTemplate)
 from biosimulators_bionetgen.warnings import IgnoredBnglFileContentWarning
+from unittest import mock
+import biosimulators_bionetgen.io
 import numpy
+import pandas
 import numpy.testing
 import os
 import pytest
 import shutil
 import subprocess
 import tempfile
+import threading
+import time
 import unittest
 
 
@@ -58,6 +64,51 @@ class DataModelTestCase(unittest.TestCase):
         task2 = read_task(filename)
         self.assertTrue(task2.is_equal(task))
 
+        self.assertEqual(format_task(task), ''.join(lines))
+
+    def test_TaskTemplate(self):
+        model = Model()
+        model['parameters'] = ModelBlock(['k_1 1.0', 'k_2 2.0', 'k_3 3.0'])
+        model['seed species'] = ModelBlock(['A() k_1'])
+        model['functions'] = ModelBlock(['f() = k_1', 'g() = k_2'])
+        actions = ['simulate({method => "ode"})']
+
+        template = TaskTemplate(model, slots=[('parameters', 0), ('parameters', 2), ('functions', 1)])
+        self.assertTrue(template.is_valid_for(model))
+        self.assertEqual(format_task(Task(model=model, actions=actions, template=template)),
+                         format_task(Task(model=model, actions=actions)))
+
+        # slots are filled with the current lines of the model
+        model['parameters'][2] = 'k_3 4.0'
+        model['functions'][1] = 'g() = 2 * k_2'
+        self.assertEqual(format_task(Task(model=model, actions=actions, template=template)),
+                         format_task(Task(model=model, actions=actions)))
+
+        # copies of the model whose blocks with slots are copied and whose other blocks are shared
+        model_copy = Model([('parameters', ModelBlock(model['parameters'])), ('seed species', model['seed species']),
+                            ('functions', ModelBlock(model['functions']))])
+        model_copy['parameters'][0] = 'k_1 5.0'
+        self.assertEqual(model['parameters'][0], 'k_1 1.0')
+        self.assertTrue(template.is_valid_for(model_copy))
+        self.assertEqual(format_task(Task(model=model_copy, actions=actions, template=template)),
+                         format_task(Task(model=model_copy, actions=actions)))
+
+        # the template is invalid for other models
+        model['functions'].append('h() = k_3')
+        self.assertFalse(template.is_valid_for(model))
+        self.assertIn('h() = k_3', format_task(Task(model=model, actions=actions, template=template)))
+
+        model_copy['seed species'] = ModelBlock(['A() k_2'])
+        self.assertFalse(template.is_valid_for(model_copy))
+        model_copy.pop('seed species')
+        self.assertFalse(template.is_valid_for(model_copy))
+        self.assertFalse(template.is_valid_for(Model([('parameters', model['parameters']), ('species', model['seed species']),
+                                                      ('functions', model['functions'])])))
+
+        # template without slots
+        template = TaskTemplate(model)
+        self.assertEqual(template.segments, [format_task(Task(model=model))])
+
     def test_read_task(self):
         filename = os.path.join(self.dirname, 'model.bngl')
         with open(filename, 'w') as file:
@@ -82,6 +133,131 @@ class DataModelTestCase(unittest.TestCase):
         read_task(os.path.join(os.path.dirname(__file__), 'fixtures', 'test.bngl'))
         read_task(os.path.join(os.path.dirname(__file__), 'fixtures', 'dolan.bngl'))
 
+    def test_read_task_defers_blocks(self):
+        filename = os.path.join(self.dirname, 'model.bngl')
+        with open(filename, 'w') as file:
+            file.write('begin model\n')
+            file.write('\tbegin  parameters # comment\n')
+            file.write('    k_1  0.0  # comment\n')
+            file.write('    k_2\t 1.0\n')
+            file.write('    begin # not the start of a block\n')
+            file.write('end parameters\n')
+            file.write('begin seed species\n')
+            file.write('    A()  k_1\n')
+            file.write('end seed species\n')
+            file.write('end model\n')
+            file.write('simulate({method => "ode"})  # comment')
+
+        with mock.patch('biosimulators_bionetgen.io._read_model_block', wraps=biosimulators_bionetgen.io._read_model_block) as read_block:
+            task = read_task(filename)
+            self.assertEqual(list(task.model.keys()), ['parameters', 'seed species'])
+            self.assertEqual(task.actions, ['simulate({method => "ode"})'])
+            read_block.assert_not_called()
+
+            self.assertEqual(task.model['seed species'], ['A() k_1'])
+            self.assertEqual(read_block.call_count, 1)
+
+            self.assertEqual(task.model['parameters'], ['k_1 0.0', 'k_2\t 1.0', 'begin'])
+            self.assertEqual(read_block.call_count, 2)
+
+    def test_TaskCache(self):
+        filename = os.path.join(self.dirname, 'model.bngl')
+        with open(filename, 'w') as file:
+            file.write('ignored\n')
+            file.write('begin model\n')
+            file.write('begin parameters\n')
+            file.write('    k_1 0.0\n')
+            file.write('end parameters\n')
+            file.write('begin observables\n')
+            file.write('    Molecules A A()\n')
+            file.write('end observables\n')
+            file.write('end model\n')
+            file.write('simulate({method => "ode"})\n')
+
+        cache = TaskCache(2)
+        with pytest.warns(IgnoredBnglFileContentWarning, match='outside content blocks were ignored'):
+            task_1 = cache.read_task(filename)
+        with pytest.warns(IgnoredBnglFileContentWarning, match='outside content blocks were ignored'):
+            task_2 = cache.read_task(os.path.join(self.dirname, '.', 'model.bngl'))
+        self.assertEqual(cache.get_statistics(), {'hits': 1, 'misses': 1, 'size': 1, 'max_size': 2})
+        self.assertTrue(task_1.is_equal(task_2))
+        self.assertEqual(task_1.actions, ['simulate({method => "ode"})'])
+
+        # tasks are isolated from each other
+        task_1.actions.append('saveConcentrations()')
+        task_1.model['parameters'][0] = 'k_1 1.0'
+        task_1.model['observables'].append('Molecules B B()')
+        task_1.model['functions'] = ModelBlock(['f() = k_1'])
+        self.assertEqual(task_2.actions, ['simulate({method => "ode"})'])
+        self.assertEqual(task_2.model['parameters'], ['k_1 0.0'])
+        self.assertEqual(task_2.model['observables'], ['Molecules A A()'])
+        self.assertNotIn('functions', task_2.model)
+
+        with pytest.warns(IgnoredBnglFileContentWarning):
+            task_3 = cache.read_task(filename)
+        self.assertEqual(dict(task_3.model), {'parameters': ['k_1 0.0'], 'observables': ['Molecules A A()']})
+
+        # changes to files invalidate their entries
+        with open(filename, 'w') as file:
+            file.write('begin model\n')
+            file.write('begin parameters\n')
+            file.write('    k_1 2.0\n')
+            file.write('end parameters\n')
+            file.write('end model\n')
+        stat = os.stat(filename)
+        os.utime(filename, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+        self.assertEqual(cache.read_task(filename).model['parameters'], ['k_1 2.0'])
+        self.assertEqual(cache.get_statistics(), {'hits': 2, 'misses': 2, 'size': 2, 'max_size': 2})
+
+        # least recently used entries are evicted
+        filename_2 = os.path.join(self.dirname, 'model_2.bngl')
+        shutil.copyfile(filename, filename_2)
+        cache.read_task(filename_2)
+        cache.read_task(filename)
+        self.assertEqual(cache.get_statistics(), {'hits': 3, 'misses': 3, 'size': 2, 'max_size': 2})
+
+        # errors aren't cached
+        with open(filename_2, 'w') as file:
+            file.write('begin model\n')
+        for i in range(2):
+            with self.assertRaisesRegex(ValueError, 'has no termination'):
+                cache.read_task(filename_2)
+        self.assertEqual(cache.get_statistics()['misses'], 5)
+
+        cache.clear()
+        self.assertEqual(cache.get_statistics(), {'hits': 0, 'misses': 0, 'size': 0, 'max_size': 2})
+
+        # disabled cache
+        cache = TaskCache(0)
+        cache.read_task(filename)
+        cache.read_task(filename)
+        self.assertEqual(cache.get_statistics(), {'hits': 0, 'misses': 2, 'size': 0, 'max_size': 0})
+
+    def test_TaskCache_hash_contents(self):
+        filename = os.path.join(self.dirname, 'model.bngl')
+        with open(filename, 'w') as file:
+            file.write('begin model\nbegin parameters\n    k_1 0.0\nend parameters\nend model\n')
+        stat = os.stat(filename)
+
+        cache = TaskCache(2, hash_contents=True)
+        cache.read_task(filename)
+
+        with open(filename, 'w') as file:
+            file.write('begin model\nbegin parameters\n    k_1 1.0\nend parameters\nend model\n')
+        os.utime(filename, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        self.assertEqual(cache.read_task(filename).model['parameters'], ['k_1 1.0'])
+        self.assertEqual(cache.get_statistics()['misses'], 2)
+
+    def test_get_task_cache(self):
+        cache = get_task_cache()
+        self.assertIs(get_task_cache(), cache)
+        self.assertEqual(cache.max_size, Config().task_cache_size)
+
+        with mock.patch.dict(os.environ, {'BIONETGEN_TASK_CACHE_SIZE': '3', 'BIONETGEN_TASK_CACHE_HASH': '1'}):
+            cache_2 = get_task_cache()
+        self.assertEqual(cache_2.max_size, 3)
+        self.assertTrue(cache_2.hash_contents)
+
     def test_read_task_error_handling(self):
         # no `begin model`
         filename = os.path.join(self.dirname, 'model.bngl')
@@ -201,3 +377,89 @@ class DataModelTestCase(unittest.TestCase):
 
         self.assertFalse(numpy.any(numpy.isnan(results)))
         numpy.testing.assert_allclose(results.loc['time', :], numpy.linspace(0., 1000000., 1000 + 1))
+
+    def test_read_simulation_results_formats(self):
+        def read_with_pandas(filename):
+            with open(filename, 'r') as file:
+                names = file.readline().replace('#', '').split()
+                return pandas.read_table(file, sep=r'\s+', header=None, names=names, float_precision='round_trip').transpose()
+
+        values = numpy.array([
+            [0., 1.5, -2.25e-300],
+            [1e-3, -0., 6.02214076e+23],
+            [2.5, 123456789.123, -1e-30],
+        ])
+        contents = {
+            'run_network': ('#' + ''.join('{:>20}'.format(name) for name in ['time', 'A', 'B']) + '\n'
+                            + ''.join(''.join(' {:19.12e}'.format(value) for value in row) + '\n' for row in values)),
+            'nfsim': ('#          time            A            B\n'
+                      + ''.join('\t'.join('{:.8e}'.format(value) for value in row) + '\n' for row in values)),
+            'crlf': '# time A B\r\n 0.000e+00 1.000e+00 2.000e+00\r\n 1.000e+00 nan inf\r\n',
+            'crlf without final line break': '# time A B\r\n 0.0e+00 1.0e+00 2.0e+00\r\n 1.0e+00 1.0e+00 3.0e-100',
+            'ragged': '# time A B\n0 1 2.5\n10 -20.25 3e+100\n',
+            'no rows': '# time A B\n',
+        }
+        for format, content in contents.items():
+            filename = os.path.join(self.dirname, format + '.gdat')
+            with open(filename, 'w', newline='') as file:
+                file.write(content)
+
+            results = read_simulation_results(filename)
+            expected_results = read_with_pandas(filename)
+            self.assertEqual(list(results.index), ['time', 'A', 'B'], format)
+            numpy.testing.assert_array_equal(results.to_numpy(), expected_results.to_numpy(), format)
+            numpy.testing.assert_array_equal(numpy.signbit(results.to_numpy()), numpy.signbit(expected_results.to_numpy()), format)
+
+            results = read_simulation_results(filename, observables=['time', 'B', 'C'])
+            self.assertEqual(list(results.index), ['time', 'B'], format)
+            numpy.testing.assert_array_equal(results.to_numpy(), expected_results.loc[['time', 'B'], :].to_numpy(), format)
+
+    def test_iter_simulation_results(self):
+        bionetgen_path = Config().bionetgen_path
+        model_filename = os.path.join(os.path.dirname(__file__), 'fixtures', 'test.bngl')
+        subprocess.check_call([bionetgen_path, model_filename, '--outdir', self.dirname])
+        results_filename = os.path.join(self.dirname, 'test.gdat')
+        expected_results = read_simulation_results(results_filename)
+
+        # read a complete file
+        blocks = list(iter_simulation_results(results_filename))
+        self.assertEqual(len(blocks), 1)
+        self.assertTrue(blocks[0].equals(expected_results))
+
+        # tail a file while it is written, including partially-written lines
+        with open(results_filename, 'r') as file:
+            data = file.read()
+
+        growing_filename = os.path.join(self.dirname, 'growing.gdat')
+        done = threading.Event()
+
+        def write():
+            with open(growing_filename, 'w') as file:
+                for i_char in range(0, len(data), 5000):
+                    file.write(data[i_char:i_char + 5000])
+                    file.flush()
+                    time.sleep(0.01)
+            done.set()
+
+        thread = threading.Thread(target=write)
+        thread.start()
+        blocks = list(iter_simulation_results(growing_filename, is_running=lambda: not done.is_set(), poll_interval=0.001))
+        thread.join()
+
+        self.assertGreater(len(blocks), 1)
+        results = pandas.concat(blocks, axis=1)
+        self.assertTrue(results.equals(expected_results))
+
+        # last line without a new line
+        with open(growing_filename, 'w') as file:
+            file.write(data.rstrip('\n'))
+        self.assertTrue(pandas.concat(list(iter_simulation_results(growing_filename)), axis=1).equals(expected_results))
+
+        # header only
+        with open(growing_filename, 'w') as file:
+            file.write(data.partition('\n')[0])
+        self.assertEqual(list(iter_simulation_results(growing_filename)), [])
+
+        # error handling
+        with self.assertRaisesRegex(FileNotFoundError, 'was not created'):
+            list(iter_simulation_results(os.path.join(self.dirname, 'missing.gdat')))
@@ -0,0 +1,88 @@
+from biosimulators_bionetgen import substitution
+from biosimulators_bionetgen.data_model import KISAO_SIMULATION_METHOD_ARGUMENTS_MAP
+from biosimulators_bionetgen.substitution import (get_preferred_substitute_algorithm_by_ids, get_substitution_table,
+                                                  read_substitution_table, write_substitution_table)
+from kisao.data_model import AlgorithmSubstitutionPolicy
+from kisao.exceptions import AlgorithmCannotBeSubstitutedException
+from kisao.warnings import AlgorithmSubstitutedWarning
+from unittest import mock
+import kisao.utils
+import os
+import shutil
+import tempfile
+import termcolor
+import unittest
+import warnings
+
+
+class SubstitutionTestCase(unittest.TestCase):
+    def setUp(self):
+        self.dirname = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.dirname)
+
+    def test_table_is_current(self):
+        table = get_substitution_table()
+        self.assertIsNotNone(table)
+        self.assertEqual(table['algorithms'], list(KISAO_SIMULATION_METHOD_ARGUMENTS_MAP.keys()))
+        self.assertEqual(table['substitutes']['KISAO_0000019'][-1], 'KISAO_0000019')
+
+    def test_get_preferred_substitute_algorithm_by_ids_agrees_with_ontology(self):
+        alt_algorithms = list(KISAO_SIMULATION_METHOD_ARGUMENTS_MAP.keys())
+        for algorithm in ['KISAO_0000019', 'KISAO_0000088', 'KISAO_0000027', 'KISAO_0000448', 'KISAO_0000560']:
+            for policy in AlgorithmSubstitutionPolicy:
+                with warnings.catch_warnings(record=True) as ontology_warnings:
+                    warnings.simplefilter('always')
+                    try:
+                        expected = kisao.utils.get_preferred_substitute_algorithm_by_ids(
+                            algorithm, alt_algorithms, substitution_policy=policy)
+                        expected_exception = None
+                    except AlgorithmCannotBeSubstitutedException as exception:
+                        expected_exception = str(exception)
+
+                if expected_exception:
+                    with self.assertRaises(AlgorithmCannotBeSubstitutedException) as context:
+                        get_preferred_substitute_algorithm_by_ids(algorithm, substitution_policy=policy)
+                    self.assertEqual(str(context.exception), expected_exception)
+                    continue
+
+                with warnings.catch_warnings(record=True) as table_warnings:
+                    warnings.simplefilter('always')
+                    substitute, msg, resolved_without_ontology = get_preferred_substitute_algorithm_by_ids(
+                        algorithm, substitution_policy=policy)
+                self.assertEqual(substitute, expected)
+                self.assertTrue(resolved_without_ontology)
+                self.assertEqual(table_warnings, [])
+                ontology_warnings = [str(w.message) for w in ontology_warnings if issubclass(w.category, AlgorithmSubstitutedWarning)]
+                if msg:
+                    self.assertEqual(ontology_warnings, [termcolor.colored(msg, 'yellow')])
+                else:
+                    self.assertEqual(ontology_warnings, [])
+
+    def test_get_preferred_substitute_algorithm_by_ids_without_table(self):
+        with mock.patch.object(substitution, 'get_substitution_table', return_value=None):
+            with self.assertWarns(AlgorithmSubstitutedWarning):
+                substitute, msg, resolved_without_ontology = get_preferred_substitute_algorithm_by_ids(
+                    'KISAO_0000088', substitution_policy=AlgorithmSubstitutionPolicy.SIMILAR_VARIABLES)
+        self.assertEqual(substitute, 'KISAO_0000019')
+        self.assertEqual(msg, None)
+        self.assertFalse(resolved_without_ontology)
+
+    def test_read_write_substitution_table(self):
+        filename = os.path.join(self.dirname, 'table.json')
+        self.assertEqual(read_substitution_table(filename), None)
+
+        table = get_substitution_table()
+        write_substitution_table(table, filename)
+        self.assertEqual(read_substitution_table(filename), table)
+
+        write_substitution_table(dict(table, kisao_version='0.0.0'), filename)
+        self.assertEqual(read_substitution_table(filename), None)
+
+        write_substitution_table(dict(table, algorithms=table['algorithms'][:-1]), filename)
+        self.assertEqual(read_substitution_table(filename), None)
+
+        with open(filename, 'w') as file:
+            file.write('{')
+        self.assertEqual(read_substitution_table(filename), None)
@@ -0,0 +1,77 @@
+from biosimulators_bionetgen.config import Config
+from biosimulators_bionetgen.timing import (PhaseTimer, DISABLED_PHASE_TIMER, get_phase_timer,
+                                            add_bionetgen_log_to_phase_timer, aggregate_phase_timings)
+from biosimulators_utils.log.data_model import TaskLog
+import time
+import unittest
+
+
+class TimingTestCase(unittest.TestCase):
+    def test_PhaseTimer(self):
+        timer = PhaseTimer()
+        self.assertTrue(timer.enabled)
+
+        with timer.phase('read_task'):
+            time.sleep(0.01)
+        with timer.phase('read_task'):
+            pass
+        with self.assertRaises(ValueError):
+            with timer.phase('bionetgen'):
+                raise ValueError()
+        timer.add('bionetgen', 2 * 10 ** 9)
+
+        timings = timer.get_timings()
+        self.assertEqual(set(timings.keys()), set(['read_task', 'bionetgen']))
+        self.assertGreaterEqual(timings['read_task'], 0.01)
+        self.assertGreaterEqual(timings['bionetgen'], 2.)
+        self.assertLess(timings['bionetgen'], 3.)
+
+    def test_DISABLED_PHASE_TIMER(self):
+        self.assertFalse(DISABLED_PHASE_TIMER.enabled)
+        with DISABLED_PHASE_TIMER.phase('read_task'):
+            pass
+        DISABLED_PHASE_TIMER.add('bionetgen', 10)
+        self.assertEqual(DISABLED_PHASE_TIMER.get_timings(), {})
+
+    def test_get_phase_timer(self):
+        config = Config()
+        config.phase_timing = False
+        self.assertIs(get_phase_timer(config), DISABLED_PHASE_TIMER)
+
+        config.phase_timing = True
+        timer = get_phase_timer(config)
+        self.assertIsInstance(timer, PhaseTimer)
+        self.assertTrue(timer.enabled)
+        self.assertIsNot(get_phase_timer(config), timer)
+
+    def test_add_bionetgen_log_to_phase_timer(self):
+        log = '\n'.join([
+            'BioNetGen version 2.5.1',
+            'ACTION: generate_network( model )',
+            'CPU TIME: generate_network 0.25 s.',
+            'ACTION: simulate( method=>"ode" )',
+            'CPU TIME: simulate_ode 1.5 s.',
+            'CPU TIME: simulate 0.5 s.',
+            'CPU TIME: total 2.5 s.',
+        ])
+        timer = PhaseTimer()
+        add_bionetgen_log_to_phase_timer(timer, log)
+        timings = timer.get_timings()
+        self.assertEqual(set(timings.keys()), set(['bionetgen_generate_network', 'bionetgen_simulate']))
+        self.assertAlmostEqual(timings['bionetgen_generate_network'], 0.25)
+        self.assertAlmostEqual(timings['bionetgen_simulate'], 2.)
+
+        timer = PhaseTimer()
+        add_bionetgen_log_to_phase_timer(timer, '')
+        self.assertEqual(timer.get_timings(), {})
+
+    def test_aggregate_phase_timings(self):
+        task_logs = [
+            TaskLog(simulator_details={'phase_timings': {'read_task': 1., 'bionetgen': 2.}}),
+            TaskLog(simulator_details={'phase_timings': {'read_task': 0.5}}),
+            TaskLog(simulator_details={'actions': []}),
+            TaskLog(),
+            None,
+        ]
+        self.assertEqual(aggregate_phase_timings(task_logs), {'read_task': 1.5, 'bionetgen': 2.})
+        self.assertEqual(aggregate_phase_timings([]), {})
@@ -1,26 +1,53 @@
 from biosimulators_bionetgen import get_simulator_version
+import biosimulators_bionetgen.ensemble
+import biosimulators_bionetgen.utils
 from biosimulators_bionetgen.config import Config
-from biosimulators_bionetgen.data_model import Task
-from biosimulators_bionetgen.utils import (add_model_attribute_change_to_task,
+from biosimulators_bionetgen.data_model import Model, Task
+from biosimulators_bionetgen.utils import (add_model_attribute_change_to_task, get_task_with_model_attribute_changes,
+                                           async_run_bionetgen_task, async_start_bionetgen_process,
+                                           async_wait_for_bionetgen_process,
+                                           preprocess_model_attribute_changes,
                                            add_variables_to_model,
                                            create_actions_for_simulation,
                                            exec_bionetgen_task,
-                                           get_variables_results_from_observable_results,)
+                                           exec_bionetgen_task_batch,
+                                           iter_bionetgen_task_results,
+                                           async_exec_bionetgen_task,
+                                           get_run_network_path,
+                                           get_run_network_task,
+                                           get_nfsim_path,
+                                           get_nfsim_task,
+                                           get_observables_for_variables,
+                                           get_variables_results_from_observable_results,
+                                           budget_variable_results,
+                                           exec_bionetgen_parameter_scan,
+                                           get_parameter_scan_actions,
+                                           exec_bionetgen_ensemble,
+                                           run_bionetgen_command,)
+from biosimulators_bionetgen.ensemble import get_ensemble_seeds
 from biosimulators_bionetgen.io import read_task, read_simulation_results, write_task
+from biosimulators_bionetgen.workspace import ResultsMemoryBudget
 from biosimulators_utils.model_lang.bngl.utils import get_parameters_variables_outputs_for_simulation
+from biosimulators_utils.report.data_model import VariableResults
 from biosimulators_utils.sedml.data_model import (ModelAttributeChange, Variable,
                                                   Symbol, UniformTimeCourseSimulation,
                                                   Algorithm, AlgorithmParameterChange)
 from biosimulators_utils.warnings import BioSimulatorsWarning
 from kisao.exceptions import AlgorithmCannotBeSubstitutedException
+from kisao.warnings import AlgorithmSubstitutedWarning
 from unittest import mock
+import asyncio
+import concurrent.futures
 import os
 import numpy
 import numpy.testing
+import pandas
 import pytest
 import shutil
 import subprocess
+import sys
 import tempfile
+import time
 import unittest
 
 
@@ -34,6 +61,42 @@ class UtilsTestCase(unittest.TestCase):
     def test_get_simulator_version(self):
         self.assertRegex(get_simulator_version(), r'^\d+\.\d+\.\d+$')
 
+    def test_get_simulator_version_cache(self):
+        bionetgen_path = os.path.join(self.dirname, 'BNG2.pl')
+        with open(bionetgen_path, 'w') as file:
+            file.write('#!/bin/sh\necho "BioNetGen version 1.2.3"\n')
+        os.chmod(bionetgen_path, 0o755)
+
+        config = Config()
+        config.bionetgen_path = bionetgen_path
+        config.version_cache_dir = os.path.join(self.dirname, 'cache')
+
+        with mock.patch('subprocess.check_output', wraps=subprocess.check_output) as check_output:
+            self.assertEqual(get_simulator_version(config), '1.2.3')
+            self.assertEqual(get_simulator_version(config), '1.2.3')
+        self.assertEqual(check_output.call_count, 1)
+        self.assertTrue(os.path.isfile(os.path.join(config.version_cache_dir, 'versions.json')))
+
+        # the version is determined again after the executable changes
+        with open(bionetgen_path, 'w') as file:
+            file.write('#!/bin/sh\necho "BioNetGen version 1.2.4"\n')
+        os.utime(bionetgen_path, ns=(0, 10 ** 9))
+        self.assertEqual(get_simulator_version(config), '1.2.4')
+        with mock.patch('subprocess.check_output', side_effect=Exception('version should be cached')):
+            self.assertEqual(get_simulator_version(config), '1.2.4')
+
+        # invalid caches are ignored
+        with open(os.path.join(config.version_cache_dir, 'versions.json'), 'w') as file:
+            file.write('[')
+        self.assertEqual(get_simulator_version(config), '1.2.4')
+
+        # versions are not cached if caching is disabled
+        config.version_cache_dir = None
+        with mock.patch('subprocess.check_output', wraps=subprocess.check_output) as check_output:
+            get_simulator_version(config)
+            get_simulator_version(config)
+        self.assertEqual(check_output.call_count, 2)
+
     def test_add_model_attribute_change_to_task(self):
         model_filename = os.path.join(os.path.dirname(__file__), 'fixtures', 'test.bngl')
 
@@ -96,6 +159,116 @@ class UtilsTestCase(unittest.TestCase):
         with self.assertRaisesRegex(NotImplementedError, 'is not a valid target'):
             add_model_attribute_change_to_task(task, change)
 
+    def test_add_model_attribute_change_to_task_with_invalid_target(self):
+        task = Task(model=Model())
+        change = ModelAttributeChange(target='parameters.k_1.size', new_value='0.5')
+        with self.assertRaisesRegex(NotImplementedError, 'parameter value: `parameters.<parameter_id>.value`'):
+            add_model_attribute_change_to_task(task, change)
+
+    def test_preprocess_model_attribute_changes(self):
+        model_filename = os.path.join(os.path.dirname(__file__), 'fixtures', 'test.bngl')
+        changes = [
+            ModelAttributeChange(target='parameters.g0.value', new_value='2.0'),
+            ModelAttributeChange(target='parameters.unknown.value', new_value='3.0'),
+            ModelAttributeChange(target='species.A().initialCount', new_value='7'),
+            ModelAttributeChange(target='species.C().initialCount', new_value='8'),
+            ModelAttributeChange(target='functions.gfunc.expression', new_value='0.5'),
+        ]
+
+        # individual actions
+        action_task = read_task(model_filename)
+        action_task.actions = []
+        preprocessed_changes = preprocess_model_attribute_changes(action_task, changes)
+        self.assertEqual([preprocessed_changes[change.target]['type'] for change in changes],
+                         ['append_action', 'append_action', 'append_action', 'append_action', 'replace_line_in_block'])
+        for change in changes:
+            add_model_attribute_change_to_task(action_task, change, preprocessed_changes[change.target])
+        self.assertEqual(action_task.actions, [
+            'setParameter("g0", 2.0)',
+            'setParameter("unknown", 3.0)',
+            'setConcentration("A()", 7)',
+            'setConcentration("C()", 8)',
+        ])
+
+        # rewritten lines
+        bulk_task = read_task(model_filename)
+        bulk_task.actions = []
+        bulk_task.model['species'][0] = '$GeneA_00() 1'
+        bulk_changes = changes + [ModelAttributeChange(target='species.GeneA_00().initialCount', new_value='2')]
+        with mock.patch.dict('os.environ', {'BIONETGEN_BULK_MODEL_CHANGES_THRESHOLD': '5'}):
+            preprocessed_changes = preprocess_model_attribute_changes(bulk_task, bulk_changes)
+        self.assertEqual([preprocessed_changes[change.target]['type'] for change in bulk_changes],
+                         ['replace_line_in_block', 'append_action', 'replace_line_in_block', 'append_action',
+                          'replace_line_in_block', 'replace_line_in_block'])
+        for change in bulk_changes:
+            add_model_attribute_change_to_task(bulk_task, change, preprocessed_changes[change.target])
+        self.assertEqual(bulk_task.actions, [
+            'setParameter("unknown", 3.0)',
+            'setConcentration("C()", 8)',
+        ])
+        self.assertEqual(bulk_task.model['parameters'][2], 'g0 2.0')
+        self.assertEqual(bulk_task.model['species'][0], '$GeneA_00() 2')
+        self.assertEqual(bulk_task.model['species'][6], 'A() 7')
+        self.assertEqual(bulk_task.model['functions'], ['gfunc() = 0.5'])
+
+        with mock.patch.dict('os.environ', {'BIONETGEN_BULK_MODEL_CHANGES_THRESHOLD': '5'}):
+            preprocessed_changes = preprocess_model_attribute_changes(read_task(model_filename), changes)
+        self.assertEqual(preprocessed_changes['parameters.g0.value']['type'], 'append_action')
+
+        # both produce the same simulation results
+        action_task = read_task(model_filename)
+        bulk_task = read_task(model_filename)
+        changes = [changes[0], changes[2], changes[4]]
+        for task, threshold in [(action_task, ''), (bulk_task, '1')]:
+            task.actions = []
+            with mock.patch.dict('os.environ', {'BIONETGEN_BULK_MODEL_CHANGES_THRESHOLD': threshold}):
+                preprocessed_changes = preprocess_model_attribute_changes(task, changes)
+            for change in changes:
+                add_model_attribute_change_to_task(task, change, preprocessed_changes[change.target])
+            task.actions.extend([
+                'generate_network({overwrite => 1})',
+                'simulate({method => "ode", t_start => 0, t_end => 10, n_steps => 10})',
+            ])
+        self.assertEqual(len(action_task.actions), 4)
+        self.assertEqual(len(bulk_task.actions), 2)
+        action_results = exec_bionetgen_task(action_task)
+        bulk_results = exec_bionetgen_task(bulk_task)
+        numpy.testing.assert_allclose(bulk_results.to_numpy(), action_results.to_numpy())
+        self.assertEqual(bulk_results.loc['Atot'].iloc[0], 7)
+
+    def test_get_task_with_model_attribute_changes(self):
+        model_filename = os.path.join(os.path.dirname(__file__), 'fixtures', 'test.bngl')
+        changes = [
+            ModelAttributeChange(target='parameters.g0.value', new_value='2.0'),
+            ModelAttributeChange(target='species.C().initialCount', new_value='8'),
+            ModelAttributeChange(target='functions.gfunc.expression', new_value='0.5'),
+        ]
+
+        task = read_task(model_filename)
+        task.actions = ['generate_network({overwrite => 1})']
+        preprocessed_changes = preprocess_model_attribute_changes(task, changes)
+        original_functions = list(task.model['functions'])
+
+        changed_task = get_task_with_model_attribute_changes(task, changes, preprocessed_changes)
+        self.assertEqual(changed_task.model['functions'], ['gfunc() = 0.5'])
+        self.assertEqual(changed_task.actions, [
+            'generate_network({overwrite => 1})',
+            'setParameter("g0", 2.0)',
+            'setConcentration("C()", 8)',
+        ])
+        self.assertEqual(list(changed_task.model.keys()), list(task.model.keys()))
+        self.assertIs(changed_task.model['parameters'], task.model['parameters'])
+        self.assertIsNot(changed_task.model['functions'], task.model['functions'])
+
+        # the task isn't modified
+        self.assertEqual(task.model['functions'], original_functions)
+        self.assertEqual(task.actions, ['generate_network({overwrite => 1})'])
+
+        changes[2].new_value = '0.25'
+        changed_task_2 = get_task_with_model_attribute_changes(task, changes, preprocessed_changes)
+        self.assertEqual(changed_task_2.model['functions'], ['gfunc() = 0.25'])
+        self.assertEqual(changed_task.model['functions'], ['gfunc() = 0.5'])
+
     def test_add_variables_to_task(self):
         model_filename = os.path.join(os.path.dirname(__file__), 'fixtures', 'test.bngl')
         task = read_task(model_filename)
@@ -197,6 +370,35 @@ class UtilsTestCase(unittest.TestCase):
             with pytest.warns(BioSimulatorsWarning, match='is not supported. Parameter must have'):
                 create_actions_for_simulation(simulation)
 
+    def test_create_actions_for_simulation_is_memoized(self):
+        simulation = UniformTimeCourseSimulation(
+            initial_time=0.,
+            output_start_time=0.,
+            output_end_time=20.,
+            number_of_points=20,
+            algorithm=Algorithm(
+                kisao_id='KISAO_0000088',
+                changes=[
+                    AlgorithmParameterChange(kisao_id='KISAO_0000211', new_value='1e-6'),
+                ]
+            ),
+        )
+        with pytest.warns(AlgorithmSubstitutedWarning, match='substituted'):
+            actions, kisao_id = create_actions_for_simulation(simulation)
+        self.assertEqual(kisao_id, 'KISAO_0000019')
+        actions.append('saveConcentrations()')
+
+        with mock.patch('biosimulators_bionetgen.utils._create_actions_for_simulation', side_effect=Exception()):
+            with pytest.warns(AlgorithmSubstitutedWarning, match='substituted'):
+                actions_2, kisao_id_2 = create_actions_for_simulation(simulation)
+        self.assertEqual(actions_2, actions[:-1])
+        self.assertEqual(kisao_id_2, 'KISAO_0000019')
+
+        simulation.algorithm.kisao_id = 'KISAO_0000019'
+        simulation.algorithm.changes[0].new_value = '1e-8'
+        actions_3, _ = create_actions_for_simulation(simulation)
+        self.assertIn('atol => 1e-8', actions_3[-1])
+
     def test_exec_bionetgen_task(self):
         model_filename = os.path.join(os.path.dirname(__file__), 'fixtures', 'test.bngl')
         task = read_task(model_filename)
@@ -219,10 +421,360 @@ class UtilsTestCase(unittest.TestCase):
         numpy.testing.assert_allclose(results.loc['time', :], numpy.linspace(0., 1000000., 1000 + 1))
 
         # error handling
-        with mock.patch('subprocess.check_call', side_effect=ValueError('big error')):
+        with mock.patch('biosimulators_bionetgen.utils.run_bionetgen_command', side_effect=ValueError('big error')):
             with self.assertRaisesRegex(ValueError, 'big error'):
                 exec_bionetgen_task(task)
 
+    def test_iter_bionetgen_task_results(self):
+        model_filename = os.path.join(os.path.dirname(__file__), 'fixtures', 'test.bngl')
+        task = read_task(model_filename)
+        task.actions = ['simulate({t_start => 0, t_end => 10000, n_steps => 1000, method => "ssa", seed => 1})']
+        expected_results = exec_bionetgen_task(task, verbose=False)
+
+        blocks = list(iter_bionetgen_task_results(task, verbose=False, poll_interval=0.001))
+        self.assertTrue(pandas.concat(blocks, axis=1).equals(expected_results))
+
+        blocks = []
+        results = exec_bionetgen_task(task, verbose=False, callback=blocks.append)
+        self.assertTrue(results.equals(expected_results))
+        self.assertTrue(pandas.concat(blocks, axis=1).equals(expected_results))
+
+        # stop the simulation early
+        task.actions = ['simulate({t_start => 0, t_end => 100000, n_steps => 1000, method => "ssa", seed => 1})']
+        with mock.patch('biosimulators_bionetgen.utils.kill_process_group',
+                        wraps=biosimulators_bionetgen.utils.kill_process_group) as kill_process_group:
+            results = exec_bionetgen_task(task, verbose=False, callback=lambda block: block.loc['time'].iloc[-1] < 100.)
+        self.assertLess(results.shape[1], 1000 + 1)
+        numpy.testing.assert_allclose(results.loc['time', :], numpy.arange(results.shape[1]) * 100.)
+        kill_process_group.assert_called_once()
+
+        # error handling
+        task.actions = ['simulate({method => "undefined"})']
+        with self.assertRaises(subprocess.CalledProcessError):
+            list(iter_bionetgen_task_results(task, verbose=False))
+
+    def test_get_run_network_path(self):
+        config = Config()
+        config.run_network_path = '/path/to/run_network'
+        self.assertEqual(get_run_network_path(config), '/path/to/run_network')
+
+        config.run_network_path = None
+        run_network_path = get_run_network_path(config)
+        self.assertEqual(os.path.basename(run_network_path), 'run_network')
+        self.assertTrue(os.access(run_network_path, os.X_OK))
+
+        config.bionetgen_path = os.path.join(self.dirname, 'BNG2.pl')
+        self.assertEqual(get_run_network_path(config), None)
+
+    def test_get_nfsim_path(self):
+        config = Config()
+        config.nfsim_path = '/path/to/NFsim'
+        self.assertEqual(get_nfsim_path(config), '/path/to/NFsim')
+
+        config.nfsim_path = None
+        nfsim_path = get_nfsim_path(config)
+        self.assertEqual(os.path.basename(nfsim_path), 'NFsim')
+        self.assertTrue(os.access(nfsim_path, os.X_OK))
+
+    def test_get_run_network_task(self):
+        command, parameters = get_run_network_task(
+            ['setParameter("k_1", 2)', 'simulate({t_start => 0, t_end => 10, n_steps => 20, method => "ode", atol => 1e-6})'],
+            'network.net', 'task', 'run_network')
+        self.assertEqual(command, ['run_network', '-o', 'task', '-p', 'cvode', '-a', '1e-06', '-r', '1e-08',
+                                   '--cdat', '1', '--fdat', '0', '-g', 'network.net', 'network.net', '0.5', '20'])
+        self.assertEqual(parameters, {'k_1': '2'})
+
+        command, parameters = get_run_network_task(
+            ['simulate({t_start => 5, t_end => 15, n_steps => 10, method => "pla", seed => 3, max_sim_steps => 100})'],
+            'network.net', 'task', 'run_network')
+        self.assertEqual(command, ['run_network', '-o', 'task', '-p', 'pla', 'fEuler|pre-neg:sb|eps=0.03', '-h', '3',
+                                   '-M', '100', '--cdat', '1', '--fdat', '0', '-i', '5',
+                                   '-g', 'network.net', 'network.net', '1', '10'])
+        self.assertEqual(parameters, {})
+
+        command, _ = get_run_network_task(['simulate({t_end => 10, n_steps => 10, method => "ssa"})'],
+                                          'network.net', 'task', 'run_network')
+        self.assertRegex(command[command.index('-h') + 1], r'^\d+$')
+
+        # actions which must be executed with BNG2.pl
+        for actions in [
+            [],
+            ['setParameter("k_1", 2)'],
+            ['setParameter("k_1", "2 * k")', 'simulate({t_end => 10, n_steps => 10, method => "ode"})'],
+            ['setConcentration("A()", 2)', 'simulate({t_end => 10, n_steps => 10, method => "ode"})'],
+            ['simulate({t_end => 10, n_steps => 10, method => "ode"})', 'setParameter("k_1", 2)'],
+            ['simulate({t_end => 10, n_steps => 10, method => "nf"})'],
+            ['simulate({t_end => 10, n_steps => 10, method => "ode", stop_if => "Atot>1"})'],
+            ['simulate({t_end => 10, n_steps => 10, method => "ode", atol => x})'],
+            ['simulate({n_steps => 10, method => "ode"})'],
+        ]:
+            self.assertEqual(get_run_network_task(actions, 'network.net', 'task', 'run_network'), None)
+
+    def test_exec_bionetgen_task_with_run_network(self):
+        model_filename = os.path.join(os.path.dirname(__file__), 'fixtures', 'test.bngl')
+
+        def get_task(method, new_value=2.0):
+            task = read_task(model_filename)
+            task.actions = [
+                'setParameter("g0", {})'.format(new_value),
+                'generate_network({overwrite => 1})',
+                'simulate({{t_start => 2, t_end => 12, n_steps => 10, method => "{}", seed => 3}})'.format(method),
+            ]
+            return task
+
+        cache_dirname = os.path.join(self.dirname, 'cache')
+        for method in ['ode', 'ssa', 'pla']:
+            with mock.patch.dict(os.environ, {'BIONETGEN_NETWORK_CACHE_DIR': cache_dirname,
+                                              'BIONETGEN_DIRECT_RUN_NETWORK': '0'}):
+                expected_results = exec_bionetgen_task(get_task(method), verbose=False)
+                other_results = exec_bionetgen_task(get_task(method, 4.0), verbose=False)
+
+            with mock.patch.dict(os.environ, {'BIONETGEN_NETWORK_CACHE_DIR': cache_dirname,
+                                              'BIONETGEN_DIRECT_RUN_NETWORK': '1'}):
+                with mock.patch.object(biosimulators_bionetgen.utils, 'write_task', side_effect=Exception('BNG2.pl should be bypassed')):
+                    results = exec_bionetgen_task(get_task(method), verbose=False)
+
+            numpy.testing.assert_allclose(results.to_numpy(), expected_results.to_numpy())
+            self.assertFalse(numpy.allclose(results.to_numpy(), other_results.to_numpy()))
+
+    def test_get_nfsim_task(self):
+        command, parameters = get_nfsim_task(
+            ['setParameter("k_1", 2)', 'simulate({t_start => 0, t_end => 10, n_steps => 20, method => "nf", seed => 3})'],
+            'model.xml', 'task', 'NFsim')
+        self.assertEqual(command, ['NFsim', '-xml', 'model.xml', '-o', 'task.gdat', '-sim', '10', '-oSteps', '20',
+                                   '-seed', '3', '-ss', 'task.species', '-cb'])
+        self.assertEqual(parameters, {'k_1': '2'})
+
+        command, _ = get_nfsim_task(['simulate({t_end => 10, n_steps => 10, method => "nf", max_sim_steps => 10})'],
+                                    'model.xml', 'task', 'NFsim')
+        self.assertRegex(command[command.index('-seed') + 1], r'^\d+$')
+
+        # actions which must be executed with BNG2.pl
+        for actions in [
+            [],
+            ['setConcentration("A()", 2)', 'simulate({t_end => 10, n_steps => 10, method => "nf"})'],
+            ['simulate({t_end => 10, n_steps => 10, method => "ode"})'],
+            ['simulate({t_end => 10, method => "nf"})'],
+            ['simulate({t_end => 10, n_steps => 0, method => "nf"})'],
+            ['simulate({t_start => 10, t_end => 10, n_steps => 10, method => "nf"})'],
+            ['simulate({t_end => 10, n_steps => 10, method => "nf", stop_if => "Atot>1"})'],
+        ]:
+            self.assertEqual(get_nfsim_task(actions, 'model.xml', 'task', 'NFsim'), None)
+
+    def test_exec_bionetgen_task_with_nfsim(self):
+        model_filename = os.path.join(os.path.dirname(__file__), 'fixtures', 'test.bngl')
+
+        def get_task(new_value):
+            task = read_task(model_filename)
+            task.model['parameters'].append('A0 2 * g0')
+            task.model['species'] = [line.replace('A() 4', 'A() A0') for line in task.model['species']]
+            task.actions = [
+                'setParameter("g0", {})'.format(new_value),
+                'simulate({t_start => 0, t_end => 10, n_steps => 5, method => "nf", seed => 7})',
+            ]
+            return task
+
+        cache_dirname = os.path.join(self.dirname, 'cache')
+        expected_results = exec_bionetgen_task(get_task(2.), verbose=False)
+
+        with mock.patch.dict(os.environ, {'BIONETGEN_MODEL_XML_CACHE_DIR': cache_dirname}):
+            other_results = exec_bionetgen_task(get_task(4.), verbose=False)
+            self.assertEqual(len(os.listdir(cache_dirname)), 1)
+
+            with mock.patch.object(biosimulators_bionetgen.utils, 'write_task', side_effect=Exception('BNG2.pl should be bypassed')):
+                results = exec_bionetgen_task(get_task(2.), verbose=False)
+
+        numpy.testing.assert_allclose(results.to_numpy(), expected_results.to_numpy())
+        self.assertEqual(results.loc['Atot', 0], 4.)
+        self.assertEqual(other_results.loc['Atot', 0], 8.)
+
+    def test_async_exec_bionetgen_task(self):
+        model_filename = os.path.join(os.path.dirname(__file__), 'fixtures', 'test.bngl')
+        task = read_task(model_filename)
+        expected_results = exec_bionetgen_task(task, verbose=False)
+
+        async def exec_tasks():
+            semaphore = asyncio.Semaphore(2)
+            return await asyncio.gather(*[async_exec_bionetgen_task(task, verbose=False, semaphore=semaphore)
+                                          for i in range(3)])
+
+        for results in asyncio.run(exec_tasks()):
+            numpy.testing.assert_allclose(results.to_numpy(), expected_results.to_numpy())
+
+        # error handling
+        task.actions = ['simulate({method => "undefined"})']
+        with self.assertRaises(subprocess.CalledProcessError):
+            asyncio.run(async_exec_bionetgen_task(task, verbose=False))
+
+        # cancellation
+        task.actions = ['simulate({t_start => 0, t_end => 1e12, n_steps => 10, method => "ssa"})']
+        temp_dirname = os.path.join(self.dirname, 'task')
+        os.mkdir(temp_dirname)
+
+        async def exec_and_cancel_task():
+            future = asyncio.ensure_future(async_exec_bionetgen_task(task, verbose=False))
+            await asyncio.sleep(2.)
+            future.cancel()
+            await asyncio.gather(future, return_exceptions=True)
+            return future
+
+        with mock.patch('tempfile.mkdtemp', return_value=temp_dirname):
+            with mock.patch('biosimulators_bionetgen.utils.kill_process_group',
+                            wraps=biosimulators_bionetgen.utils.kill_process_group) as kill_process_group:
+                future = asyncio.run(exec_and_cancel_task())
+        self.assertTrue(future.cancelled())
+        kill_process_group.assert_called_once()
+        self.assertFalse(os.path.isdir(temp_dirname))
+
+    def test_run_bionetgen_command(self):
+        allocate_memory = [sys.executable, '-c', 'x = bytearray(200 * 2 ** 20); x[::4096] = b"1" * len(x[::4096])']
+
+        # resource accounting
+        with mock.patch.dict(os.environ, {'BIONETGEN_RESOURCE_ACCOUNTING': '1'}):
+            resource_usage = run_bionetgen_command(allocate_memory, verbose=False)
+        self.assertGreater(resource_usage['cpu_time'], 0.)
+        self.assertGreater(resource_usage['max_rss'], 200 * 2 ** 20)
+        self.assertLess(resource_usage['max_rss'], 300 * 2 ** 20)
+
+        self.assertEqual(run_bionetgen_command(allocate_memory, verbose=False), None)
+
+        for resource_accounting in ['1', '0']:
+            with mock.patch.dict(os.environ, {'BIONETGEN_RESOURCE_ACCOUNTING': resource_accounting}):
+                # memory limit
+                with mock.patch.dict(os.environ, {'BIONETGEN_MAX_MEMORY': str(100 * 2 ** 20)}):
+                    with self.assertRaises(subprocess.CalledProcessError):
+                        run_bionetgen_command(allocate_memory, verbose=False)
+
+                # the limits are applied by the launcher rather than between forking and executing the command
+                with mock.patch.dict(os.environ, {'BIONETGEN_MAX_MEMORY': str(2 ** 30)}):
+                    with mock.patch('subprocess.Popen', wraps=subprocess.Popen) as popen:
+                        run_bionetgen_command(['true'], verbose=False)
+                self.assertNotIn('preexec_fn', popen.call_args.kwargs)
+                self.assertEqual(popen.call_args.args[0][-1], 'true')
+                self.assertNotEqual(popen.call_args.args[0][0], 'true')
+
+                # CPU time limit
+                with mock.patch.dict(os.environ, {'BIONETGEN_MAX_CPU_TIME': '1'}):
+                    with self.assertRaises(subprocess.CalledProcessError) as exception_cm:
+                        run_bionetgen_command([sys.executable, '-c', 'while True: pass'], verbose=False)
+                self.assertLess(exception_cm.exception.returncode, 0)
+
+                # wall-clock timeout
+                with mock.patch.dict(os.environ, {'BIONETGEN_TIMEOUT': '0.5'}):
+                    start = time.time()
+                    with self.assertRaises(subprocess.TimeoutExpired):
+                        run_bionetgen_command(['sleep', '30'], verbose=False)
+                    self.assertLess(time.time() - start, 10.)
+
+                    run_bionetgen_command(['true'], verbose=False)
+
+                # error handling
+                with self.assertRaises(subprocess.CalledProcessError):
+                    run_bionetgen_command(['false'], verbose=False)
+                with self.assertRaises(FileNotFoundError) as exception_cm:
+                    run_bionetgen_command([os.path.join(self.dirname, 'undefined')], verbose=False)
+                self.assertEqual(exception_cm.exception.filename, os.path.join(self.dirname, 'undefined'))
+
+    def test_async_run_bionetgen_task_with_busy_default_executor(self):
+        model_filename = os.path.join(os.path.dirname(__file__), 'fixtures', 'test.bngl')
+        task = read_task(model_filename)
+
+        async def run_task():
+            # occupy the only thread of the default executor of the event loop
+            loop = asyncio.get_running_loop()
+            loop.set_default_executor(concurrent.futures.ThreadPoolExecutor(max_workers=1))
+            busy = loop.run_in_executor(None, time.sleep, 8.)
+
+            start = time.time()
+            resource_usage = await async_run_bionetgen_task(task, self.dirname, verbose=False)
+            duration = time.time() - start
+
+            await busy
+            return resource_usage, duration
+
+        with mock.patch.dict(os.environ, {'BIONETGEN_TIMEOUT': '6', 'BIONETGEN_RESOURCE_ACCOUNTING': '1'}):
+            resource_usage, duration = asyncio.run(run_task())
+        self.assertLess(duration, 6.)
+        self.assertGreater(resource_usage['cpu_time'], 0.)
+        self.assertTrue(os.path.isfile(os.path.join(self.dirname, 'task.gdat')))
+
+        async def run_command(command):
+            process = await async_start_bionetgen_process(command, verbose=False)
+            return await async_wait_for_bionetgen_process(process)
+
+        for resource_accounting in ['1', '0']:
+            with mock.patch.dict(os.environ, {'BIONETGEN_RESOURCE_ACCOUNTING': resource_accounting}):
+                self.assertEqual(asyncio.run(run_command(['false']))[0], 1)
+                with self.assertRaises(FileNotFoundError) as exception_cm:
+                    asyncio.run(run_command([os.path.join(self.dirname, 'undefined')]))
+                self.assertEqual(exception_cm.exception.filename, os.path.join(self.dirname, 'undefined'))
+
+    def test_exec_bionetgen_task_with_timeout(self):
+        model_filename = os.path.join(os.path.dirname(__file__), 'fixtures', 'test.bngl')
+        task = read_task(model_filename)
+
+        with mock.patch.dict(os.environ, {'BIONETGEN_RESOURCE_ACCOUNTING': '1'}):
+            results = exec_bionetgen_task(task, verbose=False)
+            self.assertGreater(results.attrs['resource_usage']['cpu_time'], 0.)
+            self.assertGreater(results.attrs['resource_usage']['max_rss'], 0)
+
+            results = asyncio.run(async_exec_bionetgen_task(task, verbose=False))
+            self.assertGreater(results.attrs['resource_usage']['cpu_time'], 0.)
+
+        task.actions = ['simulate({t_start => 0, t_end => 1e12, n_steps => 10, method => "ssa"})']
+        with mock.patch.dict(os.environ, {'BIONETGEN_TIMEOUT': '2'}):
+            with mock.patch('biosimulators_bionetgen.utils.kill_process_group',
+                            wraps=biosimulators_bionetgen.utils.kill_process_group) as kill_process_group:
+                with self.assertRaises(subprocess.TimeoutExpired):
+                    exec_bionetgen_task(task, verbose=False)
+                self.assertEqual(kill_process_group.call_count, 1)
+
+                with self.assertRaises(subprocess.TimeoutExpired):
+                    asyncio.run(async_exec_bionetgen_task(task, verbose=False))
+                self.assertEqual(kill_process_group.call_count, 2)
+
+                with self.assertRaises(subprocess.TimeoutExpired):
+                    list(iter_bionetgen_task_results(task, verbose=False))
+                self.assertEqual(kill_process_group.call_count, 3)
+
+    def test_exec_bionetgen_task_batch(self):
+        model_filename = os.path.join(os.path.dirname(__file__), 'fixtures', 'test.bngl')
+        simulations_actions = [
+            [
+                'setConcentration("A()", 5)',
+                'setParameter("g1", 30.0)',
+                'generate_network({overwrite => 1})',
+                'simulate({t_start => 0, t_end => 10, n_steps => 10, method => "ode"})',
+            ],
+            [
+                'generate_network({overwrite => 1})',
+                'simulate({t_start => 0, t_end => 20, n_steps => 5, method => "ode"})',
+            ],
+        ]
+
+        task = read_task(model_filename)
+        task.actions = []
+        with mock.patch('biosimulators_bionetgen.utils.run_bionetgen_command',
+                        wraps=biosimulators_bionetgen.utils.run_bionetgen_command) as run_command:
+            batch_results = exec_bionetgen_task_batch(task.model, simulations_actions, verbose=False)
+        self.assertEqual(run_command.call_count, 1)
+
+        self.assertEqual(len(batch_results), 2)
+        for simulation_actions, results in zip(simulations_actions, batch_results):
+            task = read_task(model_filename)
+            task.actions = simulation_actions
+            expected_results = exec_bionetgen_task(task, verbose=False)
+            numpy.testing.assert_allclose(results.to_numpy(), expected_results.to_numpy())
+
+    def test_get_observables_for_variables(self):
+        variables = [
+            Variable(id='Time', symbol=Symbol.time),
+            Variable(id='Atot', target='A()'),
+            Variable(id='GA00tot', target='GeneA_00()'),
+            Variable(id='Atot', target='A()'),
+        ]
+        self.assertEqual(get_observables_for_variables(variables), ['time', 'Atot', 'GA00tot'])
+
     def test_get_variables_results_from_observable_results(self):
         bionetgen_path = Config().bionetgen_path
         model_filename = os.path.join(os.path.dirname(__file__), 'fixtures', 'test.bngl')
@@ -246,6 +798,19 @@ class UtilsTestCase(unittest.TestCase):
             self.assertFalse(numpy.any(numpy.isnan(values)))
         numpy.testing.assert_allclose(var_results['Time'], numpy.linspace(0., 1000000., 1000 + 1))
 
+        # results are views of the values of the observables
+        obs_values = obs_results.to_numpy()
+        for values in var_results.values():
+            self.assertTrue(numpy.shares_memory(values, obs_values))
+
+        # time is shared and output windows are views
+        variables.insert(1, Variable(id='Time2', symbol=Symbol.time))
+        var_results = get_variables_results_from_observable_results(obs_results, variables, number_of_points=10)
+        self.assertIs(var_results['Time2'], var_results['Time'])
+        numpy.testing.assert_allclose(var_results['Time'], numpy.linspace(990000., 1000000., 10 + 1))
+        numpy.testing.assert_allclose(var_results['Atot'], obs_results.loc['Atot', :].to_numpy()[-11:])
+        self.assertTrue(numpy.shares_memory(var_results['Atot'], obs_values))
+
         # handle errors
         variables.append(Variable(id='X', symbol='x'))
         with self.assertRaisesRegex(NotImplementedError, 'symbols are not supported'):
@@ -256,6 +821,133 @@ class UtilsTestCase(unittest.TestCase):
         with self.assertRaisesRegex(ValueError, 'could not be recorded'):
             get_variables_results_from_observable_results(obs_results, variables)
 
+    def test_budget_variable_results(self):
+        time = numpy.linspace(0., 1., 5)
+        variable_results = VariableResults()
+        variable_results['Time'] = time
+        variable_results['Time2'] = time
+        variable_results['A'] = numpy.arange(5.)
+        variable_results['B'] = None
+
+        config = Config()
+        config.results_memory_budget = None
+        self.assertEqual(budget_variable_results(variable_results, config), None)
+        self.assertIs(variable_results['Time'], time)
+
+        config.results_memory_budget = 80
+        budget = ResultsMemoryBudget(config.results_memory_budget, os.path.join(self.dirname, 'results'))
+        with mock.patch('biosimulators_bionetgen.workspace._results_memory_budgets', {os.getpid(): budget}):
+            self.assertEqual(budget_variable_results(variable_results, config), 0)
+            self.assertNotIsInstance(variable_results['A'], numpy.memmap)
+            self.assertTrue(budget.is_allocated(variable_results['A']))
+            self.assertIs(variable_results['Time2'], variable_results['Time'])
+            self.assertTrue(numpy.shares_memory(variable_results['Time'], variable_results['A'].base))
+            numpy.testing.assert_equal(variable_results['Time'], time)
+            numpy.testing.assert_equal(variable_results['A'], numpy.arange(5.))
+            self.assertEqual(variable_results['B'], None)
+
+            # results which were already budgeted are left unchanged
+            results_A = variable_results['A']
+            self.assertEqual(budget_variable_results(variable_results, config), 0)
+            self.assertIs(variable_results['A'], results_A)
+
+            # once the budget is exhausted, results are spilled to memory-mapped files
+            variable_results_2 = VariableResults({'Time': time, 'A': numpy.arange(5.)})
+            self.assertEqual(budget_variable_results(variable_results_2, config), 80)
+            self.assertIsInstance(variable_results_2['Time'], numpy.memmap)
+            self.assertIsInstance(variable_results_2['A'], numpy.memmap)
+            numpy.testing.assert_equal(variable_results_2['Time'], time)
+            numpy.testing.assert_equal(variable_results_2['A'], numpy.arange(5.))
+
+    def test_get_parameter_scan_actions(self):
+        self.assertEqual(
+            get_parameter_scan_actions(['generate_network({overwrite => 1})', 'simulate({method => "ode", t_end => 10})'],
+                                       'g0', ['1', '2.5']),
+            ['generate_network({overwrite => 1})',
+             'parameter_scan({method => "ode", t_end => 10, parameter => "g0", par_scan_vals => [1, 2.5], suffix => "scan"})'])
+        self.assertEqual(
+            get_parameter_scan_actions(['simulate({})'], 'g0', ['1']),
+            ['parameter_scan({parameter => "g0", par_scan_vals => [1], suffix => "scan"})'])
+
+        self.assertEqual(get_parameter_scan_actions(['generate_network({overwrite => 1})'], 'g0', ['1']), None)
+        self.assertEqual(get_parameter_scan_actions(['simulate({})', 'simulate({})'], 'g0', ['1']), None)
+
+    def test_exec_bionetgen_parameter_scan(self):
+        model_filename = os.path.join(os.path.dirname(__file__), 'fixtures', 'test.bngl')
+        task = read_task(model_filename)
+        task.actions = [
+            'generate_network({overwrite => 1})',
+            'simulate({method => "ode", t_start => 0, t_end => 100, n_steps => 10})',
+        ]
+
+        values = ['2', '4.5']
+        results = exec_bionetgen_parameter_scan(task, 'g0', values, observables=['time', 'Atot'])
+        self.assertEqual(len(results), len(values))
+
+        for value, value_results in zip(values, results):
+            self.assertEqual(list(value_results.index), ['time', 'Atot'])
+
+            value_task = read_task(model_filename)
+            value_task.actions = ['setParameter("g0", {})'.format(value)] + task.actions
+            expected_results = exec_bionetgen_task(value_task)
+            numpy.testing.assert_allclose(value_results.loc['time', :], expected_results.loc['time', :])
+            numpy.testing.assert_allclose(value_results.loc['Atot', :], expected_results.loc['Atot', :], rtol=1e-6)
+
+        numpy.testing.assert_raises(AssertionError, numpy.testing.assert_allclose,
+                                    results[0].loc['Atot', :], results[1].loc['Atot', :])
+
+        task.actions = ['generate_network({overwrite => 1})']
+        with self.assertRaisesRegex(ValueError, 'exactly one simulation'):
+            exec_bionetgen_parameter_scan(task, 'g0', values)
+
+    def test_exec_bionetgen_ensemble(self):
+        model_filename = os.path.join(os.path.dirname(__file__), 'fixtures', 'test.bngl')
+
+        for method, generate_network_actions in [('ssa', ['generate_network({overwrite => 1})']), ('nf', [])]:
+            task = read_task(model_filename)
+            simulate_action = 'simulate({{method => "{}", t_start => 0, t_end => 10, n_steps => 10, seed => 3}})'.format(method)
+            task.actions = ['setParameter("g0", 8)'] + generate_network_actions + [simulate_action]
+
+            # replicates are streamed into the statistics
+            with mock.patch('biosimulators_bionetgen.ensemble.EnsembleStatistics.add', autospec=True,
+                            side_effect=biosimulators_bionetgen.ensemble.EnsembleStatistics.add) as add:
+                statistics = exec_bionetgen_ensemble(task, 4, num_workers=2, verbose=False, observables=['time', 'Atot'])
+            self.assertEqual(add.call_count, 4)
+            self.assertEqual(statistics.num_replicates, 4)
+            self.assertEqual(list(statistics.get_mean().index), ['time', 'Atot'])
+
+            # replicates are equivalent to individual simulations with the derived seeds
+            replicates = []
+            for seed in get_ensemble_seeds(4, 3):
+                replicate_task = read_task(model_filename)
+                replicate_task.actions = task.actions[:-1] + [simulate_action.replace('seed => 3', 'seed => {}'.format(seed))]
+                replicates.append(exec_bionetgen_task(replicate_task, verbose=False).loc[['time', 'Atot'], :].to_numpy())
+            replicates = numpy.array(replicates)
+            numpy.testing.assert_allclose(statistics.get_mean().to_numpy(), replicates.mean(axis=0))
+            numpy.testing.assert_allclose(statistics.get_std().to_numpy(), replicates.std(axis=0, ddof=1))
+            numpy.testing.assert_allclose(statistics.get_quantile(0.5).to_numpy(), numpy.median(replicates, axis=0))
+
+            # replicates are deterministic, including when they are simulated with BioNetGen
+            with mock.patch('biosimulators_bionetgen.utils.get_run_network_path', return_value=None):
+                with mock.patch('biosimulators_bionetgen.utils.get_nfsim_path', return_value=None):
+                    statistics_2 = exec_bionetgen_ensemble(task, 4, num_workers=1, verbose=False,
+                                                           observables=['time', 'Atot'])
+            numpy.testing.assert_allclose(statistics_2.get_mean().to_numpy(), statistics.get_mean().to_numpy())
+
+        # error handling
+        task.actions = ['generate_network({overwrite => 1})', 'simulate({method => "ode", t_end => 10, n_steps => 10})']
+        with self.assertRaisesRegex(ValueError, 'method must be one of'):
+            exec_bionetgen_ensemble(task, 2)
+
+        task.actions = ['simulate({method => "nf", t_end => 10, n_steps => 10})', 'resetConcentrations()']
+        with self.assertRaisesRegex(ValueError, 'only simulation'):
+            exec_bionetgen_ensemble(task, 2)
+
+        task.actions = ['simulate({method => "nf", t_end => 10, n_steps => 10})']
+        with mock.patch('biosimulators_bionetgen.utils.run_bionetgen_command', side_effect=[None, ValueError('big error')]):
+            with self.assertRaisesRegex(ValueError, 'big error'):
+                exec_bionetgen_ensemble(task, 2, num_workers=1)
+
     def test_get_parameters_variables_outputs_for_simulation(self):
         fixtures_dirname = os.path.join(os.path.dirname(__file__), 'fixtures')
         for model_filename in [
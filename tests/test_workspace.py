@@ -0,0 +1,200 @@
+from biosimulators_bionetgen.config import Config
+from biosimulators_bionetgen.io import read_task
+from biosimulators_bionetgen.utils import exec_bionetgen_task
+from biosimulators_bionetgen.workspace import (WorkspaceManager, get_workspace_manager, task_workspace,
+                                               ResultsMemoryBudget, get_results_memory_budget)
+from unittest import mock
+import gc
+import numpy
+import numpy.testing
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+
+
+class WorkspaceTestCase(unittest.TestCase):
+    def setUp(self):
+        self.dirname = tempfile.mkdtemp()
+        self.ram_dirname = os.path.join(self.dirname, 'ram')
+        self.disk_dirname = os.path.join(self.dirname, 'disk')
+        os.mkdir(self.ram_dirname)
+        os.mkdir(self.disk_dirname)
+
+    def tearDown(self):
+        shutil.rmtree(self.dirname)
+
+    def test_WorkspaceManager_acquire_release(self):
+        manager = WorkspaceManager(disk_dirname=self.disk_dirname)
+        root = os.path.join(self.disk_dirname, 'biosimulators-bionetgen-{}'.format(os.getpid()))
+
+        dirname = manager.acquire()
+        self.assertEqual(os.path.dirname(dirname), root)
+        self.assertEqual(os.listdir(dirname), [])
+        dirname_2 = manager.acquire()
+        self.assertNotEqual(dirname_2, dirname)
+
+        with open(os.path.join(dirname, 'task.gdat'), 'w') as file:
+            file.write('')
+        os.mkdir(os.path.join(dirname, 'subdir'))
+        manager.release(dirname)
+        manager._cleaner.submit(lambda: None).result()
+
+        # released workspaces are emptied and reused
+        dirname_3 = manager.acquire()
+        self.assertEqual(dirname_3, dirname)
+        self.assertEqual(os.listdir(dirname_3), [])
+        self.assertEqual(manager.num_workspaces, 2)
+
+        manager.remove()
+        self.assertFalse(os.path.isdir(root))
+
+    def test_WorkspaceManager_get_base_dirname(self):
+        manager = WorkspaceManager(ram_dirname=self.ram_dirname, ram_min_free=0, disk_dirname=self.disk_dirname)
+        self.assertEqual(manager.get_base_dirname(), self.ram_dirname)
+        self.assertEqual(os.path.dirname(os.path.dirname(manager.acquire())), self.ram_dirname)
+
+        manager.ram_min_free = shutil.disk_usage(self.ram_dirname).free * 2
+        self.assertEqual(manager.get_base_dirname(), self.disk_dirname)
+        self.assertEqual(os.path.dirname(os.path.dirname(manager.acquire())), self.disk_dirname)
+
+        manager.ram_dirname = os.path.join(self.dirname, 'does-not-exist')
+        manager.ram_min_free = 0
+        self.assertEqual(manager.get_base_dirname(), self.disk_dirname)
+
+        manager.ram_dirname = None
+        self.assertEqual(manager.get_base_dirname(), self.disk_dirname)
+
+        manager.remove()
+        self.assertEqual(os.listdir(self.ram_dirname), [])
+        self.assertEqual(os.listdir(self.disk_dirname), [])
+
+    def test_WorkspaceManager_remove_stale_roots(self):
+        process = subprocess.Popen([sys.executable, '-c', ''])
+        process.wait()
+        stale_root = os.path.join(self.disk_dirname, 'biosimulators-bionetgen-{}'.format(process.pid))
+        live_root = os.path.join(self.disk_dirname, 'biosimulators-bionetgen-{}'.format(os.getppid()))
+        other_dirname = os.path.join(self.disk_dirname, 'other')
+        for dirname in [stale_root, live_root, other_dirname]:
+            os.mkdir(dirname)
+
+        manager = WorkspaceManager(disk_dirname=self.disk_dirname)
+        manager.acquire()
+        manager._cleaner.submit(lambda: None).result()
+
+        self.assertEqual(sorted(os.listdir(self.disk_dirname)), sorted([
+            os.path.basename(live_root),
+            'biosimulators-bionetgen-{}'.format(os.getpid()),
+            'other',
+        ]))
+
+        manager.remove()
+
+    def test_WorkspaceManager_remove_in_forked_process(self):
+        manager = WorkspaceManager(disk_dirname=self.disk_dirname)
+        dirname = manager.acquire()
+        with mock.patch('os.getpid', return_value=manager.pid + 1):
+            manager.remove()
+        self.assertTrue(os.path.isdir(dirname))
+
+        manager.remove()
+        self.assertFalse(os.path.isdir(dirname))
+
+    def test_get_workspace_manager(self):
+        with mock.patch('biosimulators_bionetgen.workspace._workspace_managers', {}):
+            with mock.patch('atexit.register') as register:
+                manager = get_workspace_manager()
+                self.assertIs(get_workspace_manager(), manager)
+                register.assert_called_once_with(manager.remove)
+
+    def test_task_workspace(self):
+        config = Config()
+        config.reuse_workspaces = False
+        config.workspace_dir = self.disk_dirname
+        with task_workspace(config) as dirname:
+            self.assertEqual(os.path.dirname(dirname), self.disk_dirname)
+            self.assertTrue(os.path.isdir(dirname))
+        self.assertFalse(os.path.isdir(dirname))
+
+        config.reuse_workspaces = True
+        config.workspace_ram_dir = None
+        manager = WorkspaceManager(disk_dirname=self.disk_dirname)
+        with mock.patch('biosimulators_bionetgen.workspace._workspace_managers', {os.getpid(): manager}):
+            with task_workspace(config) as dirname:
+                with open(os.path.join(dirname, 'task.bngl'), 'w') as file:
+                    file.write('')
+            manager._cleaner.submit(lambda: None).result()
+            self.assertTrue(os.path.isdir(dirname))
+            self.assertEqual(os.listdir(dirname), [])
+
+            with task_workspace(config) as dirname_2:
+                self.assertEqual(dirname_2, dirname)
+
+        manager.remove()
+        self.assertEqual(os.listdir(self.disk_dirname), [])
+
+    def test_exec_bionetgen_task_in_reused_workspace(self):
+        model_filename = os.path.join(os.path.dirname(__file__), 'fixtures', 'test.bngl')
+        expected_results = exec_bionetgen_task(read_task(model_filename), verbose=False)
+
+        manager = WorkspaceManager(disk_dirname=self.disk_dirname)
+        with mock.patch('biosimulators_bionetgen.workspace._workspace_managers', {os.getpid(): manager}):
+            with mock.patch.dict(os.environ, {'BIONETGEN_REUSE_WORKSPACES': '1'}):
+                for _ in range(2):
+                    results = exec_bionetgen_task(read_task(model_filename), verbose=False)
+                    manager._cleaner.submit(lambda: None).result()
+                    numpy.testing.assert_allclose(results.to_numpy(), expected_results.to_numpy())
+
+        self.assertEqual(manager.num_workspaces, 1)
+        manager.remove()
+
+    def test_ResultsMemoryBudget(self):
+        results_dirname = os.path.join(self.disk_dirname, 'results')
+        budget = ResultsMemoryBudget(100, results_dirname)
+
+        array, spilled = budget.allocate((10,))
+        self.assertFalse(spilled)
+        self.assertNotIsInstance(array, numpy.memmap)
+        self.assertEqual(budget.size, 80)
+        self.assertTrue(budget.is_allocated(array[2:4]))
+        self.assertFalse(budget.is_allocated(numpy.zeros(10)))
+
+        # arrays are spilled to memory-mapped files once the budget is exhausted
+        array_2, spilled = budget.allocate((2, 5))
+        self.assertTrue(spilled)
+        self.assertIsInstance(array_2, numpy.memmap)
+        self.assertEqual(os.listdir(results_dirname), ['results-1.dat'])
+        self.assertEqual(budget.size, 80)
+
+        # memory is returned to the budget and files are removed once the arrays are garbage collected
+        view = array_2[1]
+        del array, array_2
+        gc.collect()
+        self.assertEqual(budget.size, 0)
+        self.assertEqual(os.listdir(results_dirname), ['results-1.dat'])
+
+        del view
+        gc.collect()
+        self.assertEqual(os.listdir(results_dirname), [])
+
+        array, spilled = budget.allocate((10,))
+        self.assertFalse(spilled)
+
+    def test_get_results_memory_budget(self):
+        config = Config()
+        config.results_memory_budget = None
+        self.assertEqual(get_results_memory_budget(config), None)
+
+        config.results_memory_budget = 100
+        config.workspace_dir = self.disk_dirname
+        manager = WorkspaceManager(disk_dirname=self.disk_dirname)
+        with mock.patch('biosimulators_bionetgen.workspace._workspace_managers', {os.getpid(): manager}):
+            with mock.patch('biosimulators_bionetgen.workspace._results_memory_budgets', {}):
+                budget = get_results_memory_budget(config)
+                self.assertIs(get_results_memory_budget(config), budget)
+        self.assertEqual(budget.max_size, 100)
+        self.assertEqual(budget.dirname, os.path.join(self.disk_dirname,
+                                                      'biosimulators-bionetgen-{}'.format(os.getpid()), 'results'))
+        manager.remove()